@@ -13,7 +13,9 @@ evaluates the state of all available cluster instances against the requirements
 (e.g., resource needs, custom scripts, priority). It will wait and retry until a suitable instance
 is found and all conditions for starting the test are met. This includes handling cluster restarts
 (respins), resource allocation, and synchronization for tests that share expensive setups
-(marked tests).
+(marked tests). Waiting workers are woken up by other workers as soon as the status of cluster
+instances changes (see the `wakeup` module). When warm spare instances are enabled, an instance
+that needs respin is swapped for an already started spare instance (see the `spares` module).
 """
 
 import dataclasses
@@ -33,24 +35,23 @@ from cardano_node_tests.cluster_management import common
 from cardano_node_tests.cluster_management import netstat_tools
 from cardano_node_tests.cluster_management import resources
 from cardano_node_tests.cluster_management import resources_management
+from cardano_node_tests.cluster_management import scheduling_events
+from cardano_node_tests.cluster_management import spares
+from cardano_node_tests.cluster_management import state_snapshots
 from cardano_node_tests.cluster_management import status_files
+from cardano_node_tests.cluster_management import wakeup
 from cardano_node_tests.utils import artifacts
 from cardano_node_tests.utils import cluster_nodes
 from cardano_node_tests.utils import configuration
 from cardano_node_tests.utils import framework_log
 from cardano_node_tests.utils import helpers
-from cardano_node_tests.utils import locking
 from cardano_node_tests.utils import temptools
 from cardano_node_tests.utils import types as ttypes
 
 LOGGER = logging.getLogger(__name__)
 
-if configuration.IS_XDIST:
-    _xdist_sleep = time.sleep
-else:
-
-    def _xdist_sleep(seconds: float, /) -> None:
-        """No need to sleep if tests are running on a single worker."""
+# Forget about marked tests that were not running for this many seconds
+MARK_STALE_SEC = 40
 
 
 @dataclasses.dataclass
@@ -72,6 +73,7 @@ class _ClusterGetStatus:
     cluster_needs_respin: bool = False
     prio_here: bool = False
     tried_all_instances: bool = False
+    already_running: bool = False
     instance_dir: pl.Path = pl.Path("/nonexistent")
     final_lock_resources: tp.Iterable[str] = ()
     final_use_resources: tp.Iterable[str] = ()
@@ -87,17 +89,18 @@ class ClusterGetter:
     def __init__(
         self,
         worker_id: str,
-        pytest_config: Config,
+        pytest_config: Config | None,
         num_of_instances: int,
         log_func: tp.Callable,
+        num_of_spares: int = 0,
     ) -> None:
         self.pytest_config = pytest_config
         self.worker_id = worker_id
         self.num_of_instances = num_of_instances
+        self.num_of_spares = num_of_spares
         self.log = log_func
 
         self.pytest_tmp_dir = temptools.get_pytest_root_tmp()
-        self.cluster_lock = common.get_cluster_lock_file()
 
         if cluster_nodes.get_cluster_type().type == cluster_nodes.ClusterType.LOCAL:
             # Soft timeout (seconds): applies when no cluster is selected.
@@ -192,6 +195,8 @@ class ClusterGetter:
         def _netstat_log_func(msg: str) -> None:
             self.log(f"c{self.cluster_instance_num}: {msg}")
 
+        use_snapshots = state_snapshots.is_enabled(scriptsdir=scriptsdir)
+
         excp: Exception | None = None
         netstat_out = ""
         ports = self.ports
@@ -219,19 +224,32 @@ class ClusterGetter:
 
             # Save artifacts only when produced during this test run
             if cluster_running_file.exists() or i > 0:
-                artifacts.save_start_script_coverage(
-                    log_file=state_dir / common.START_CLUSTER_LOG,
-                    pytest_config=self.pytest_config,
-                )
+                if self.pytest_config is not None:
+                    artifacts.save_start_script_coverage(
+                        log_file=state_dir / common.START_CLUSTER_LOG,
+                        pytest_config=self.pytest_config,
+                    )
                 artifacts.save_cluster_artifacts(save_dir=self.pytest_tmp_dir, state_dir=state_dir)
 
             shutil.rmtree(state_dir, ignore_errors=True)
 
             _cluster_started = False
             try:
-                cluster_obj = cluster_nodes.start_cluster(
-                    cmd=str(startup_files.start_script), args=startup_files.start_script_args
-                )
+                # Restore already bootstrapped cluster instance, if possible
+                if use_snapshots and i == 0:
+                    cluster_obj = state_snapshots.restore_snapshot(
+                        state_dir=state_dir, instance_num=self.cluster_instance_num
+                    )
+                    if cluster_obj is not None:
+                        self.log(f"c{self.cluster_instance_num}: restored cluster from snapshot")
+                if cluster_obj is None:
+                    cluster_obj = cluster_nodes.start_cluster(
+                        cmd=str(startup_files.start_script), args=startup_files.start_script_args
+                    )
+                    if use_snapshots:
+                        state_snapshots.take_snapshot(
+                            state_dir=state_dir, instance_num=self.cluster_instance_num
+                        )
                 _cluster_started = True
             except Exception as err:
                 LOGGER.error(f"Failed to start cluster: {err}")  # noqa: TRY400
@@ -369,6 +387,15 @@ class ClusterGetter:
         # Respin is needed when custom scripts were specified
         return bool(cget_status.scriptsdir)
 
+    def _wait_for_change(self, seconds: float) -> None:
+        """Wait until other worker signals a status change, at most for the given time."""
+        # No need to wait if tests are running on a single worker
+        if not configuration.IS_XDIST:
+            return
+
+        if wakeup.get_waiter(worker_id=self.worker_id).wait(timeout=seconds):
+            self.log("woken up by status change")
+
     def _on_marked_test_stop(self, instance_num: int, mark: str) -> None:
         """Perform actions after all marked tests are finished."""
         self.log(f"c{instance_num}: in `_on_marked_test_stop`")
@@ -385,6 +412,9 @@ class ClusterGetter:
 
         # Remove files that indicates that the mark is ready
         status_files.rm_curr_mark_files(instance_num=instance_num, mark=mark)
+        scheduling_events.emit(
+            self.worker_id, scheduling_events.MARK_STOP, instance=instance_num, mark=mark
+        )
 
         # Remove file that indicates resources that are locked by the marked tests
         status_files.rm_resource_locked_files(instance_num=instance_num, mark=mark)
@@ -392,9 +422,11 @@ class ClusterGetter:
         # Remove file that indicates resources that are in-use by the marked tests
         status_files.rm_resource_used_files(instance_num=instance_num, mark=mark)
 
+        wakeup.notify_waiters(worker_id=self.worker_id)
+
     def _get_marked_tests_status(
-        self, marked_tests_cache: dict[int, dict[str, int]], instance_num: int
-    ) -> dict[str, int]:
+        self, marked_tests_cache: dict[int, dict[str, float]], instance_num: int
+    ) -> dict[str, float]:
         """Return marked tests status for cluster instance."""
         if instance_num not in marked_tests_cache:
             marked_tests_cache[instance_num] = {}
@@ -403,7 +435,7 @@ class ClusterGetter:
 
     def _update_marked_tests(
         self,
-        marked_tests_cache: dict[int, dict[str, int]],
+        marked_tests_cache: dict[int, dict[str, float]],
         cget_status: _ClusterGetStatus,
     ) -> None:
         """Update status about running of marked test.
@@ -413,6 +445,9 @@ class ClusterGetter:
         to repeat all the expensive setup if we already cleared the mark. Therefore we need to
         keep track of marked tests and clear the mark and cluster instance only when no marked
         test was running for some time.
+
+        The status is checked on every wake-up, so the time is measured in seconds
+        rather than in number of checks.
         """
         # No need to continue if there are no marked tests
         if not status_files.list_curr_mark_files(instance_num=cget_status.instance_num):
@@ -435,19 +470,19 @@ class ClusterGetter:
             instance_num=cget_status.instance_num
         )
 
+        now = time.monotonic()
         for m in marks_in_progress:
-            marked_tests_status[m] = 0
-
-        for m in marked_tests_status:
-            marked_tests_status[m] += 1
+            marked_tests_status[m] = now
 
+        for m, last_seen in list(marked_tests_status.items()):
             # Clean the stale status files if we are waiting too long for the next marked test
-            if marked_tests_status[m] >= 20:
+            if now - last_seen >= MARK_STALE_SEC:
                 self.log(
                     f"c{cget_status.instance_num}: no marked tests running for a while, "
                     "cleaning the mark status file"
                 )
                 self._on_marked_test_stop(instance_num=cget_status.instance_num, mark=m)
+                del marked_tests_status[m]
 
     def _resolve_resources_availability(self, cget_status: _ClusterGetStatus) -> bool:
         """Resolve availability of required "use" and "lock" resources."""
@@ -471,6 +506,14 @@ class ClusterGetter:
                     f"c{cget_status.instance_num}: want to lock '{cget_status.lock_resources}' and "
                     f"'{unlockable_resources}' are unavailable, cannot start"
                 )
+                scheduling_events.emit(
+                    self.worker_id,
+                    scheduling_events.RESOURCES_UNAVAILABLE,
+                    instance=cget_status.instance_num,
+                    test=cget_status.current_test.split(" ")[0],
+                    wanted=cget_status.lock_resources,
+                    unavailable=sorted(unlockable_resources),
+                )
                 return False
 
         # This test wants to use some resources, check if these are not locked
@@ -485,6 +528,14 @@ class ClusterGetter:
                     f"c{cget_status.instance_num}: want to use '{cget_status.use_resources}' and "
                     f"'{resources_locked}' are locked, cannot start"
                 )
+                scheduling_events.emit(
+                    self.worker_id,
+                    scheduling_events.RESOURCES_UNAVAILABLE,
+                    instance=cget_status.instance_num,
+                    test=cget_status.current_test.split(" ")[0],
+                    wanted=cget_status.use_resources,
+                    unavailable=sorted(resources_locked),
+                )
                 return False
 
         # Make sure that all resource names are sanitized, otherwise there will be issues with
@@ -580,7 +631,7 @@ class ClusterGetter:
 
     def _check_dead_fraction(self, max_dead_fraction: float) -> None:
         """Fail if the fraction of dead cluster instances is too high."""
-        total = self.num_of_instances
+        total = self.num_of_instances + self.num_of_spares
         if total == 0:
             msg = "Number of cluster instances must be greater than 0."
             raise ValueError(msg)
@@ -624,6 +675,32 @@ class ClusterGetter:
         # Remove status files that are checked by other workers
         status_files.rm_curr_mark_files(instance_num=cget_status.instance_num)
 
+    def _swap_for_spare(self, cget_status: _ClusterGetStatus) -> bool:
+        """Replace the cluster instance that needs respin with a warm spare instance."""
+        if not (self.num_of_spares and cget_status.cluster_needs_respin):
+            return False
+
+        # The instance is needed by this test or by tests that are already running on it
+        if (
+            cget_status.selected_instance == cget_status.instance_num
+            or cget_status.started_tests_sfiles
+            or self._test_needs_respin(cget_status)
+        ):
+            return False
+
+        spare_num = spares.find_warm_spare()
+        if spare_num == -1:
+            return False
+
+        self.log(
+            f"c{cget_status.instance_num}: swapping for warm spare instance c{spare_num}, "
+            "respinning in background"
+        )
+        spares.swap_for_spare(
+            instance_num=cget_status.instance_num, spare_num=spare_num, worker_id=self.worker_id
+        )
+        return True
+
     def _init_respin(self, cget_status: _ClusterGetStatus) -> bool:
         """Initialize respin of this cluster instance on this worker."""
         # Respin already initialized
@@ -671,6 +748,9 @@ class ClusterGetter:
             status_files.rm_respin_progress_files(instance_num=cget_status.instance_num)
             status_files.rm_respin_needed_files(instance_num=cget_status.instance_num)
 
+            # Let the waiting workers know the cluster instance is available again
+            wakeup.notify_waiters(worker_id=self.worker_id)
+
             return True
 
         # NOTE: when `_respin` is called, the env variables needed for cluster start scripts need
@@ -686,6 +766,14 @@ class ClusterGetter:
         if not cget_status.mark:
             return
 
+        if not cget_status.marked_ready_sfiles:
+            scheduling_events.emit(
+                self.worker_id,
+                scheduling_events.MARK_START,
+                instance=cget_status.instance_num,
+                mark=cget_status.mark,
+            )
+
         status_files.create_curr_mark_file(
             instance_num=cget_status.instance_num, worker_id=self.worker_id, mark=cget_status.mark
         )
@@ -813,12 +901,12 @@ class ClusterGetter:
             # Check if the development cluster instance is ready by now so we don't need to obtain
             # cluster lock when it is not necessary
             if not self._is_dev_cluster_ready():
-                with locking.FileLockIfXdist(self.cluster_lock):
+                with common.get_cluster_lock():
                     self._setup_dev_cluster()
 
             available_instances = [cluster_nodes.get_cluster_env().instance_num]
         else:
-            available_instances = list(range(self.num_of_instances))
+            available_instances = list(range(self.num_of_instances + self.num_of_spares))
 
         if configuration.FORBID_RESTART and scriptsdir:
             msg = "Cannot use custom cluster scripts when 'FORBID_RESTART' is set."
@@ -844,9 +932,56 @@ class ClusterGetter:
             scriptsdir=scriptsdir,
             current_test=os.environ.get("PYTEST_CURRENT_TEST") or "",
         )
-        marked_tests_cache: dict[int, dict[str, int]] = {}
 
         self.log(f"want to run test '{cget_status.current_test}'")
+        scheduling_events.emit(
+            self.worker_id,
+            scheduling_events.WAIT_START,
+            test=cget_status.current_test.split(" ")[0],
+            mark=mark,
+            prio=prio,
+        )
+
+        # The wait ends also when the test doesn't get a cluster instance, e.g. on timeout
+        wait_end: dict[str, tp.Any] = {"instance": -1, "error": "interrupted"}
+        try:
+            instance_num = self._wait_for_instance(
+                cget_status=cget_status, available_instances=available_instances
+            )
+            if cget_status.already_running:
+                wait_end = {"instance": instance_num, "already_running": True}
+            else:
+                wait_end = {
+                    "instance": instance_num,
+                    "locked": cget_status.final_lock_resources,
+                    "used": cget_status.final_use_resources,
+                }
+        except Exception as exc:
+            wait_end = {"instance": -1, "error": f"{type(exc).__name__}: {exc}"}
+            raise
+        finally:
+            scheduling_events.emit(
+                self.worker_id,
+                scheduling_events.WAIT_END,
+                test=cget_status.current_test.split(" ")[0],
+                mark=mark,
+                **wait_end,
+            )
+
+        return instance_num
+
+    def _wait_for_instance(  # noqa: C901
+        self, cget_status: _ClusterGetStatus, available_instances: list[int]
+    ) -> int:
+        """Wait until the test can start on one of the available cluster instances."""
+        mark = cget_status.mark
+        prio = cget_status.prio
+        scriptsdir = cget_status.scriptsdir
+        marked_tests_cache: dict[int, dict[str, float]] = {}
+
+        # Discard wake-ups that were sent while this worker was not waiting
+        if configuration.IS_XDIST:
+            wakeup.get_waiter(worker_id=self.worker_id).drain()
 
         # Iterate until it is possible to start the test. Timeout after grace period.
         now = time.monotonic()
@@ -867,15 +1002,33 @@ class ClusterGetter:
                 raise TimeoutError(msg)
 
             if cget_status.respin_ready:
-                self._respin(scriptsdir=scriptsdir)
+                scheduling_events.emit(
+                    self.worker_id,
+                    scheduling_events.RESPIN_START,
+                    instance=self.cluster_instance_num,
+                    scriptsdir=scriptsdir,
+                )
+                respun = False
+                try:
+                    respun = self._respin(scriptsdir=scriptsdir)
+                finally:
+                    scheduling_events.emit(
+                        self.worker_id,
+                        scheduling_events.RESPIN_END,
+                        instance=self.cluster_instance_num,
+                        success=respun,
+                    )
 
-            # Sleep for a while to avoid too many checks in a short time
-            _xdist_sleep(random.uniform(0.6, 1.2) * cget_status.sleep_delay)
+            # Wait for a status change. The randomized timeout acts as a watchdog, to avoid
+            # waiting forever for changes that are not signaled.
+            self._wait_for_change(random.uniform(0.6, 1.2) * cget_status.sleep_delay)
             cget_status.sleep_delay = max(cget_status.sleep_delay, 1)
 
-            # Nothing time consuming can go under this lock as all other workers will need to wait
-            with locking.FileLockIfXdist(self.cluster_lock):
+            # Nothing time consuming can go under this lock as all other workers will need to wait.
+            # Status files of each cluster instance are read just once while holding the lock.
+            with common.get_cluster_lock(), status_files.cached_reads():
                 if self._is_already_running():
+                    cget_status.already_running = True
                     return self.cluster_instance_num
 
                 self._fail_on_dead_clusters(remaining_time_sec=remaining_soft)
@@ -897,8 +1050,15 @@ class ClusterGetter:
 
                 self._cluster_instance_num = -1
 
+                spares.init_spares(
+                    num_of_instances=self.num_of_instances, num_of_spares=self.num_of_spares
+                )
+                spare_instances = (
+                    status_files.get_spare_instances() if self.num_of_spares else set()
+                )
+
                 # Try all existing cluster instances; randomize the order
-                for instance_num in random.sample(available_instances, k=self.num_of_instances):
+                for instance_num in random.sample(available_instances, k=len(available_instances)):
                     # If instance to run the test on was already decided, skip all other instances
                     if cget_status.selected_instance not in (-1, instance_num):
                         continue
@@ -914,6 +1074,11 @@ class ClusterGetter:
                         self._cleanup_dead_clusters(cget_status)
                         continue
 
+                    # Tests don't run on spare instances, make sure they are started in background
+                    if instance_num in spare_instances:
+                        spares.maintain_spare(instance_num=instance_num)
+                        continue
+
                     # Cluster respin planned or in progress, so no new tests can start
                     if self._respun_by_other_worker(cget_status):
                         cget_status.sleep_delay = 5
@@ -949,6 +1114,11 @@ class ClusterGetter:
                     # Cache the result as the check itself can be expensive.
                     cget_status.cluster_needs_respin = self._cluster_needs_respin(instance_num)
 
+                    # Swap the instance for a warm spare instance instead of waiting for respin
+                    if self._swap_for_spare(cget_status):
+                        cget_status.sleep_delay = 0
+                        continue
+
                     # Select this instance for running marked tests if possible
                     if mark and not self._marked_select_instance(cget_status):
                         cget_status.sleep_delay = 2
@@ -998,6 +1168,7 @@ class ClusterGetter:
                     # Remove "prio" status file
                     if prio:
                         status_files.rm_prio_in_progress_files(worker_id=self.worker_id)
+                        wakeup.notify_waiters(worker_id=self.worker_id)
 
                     # Create status file for marked tests.
                     # This must be done before the cluster is re-spun, so that other marked tests
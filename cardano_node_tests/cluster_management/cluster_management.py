@@ -11,7 +11,8 @@ Key concepts:
       files created on a shared file system. These files act as locks and signals to indicate the
       state of cluster instances (e.g., which test is running, if a respin is needed, which
       resources are locked). The `status_files` module manages the creation and lookup of these
-      files.
+      files. The status files can be also kept in a SQLite database, or by a central coordinator
+      process (see the `status_backends` and `coordinator` modules).
     - **Resource Management**: Tests can declare what resources they need. A resource can be, for
       example, a specific feature of a cluster that cannot be used by multiple tests at the same
       time. The `ClusterManager` handles locking of these resources so that only one test can use
@@ -1,3 +1,8 @@
+import contextlib
+
+from cardano_node_tests.cluster_management import coordinator
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import locking
 from cardano_node_tests.utils import temptools
 
 CLUSTER_LOCK = ".cluster.lock"
@@ -10,3 +15,14 @@ def get_cluster_lock_file() -> str:
     pytest_tmp_dir = temptools.get_pytest_root_tmp()
     cluster_lock = f"{pytest_tmp_dir}/{CLUSTER_LOCK}"
     return cluster_lock
+
+
+def get_cluster_lock() -> contextlib.AbstractContextManager:
+    """Return the global lock for scheduling tests on cluster instances.
+
+    The lock is provided by the coordinator when it is enabled, otherwise it is a file lock.
+    """
+    if configuration.STATUS_BACKEND == "coordinator":
+        return coordinator.get_client().lock()
+    file_lock: contextlib.AbstractContextManager = locking.FileLockIfXdist(get_cluster_lock_file())
+    return file_lock
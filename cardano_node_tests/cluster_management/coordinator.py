@@ -0,0 +1,336 @@
+"""Central coordinator of cluster instances scheduling.
+
+When enabled (`CLUSTER_STATUS_BACKEND=coordinator`), the pytest controller process starts
+a coordinator server listening on a Unix socket. The coordinator owns the scheduling state of all
+cluster instances (tests running, locked and used resources, marks, respin and "prio" flags) in
+memory, and it also provides the global cluster lock.
+
+Pytest workers connect to the coordinator and:
+* acquire and release the global cluster lock - the lock is granted in FIFO order, so no worker
+  can be starved by others
+* read and modify the scheduling state - all state is returned in a single round trip, and
+  lookups are then answered from memory
+
+The scheduling rules themselves are not changed, workers run the same `ClusterGetter` logic
+as with the other status backends. As all the requests go through the coordinator, it is a single
+place where scheduling metrics are collected.
+
+Protocol: newline-delimited JSON. Request is `{"op": <name>, ...}`, response is
+`{"result": ...}` or `{"error": <message>}`.
+"""
+
+import collections
+import contextlib
+import dataclasses
+import fnmatch
+import functools
+import json
+import logging
+import os
+import pathlib as pl
+import shutil
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+import typing as tp
+
+from cardano_node_tests.cluster_management import status_backends
+
+LOGGER = logging.getLogger(__name__)
+
+COORDINATOR_SOCKET_ENV = "CLUSTER_COORDINATOR_SOCKET"
+
+
+@dataclasses.dataclass
+class CoordinatorStats:
+    """Scheduling metrics collected by the coordinator."""
+
+    lock_acquisitions: int = 0
+    lock_wait_total: float = 0.0
+    lock_wait_max: float = 0.0
+    lock_hold_total: float = 0.0
+    lock_hold_max: float = 0.0
+    max_waiters: int = 0
+    requests: dict[str, int] = dataclasses.field(default_factory=dict)
+
+
+class _FifoLock:
+    """Reentrant lock that is granted to owners in the order they asked for it."""
+
+    def __init__(self, stats: CoordinatorStats) -> None:
+        self.stats = stats
+        self._cond = threading.Condition()
+        self._queue: collections.deque[object] = collections.deque()
+        self._owner: object | None = None
+        self._count = 0
+        self._acquired_at = 0.0
+
+    def acquire(self, owner: object) -> None:
+        with self._cond:
+            if self._owner is owner:
+                self._count += 1
+                return
+
+            start = time.monotonic()
+            self._queue.append(owner)
+            self.stats.max_waiters = max(self.stats.max_waiters, len(self._queue))
+            while self._owner is not None or self._queue[0] is not owner:
+                self._cond.wait()
+            self._queue.popleft()
+
+            self._owner = owner
+            self._count = 1
+            self._acquired_at = time.monotonic()
+
+            waited = self._acquired_at - start
+            self.stats.lock_acquisitions += 1
+            self.stats.lock_wait_total += waited
+            self.stats.lock_wait_max = max(self.stats.lock_wait_max, waited)
+
+    def release(self, owner: object) -> None:
+        with self._cond:
+            if self._owner is not owner:
+                msg = "Cannot release lock that is not owned."
+                raise RuntimeError(msg)
+
+            self._count -= 1
+            if self._count > 0:
+                return
+
+            held = time.monotonic() - self._acquired_at
+            self.stats.lock_hold_total += held
+            self.stats.lock_hold_max = max(self.stats.lock_hold_max, held)
+
+            self._owner = None
+            self._cond.notify_all()
+
+    def forget(self, owner: object) -> None:
+        """Release the lock and leave the queue, e.g. when connection with the owner was lost."""
+        with self._cond:
+            if self._owner is owner:
+                self._count = 1
+                self.release(owner)
+            with contextlib.suppress(ValueError):
+                self._queue.remove(owner)
+                self._cond.notify_all()
+
+
+class _State:
+    """Scheduling state kept by the coordinator."""
+
+    def __init__(self) -> None:
+        self.stats = CoordinatorStats()
+        self.lock = _FifoLock(stats=self.stats)
+        self._mutex = threading.Lock()
+        self.entries: dict[str, dict[str, str]] = {}
+
+    def count_request(self, op: str) -> None:
+        with self._mutex:
+            self.stats.requests[op] = self.stats.requests.get(op, 0) + 1
+
+    def glob(self, location_pattern: str, name_pattern: str) -> list[tuple[str, str]]:
+        with self._mutex:
+            return [
+                (loc, n)
+                for loc, names in self.entries.items()
+                if fnmatch.fnmatchcase(loc, location_pattern)
+                for n in names
+                if fnmatch.fnmatchcase(n, name_pattern)
+            ]
+
+    def snapshot(self) -> dict[str, dict[str, str]]:
+        with self._mutex:
+            return {loc: dict(names) for loc, names in self.entries.items()}
+
+    def touch(self, location: str, name: str, content: str) -> None:
+        with self._mutex:
+            self.entries.setdefault(location, {})[name] = content
+
+    def read_text(self, location: str, name: str) -> str | None:
+        with self._mutex:
+            return self.entries.get(location, {}).get(name)
+
+    def unlink(self, location: str, name: str) -> bool:
+        with self._mutex:
+            return self.entries.get(location, {}).pop(name, None) is not None
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    @property
+    def coordinator(self) -> "CoordinatorServer":
+        return tp.cast("CoordinatorServer", self.server)
+
+    def _dispatch(self, request: dict) -> tp.Any:  # noqa: PLR0911
+        state = self.coordinator.state
+        op = request["op"]
+        state.count_request(op)
+
+        if op == "lock":
+            state.lock.acquire(owner=self)
+            return True
+        if op == "unlock":
+            state.lock.release(owner=self)
+            return True
+        if op == "glob":
+            return state.glob(location_pattern=request["location"], name_pattern=request["name"])
+        if op == "snapshot":
+            return state.snapshot()
+        if op == "touch":
+            state.touch(
+                location=request["location"], name=request["name"], content=request["content"]
+            )
+            return True
+        if op == "read_text":
+            return state.read_text(location=request["location"], name=request["name"])
+        if op == "unlink":
+            return state.unlink(location=request["location"], name=request["name"])
+        if op == "stats":
+            return dataclasses.asdict(state.stats)
+
+        msg = f"Unknown operation: {op}"
+        raise ValueError(msg)
+
+    def handle(self) -> None:
+        try:
+            for line in self.rfile:
+                try:
+                    response = {"result": self._dispatch(json.loads(line))}
+                except Exception as err:
+                    response = {"error": f"{type(err).__name__}: {err}"}
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        finally:
+            self.coordinator.state.lock.forget(owner=self)
+
+
+class CoordinatorServer(socketserver.ThreadingUnixStreamServer):
+    """Coordinator server running in a thread of the pytest controller process."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: pl.Path) -> None:
+        self.state = _State()
+        self.socket_path = socket_path
+        super().__init__(str(socket_path), _RequestHandler)
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="cluster-coordinator", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+        LOGGER.info(f"Cluster coordinator listening on '{self.socket_path}'.")
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        LOGGER.info(f"Cluster coordinator stats: {dataclasses.asdict(self.state.stats)}")
+        shutil.rmtree(self.socket_path.parent, ignore_errors=True)
+
+
+def start_server() -> CoordinatorServer:
+    """Start the coordinator server and make its socket path known to pytest workers.
+
+    Must be called in the pytest controller process before pytest workers are started.
+    """
+    # Keep the socket path short, there's a length limit for Unix socket paths
+    socket_dir = pl.Path(tempfile.mkdtemp(prefix="cnt-coord-"))
+    server = CoordinatorServer(socket_path=socket_dir / "coordinator.sock")
+    server.start()
+    os.environ[COORDINATOR_SOCKET_ENV] = str(server.socket_path)
+    return server
+
+
+class CoordinatorClient:
+    """Connection of a pytest worker to the coordinator."""
+
+    def __init__(self, socket_path: str) -> None:
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(socket_path)
+        self._rfile = self._sock.makefile("rb")
+        self._mutex = threading.Lock()
+
+    def request(self, op: str, **kwargs: tp.Any) -> tp.Any:
+        with self._mutex:
+            self._sock.sendall(json.dumps({"op": op, **kwargs}).encode("utf-8") + b"\n")
+            line = self._rfile.readline()
+
+        if not line:
+            msg = "Connection to the cluster coordinator was lost."
+            raise ConnectionError(msg)
+
+        response = json.loads(line)
+        if "error" in response:
+            msg = f"Cluster coordinator request '{op}' failed: {response['error']}"
+            raise RuntimeError(msg)
+        return response["result"]
+
+    def close(self) -> None:
+        self._rfile.close()
+        self._sock.close()
+
+    @contextlib.contextmanager
+    def lock(self) -> tp.Iterator[None]:
+        """Hold the global cluster lock - context manager."""
+        self.request("lock")
+        try:
+            yield
+        finally:
+            self.request("unlock")
+
+
+@functools.cache
+def get_client() -> CoordinatorClient:
+    """Return connection to the coordinator for the current process."""
+    socket_path = os.environ.get(COORDINATOR_SOCKET_ENV)
+    if not socket_path:
+        msg = f"The `{COORDINATOR_SOCKET_ENV}` env variable is not set, coordinator not running."
+        raise RuntimeError(msg)
+    return CoordinatorClient(socket_path=socket_path)
+
+
+class CoordinatorBackend(status_backends.StatusBackend):
+    """Status entries are kept by the coordinator."""
+
+    def __init__(self, root: pl.Path, client: CoordinatorClient) -> None:
+        super().__init__(root=root)
+        self.client = client
+
+    def _read_location(self, location: str) -> dict[str, str | None]:
+        # Read all locations at once, so a loop over all cluster instances needs just one request
+        assert self._cache is not None
+        snapshot: dict[str, dict[str, str]] = self.client.request("snapshot")
+        self._cache.update(snapshot)  # type: ignore[arg-type]
+        self._cache_complete = True
+        return self._cache.get(location, {})
+
+    def _list_locations(self, location_pattern: str) -> list[str]:
+        assert self._cache is not None
+        if not self._cache_complete:
+            self._read_location("")
+        return [loc for loc in self._cache if fnmatch.fnmatchcase(loc, location_pattern)]
+
+    def _glob(self, location_pattern: str, name_pattern: str) -> list[pl.Path]:
+        found = self.client.request("glob", location=location_pattern, name=name_pattern)
+        return [self._get_path(location=loc, name=n) for loc, n in found]
+
+    def _touch(self, location: str, name: str, content: str) -> None:
+        self.client.request("touch", location=location, name=name, content=content)
+
+    def _read_text(self, location: str, name: str) -> str:
+        content = self.client.request("read_text", location=location, name=name)
+        if content is None:
+            msg = f"Status entry not found: {self._get_path(location=location, name=name)}"
+            raise FileNotFoundError(msg)
+        return str(content)
+
+    def _unlink(self, location: str, name: str) -> None:
+        if not self.client.request("unlink", location=location, name=name):
+            msg = f"Status entry not found: {self._get_path(location=location, name=name)}"
+            raise FileNotFoundError(msg)
+
+
+@functools.cache
+def get_backend(root: pl.Path) -> CoordinatorBackend:
+    """Return coordinator status backend for given pytest root temp dir."""
+    return CoordinatorBackend(root=root, client=get_client())
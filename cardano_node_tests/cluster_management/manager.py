@@ -27,7 +27,10 @@ from cardano_node_tests.cluster_management import cache
 from cardano_node_tests.cluster_management import cluster_getter
 from cardano_node_tests.cluster_management import common
 from cardano_node_tests.cluster_management import resources_management
+from cardano_node_tests.cluster_management import scheduling_events
+from cardano_node_tests.cluster_management import spares
 from cardano_node_tests.cluster_management import status_files
+from cardano_node_tests.cluster_management import wakeup
 from cardano_node_tests.utils import artifacts
 from cardano_node_tests.utils import cluster_nodes
 from cardano_node_tests.utils import cluster_scripts
@@ -81,7 +84,14 @@ class ClusterManager:
             self.range_num = 1
             self.num_of_instances = 1
 
-        self.cluster_lock = f"{self.pytest_tmp_dir}/{common.CLUSTER_LOCK}"
+        # Spare instances are respun in background, so they are useless when respin is not allowed
+        self.num_of_spares = (
+            configuration.SPARE_INSTANCES
+            if configuration.IS_XDIST
+            and not (configuration.DEV_CLUSTER_RUNNING or configuration.FORBID_RESTART)
+            else 0
+        )
+
         self.log_lock = f"{self.pytest_tmp_dir}/{common.LOG_LOCK}"
 
         self._cluster_instance_num = -1
@@ -127,6 +137,10 @@ class ClusterManager:
                 continue
 
             artifacts.save_cli_coverage(cluster_obj=cluster_obj, pytest_config=self.pytest_config)
+            artifacts.save_cli_latency(cluster_obj=cluster_obj, pytest_config=self.pytest_config)
+            query_cache = getattr(cluster_obj, "query_cache", None)
+            if query_cache and query_cache.enabled:
+                LOGGER.info(query_cache.get_summary())
 
     def _is_valid_cluster_instance(self, work_dir: pl.Path, instance_num: int) -> bool:
         """Check if cluster instance is valid."""
@@ -163,7 +177,7 @@ class ClusterManager:
 
         work_dir = cluster_nodes.get_cluster_env().work_dir
 
-        for instance_num in range(self.num_of_instances):
+        for instance_num in range(self.num_of_instances + self.num_of_spares):
             state_dir = work_dir / f"{cluster_nodes.STATE_CLUSTER}{instance_num}"
             if not self._is_valid_cluster_instance(work_dir=work_dir, instance_num=instance_num):
                 continue
@@ -185,7 +199,10 @@ class ClusterManager:
 
         work_dir = cluster_nodes.get_cluster_env().work_dir
 
-        for instance_num in range(self.num_of_instances):
+        # Don't let the background respins start spare instances again
+        spares.stop_warmups(instances=range(self.num_of_instances + self.num_of_spares))
+
+        for instance_num in range(self.num_of_instances + self.num_of_spares):
             state_dir = work_dir / f"{cluster_nodes.STATE_CLUSTER}{instance_num}"
             if not self._is_valid_cluster_instance(work_dir=work_dir, instance_num=instance_num):
                 continue
@@ -208,7 +225,7 @@ class ClusterManager:
 
     def set_needs_respin(self) -> None:
         """Indicate that the cluster instance needs respin."""
-        with locking.FileLockIfXdist(self.cluster_lock):
+        with common.get_cluster_lock():
             self.log(f"c{self.cluster_instance_num}: called `set_needs_respin`")
             status_files.create_respin_needed_file(
                 instance_num=self.cluster_instance_num, worker_id=self.worker_id
@@ -252,7 +269,10 @@ class ClusterManager:
         current_test = os.environ.get("PYTEST_CURRENT_TEST") or ""
         self.log(f"c{self._cluster_instance_num}: called `on_test_stop` for '{current_test}'")
 
-        with locking.FileLockIfXdist(self.cluster_lock):
+        # The cluster instance can be respun once the test is finished
+        logfiles.unwatch_cluster_logs()
+
+        with common.get_cluster_lock(), status_files.cached_reads():
             # Delete an "ignore errors" rules file that was created for the current pytest worker.
             # There's only one test running on a worker at a time. Deleting the corresponding rules
             # file right after a test is finished is therefore safe. The effect is that the rules
@@ -286,6 +306,17 @@ class ClusterManager:
             tnames = status_files.get_test_names(instance_num=self.cluster_instance_num)
             self.log(f"c{self._cluster_instance_num}: running tests: {tnames}")
 
+        scheduling_events.emit(
+            self.worker_id,
+            scheduling_events.TEST_STOP,
+            instance=self.cluster_instance_num,
+            test=current_test.split(" ")[0],
+        )
+
+        # Resources were released, wake up workers that are waiting for them
+        if configuration.IS_XDIST:
+            wakeup.notify_waiters(worker_id=self.worker_id)
+
     def _get_resources_from_paths(
         self,
         paths: tp.Iterable[pl.Path],
@@ -338,6 +369,7 @@ class ClusterManager:
             return
 
         artifacts.save_cli_coverage(cluster_obj=cluster_obj, pytest_config=self.pytest_config)
+        artifacts.save_cli_latency(cluster_obj=cluster_obj, pytest_config=self.pytest_config)
 
     def _reload_cluster_obj(self, state_dir: pl.Path) -> None:
         """Reload cluster instance data if necessary."""
@@ -376,6 +408,7 @@ class ClusterManager:
             pytest_config=self.pytest_config,
             num_of_instances=self.num_of_instances,
             log_func=self.log,
+            num_of_spares=self.num_of_spares,
         ).get_cluster_instance(
             mark=mark,
             lock_resources=lock_resources,
@@ -399,6 +432,9 @@ class ClusterManager:
         cluster_obj._cluster_manager = self  # type: ignore
         self._initialized = True
 
+        # Search for errors in log files while the test is running
+        logfiles.watch_cluster_logs()
+
     def get(
         self,
         mark: str = "",
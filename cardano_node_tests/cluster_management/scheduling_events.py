@@ -0,0 +1,50 @@
+"""Structured scheduling events.
+
+When the `SCHEDULING_EVENTS` env variable is set, scheduling events are appended as JSON lines
+to the given file. Every record has the `ts` (Unix timestamp), `worker` and `event` fields,
+and event-specific fields. The events can be analyzed by the `scheduling-timeline` script.
+
+Events:
+* `wait_start`: test started waiting for a cluster instance
+* `wait_end`: test obtained a cluster instance, the resources were locked; the `error` field
+  is set when the test didn't get any cluster instance, `already_running` when the test was
+  already running on the instance
+* `resources_unavailable`: requested resources are locked or used by other tests
+* `respin_start`, `respin_end`: respin of a cluster instance
+* `mark_start`, `mark_stop`: a marked group of tests started or finished on a cluster instance
+* `test_stop`: test finished and released its cluster instance
+"""
+
+import json
+import time
+import typing as tp
+
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import locking
+from cardano_node_tests.utils import temptools
+
+EVENTS_LOCK = ".scheduling_events.lock"
+
+WAIT_START = "wait_start"
+WAIT_END = "wait_end"
+RESOURCES_UNAVAILABLE = "resources_unavailable"
+RESPIN_START = "respin_start"
+RESPIN_END = "respin_end"
+MARK_START = "mark_start"
+MARK_STOP = "mark_stop"
+TEST_STOP = "test_stop"
+
+
+def emit(worker_id: str, event: str, **data: tp.Any) -> None:
+    """Record a scheduling event."""
+    if not configuration.SCHEDULING_EVENTS:
+        return
+
+    record = {"ts": time.time(), "worker": worker_id, "event": event, **data}
+    line = json.dumps(record, default=str)
+
+    with (
+        locking.FileLockIfXdist(f"{temptools.get_pytest_root_tmp()}/{EVENTS_LOCK}"),
+        open(configuration.SCHEDULING_EVENTS, "a", encoding="utf-8") as events_fp,
+    ):
+        events_fp.write(f"{line}\n")
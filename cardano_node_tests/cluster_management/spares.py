@@ -0,0 +1,225 @@
+"""Warm spare cluster instances.
+
+When the `CLUSTER_SPARE_INSTANCES` env variable is set, the given number of extra cluster
+instances is kept started in the background, on top of the `CLUSTERS_COUNT` instances that
+tests run on. When an active cluster instance needs respin, it is swapped for an already started
+("warm") spare instance, so tests can continue right away. The dirty instance becomes a spare
+instance and it is respun in a background process.
+
+The spare instances use the instance numbers that follow the active instances, so each of them
+has its own ports, state dir and db-sync database.
+"""
+
+import argparse
+import contextlib
+import datetime
+import os
+import pathlib as pl
+import signal
+import subprocess
+import sys
+
+from cardano_node_tests.cluster_management import common
+from cardano_node_tests.cluster_management import status_files
+from cardano_node_tests.cluster_management import wakeup
+from cardano_node_tests.utils import cluster_nodes
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import locking
+from cardano_node_tests.utils import temptools
+
+SPARE_WORKER_ID = "spare"
+WARMUP_PID_FILE = ".spare_warmup.pid"
+WARMUP_LOG_FILE = "spare_warmup.log"
+USAGE = "Respin a spare cluster instance in the background."
+
+
+def init_spares(num_of_instances: int, num_of_spares: int) -> None:
+    """Mark the initial spare instances.
+
+    Must be called under the global cluster lock.
+    """
+    if not num_of_spares or status_files.list_spares_initialized_files():
+        return
+
+    for instance_num in range(num_of_instances, num_of_instances + num_of_spares):
+        status_files.get_instance_dir(instance_num=instance_num).mkdir(exist_ok=True)
+        status_files.create_spare_file(instance_num=instance_num)
+    status_files.create_spares_initialized_file()
+
+
+def is_warming_up(instance_num: int) -> bool:
+    """Check if the spare instance is being respun in the background."""
+    return bool(status_files.list_respin_progress_files(instance_num=instance_num))
+
+
+def is_warm(instance_num: int) -> bool:
+    """Check if the spare instance is started and ready to be swapped in."""
+    return (
+        status_files.get_cluster_running_file(instance_num=instance_num).exists()
+        and not status_files.get_cluster_dead_file(instance_num=instance_num).exists()
+        and not is_warming_up(instance_num=instance_num)
+        and not status_files.list_respin_needed_files(instance_num=instance_num)
+    )
+
+
+def find_warm_spare() -> int:
+    """Return number of a warm spare instance, or -1 if there's none.
+
+    Must be called under the global cluster lock.
+    """
+    for instance_num in sorted(status_files.get_spare_instances()):
+        if is_warm(instance_num=instance_num):
+            return instance_num
+    return -1
+
+
+def get_warmup_pid_file(instance_num: int) -> pl.Path:
+    return status_files.get_instance_dir(instance_num=instance_num) / WARMUP_PID_FILE
+
+
+def start_warmup(instance_num: int) -> None:
+    """Respin the spare instance in a background process.
+
+    Must be called under the global cluster lock.
+    """
+    instance_dir = status_files.get_instance_dir(instance_num=instance_num)
+    instance_dir.mkdir(exist_ok=True)
+
+    # Other workers will see the respin in progress
+    status_files.create_respin_progress_file(instance_num=instance_num, worker_id=SPARE_WORKER_ID)
+
+    cmd = [
+        sys.executable,
+        "-m",
+        "cardano_node_tests.cluster_management.spares",
+        "--instance-num",
+        str(instance_num),
+        "--root-tmp",
+        str(temptools.get_pytest_root_tmp()),
+        "--worker-tmp",
+        str(temptools.get_pytest_worker_tmp()),
+    ]
+    with open(instance_dir / WARMUP_LOG_FILE, "a", encoding="utf-8") as log_fp:
+        # Start a new session, so the whole process group can be terminated at the end
+        # of the test run
+        proc = subprocess.Popen(
+            cmd, stdout=log_fp, stderr=subprocess.STDOUT, start_new_session=True
+        )
+    get_warmup_pid_file(instance_num=instance_num).write_text(str(proc.pid))
+
+
+def maintain_spare(instance_num: int) -> None:
+    """Start the spare instance in background if it is not started yet or needs respin.
+
+    Must be called under the global cluster lock.
+    """
+    if status_files.get_cluster_dead_file(instance_num=instance_num).exists():
+        return
+    if is_warming_up(instance_num=instance_num):
+        return
+    if status_files.get_cluster_running_file(
+        instance_num=instance_num
+    ).exists() and not status_files.list_respin_needed_files(instance_num=instance_num):
+        return
+    start_warmup(instance_num=instance_num)
+
+
+def swap_for_spare(instance_num: int, spare_num: int, worker_id: str) -> None:
+    """Replace the active instance that needs respin with the warm spare instance.
+
+    Must be called under the global cluster lock.
+    """
+    status_files.rm_spare_files(instance_num=spare_num)
+    status_files.create_spare_file(instance_num=instance_num)
+
+    # Remove mark status files as these will not be valid after respin
+    status_files.rm_curr_mark_files(instance_num=instance_num)
+
+    start_warmup(instance_num=instance_num)
+
+    # Let the waiting workers know the spare instance is available
+    wakeup.notify_waiters(worker_id=worker_id)
+
+
+def stop_warmups(instances: range) -> None:
+    """Terminate the background respins that are still running."""
+    for instance_num in instances:
+        pid_file = get_warmup_pid_file(instance_num=instance_num)
+        if not pid_file.exists():
+            continue
+        with contextlib.suppress(ValueError, ProcessLookupError, PermissionError):
+            os.killpg(int(pid_file.read_text().strip()), signal.SIGTERM)
+        pid_file.unlink(missing_ok=True)
+
+
+def _log(msg: str) -> None:
+    """Log a message to the scheduling log."""
+    if not configuration.SCHEDULING_LOG:
+        return
+
+    with (
+        locking.FileLockIfXdist(f"{temptools.get_pytest_root_tmp()}/{common.LOG_LOCK}"),
+        open(configuration.SCHEDULING_LOG, "a", encoding="utf-8") as logfile,
+    ):
+        logfile.write(f"{datetime.datetime.now(tz=datetime.UTC)} on {SPARE_WORKER_ID}: {msg}\n")
+
+
+def get_args() -> argparse.Namespace:
+    """Get command line arguments."""
+    parser = argparse.ArgumentParser(description=USAGE)
+    parser.add_argument(
+        "--instance-num",
+        required=True,
+        type=int,
+        help="Number of the spare cluster instance.",
+    )
+    parser.add_argument(
+        "--root-tmp",
+        required=True,
+        type=pl.Path,
+        help="Root of the pytest temporary directory.",
+    )
+    parser.add_argument(
+        "--worker-tmp",
+        required=True,
+        type=pl.Path,
+        help="Pytest temporary directory of the worker that started the respin.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = get_args()
+    instance_num: int = args.instance_num
+
+    temptools.PytestTempDirs.pytest_root_tmp = args.root_tmp
+    temptools.PytestTempDirs.pytest_worker_tmp = args.worker_tmp
+    temptools.PytestTempDirs.pytest_shared_tmp = args.root_tmp / "tmp"
+
+    # The `cluster_getter` module imports this module
+    from cardano_node_tests.cluster_management import cluster_getter  # noqa: PLC0415
+
+    cluster_nodes.set_cluster_env(instance_num=instance_num)
+    cget = cluster_getter.ClusterGetter(
+        worker_id=SPARE_WORKER_ID,
+        pytest_config=None,
+        num_of_instances=configuration.CLUSTERS_COUNT,
+        log_func=_log,
+    )
+    cget._cluster_instance_num = instance_num
+
+    respun = False
+    try:
+        respun = cget._respin()
+    finally:
+        with common.get_cluster_lock():
+            status_files.rm_respin_progress_files(instance_num=instance_num)
+            status_files.rm_respin_needed_files(instance_num=instance_num)
+        get_warmup_pid_file(instance_num=instance_num).unlink(missing_ok=True)
+        wakeup.notify_waiters()
+
+    return 0 if respun else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
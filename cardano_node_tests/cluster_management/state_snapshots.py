@@ -0,0 +1,290 @@
+"""Snapshots of bootstrapped local cluster instances.
+
+When the `CLUSTER_SNAPSHOTS_DIR` env variable is set, the files created by the `start-cluster`
+bootstrap (keys, genesis files, node configs, the signed Tx that registers pools, DReps and CC
+members) are saved right after the bootstrap finishes. Next time the cluster instance needs to be
+started, the snapshot is restored instead of running the bootstrap again.
+
+The node databases are not part of the snapshot. They are tied to the genesis files, so a chain
+can't be moved to a new system start time. Instead, the restored cluster starts a new chain:
+the system start time in the genesis files is set to "now", the genesis hashes in node configs are
+updated, and the saved registration Tx is submitted again. The Tx spends only genesis UTxOs
+and has no validity interval, so it is valid on the new chain as well.
+
+Only the "fast" testnet variants, that register everything in a single Tx, can be snapshotted.
+Snapshots are keyed by the instance number (ports and paths are baked into the state dir),
+the testnet variant, the node version, checksum of the cluster scripts and the env variables
+that affect the bootstrap. A snapshot that fails to start is removed and the cluster instance
+is bootstrapped the usual way.
+"""
+
+import datetime
+import functools
+import hashlib
+import json
+import logging
+import os
+import pathlib as pl
+import shutil
+import time
+
+from cardano_clusterlib import clusterlib
+
+from cardano_node_tests.cluster_management import common
+from cardano_node_tests.utils import cluster_nodes
+from cardano_node_tests.utils import cluster_scripts
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import helpers
+
+LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_META = "snapshot.json"
+SNAPSHOT_STATE = "state"
+CLUSTER_START_TIME = "cluster_start_time"
+# Signed Tx that registers pools, DReps and CC members, created by `common-start-fast`
+REGISTRATION_TX = pl.Path("shelley") / "transfer-register-delegate-tx.tx"
+FAUCET_ADDR_FILE = pl.Path("shelley") / "genesis-utxo.addr"
+
+# Seconds between restoring the genesis files and the start of the new chain
+START_DELAY = 5
+# Seconds to wait for the first block of the restored cluster
+FIRST_BLOCK_TIMEOUT = 120
+
+# Env variables read by the cluster scripts that change the bootstrapped cluster
+KEY_ENV_VARS = (
+    "AUTORESTART_NODES",
+    "ENABLE_EXPERIMENTAL",
+    "ENABLE_TX_GENERATOR",
+    "EPOCH_SEC",
+    "MIXED_UTXO_BACKENDS",
+    "NO_CC",
+    "NUM_POOLS",
+    "PORTS_BASE",
+    "PROTOCOL_VERSION",
+    "SLOT_LENGTH",
+    "USE_GENESIS_MODE",
+    "UTXO_BACKEND",
+)
+
+# Files of the node databases and of the running processes, not valid in a new chain
+SKIPPED_FILES_GLOBS = (
+    "db-bft*",
+    "db-pool*",
+    "supervisord.pid",
+    "supervisord.sock",
+    "supervisord.log",
+    "*.socket",
+    "*.stdout",
+    "*.stderr",
+    common.START_CLUSTER_LOG,
+)
+
+
+def is_enabled(scriptsdir: clusterlib.FileType = "") -> bool:
+    """Check if the cluster snapshots can be used."""
+    return bool(
+        configuration.SNAPSHOTS_DIR
+        and not scriptsdir
+        # The db-sync database would need to be snapshotted as well
+        and not configuration.HAS_DBSYNC
+        # The bootstrap steps that run after the registration Tx are not repeated on restore
+        and not helpers.is_truthy_env_var("ENABLE_TX_GENERATOR")
+        and not helpers.is_truthy_env_var("USE_GENESIS_MODE")
+        and cluster_nodes.get_cluster_type().type == cluster_nodes.ClusterType.LOCAL
+    )
+
+
+def _get_scripts_checksum() -> str:
+    """Return checksum of the cluster scripts of the selected testnet variant."""
+    scripts_dir = cluster_scripts.get_testnet_variant_scriptdir2(
+        testnet_variant=configuration.TESTNET_VARIANT
+    )
+    checksum = hashlib.sha256()
+    for base_dir in (cluster_scripts.COMMON_DIR, scripts_dir):
+        for fpath in sorted(p for p in base_dir.rglob("*") if p.is_file()):
+            checksum.update(str(fpath.relative_to(base_dir)).encode())
+            checksum.update(fpath.read_bytes())
+    return checksum.hexdigest()
+
+
+@functools.cache
+def get_snapshot_key(instance_num: int) -> str:
+    """Return key of the snapshot for the cluster instance.
+
+    The key doesn't change during the test run, so it is computed only once per instance.
+    """
+    node_version = helpers.run_command("cardano-node --version").decode().strip()
+    key_data = {
+        "instance_num": instance_num,
+        "testnet_variant": configuration.TESTNET_VARIANT,
+        "node_version": node_version,
+        "scripts_checksum": _get_scripts_checksum(),
+        "env": {v: os.environ.get(v) or "" for v in KEY_ENV_VARS},
+    }
+    key_hash = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+    return f"cluster{instance_num}_{key_hash[:16]}"
+
+
+def get_snapshot_dir(instance_num: int) -> pl.Path:
+    return pl.Path(configuration.SNAPSHOTS_DIR) / get_snapshot_key(instance_num=instance_num)
+
+
+def _copy_tree(src: pl.Path, dst: pl.Path) -> None:
+    shutil.copytree(src, dst, symlinks=True, ignore=shutil.ignore_patterns(*SKIPPED_FILES_GLOBS))
+
+
+def take_snapshot(state_dir: pl.Path, instance_num: int) -> None:
+    """Save snapshot of freshly bootstrapped cluster instance, unless it already exists.
+
+    The node databases are not copied, so the running cluster is not affected.
+    """
+    snapshot_dir = get_snapshot_dir(instance_num=instance_num)
+    if snapshot_dir.exists():
+        return
+    if not (state_dir / REGISTRATION_TX).exists():
+        LOGGER.info(f"The '{configuration.TESTNET_VARIANT}' testnet can't be snapshotted.")
+        return
+
+    tmp_dir = snapshot_dir.with_name(f"{snapshot_dir.name}.tmp{helpers.get_rand_str(4)}")
+    tmp_dir.mkdir(parents=True)
+    try:
+        _copy_tree(src=state_dir, dst=tmp_dir / SNAPSHOT_STATE)
+        (tmp_dir / SNAPSHOT_META).write_text(json.dumps({"created": time.time()}))
+        tmp_dir.rename(snapshot_dir)
+        LOGGER.info(f"Saved snapshot of cluster instance 'c{instance_num}' to '{snapshot_dir}'.")
+    except Exception:
+        LOGGER.exception(f"Failed to save snapshot of cluster instance 'c{instance_num}'.")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def set_start_time(state_dir: pl.Path, start_time: int) -> None:
+    """Set system start time of the cluster in genesis files."""
+    byron_genesis = state_dir / "byron" / "genesis.json"
+    byron_data = json.loads(byron_genesis.read_text())
+    byron_data["startTime"] = start_time
+    byron_genesis.write_text(json.dumps(byron_data, indent=2))
+
+    shelley_genesis = state_dir / "shelley" / "genesis.json"
+    shelley_data = json.loads(shelley_genesis.read_text())
+    system_start = datetime.datetime.fromtimestamp(start_time, tz=datetime.UTC)
+    shelley_data["systemStart"] = system_start.strftime("%Y-%m-%dT%H:%M:%SZ")
+    shelley_genesis.write_text(json.dumps(shelley_data, indent=2))
+
+    (state_dir / CLUSTER_START_TIME).write_text(f"{start_time}\n")
+
+
+def update_genesis_hashes(state_dir: pl.Path) -> None:
+    """Update hashes of the changed genesis files in node configs."""
+    byron_hash = (
+        helpers.run_command(
+            [
+                "cardano-cli",
+                "byron",
+                "genesis",
+                "print-genesis-hash",
+                "--genesis-json",
+                str(state_dir / "byron" / "genesis.json"),
+            ]
+        )
+        .decode()
+        .strip()
+    )
+    shelley_hash = (
+        helpers.run_command(
+            [
+                "cardano-cli",
+                "latest",
+                "genesis",
+                "hash",
+                "--genesis",
+                str(state_dir / "shelley" / "genesis.json"),
+            ]
+        )
+        .decode()
+        .strip()
+    )
+
+    for config_file in state_dir.glob("config-*.json"):
+        config = json.loads(config_file.read_text())
+        config["ByronGenesisHash"] = byron_hash
+        config["ShelleyGenesisHash"] = shelley_hash
+        config_file.write_text(json.dumps(config, indent=2))
+
+
+def _wait_for_first_block(cluster_obj: clusterlib.ClusterLib) -> None:
+    """Wait until the node socket is available and the new chain has its first block."""
+    end_time = time.time() + FIRST_BLOCK_TIMEOUT
+    while True:
+        try:
+            if "block" in cluster_obj.g_query.get_tip():
+                return
+        except clusterlib.CLIError:
+            # The node socket is not available yet
+            pass
+        if time.time() > end_time:
+            msg = f"No block was created in {FIRST_BLOCK_TIMEOUT} seconds."
+            raise clusterlib.CLIError(msg)
+        time.sleep(1)
+
+
+def _start_optional_services(instance_num: int) -> None:
+    """Start the services that `start-cluster` starts explicitly, e.g. `submit_api`."""
+    stopped_services = [
+        s.name
+        for s in cluster_nodes.services_status(instance_num=instance_num)
+        if s.status == "STOPPED"
+    ]
+    if stopped_services:
+        cluster_nodes.services_action(
+            service_names=stopped_services, action="start", instance_num=instance_num
+        )
+
+
+def _submit_registration_tx(cluster_obj: clusterlib.ClusterLib, state_dir: pl.Path) -> None:
+    """Submit the saved Tx that registers pools, DReps and CC members."""
+    faucet_addr = (state_dir / FAUCET_ADDR_FILE).read_text().strip()
+    # The Tx spends the genesis UTxO of the faucet, the only UTxO on the address
+    txins = cluster_obj.g_query.get_utxo(address=faucet_addr)
+    cluster_obj.g_transaction.submit_tx(tx_file=state_dir / REGISTRATION_TX, txins=txins)
+
+
+def _stop_restored(state_dir: pl.Path) -> None:
+    stop_script = state_dir / cluster_scripts.STOP_SCRIPT
+    try:
+        helpers.run_command(str(stop_script), ignore_fail=True)
+    except Exception:
+        LOGGER.exception(f"Failed to stop cluster with `{stop_script}`.")
+
+
+def restore_snapshot(state_dir: pl.Path, instance_num: int) -> clusterlib.ClusterLib | None:
+    """Start cluster instance from a snapshot.
+
+    Return `None` when there's no usable snapshot.
+    """
+    snapshot_dir = get_snapshot_dir(instance_num=instance_num)
+    if not (snapshot_dir / SNAPSHOT_META).exists():
+        return None
+
+    LOGGER.info(f"Restoring cluster instance 'c{instance_num}' from '{snapshot_dir}'.")
+    try:
+        _copy_tree(src=snapshot_dir / SNAPSHOT_STATE, dst=state_dir)
+        set_start_time(state_dir=state_dir, start_time=int(time.time()) + START_DELAY)
+        update_genesis_hashes(state_dir=state_dir)
+        helpers.run_command(str(state_dir / "supervisord_start"), workdir=state_dir.parent)
+
+        cluster_obj = cluster_nodes.get_cluster_type().get_cluster_obj()
+        _wait_for_first_block(cluster_obj=cluster_obj)
+        _start_optional_services(instance_num=instance_num)
+        _submit_registration_tx(cluster_obj=cluster_obj, state_dir=state_dir)
+    except Exception:
+        LOGGER.exception(
+            f"Failed to restore cluster instance 'c{instance_num}' from snapshot, removing it."
+        )
+        _stop_restored(state_dir=state_dir)
+        shutil.rmtree(state_dir, ignore_errors=True)
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+        return None
+
+    LOGGER.info(f"Cluster instance 'c{instance_num}' restored from snapshot.")
+    return cluster_obj
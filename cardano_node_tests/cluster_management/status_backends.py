@@ -0,0 +1,310 @@
+"""Storage backends for cluster instance status files.
+
+Status files are identified by their path, i.e. by the location (directory relative to the pytest
+root temp dir, e.g. `cluster3`, or empty string for the root dir itself) and by the file name.
+File names encode all the information about the status (resource name, mark, worker ID), see
+the `status_files` module.
+
+Available backends:
+* `files` - the original layout, every status is a file on the shared file system
+* `sqlite` - a single SQLite database (in WAL mode) shared by all pytest workers, indexed
+  by location and name
+* `memory` - an in-process index; usable only when running without multiple pytest workers
+
+All backends support the same glob patterns as `pathlib.Path.glob` for the last path component,
+so the lookups return the same (possibly virtual) paths regardless of the backend.
+"""
+
+import abc
+import contextlib
+import fnmatch
+import functools
+import os
+import pathlib as pl
+import sqlite3
+import typing as tp
+
+BACKEND_FILES = "files"
+BACKEND_SQLITE = "sqlite"
+BACKEND_MEMORY = "memory"
+BACKENDS = (BACKEND_FILES, BACKEND_SQLITE, BACKEND_MEMORY)
+
+SQLITE_DB_NAME = ".status.sqlite3"
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _has_wildcard(pattern: str) -> bool:
+    return bool(_GLOB_CHARS.intersection(pattern))
+
+
+class StatusBackend(abc.ABC):
+    """Base class for status backends.
+
+    Lookups can be served from a read cache (see `cached_reads`). When the cache is active,
+    status entries of a location are read just once and all subsequent lookups are answered from
+    memory. Writes done through the backend update the cache, so the cache stays consistent as
+    long as no other process modifies the status entries at the same time (i.e. the cache must
+    be used only under the global cluster lock).
+    """
+
+    def __init__(self, root: pl.Path) -> None:
+        self.root = root
+        self._cache: dict[str, dict[str, str | None]] | None = None
+        # Set by backends that read all locations at once
+        self._cache_complete = False
+
+    def _get_location(self, path: pl.Path) -> str:
+        parent = path.parent
+        if parent == self.root:
+            return ""
+        if parent.parent != self.root:
+            msg = f"Status file '{path}' is not located in '{self.root}'."
+            raise ValueError(msg)
+        return parent.name
+
+    def _get_path(self, location: str, name: str) -> pl.Path:
+        if location:
+            return self.root / location / name
+        return self.root / name
+
+    @abc.abstractmethod
+    def _read_location(self, location: str) -> dict[str, str | None]:
+        """Return all status entries of the location, mapped to their content (if known)."""
+
+    @abc.abstractmethod
+    def _list_locations(self, location_pattern: str) -> list[str]:
+        """Return all locations matching the pattern."""
+
+    @abc.abstractmethod
+    def _glob(self, location_pattern: str, name_pattern: str) -> list[pl.Path]:
+        """Return paths of status entries matching the patterns."""
+
+    @abc.abstractmethod
+    def _touch(self, location: str, name: str, content: str) -> None:
+        """Create the status entry, or replace its content."""
+
+    @abc.abstractmethod
+    def _read_text(self, location: str, name: str) -> str:
+        """Return content of the status entry."""
+
+    @abc.abstractmethod
+    def _unlink(self, location: str, name: str) -> None:
+        """Remove the status entry."""
+
+    def _get_cached_location(self, location: str) -> dict[str, str | None]:
+        assert self._cache is not None
+        entries = self._cache.get(location)
+        if entries is None:
+            entries = {} if self._cache_complete else self._read_location(location)
+            self._cache[location] = entries
+        return entries
+
+    @contextlib.contextmanager
+    def cached_reads(self) -> tp.Iterator[None]:
+        """Serve lookups from a single read of each location - context manager."""
+        if self._cache is not None:
+            yield
+            return
+
+        self._cache = {}
+        try:
+            yield
+        finally:
+            self._cache = None
+            self._cache_complete = False
+
+    def glob(self, location_pattern: str, name_pattern: str) -> list[pl.Path]:
+        """Return paths of status entries matching the patterns."""
+        if self._cache is None:
+            return self._glob(location_pattern=location_pattern, name_pattern=name_pattern)
+
+        if _has_wildcard(location_pattern):
+            locations = self._list_locations(location_pattern)
+        else:
+            locations = [location_pattern]
+
+        return [
+            self._get_path(location=loc, name=n)
+            for loc in locations
+            for n in self._get_cached_location(loc)
+            if fnmatch.fnmatchcase(n, name_pattern)
+        ]
+
+    def touch(self, path: pl.Path, content: str = "") -> None:
+        """Create the status entry, replace its content if it already exists."""
+        location = self._get_location(path)
+        self._touch(location=location, name=path.name, content=content)
+        if self._cache is not None and (location in self._cache or self._cache_complete):
+            self._cache.setdefault(location, {})[path.name] = content
+
+    def read_text(self, path: pl.Path) -> str:
+        """Return content of the status entry."""
+        location = self._get_location(path)
+        if self._cache is not None:
+            content = self._cache.get(location, {}).get(path.name)
+            if content is not None:
+                return content
+        return self._read_text(location=location, name=path.name)
+
+    def unlink(self, path: pl.Path) -> None:
+        """Delete the status entry."""
+        location = self._get_location(path)
+        self._unlink(location=location, name=path.name)
+        if self._cache is not None and location in self._cache:
+            self._cache[location].pop(path.name, None)
+
+
+class FilesBackend(StatusBackend):
+    """Every status entry is a file on the shared file system."""
+
+    def _read_location(self, location: str) -> dict[str, str | None]:
+        loc_dir = self.root / location if location else self.root
+        try:
+            with os.scandir(loc_dir) as it:
+                return {e.name: None for e in it if e.name.startswith(".") and e.is_file()}
+        except FileNotFoundError:
+            return {}
+
+    def _list_locations(self, location_pattern: str) -> list[str]:
+        return [p.name for p in self.root.glob(location_pattern) if p.is_dir()]
+
+    def _glob(self, location_pattern: str, name_pattern: str) -> list[pl.Path]:
+        pattern = f"{location_pattern}/{name_pattern}" if location_pattern else name_pattern
+        return list(self.root.glob(pattern))
+
+    def _touch(self, location: str, name: str, content: str) -> None:
+        path = self._get_path(location=location, name=name)
+        if content:
+            path.write_text(content)
+        else:
+            path.touch()
+
+    def _read_text(self, location: str, name: str) -> str:
+        return self._get_path(location=location, name=name).read_text()
+
+    def _unlink(self, location: str, name: str) -> None:
+        self._get_path(location=location, name=name).unlink()
+
+
+class SqliteBackend(StatusBackend):
+    """All status entries are rows in a single SQLite database shared by all pytest workers."""
+
+    def __init__(self, root: pl.Path) -> None:
+        super().__init__(root=root)
+        self.db_file = root / SQLITE_DB_NAME
+        # Autocommit mode, every statement is a transaction on its own
+        self.conn = sqlite3.connect(self.db_file, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS status ("
+            "location TEXT NOT NULL, name TEXT NOT NULL, content TEXT NOT NULL DEFAULT '', "
+            "PRIMARY KEY (location, name)) WITHOUT ROWID"
+        )
+
+    def _read_location(self, location: str) -> dict[str, str | None]:
+        # Read all locations at once, the table is small. This way a loop over all cluster
+        # instances needs just one query.
+        assert self._cache is not None
+        rows = self.conn.execute("SELECT location, name, content FROM status").fetchall()
+        for loc, name, content in rows:
+            self._cache.setdefault(loc, {})[name] = content
+        self._cache_complete = True
+        return self._cache.get(location, {})
+
+    def _list_locations(self, location_pattern: str) -> list[str]:
+        if self._cache is not None:
+            if not self._cache_complete:
+                self._read_location("")
+            return [loc for loc in self._cache if fnmatch.fnmatchcase(loc, location_pattern)]
+
+        rows = self.conn.execute(
+            "SELECT DISTINCT location FROM status WHERE location GLOB ?", (location_pattern,)
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def _glob(self, location_pattern: str, name_pattern: str) -> list[pl.Path]:
+        # Exact match on location, so the primary key index can be used also for the name prefix
+        loc_op = "GLOB" if _has_wildcard(location_pattern) else "="
+        rows = self.conn.execute(
+            f"SELECT location, name FROM status WHERE location {loc_op} ? AND name GLOB ?",
+            (location_pattern, name_pattern),
+        ).fetchall()
+        return [self._get_path(location=loc, name=n) for loc, n in rows]
+
+    def _touch(self, location: str, name: str, content: str) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO status (location, name, content) VALUES (?, ?, ?)",
+            (location, name, content),
+        )
+
+    def _read_text(self, location: str, name: str) -> str:
+        row = self.conn.execute(
+            "SELECT content FROM status WHERE location = ? AND name = ?", (location, name)
+        ).fetchone()
+        if row is None:
+            msg = f"Status entry not found: {self._get_path(location=location, name=name)}"
+            raise FileNotFoundError(msg)
+        return str(row[0])
+
+    def _unlink(self, location: str, name: str) -> None:
+        cur = self.conn.execute(
+            "DELETE FROM status WHERE location = ? AND name = ?", (location, name)
+        )
+        if cur.rowcount == 0:
+            msg = f"Status entry not found: {self._get_path(location=location, name=name)}"
+            raise FileNotFoundError(msg)
+
+
+class MemoryBackend(StatusBackend):
+    """All status entries are kept in memory of the current process."""
+
+    def __init__(self, root: pl.Path) -> None:
+        super().__init__(root=root)
+        self.entries: dict[str, dict[str, str]] = {}
+
+    def _read_location(self, location: str) -> dict[str, str | None]:
+        return dict(self.entries.get(location, {}))
+
+    def _list_locations(self, location_pattern: str) -> list[str]:
+        return [loc for loc in self.entries if fnmatch.fnmatchcase(loc, location_pattern)]
+
+    def _glob(self, location_pattern: str, name_pattern: str) -> list[pl.Path]:
+        return [
+            self._get_path(location=loc, name=n)
+            for loc in self._list_locations(location_pattern)
+            for n in self.entries[loc]
+            if fnmatch.fnmatchcase(n, name_pattern)
+        ]
+
+    def _touch(self, location: str, name: str, content: str) -> None:
+        self.entries.setdefault(location, {})[name] = content
+
+    def _read_text(self, location: str, name: str) -> str:
+        try:
+            return self.entries[location][name]
+        except KeyError:
+            msg = f"Status entry not found: {self._get_path(location=location, name=name)}"
+            raise FileNotFoundError(msg) from None
+
+    def _unlink(self, location: str, name: str) -> None:
+        try:
+            del self.entries[location][name]
+        except KeyError:
+            msg = f"Status entry not found: {self._get_path(location=location, name=name)}"
+            raise FileNotFoundError(msg) from None
+
+
+@functools.cache
+def get_backend(name: str, root: pl.Path) -> StatusBackend:
+    """Return status backend of given name for given pytest root temp dir."""
+    if name == BACKEND_FILES:
+        return FilesBackend(root=root)
+    if name == BACKEND_SQLITE:
+        return SqliteBackend(root=root)
+    if name == BACKEND_MEMORY:
+        return MemoryBackend(root=root)
+
+    msg = f"Unknown status backend: {name}"
+    raise ValueError(msg)
@@ -10,12 +10,21 @@ Common components of status file names:
 * `_@@<resource_name>@@_`: resource name
 * `_%%<mark>%%_`: test mark
 * `_<worker_id>`: pytest worker ID
+
+The status files used for scheduling (tests running, resources, marks, respin and "prio" flags)
+are stored using the status backend selected by the `CLUSTER_STATUS_BACKEND` env variable
+(see the `status_backends` and `coordinator` modules). Files that indicate state of the cluster
+instance itself (running, stopped, dead) are always regular files.
 """
 
+import contextlib
 import pathlib as pl
 import re
 import typing as tp
 
+from cardano_node_tests.cluster_management import coordinator
+from cardano_node_tests.cluster_management import status_backends
+from cardano_node_tests.utils import configuration
 from cardano_node_tests.utils import temptools
 
 RESOURCE_LOCKED_GLOB = ".resource_locked"
@@ -26,6 +35,8 @@ RESPIN_IN_PROGRESS_GLOB = ".respin_in_progress"
 RESPIN_AFTER_MARK_GLOB = ".respin_after_mark"
 PRIO_IN_PROGRESS_GLOB = ".prio_in_progress"
 TEST_RUNNING_GLOB = ".test_running"
+SPARE_INSTANCE_GLOB = ".spare_instance"
+SPARES_INITIALIZED = ".spares_initialized"
 
 CLUSTER_DIR_TEMPLATE = "cluster"
 CLUSTER_RUNNING_FILE = ".cluster_running"
@@ -36,6 +47,25 @@ CLUSTER_STARTED_BY_FRAMEWORK = ".cluster_started_by_cnt"
 RE_RESNAME = re.compile("_@@(.+)@@_")
 
 
+def get_backend() -> status_backends.StatusBackend:
+    """Return the status backend for the current pytest run."""
+    root = temptools.get_pytest_root_tmp()
+    if configuration.STATUS_BACKEND == "coordinator":
+        return coordinator.get_backend(root=root)
+    return status_backends.get_backend(name=configuration.STATUS_BACKEND, root=root)
+
+
+@contextlib.contextmanager
+def cached_reads() -> tp.Iterator[None]:
+    """Read status files of each cluster instance just once - context manager.
+
+    Must be used only under the global cluster lock, as changes made by other workers are not
+    visible while the context manager is active.
+    """
+    with get_backend().cached_reads():
+        yield
+
+
 def get_instance_dir(instance_num: int) -> pl.Path:
     """Return cluster instance directory for the given instance number."""
     pytest_tmp_dir = temptools.get_pytest_root_tmp()
@@ -106,13 +136,24 @@ def get_test_running_file(instance_num: int, worker_id: str, mark: str = "") ->
     return instance_dir / f"{TEST_RUNNING_GLOB}{mark_str}_{worker_id}"
 
 
+def get_spare_file(instance_num: int) -> pl.Path:
+    """Return the status file that indicates that the cluster instance is a spare instance."""
+    instance_dir = get_instance_dir(instance_num=instance_num)
+    return instance_dir / SPARE_INSTANCE_GLOB
+
+
+def get_spares_initialized_file() -> pl.Path:
+    """Return the status file that indicates that the initial spare instances were selected."""
+    pytest_tmp_dir = temptools.get_pytest_root_tmp()
+    return pytest_tmp_dir / SPARES_INITIALIZED
+
+
 def get_marks_in_progress(instance_num: int | None = None, worker_id: str = "*") -> list[str]:
     """Return list of marks that are in progress."""
     instance_num_str = str(instance_num) if instance_num is not None else "*"
     worker_id_str = "" if worker_id == "*" else f"_{worker_id}"
-    pytest_tmp_dir = temptools.get_pytest_root_tmp()
-    files = pytest_tmp_dir.glob(
-        f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}/{TEST_RUNNING_GLOB}_@@*{worker_id_str}"
+    files = get_backend().glob(
+        f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}", f"{TEST_RUNNING_GLOB}_@@*{worker_id_str}"
     )
     marks_in_progress = [f.name.split("@@")[1] for f in files]
     return marks_in_progress
@@ -135,12 +176,8 @@ def list_test_running_files(
         mark_str = f"_@@{mark}@@"
 
     instance_num_str = str(instance_num) if instance_num is not None else "*"
-    pytest_tmp_dir = temptools.get_pytest_root_tmp()
-
-    files = list(
-        pytest_tmp_dir.glob(
-            f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}/{TEST_RUNNING_GLOB}{mark_str}_{worker_id}"
-        )
+    files = get_backend().glob(
+        f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}", f"{TEST_RUNNING_GLOB}{mark_str}_{worker_id}"
     )
 
     if mark == "" and worker_id == "*":
@@ -160,7 +197,7 @@ def get_test_names(
     If `mark` is an empty string, list all status files that don't have mark.
     """
     tnames = [
-        tf.read_text().strip()
+        get_backend().read_text(tf).strip()
         for tf in list_test_running_files(instance_num=instance_num, worker_id=worker_id, mark=mark)
     ]
     return tnames
@@ -168,8 +205,25 @@ def get_test_names(
 
 def list_prio_in_progress_files(worker_id: str = "*") -> list[pl.Path]:
     """List all "priority test in progress" status files."""
-    pytest_tmp_dir = temptools.get_pytest_root_tmp()
-    files = list(pytest_tmp_dir.glob(f"{PRIO_IN_PROGRESS_GLOB}_{worker_id}"))
+    files = get_backend().glob("", f"{PRIO_IN_PROGRESS_GLOB}_{worker_id}")
+    return files
+
+
+def list_spare_files(instance_num: int | None = None) -> list[pl.Path]:
+    """List all "spare instance" status files."""
+    instance_num_str = str(instance_num) if instance_num is not None else "*"
+    files = get_backend().glob(f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}", SPARE_INSTANCE_GLOB)
+    return files
+
+
+def get_spare_instances() -> set[int]:
+    """Return numbers of cluster instances that are spare instances."""
+    return {int(f.parent.name.replace(CLUSTER_DIR_TEMPLATE, "")) for f in list_spare_files()}
+
+
+def list_spares_initialized_files() -> list[pl.Path]:
+    """List the "spares initialized" status file."""
+    files = get_backend().glob("", SPARES_INITIALIZED)
     return files
 
 
@@ -188,11 +242,8 @@ def list_respin_needed_files(
 ) -> list[pl.Path]:
     """List all "needs respin" status files."""
     instance_num_str = str(instance_num) if instance_num is not None else "*"
-    pytest_tmp_dir = temptools.get_pytest_root_tmp()
-    files = list(
-        pytest_tmp_dir.glob(
-            f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}/{RESPIN_NEEDED_GLOB}_{worker_id}"
-        )
+    files = get_backend().glob(
+        f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}", f"{RESPIN_NEEDED_GLOB}_{worker_id}"
     )
     return files
 
@@ -202,11 +253,8 @@ def list_respin_progress_files(
 ) -> list[pl.Path]:
     """List all "respin in progress" status files."""
     instance_num_str = str(instance_num) if instance_num is not None else "*"
-    pytest_tmp_dir = temptools.get_pytest_root_tmp()
-    files = list(
-        pytest_tmp_dir.glob(
-            f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}/{RESPIN_IN_PROGRESS_GLOB}_{worker_id}"
-        )
+    files = get_backend().glob(
+        f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}", f"{RESPIN_IN_PROGRESS_GLOB}_{worker_id}"
     )
     return files
 
@@ -216,12 +264,9 @@ def list_respin_after_mark_files(
 ) -> list[pl.Path]:
     """List all "respin after mark" status files."""
     instance_num_str = str(instance_num) if instance_num is not None else "*"
-    pytest_tmp_dir = temptools.get_pytest_root_tmp()
-    files = list(
-        pytest_tmp_dir.glob(
-            f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}/"
-            f"{RESPIN_AFTER_MARK_GLOB}_@@{mark}@@_{worker_id}"
-        )
+    files = get_backend().glob(
+        f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}",
+        f"{RESPIN_AFTER_MARK_GLOB}_@@{mark}@@_{worker_id}",
     )
     return files
 
@@ -243,13 +288,9 @@ def list_resource_locked_files(
         mark_str = f"_%%{mark}%%"
 
     instance_num_str = str(instance_num) if instance_num is not None else "*"
-    pytest_tmp_dir = temptools.get_pytest_root_tmp()
-
-    files = list(
-        pytest_tmp_dir.glob(
-            f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}/"
-            f"{RESOURCE_LOCKED_GLOB}_@@*@@{mark_str}_{worker_id}"
-        )
+    files = get_backend().glob(
+        f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}",
+        f"{RESOURCE_LOCKED_GLOB}_@@*@@{mark_str}_{worker_id}",
     )
 
     if mark == "" and worker_id == "*":
@@ -276,13 +317,9 @@ def list_resource_used_files(
         mark_str = f"_%%{mark}%%"
 
     instance_num_str = str(instance_num) if instance_num is not None else "*"
-    pytest_tmp_dir = temptools.get_pytest_root_tmp()
-
-    files = list(
-        pytest_tmp_dir.glob(
-            f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}/"
-            f"{RESOURCE_IN_USE_GLOB}_@@*@@{mark_str}_{worker_id}"
-        )
+    files = get_backend().glob(
+        f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}",
+        f"{RESOURCE_IN_USE_GLOB}_@@*@@{mark_str}_{worker_id}",
     )
 
     if mark == "" and worker_id == "*":
@@ -297,11 +334,8 @@ def list_curr_mark_files(
 ) -> list[pl.Path]:
     """List all "current mark" status files."""
     instance_num_str = str(instance_num) if instance_num is not None else "*"
-    pytest_tmp_dir = temptools.get_pytest_root_tmp()
-    files = list(
-        pytest_tmp_dir.glob(
-            f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}/{TEST_CURR_MARK_GLOB}_@@{mark}@@_{worker_id}"
-        )
+    files = get_backend().glob(
+        f"{CLUSTER_DIR_TEMPLATE}{instance_num_str}", f"{TEST_CURR_MARK_GLOB}_@@{mark}@@_{worker_id}"
     )
     return files
 
@@ -309,21 +343,21 @@ def list_curr_mark_files(
 def create_respin_needed_file(instance_num: int, worker_id: str) -> pl.Path:
     """Create the status file that indicates that the cluster instance needs respin."""
     file = get_respin_needed_file(instance_num=instance_num, worker_id=worker_id)
-    file.touch()
+    get_backend().touch(file)
     return file
 
 
 def create_respin_progress_file(instance_num: int, worker_id: str) -> pl.Path:
     """Create the status file that indicates that respin is in progress."""
     file = get_respin_progress_file(instance_num=instance_num, worker_id=worker_id)
-    file.touch()
+    get_backend().touch(file)
     return file
 
 
 def create_curr_mark_file(instance_num: int, worker_id: str, mark: str) -> pl.Path:
     """Create the status file that indicates presence of marked test on a pytest worker."""
     file = get_curr_mark_file(instance_num=instance_num, worker_id=worker_id, mark=mark)
-    file.touch()
+    get_backend().touch(file)
     return file
 
 
@@ -333,14 +367,28 @@ def create_respin_after_mark_file(instance_num: int, worker_id: str, mark: str)
     The respin will happen after marked tests are finished on the dedicated cluster instance.
     """
     file = get_respin_after_mark_file(instance_num=instance_num, worker_id=worker_id, mark=mark)
-    file.touch()
+    get_backend().touch(file)
     return file
 
 
 def create_prio_in_progress_file(worker_id: str) -> pl.Path:
     """Create the status file that indicates that priority test is in progress."""
     file = get_prio_in_progress_file(worker_id=worker_id)
-    file.touch()
+    get_backend().touch(file)
+    return file
+
+
+def create_spare_file(instance_num: int) -> pl.Path:
+    """Create the status file that indicates that the cluster instance is a spare instance."""
+    file = get_spare_file(instance_num=instance_num)
+    get_backend().touch(file)
+    return file
+
+
+def create_spares_initialized_file() -> pl.Path:
+    """Create the status file that indicates that the initial spare instances were selected."""
+    file = get_spares_initialized_file()
+    get_backend().touch(file)
     return file
 
 
@@ -373,7 +421,7 @@ def create_test_running_file(
     Save the test name in the status file.
     """
     file = get_test_running_file(instance_num=instance_num, worker_id=worker_id, mark=mark)
-    file.write_text(test_id)
+    get_backend().touch(file, content=test_id)
     return file
 
 
@@ -386,8 +434,9 @@ def create_resource_locked_files(
     files = [
         (instance_dir / f"{RESOURCE_LOCKED_GLOB}_@@{r}@@{mark_str}_{worker_id}") for r in lock_names
     ]
+    backend = get_backend()
     for f in files:
-        f.touch()
+        backend.touch(f)
     return files
 
 
@@ -400,8 +449,9 @@ def create_resource_used_files(
     files = [
         (instance_dir / f"{RESOURCE_IN_USE_GLOB}_@@{r}@@{mark_str}_{worker_id}") for r in use_names
     ]
+    backend = get_backend()
     for f in files:
-        f.touch()
+        backend.touch(f)
     return files
 
 
@@ -429,8 +479,9 @@ def rm_resource_locked_files(
     If `mark` is an empty string, list all status files that don't have mark.
     """
     files = list_resource_locked_files(instance_num=instance_num, worker_id=worker_id, mark=mark)
+    backend = get_backend()
     for f in files:
-        f.unlink()
+        backend.unlink(f)
     return files
 
 
@@ -444,8 +495,9 @@ def rm_resource_used_files(
     If `mark` is an empty string, list all status files that don't have mark.
     """
     files = list_resource_used_files(instance_num=instance_num, worker_id=worker_id, mark=mark)
+    backend = get_backend()
     for f in files:
-        f.unlink()
+        backend.unlink(f)
     return files
 
 
@@ -459,8 +511,9 @@ def rm_test_running_files(
     If `mark` is an empty string, list all status files that don't have mark.
     """
     files = list_test_running_files(instance_num=instance_num, worker_id=worker_id, mark=mark)
+    backend = get_backend()
     for f in files:
-        f.unlink()
+        backend.unlink(f)
     return files
 
 
@@ -469,8 +522,9 @@ def rm_respin_after_mark_files(
 ) -> list[pl.Path]:
     """Delete all "respin after mark" status files."""
     files = list_respin_after_mark_files(instance_num=instance_num, worker_id=worker_id, mark=mark)
+    backend = get_backend()
     for f in files:
-        f.unlink()
+        backend.unlink(f)
     return files
 
 
@@ -479,16 +533,18 @@ def rm_curr_mark_files(
 ) -> list[pl.Path]:
     """Delete all "current mark" status files."""
     files = list_curr_mark_files(instance_num=instance_num, worker_id=worker_id, mark=mark)
+    backend = get_backend()
     for f in files:
-        f.unlink()
+        backend.unlink(f)
     return files
 
 
 def rm_prio_in_progress_files(worker_id: str = "*") -> list[pl.Path]:
     """Delete all "priority test in progress" status files."""
     files = list_prio_in_progress_files(worker_id=worker_id)
+    backend = get_backend()
     for f in files:
-        f.unlink()
+        backend.unlink(f)
     return files
 
 
@@ -497,14 +553,25 @@ def rm_respin_progress_files(
 ) -> list[pl.Path]:
     """Delete all "respin in progress" status files."""
     files = list_respin_progress_files(instance_num=instance_num, worker_id=worker_id)
+    backend = get_backend()
     for f in files:
-        f.unlink()
+        backend.unlink(f)
     return files
 
 
 def rm_respin_needed_files(instance_num: int | None = None, worker_id: str = "*") -> list[pl.Path]:
     """Delete all "needs respin" status files."""
     files = list_respin_needed_files(instance_num=instance_num, worker_id=worker_id)
+    backend = get_backend()
+    for f in files:
+        backend.unlink(f)
+    return files
+
+
+def rm_spare_files(instance_num: int | None = None) -> list[pl.Path]:
+    """Delete all "spare instance" status files."""
+    files = list_spare_files(instance_num=instance_num)
+    backend = get_backend()
     for f in files:
-        f.unlink()
+        backend.unlink(f)
     return files
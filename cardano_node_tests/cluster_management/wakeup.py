@@ -0,0 +1,157 @@
+"""Wake-up notifications for pytest workers waiting for a cluster instance.
+
+Every waiting worker listens on its own Unix datagram socket created in the pytest root temp dir.
+Whenever a worker changes the status of a cluster instance in a way that can allow other workers
+to continue (test finished, resources released, respin finished, "prio" test started), it sends
+a datagram to all the sockets. The waiting workers are woken up right away, instead of finishing
+their sleep.
+
+Waiting is always limited by a timeout, so polling still happens as a watchdog. When the socket
+cannot be created (e.g. the socket path is too long), waiting falls back to plain sleep.
+
+The list of sockets is cached and listed again only when the temp dir was modified, or when
+a socket is gone.
+"""
+
+import dataclasses
+import functools
+import logging
+import pathlib as pl
+import select
+import socket
+import time
+
+from cardano_node_tests.utils import temptools
+
+LOGGER = logging.getLogger(__name__)
+
+WAKEUP_SOCK_GLOB = ".wakeup"
+# Dir modifications this close to the listing can have the same mtime as the listing itself
+# (the mtime granularity is coarse), so such a listing is not trusted.
+MTIME_RACY_SEC = 1.0
+
+
+def _get_sock_path(root: pl.Path, worker_id: str) -> pl.Path:
+    return root / f"{WAKEUP_SOCK_GLOB}_{worker_id}.sock"
+
+
+class Waiter:
+    """Wait for a wake-up notification, or until timeout."""
+
+    def __init__(self, root: pl.Path, worker_id: str) -> None:
+        self.sock_path = _get_sock_path(root=root, worker_id=worker_id)
+        self.sock: socket.socket | None = None
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            self.sock_path.unlink(missing_ok=True)
+            sock.bind(str(self.sock_path))
+        except OSError as err:
+            LOGGER.warning(f"Cannot listen for wake-ups on '{self.sock_path}', will poll: {err}")
+            sock.close()
+            return
+
+        sock.setblocking(False)
+        self.sock = sock
+
+    def drain(self) -> bool:
+        """Discard pending notifications. Return True if there were any."""
+        if self.sock is None:
+            return False
+
+        drained = False
+        while True:
+            try:
+                self.sock.recv(64)
+            except BlockingIOError:
+                break
+            drained = True
+        return drained
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for a notification. Return True if woken up before the timeout."""
+        if timeout <= 0:
+            return self.drain()
+
+        if self.sock is None:
+            time.sleep(timeout)
+            return False
+
+        ready, __, __ = select.select([self.sock], [], [], timeout)
+        if not ready:
+            return False
+
+        return self.drain()
+
+    def close(self) -> None:
+        if self.sock is None:
+            return
+        self.sock.close()
+        self.sock = None
+        self.sock_path.unlink(missing_ok=True)
+
+
+@functools.cache
+def _get_waiter(root: pl.Path, worker_id: str) -> Waiter:
+    return Waiter(root=root, worker_id=worker_id)
+
+
+def get_waiter(worker_id: str) -> Waiter:
+    """Return waiter of the given pytest worker."""
+    return _get_waiter(root=temptools.get_pytest_root_tmp(), worker_id=worker_id)
+
+
+@dataclasses.dataclass
+class _SockPathsListing:
+    mtime_ns: int
+    listed: float
+    sock_paths: list[pl.Path]
+
+
+_SOCK_PATHS_LISTINGS: dict[pl.Path, _SockPathsListing] = {}
+
+
+def _get_sock_paths(root: pl.Path) -> list[pl.Path]:
+    """Return sockets of the waiters, list them only when the dir was modified."""
+    mtime_ns = root.stat().st_mtime_ns
+    listing = _SOCK_PATHS_LISTINGS.get(root)
+    if (
+        listing
+        and listing.mtime_ns == mtime_ns
+        and mtime_ns / 1e9 < listing.listed - MTIME_RACY_SEC
+    ):
+        return listing.sock_paths
+
+    listed = time.time()
+    sock_paths = list(root.glob(f"{WAKEUP_SOCK_GLOB}_*.sock"))
+    _SOCK_PATHS_LISTINGS[root] = _SockPathsListing(
+        mtime_ns=mtime_ns, listed=listed, sock_paths=sock_paths
+    )
+    return sock_paths
+
+
+@functools.cache
+def _get_sender() -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    return sock
+
+
+def notify_waiters(worker_id: str = "") -> None:
+    """Wake up all waiting pytest workers, except the one with the given `worker_id`."""
+    root = temptools.get_pytest_root_tmp()
+    own_sock = _get_sock_path(root=root, worker_id=worker_id) if worker_id else None
+    sender = _get_sender()
+
+    for sock_path in _get_sock_paths(root=root):
+        if sock_path == own_sock:
+            continue
+        try:
+            sender.sendto(b"1", str(sock_path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            # The worker is gone, list the sockets again next time
+            _SOCK_PATHS_LISTINGS.pop(root, None)
+        except OSError:
+            # E.g. the worker already has pending notifications that it didn't read yet
+            # (`BlockingIOError`)
+            continue
@@ -1,11 +1,127 @@
 import collections
+import itertools
+import json
+import logging
+import os
+import pathlib as pl
+import statistics
 import typing as tp
 
 import pytest
 from xdist import scheduler
 from xdist import workermanage
 
+from cardano_node_tests.cluster_management import resources_management
+from cardano_node_tests.utils import configuration
+
+LOGGER = logging.getLogger(__name__)
+
 LONG_MARKER = "long"
+RESOURCES_MARKER = "lock_resources"
+RESOURCES_PREFIX = "res="
+_RESOURCES_ATTR = "_lock_resources"
+
+_FixtureFuncT = tp.TypeVar("_FixtureFuncT", bound=tp.Callable)
+
+# Weight of the latest measured duration when updating the stored durations
+DURATIONS_SMOOTHING = 0.5
+
+# Durations of tests executed in this session, indexed by base nodeid
+_session_durations: dict[str, float] = collections.defaultdict(float)
+
+
+def get_base_nodeid(nodeid: str) -> str:
+    """Return nodeid without the group name and long-running marker suffixes."""
+    # Check the index of ']' to avoid the case: parametrize mark value has '@'
+    param_end_idx = nodeid.rfind("]")
+    suffix_idx = nodeid.find("@", param_end_idx if param_end_idx != -1 else 0)
+    return nodeid if suffix_idx == -1 else nodeid[:suffix_idx]
+
+
+def _is_long(nodeid: str) -> bool:
+    return nodeid.endswith(f"@{LONG_MARKER}")
+
+
+def _get_suffixes(nodeid: str) -> list[str]:
+    """Return suffixes (group name, resources, long-running marker) added to the nodeid."""
+    # Check the index of ']' to avoid the case: parametrize mark value has '@'
+    param_end_idx = nodeid.rfind("]")
+    return nodeid[param_end_idx if param_end_idx != -1 else 0 :].split("@")[1:]
+
+
+def get_resources(nodeid: str) -> list[str]:
+    """Return resources declared for the test, as recorded in the nodeid."""
+    if f"@{RESOURCES_PREFIX}" not in nodeid:
+        return []
+    for suffix in _get_suffixes(nodeid):
+        if suffix.startswith(RESOURCES_PREFIX):
+            return suffix[len(RESOURCES_PREFIX) :].split(",")
+    return []
+
+
+def lock_resources(
+    *resources: str | resources_management.BaseFilter,
+) -> tp.Callable[[_FixtureFuncT], _FixtureFuncT]:
+    """Declare resources locked by a fixture, for the resource-aware scheduling.
+
+    The decorator must be applied below the `pytest.fixture` decorator. For tests, the same
+    can be declared with the `lock_resources` marker.
+    """
+
+    def _decorator(func: _FixtureFuncT) -> _FixtureFuncT:
+        setattr(func, _RESOURCES_ATTR, resources)
+        return func
+
+    return _decorator
+
+
+def _get_declared_resources(item: tp.Any) -> list[str]:
+    """Return resources declared by test markers and by fixtures used by the test."""
+    declared: list[str | resources_management.BaseFilter] = []
+    for marker in item.iter_markers(RESOURCES_MARKER):
+        declared.extend(marker.args)
+    fixtureinfo = getattr(item, "_fixtureinfo", None)
+    for fixturedefs in fixtureinfo.name2fixturedefs.values() if fixtureinfo else ():
+        declared.extend(getattr(fixturedefs[-1].func, _RESOURCES_ATTR, ()))
+
+    names = {
+        r if isinstance(r, str) else "|".join(sorted(r.resources))
+        for r in declared
+        if r  # Skip empty declarations
+    }
+    return sorted(names)
+
+
+def load_durations(durations_file: str | pl.Path) -> dict[str, float]:
+    """Load test durations recorded in previous runs."""
+    try:
+        with open(durations_file, encoding="utf-8") as in_fp:
+            durations = json.load(in_fp)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        LOGGER.warning(f"Failed to load test durations from '{durations_file}'.")
+        return {}
+
+    return {str(k): float(v) for k, v in durations.items()}
+
+
+def save_durations(durations_file: str | pl.Path, measured: dict[str, float]) -> None:
+    """Merge durations measured in this session into the durations store."""
+    durations = load_durations(durations_file)
+    for nodeid, duration in measured.items():
+        old = durations.get(nodeid)
+        durations[nodeid] = (
+            duration
+            if old is None
+            else old * (1 - DURATIONS_SMOOTHING) + duration * DURATIONS_SMOOTHING
+        )
+
+    # Write to a temporary file first, so the store is never left half-written
+    tmp_file = pl.Path(f"{durations_file}.{os.getpid()}.tmp")
+    with open(tmp_file, "w", encoding="utf-8") as out_fp:
+        json.dump(durations, out_fp, indent=1, sort_keys=True)
+    tmp_file.replace(durations_file)
 
 
 class OneLongScheduling(scheduler.LoadScopeScheduling):
@@ -43,97 +159,295 @@ class OneLongScheduling(scheduler.LoadScopeScheduling):
                },
                (...)
            }
+
+    When test durations from previous runs are available (`SCHEDULING_DURATIONS`), the work
+    units are handed out longest first (LPT - longest processing time first). As each worker
+    gets a new work unit as soon as it is almost depleted of work, this packs the work units
+    so that the last worker finishes as early as possible.
+
+    When resource-aware scheduling is enabled (`RESOURCE_AWARE_SCHEDULING`), resources that tests
+    lock are declared at collection time. Work units with tests that lock resources are then
+    handed out only while there are less work units locking the same resources pending than there
+    are copies of the resources on all cluster instances. Tests of the same work unit run one after
+    another on the same worker, so they count as one. Conflicting tests are thus spread over time,
+    and workers don't wait for each other's resources.
     """
 
+    def __init__(self, config: tp.Any, log: tp.Any = None) -> None:
+        super().__init__(config, log)
+        self.durations: dict[str, float] = (
+            load_durations(configuration.SCHEDULING_DURATIONS)
+            if configuration.SCHEDULING_DURATIONS
+            else {}
+        )
+        self._queues_ready = False
+        # The workers count is not known to `configuration` on the controller
+        self.clusters_count = configuration.get_clusters_count(xdist_workers_count=self.numnodes)
+        # Scopes of work units in the `workqueue`, split by whether the work unit contains
+        # a long-running test. Scopes that were already popped from the `workqueue` are removed
+        # lazily.
+        self._long_scopes: collections.OrderedDict[str, None] = collections.OrderedDict()
+        self._short_scopes: collections.OrderedDict[str, None] = collections.OrderedDict()
+        # Scopes of work units with tests that lock resources, indexed by the locked resources
+        # and by whether the work unit contains a long-running test. The scopes are mapped to
+        # their order in the `workqueue`.
+        self._resource_scopes: dict[
+            tuple[frozenset[str], bool], collections.OrderedDict[str, int]
+        ] = {}
+        self._resource_scopes_order = itertools.count()
+        # Number of pending tests that lock given resource, for each assigned work unit
+        self._scope_locks: dict[str, collections.Counter[str]] = {}
+        # Number of assigned work units with pending tests that lock given resource
+        self._resources_pending: collections.Counter[str] = collections.Counter()
+        # Number of pending tests and pending long-running tests assigned to each node
+        self._pending: dict[workermanage.WorkerController, int] = collections.defaultdict(int)
+        self._long_pending: dict[workermanage.WorkerController, int] = collections.defaultdict(int)
+        self._nodeid_indexes: dict[workermanage.WorkerController, dict[str, int]] = {}
+
+    def _sort_workqueue(self) -> None:
+        """Sort the work units by their estimated duration, longest first."""
+        if not self.durations:
+            return
+
+        # Tests with no recorded duration are assumed to take the median time
+        default_duration = statistics.median(self.durations.values())
+
+        def _get_estimate(nodeids_dict: dict[str, bool]) -> float:
+            return sum(
+                self.durations.get(get_base_nodeid(nodeid), default_duration)
+                for nodeid in nodeids_dict
+            )
+
+        # The sort is stable, so work units with equal estimates keep the collection order
+        sorted_units = sorted(
+            self.workqueue.items(), key=lambda item: _get_estimate(item[1]), reverse=True
+        )
+        self.workqueue.clear()
+        self.workqueue.update(sorted_units)
+
+    def _enqueue_scopes(self, workload: dict[str, dict[str, bool]]) -> None:
+        """Add scopes of work units to the long or short scopes queue."""
+        for scope, nodeids_dict in workload.items():
+            self._long_scopes.pop(scope, None)
+            self._short_scopes.pop(scope, None)
+
+            is_long = any(_is_long(nodeid) for nodeid in nodeids_dict)
+            resources = frozenset(r for nodeid in nodeids_dict for r in get_resources(nodeid))
+            if resources:
+                scopes = self._resource_scopes.setdefault(
+                    (resources, is_long), collections.OrderedDict()
+                )
+                scopes.pop(scope, None)
+                scopes[scope] = next(self._resource_scopes_order)
+            elif is_long:
+                self._long_scopes[scope] = None
+            else:
+                self._short_scopes[scope] = None
+
+    def _init_queues(self) -> None:
+        """Sort the work queue and split it to long and short scopes."""
+        self._queues_ready = True
+        self._sort_workqueue()
+        self._enqueue_scopes(self.workqueue)
+
     def _split_scope(self, nodeid: str) -> str:
         """Determine the scope (grouping) of a nodeid.
 
         Example:
-            example/loadsuite/test/test_gamma.py::test_beta0[param]@group_name@long
+            example/loadsuite/test/test_gamma.py::test_beta0[param]@res=cluster@group_name@long
         """
-        # Check the index of ']' to avoid the case: parametrize mark value has '@'
-        param_end_idx = nodeid.rfind("]")
-        scope_start_idx = param_end_idx if param_end_idx != -1 else 0
+        suffixes = [s for s in _get_suffixes(nodeid) if not s.startswith(RESOURCES_PREFIX)]
 
-        if nodeid.rfind("@") <= scope_start_idx:
-            return nodeid  # nodeid has neither group name nor long-running marker
+        if not suffixes or suffixes == [LONG_MARKER]:
+            return nodeid  # nodeid has no group name
 
-        comps = nodeid[scope_start_idx:].split("@")
+        return suffixes[0]  # nodeid has a group name
 
-        if len(comps) == 3:  # nodeid has a group name and a long-running marker
-            return comps[1]
-        if comps[-1] == LONG_MARKER:  # nodeid has a long-running marker
-            return nodeid
-
-        return comps[1]  # nodeid has a group name
-
-    def _is_long_pending(self, assigned_to_node: dict) -> bool:
-        """Return True if there is a long-running test pending."""
-        for nodeids_dict in assigned_to_node.values():
-            for nodeid, is_completed in nodeids_dict.items():
-                if not is_completed and nodeid.endswith(f"@{LONG_MARKER}"):
-                    return True
-
-        return False
-
-    def _get_short_scope(self) -> str:
-        """Return first non-long work unit."""
-        for scope, nodeids_dict in self.workqueue.items():
-            for nodeid in nodeids_dict:
-                if nodeid.endswith(f"@{LONG_MARKER}"):
-                    break
-            else:
-                return str(scope)
+    def _pop_scope(self, scopes: collections.OrderedDict[str, None]) -> str:
+        """Return first scope from the given queue that is still in the `workqueue`."""
+        while scopes:
+            scope, __ = scopes.popitem(last=False)
+            if scope in self.workqueue:
+                return scope
 
         return ""
 
-    def _get_long_scope(self) -> str:
-        """Return first long work unit."""
-        for scope, nodeids_dict in self.workqueue.items():
-            for nodeid in nodeids_dict:
-                if nodeid.endswith(f"@{LONG_MARKER}"):
-                    return str(scope)
+    def _get_resource_capacity(self, resource: str) -> int:
+        """Return how many tests locking the resource can run at the same time."""
+        # Every cluster instance has its own copy of the resource. A `OneOf` filter is recorded
+        # as resource names joined by "|", and any of the resources can be locked.
+        return self.clusters_count * len(resource.split("|"))
 
-        return ""
+    def _pop_resource_scope(self, long: bool | None) -> str:
+        """Return first work unit with resources that are not locked by too many pending tests.
+
+        Args:
+            long: Whether the work unit must (True), or must not (False) contain a long-running
+                test. None if it doesn't matter.
+        """
+        first_scopes: collections.OrderedDict[str, int] | None = None
+        for (resources, is_long), scopes in self._resource_scopes.items():
+            if long is not None and is_long != long:
+                continue
+            if any(self._resources_pending[r] >= self._get_resource_capacity(r) for r in resources):
+                continue
+            # Scopes that were already popped from the `workqueue` are removed lazily
+            while scopes and next(iter(scopes)) not in self.workqueue:
+                scopes.popitem(last=False)
+            if scopes and (
+                first_scopes is None
+                or next(iter(scopes.values())) < next(iter(first_scopes.values()))
+            ):
+                first_scopes = scopes
+
+        if not first_scopes:
+            return ""
+
+        scope, __ = first_scopes.popitem(last=False)
+        return scope
+
+    def _lock_resources(self, scope: str, work_unit: dict[str, bool]) -> None:
+        """Count resources locked by pending tests of an assigned work unit."""
+        locks = collections.Counter(
+            r
+            for nodeid, completed in work_unit.items()
+            if not completed
+            for r in get_resources(nodeid)
+        )
+        if not locks:
+            return
+        self._scope_locks[scope] = locks
+        self._resources_pending.update(locks.keys())
+
+    def _release_resources(self, scope: str, resources: tp.Iterable[str]) -> None:
+        """Release resources that are no longer locked by pending tests of a work unit."""
+        locks = self._scope_locks.get(scope)
+        if not locks:
+            return
+        for r in resources:
+            locks[r] -= 1
+            if locks[r] <= 0:
+                del locks[r]
+                self._resources_pending[r] -= 1
+        if not locks:
+            del self._scope_locks[scope]
+
+    def _update_pending(
+        self, node: workermanage.WorkerController, nodeid: str, change: int
+    ) -> None:
+        """Update counters of pending tests."""
+        self._pending[node] += change
+        if _is_long(nodeid):
+            self._long_pending[node] += change
+
+    def _get_nodeid_indexes(self, node: workermanage.WorkerController) -> dict[str, int]:
+        """Return mapping of nodeids to their indexes in the node's collection."""
+        nodeid_indexes = self._nodeid_indexes.get(node)
+        if nodeid_indexes is None:
+            nodeid_indexes = {
+                nodeid: idx for idx, nodeid in enumerate(self.registered_collections[node])
+            }
+            self._nodeid_indexes[node] = nodeid_indexes
+        return nodeid_indexes
+
+    def mark_test_complete(
+        self,
+        node: workermanage.WorkerController,
+        item_index: int,
+        duration: float = 0,  # noqa: ARG002
+    ) -> None:
+        """Mark test item as completed by node."""
+        nodeid = self.registered_collections[node][item_index]
+        scope = self._split_scope(nodeid)
+
+        work_unit = self.assigned_work[node][scope]
+        if not work_unit[nodeid]:
+            work_unit[nodeid] = True
+            self._update_pending(node=node, nodeid=nodeid, change=-1)
+            self._release_resources(scope=scope, resources=get_resources(nodeid))
+
+        self._reschedule(node)
+
+    def remove_node(self, node: workermanage.WorkerController) -> str | None:
+        """Remove a node from the scheduler."""
+        self._pending.pop(node, None)
+        self._long_pending.pop(node, None)
+        self._nodeid_indexes.pop(node, None)
+
+        # Uncompleted work units of a crashed node are made available again
+        workload = self.assigned_work.get(node) or {}
+        if self._pending_of(workload):
+            for scope in workload:
+                if scope in self._scope_locks:
+                    self._resources_pending.subtract(self._scope_locks.pop(scope).keys())
+            self._enqueue_scopes(workload)
+
+        crashitem: str | None = super().remove_node(node)
+        return crashitem
+
+    def _reschedule(self, node: workermanage.WorkerController) -> None:
+        """Maybe schedule new items on the node."""
+        # Do not add more work to a node shutting down
+        if node.shutting_down:
+            return
+
+        # Check that more work is available
+        if not self.workqueue:
+            node.shutdown()
+            return
+
+        # Check that the node is almost depleted of work
+        # 2: Heuristic of minimum tests to enqueue more work
+        if self._pending[node] > 2:
+            return
+
+        # Pop one unit of work and assign it
+        self._assign_work_unit(node)
 
     def _assign_work_unit(self, node: workermanage.WorkerController) -> None:
         """Assign a work unit to a node."""
         assert self.workqueue
 
-        assigned_to_node = self.assigned_work.setdefault(node, collections.OrderedDict())
-        scope, work_unit = None, None
-
-        # Check if there are any long-running tests already pending
+        # The work queue is complete once the first work unit is being assigned
+        if not self._queues_ready:
+            self._init_queues()
 
-        long_pending = self._is_long_pending(assigned_to_node)
+        assigned_to_node = self.assigned_work.setdefault(node, collections.OrderedDict())
 
-        if long_pending:
+        if self._long_pending[node]:
             # Try to find a work unit with no long-running test if there is already a long-running
             # test pending
-            scope = self._get_short_scope()
-            if scope:
-                work_unit = self.workqueue.pop(scope)
+            scope = self._pop_resource_scope(long=False) or self._pop_scope(self._short_scopes)
         else:
             # Try to find a work unit with long-running test if there is no long-running test
-            # pending. We want to schedule long-running tests as early as possible
-            scope = self._get_long_scope()
-            if scope:
-                work_unit = self.workqueue.pop(scope)
+            # pending. We want to schedule long-running tests as early as possible.
+            # Tests that lock resources are scheduled as early as the resources allow.
+            scope = (
+                self._pop_resource_scope(long=True)
+                or self._pop_scope(self._long_scopes)
+                or self._pop_resource_scope(long=None)
+                or self._pop_scope(self._short_scopes)
+            )
 
-        # Grab the first unit of work if none was grabbed above
-        if work_unit is None:
+        # Grab the first unit of work if none was grabbed above, e.g. when all the remaining work
+        # units lock resources that are already locked by too many pending tests
+        if scope:
+            work_unit = self.workqueue.pop(scope)
+        else:
             scope, work_unit = self.workqueue.popitem(last=False)
 
         # Keep track of the assigned work
         assigned_to_node[scope] = work_unit
+        self._lock_resources(scope=scope, work_unit=work_unit)
 
         # Ask the node to execute the workload
-        worker_collection = self.registered_collections[node]
-        nodeids_indexes = [
-            worker_collection.index(nodeid)
-            for nodeid, completed in work_unit.items()
-            if not completed
-        ]
+        nodeid_indexes = self._get_nodeid_indexes(node)
+        nodeids_indexes = []
+        for nodeid, completed in work_unit.items():
+            if completed:
+                continue
+            nodeids_indexes.append(nodeid_indexes[nodeid])
+            self._update_pending(node=node, nodeid=nodeid, change=1)
 
         node.send_runtest_some(nodeids_indexes)
 
@@ -143,12 +457,17 @@ def pytest_collection_modifyitems(items: list) -> None:
     for item in items:
         group_marker = item.get_closest_marker("xdist_group")
         long_marker = item.get_closest_marker(LONG_MARKER)
+        resources = _get_declared_resources(item) if configuration.RESOURCE_AWARE_SCHEDULING else []
 
-        if not (group_marker or long_marker):
+        if not (group_marker or long_marker or resources):
             continue
 
         comps = [item.nodeid]
 
+        # Add the resources to nodeid as suffix
+        if resources:
+            comps.append(f"{RESOURCES_PREFIX}{','.join(resources)}")
+
         # Add the group name to nodeid as suffix
         if group_marker:
             gname = (
@@ -165,5 +484,26 @@ def pytest_collection_modifyitems(items: list) -> None:
         item._nodeid = "@".join(comps)
 
 
+def pytest_runtest_logreport(report: tp.Any) -> None:
+    # On xdist controller, the reports come from all the workers
+    _session_durations[get_base_nodeid(report.nodeid)] += report.duration
+
+
+def pytest_sessionfinish(session: tp.Any) -> None:
+    if (
+        not configuration.SCHEDULING_DURATIONS
+        or hasattr(session.config, "workerinput")
+        or not _session_durations
+    ):
+        return
+
+    try:
+        save_durations(
+            durations_file=configuration.SCHEDULING_DURATIONS, measured=_session_durations
+        )
+    except OSError:
+        LOGGER.warning(f"Failed to save test durations to '{configuration.SCHEDULING_DURATIONS}'.")
+
+
 def pytest_xdist_make_scheduler(config: tp.Any, log: tp.Any) -> OneLongScheduling:
     return OneLongScheduling(config, log)
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""Analyze scheduling events recorded during a test run.
+
+The events are recorded when the `SCHEDULING_EVENTS` env variable is set. The script prints
+a summary of cluster instances utilization, times tests waited for a cluster instance, respins
+and resources contention. Optionally, it renders per-instance Gantt timeline and a histogram of
+wait times.
+"""
+
+import argparse
+import collections
+import dataclasses
+import json
+import pathlib as pl
+import statistics
+import sys
+import typing as tp
+
+import matplotlib.pyplot as plt
+
+
+@dataclasses.dataclass(frozen=True, order=True)
+class Interval:
+    start: float
+    end: float
+    instance: int
+    label: str = ""
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclasses.dataclass
+class Timeline:
+    """Intervals reconstructed from scheduling events."""
+
+    start: float
+    end: float
+    tests: list[Interval]
+    respins: list[Interval]
+    failed_respins: int
+    waits: list[float]
+    contention: collections.Counter[str]
+    contended_tests: set[str]
+
+    @property
+    def span(self) -> float:
+        return max(self.end - self.start, 1e-9)
+
+
+def load_events(events_file: pl.Path) -> list[dict[str, tp.Any]]:
+    """Load scheduling events sorted by time."""
+    events = []
+    with open(events_file, encoding="utf-8") as in_fp:
+        for line in in_fp:
+            line_s = line.strip()
+            if line_s:
+                events.append(json.loads(line_s))
+    events.sort(key=lambda e: e["ts"])
+    return events
+
+
+def get_timeline(events: list[dict[str, tp.Any]]) -> Timeline:  # noqa: C901
+    """Reconstruct tests and respins intervals from the events."""
+    if not events:
+        msg = "No scheduling events found."
+        raise RuntimeError(msg)
+
+    first_ts, last_ts = events[0]["ts"], events[-1]["ts"]
+    wait_started: dict[str, float] = {}
+    running: dict[str, tuple[float, int, str]] = {}
+    respinning: dict[str, tuple[float, int]] = {}
+
+    tests: list[Interval] = []
+    respins: list[Interval] = []
+    failed_respins = 0
+    waits: list[float] = []
+    contention: collections.Counter[str] = collections.Counter()
+    contended_tests: set[str] = set()
+
+    for event in events:
+        worker, ts, name = event["worker"], event["ts"], event["event"]
+        if name == "wait_start":
+            wait_started[worker] = ts
+        elif name == "wait_end":
+            waits.append(ts - wait_started.pop(worker, ts))
+            # The test didn't get a cluster instance, or it is already running on the instance
+            if event.get("error") or (event.get("already_running") and worker in running):
+                continue
+            running[worker] = (ts, event["instance"], event.get("test", ""))
+        elif name == "test_stop":
+            if worker in running:
+                start, instance, test = running.pop(worker)
+                tests.append(Interval(start=start, end=ts, instance=instance, label=test))
+        elif name == "respin_start":
+            respinning[worker] = (ts, event["instance"])
+        elif name == "respin_end":
+            if worker in respinning:
+                start, instance = respinning.pop(worker)
+                respins.append(Interval(start=start, end=ts, instance=instance))
+            if not event.get("success", True):
+                failed_respins += 1
+        elif name == "resources_unavailable":
+            contention.update(event.get("unavailable") or ())
+            contended_tests.add(event.get("test", ""))
+
+    # Close intervals that were still open when the recording ended
+    for start, instance, test in running.values():
+        tests.append(Interval(start=start, end=last_ts, instance=instance, label=test))
+    for start, instance in respinning.values():
+        respins.append(Interval(start=start, end=last_ts, instance=instance))
+
+    return Timeline(
+        start=first_ts,
+        end=last_ts,
+        tests=sorted(tests),
+        respins=sorted(respins),
+        failed_respins=failed_respins,
+        waits=waits,
+        contention=contention,
+        contended_tests=contended_tests,
+    )
+
+
+def get_busy_time(intervals: tp.Iterable[Interval]) -> float:
+    """Return time covered by at least one of the intervals."""
+    busy = 0.0
+    cur_start, cur_end = -1.0, -1.0
+    for i in sorted(intervals):
+        if i.start > cur_end:
+            busy += cur_end - cur_start
+            cur_start, cur_end = i.start, i.end
+        else:
+            cur_end = max(cur_end, i.end)
+    busy += cur_end - cur_start
+    return busy
+
+
+def get_max_concurrency(intervals: tp.Iterable[Interval]) -> int:
+    """Return the maximal number of overlapping intervals."""
+    points = sorted(p for i in intervals for p in ((i.start, 1), (i.end, -1)))
+    max_conc = conc = 0
+    for __, change in points:
+        conc += change
+        max_conc = max(max_conc, conc)
+    return max_conc
+
+
+def _assign_lanes(intervals: list[Interval]) -> list[int]:
+    """Assign intervals to lanes so that intervals in the same lane don't overlap."""
+    lanes_end: list[float] = []
+    lanes = []
+    for i in intervals:
+        for lane, lane_end in enumerate(lanes_end):
+            if lane_end <= i.start:
+                lanes_end[lane] = i.end
+                lanes.append(lane)
+                break
+        else:
+            lanes_end.append(i.end)
+            lanes.append(len(lanes_end) - 1)
+    return lanes
+
+
+def format_summary(timeline: Timeline) -> str:
+    """Return human readable summary of the scheduling."""
+    lines = [f"Recorded time span: {timeline.span:.0f} s"]
+
+    instances = sorted({i.instance for i in (*timeline.tests, *timeline.respins)})
+    lines.append("")
+    lines.append("instance  tests  busy[%]  avg_tests  max_tests  respins  respin_time[s]")
+    for inst in instances:
+        inst_tests = [i for i in timeline.tests if i.instance == inst]
+        inst_respins = [i for i in timeline.respins if i.instance == inst]
+        busy = get_busy_time(inst_tests) / timeline.span * 100 if inst_tests else 0.0
+        avg_tests = sum(i.duration for i in inst_tests) / timeline.span
+        lines.append(
+            f"{inst:>8}  {len(inst_tests):>5}  {busy:>7.1f}  {avg_tests:>9.2f}  "
+            f"{get_max_concurrency(inst_tests):>9}  {len(inst_respins):>7}  "
+            f"{sum(i.duration for i in inst_respins):>14.0f}"
+        )
+
+    lines.append("")
+    if timeline.waits:
+        waits = sorted(timeline.waits)
+        p90 = statistics.quantiles(waits, n=10)[-1] if len(waits) > 1 else waits[0]
+        lines.append(
+            f"Wait for cluster instance: {len(waits)} tests, mean {statistics.fmean(waits):.1f} s, "
+            f"median {statistics.median(waits):.1f} s, p90 {p90:.1f} s, max {waits[-1]:.1f} s, "
+            f"total {sum(waits):.0f} s"
+        )
+    if timeline.respins:
+        durations = [i.duration for i in timeline.respins]
+        lines.append(
+            f"Respins: {len(durations)} ({timeline.failed_respins} failed), "
+            f"mean {statistics.fmean(durations):.1f} s, max {max(durations):.1f} s"
+        )
+    if timeline.contention:
+        most_common = ", ".join(f"{r} ({c})" for r, c in timeline.contention.most_common(10))
+        lines.append(
+            f"Resources contention: {len(timeline.contended_tests)} tests waited for resources; "
+            f"most contended: {most_common}"
+        )
+
+    return "\n".join(lines)
+
+
+def plot_timeline(timeline: Timeline, output_path: pl.Path) -> None:
+    """Plot per-instance Gantt timeline of tests and respins."""
+    instances = sorted({i.instance for i in (*timeline.tests, *timeline.respins)})
+
+    fig_height = max(3, len(instances) * 1.2)
+    fig, ax = plt.subplots(figsize=(16, fig_height))
+
+    yticks = []
+    for row, inst in enumerate(instances):
+        inst_tests = [i for i in timeline.tests if i.instance == inst]
+        lanes = _assign_lanes(inst_tests)
+        lanes_num = max(lanes, default=0) + 1
+        lane_height = 0.8 / lanes_num
+
+        for interval, lane in zip(inst_tests, lanes):
+            ax.broken_barh(
+                [(interval.start - timeline.start, interval.duration)],
+                (row + lane * lane_height, lane_height * 0.9),
+                facecolors="tab:blue",
+            )
+        for interval in (i for i in timeline.respins if i.instance == inst):
+            ax.broken_barh(
+                [(interval.start - timeline.start, interval.duration)],
+                (row, 0.8),
+                facecolors="tab:red",
+                alpha=0.6,
+            )
+        yticks.append(row + 0.4)
+
+    ax.set_yticks(yticks, labels=[f"c{i}" for i in instances])
+    ax.set_xlabel("Time since start of recording [s]")
+    ax.set_title("Cluster instances timeline (blue: tests, red: respins)")
+
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150)
+    plt.close(fig)
+
+
+def plot_waits(timeline: Timeline, output_path: pl.Path) -> None:
+    """Plot histogram of times tests waited for a cluster instance."""
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.hist(timeline.waits, bins=50)
+    ax.set_xlabel("Wait for cluster instance [s]")
+    ax.set_ylabel("Number of tests")
+    ax.set_title("Wait times")
+
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150)
+    plt.close(fig)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Summarize scheduling events and render cluster instances timeline."
+    )
+    parser.add_argument(
+        "-e",
+        "--events",
+        required=True,
+        help="Path to the scheduling events file (the `SCHEDULING_EVENTS` output).",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="Directory for the timeline and wait times graphs.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    events_file = pl.Path(args.events)
+
+    if not events_file.exists():
+        print(f"Error: events file '{args.events}' does not exist.", file=sys.stderr)
+        return 1
+
+    try:
+        timeline = get_timeline(load_events(events_file))
+    except (ValueError, KeyError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(format_summary(timeline))
+
+    if args.output_dir:
+        output_dir = pl.Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        plot_timeline(timeline=timeline, output_path=output_dir / "scheduling_timeline.png")
+        if timeline.waits:
+            plot_waits(timeline=timeline, output_path=output_dir / "wait_times.png")
+        print(f"Saved graphs to {output_dir}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,8 +13,7 @@ import os
 import pathlib as pl
 import sys
 
-from cardano_clusterlib import clusterlib
-
+from cardano_node_tests.utils import custom_clusterlib
 from cardano_node_tests.utils import helpers
 from cardano_node_tests.utils import testnet_cleanup
 
@@ -65,7 +64,7 @@ def main() -> int:
         return 1
 
     state_dir = pl.Path(socket_env).parent
-    cluster_obj = clusterlib.ClusterLib(state_dir=state_dir)
+    cluster_obj = custom_clusterlib.ClusterLib(state_dir=state_dir)
     testnet_cleanup.cleanup(
         cluster_obj=cluster_obj,
         location=args.artifacts_base_dir,
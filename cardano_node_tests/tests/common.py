@@ -291,15 +291,17 @@ def detect_fork(
     payment_rec = cluster_obj.g_address.gen_payment_addr_and_keys(
         name=f"{temp_template}_fork",
     )
-    tx_raw_output = clusterlib_utils.fund_from_faucet(
+    clusterlib_utils.fund_from_faucet(
         payment_rec,
         cluster_obj=cluster_obj,
         all_faucets=cluster_manager.cache.addrs_data,
         amount=2_000_000,
         tx_name=f"{temp_template}_fork",
     )
-    assert tx_raw_output
-    utxos = cluster_obj.g_query.get_utxo(tx_raw_output=tx_raw_output)
+    # The funding Tx can be shared with other workers (`FAUCET_BROKER`), the new address has
+    # just the one UTxO
+    utxos = cluster_obj.g_query.get_utxo(address=payment_rec.address)
+    assert utxos
 
     # Check if all nodes know about the UTxO
     try:
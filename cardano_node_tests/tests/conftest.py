@@ -15,7 +15,9 @@ from pytest_metadata.plugin import metadata_key
 from xdist import workermanage
 
 from cardano_node_tests.cluster_management import cluster_management
+from cardano_node_tests.cluster_management import coordinator
 from cardano_node_tests.cluster_management import resources_management
+from cardano_node_tests.pytest_plugins import xdist_scheduler
 from cardano_node_tests.utils import artifacts
 from cardano_node_tests.utils import cluster_nodes
 from cardano_node_tests.utils import configuration
@@ -23,9 +25,11 @@ from cardano_node_tests.utils import dbsync_conn
 from cardano_node_tests.utils import dbsync_queries
 from cardano_node_tests.utils import helpers
 from cardano_node_tests.utils import locking
+from cardano_node_tests.utils import logfiles
 from cardano_node_tests.utils import submit_utils
 from cardano_node_tests.utils import temptools
 from cardano_node_tests.utils import testnet_cleanup
+from cardano_node_tests.utils import tip_follower
 from cardano_node_tests.utils.versions import VERSIONS
 
 LOGGER = logging.getLogger(__name__)
@@ -82,6 +86,15 @@ def _check_cardano_node_socket_path() -> None:
         raise RuntimeError(msg)
 
 
+def _start_coordinator(config: tp.Any) -> None:
+    """Start the scheduling coordinator in the controller process, before workers are started."""
+    if configuration.STATUS_BACKEND != "coordinator" or hasattr(config, "workerinput"):
+        return
+
+    coordinator_server = coordinator.start_server()
+    config.add_cleanup(coordinator_server.stop)
+
+
 def pytest_configure(config: tp.Any) -> None:
     _check_cardano_node_socket_path()
 
@@ -89,6 +102,8 @@ def pytest_configure(config: tp.Any) -> None:
     if config.getvalue("skipall"):
         return
 
+    _start_coordinator(config)
+
     config.stash[metadata_key]["cardano-node"] = str(VERSIONS.node)
     config.stash[metadata_key]["cardano-node rev"] = VERSIONS.git_rev
     config.stash[metadata_key]["cardano-node ghc"] = VERSIONS.ghc
@@ -242,6 +257,32 @@ def close_dbconn() -> tp.Generator[None]:
     yield
     dbsync_conn.close_all()
 
+    query_stats = dbsync_queries.get_query_stats()
+    if query_stats:
+        LOGGER.info(
+            "The most time consuming db-sync queries:\n"
+            + "\n".join(
+                f"  {k}: {v.total_sec:.2f}s total, {v.count} calls, {v.max_sec:.2f}s max"
+                for k, v in list(query_stats.items())[:10]
+            )
+        )
+    if configuration.DBSYNC_QUERY_STATS:
+        dbsync_queries.save_query_stats(stats_file=configuration.DBSYNC_QUERY_STATS)
+
+
+@pytest.fixture(scope="session")
+def stop_tip_followers() -> tp.Generator[None]:
+    """Stop following chain tips at the end of session, so other workers can take over."""
+    yield
+    tip_follower.stop_all()
+
+
+@pytest.fixture(scope="session")
+def stop_log_search_pool() -> tp.Generator[None]:
+    """Stop the processes for searching log files at the end of session."""
+    yield
+    logfiles.shutdown_search_pool()
+
 
 def _save_all_cluster_instances_artifacts(
     cluster_manager_obj: cluster_management.ClusterManager,
@@ -356,6 +397,8 @@ def session_autouse(
     init_pytest_temp_dirs: None,
     change_dir: None,
     close_dbconn: tp.Any,
+    stop_tip_followers: tp.Any,
+    stop_log_search_pool: tp.Any,
     testenv_setup_teardown: tp.Any,
 ) -> None:
     """Autouse session fixtures that are required for session setup and teardown."""
@@ -452,6 +495,7 @@ def cluster(
 
 
 @pytest.fixture
+@xdist_scheduler.lock_resources(cluster_management.Resources.CLUSTER)
 def cluster_singleton(
     cluster_manager: cluster_management.ClusterManager,
 ) -> clusterlib.ClusterLib:
@@ -460,6 +504,9 @@ def cluster_singleton(
 
 
 @pytest.fixture
+@xdist_scheduler.lock_resources(
+    resources_management.OneOf(resources=cluster_management.Resources.ALL_POOLS)
+)
 def cluster_lock_pool(
     cluster_manager: cluster_management.ClusterManager,
 ) -> tuple[clusterlib.ClusterLib, str]:
@@ -186,14 +186,11 @@ class TestTxChaining:
                 raise AssertionError(submit_err)
 
         if configuration.HAS_DBSYNC:
-            # Wait a bit for all Txs to appear in db-sync
-            time.sleep(5)
-
-            check_tx_outs = [
-                dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=t) for t in tx_raw_outputs
-            ]
+            tx_records = (
+                dbsync_utils.check_txs(cluster_obj=cluster, tx_raw_outputs=tx_raw_outputs) or []
+            )
 
-            block_ids = [r.block_id for r in check_tx_outs if r]
+            block_ids = [r.block_id for r in tx_records]
             assert block_ids == sorted(block_ids), "Block IDs of Txs are not ordered"
 
             how_many_blocks = block_ids[-1] - block_ids[0]
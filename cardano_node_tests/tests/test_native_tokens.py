@@ -237,8 +237,7 @@ class TestMinting:
         tx_view.check_tx_view(cluster_obj=cluster, tx_raw_output=tx_out_mint)
         tx_view.check_tx_view(cluster_obj=cluster, tx_raw_output=tx_out_burn)
 
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_mint)
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_burn)
+        dbsync_utils.check_txs(cluster_obj=cluster, tx_raw_outputs=[tx_out_mint, tx_out_burn])
 
     @allure.link(helpers.get_vcs_link())
     @submit_utils.PARAM_SUBMIT_METHOD
@@ -332,8 +331,7 @@ class TestMinting:
             "TX fee doesn't fit the expected interval"
         )
 
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_mint)
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_burn)
+        dbsync_utils.check_txs(cluster_obj=cluster, tx_raw_outputs=[tx_out_mint, tx_out_burn])
 
     @allure.link(helpers.get_vcs_link())
     @submit_utils.PARAM_SUBMIT_METHOD
@@ -456,8 +454,7 @@ class TestMinting:
         tx_view.check_tx_view(cluster_obj=cluster, tx_raw_output=tx_out_mint)
         tx_view.check_tx_view(cluster_obj=cluster, tx_raw_output=tx_out_burn)
 
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_mint)
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_burn)
+        dbsync_utils.check_txs(cluster_obj=cluster, tx_raw_outputs=[tx_out_mint, tx_out_burn])
 
     @allure.link(helpers.get_vcs_link())
     @submit_utils.PARAM_SUBMIT_METHOD
@@ -569,9 +566,9 @@ class TestMinting:
             "TX fee doesn't fit the expected interval"
         )
 
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_mint1)
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_mint_burn)
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_burn2)
+        dbsync_utils.check_txs(
+            cluster_obj=cluster, tx_raw_outputs=[tx_out_mint1, tx_out_mint_burn, tx_out_burn2]
+        )
 
     @allure.link(helpers.get_vcs_link())
     @submit_utils.PARAM_SUBMIT_METHOD
@@ -857,8 +854,7 @@ class TestMinting:
         tx_view.check_tx_view(cluster_obj=cluster, tx_raw_output=tx_out_mint)
         tx_view.check_tx_view(cluster_obj=cluster, tx_raw_output=tx_out_burn)
 
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_mint)
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_burn)
+        dbsync_utils.check_txs(cluster_obj=cluster, tx_raw_outputs=[tx_out_mint, tx_out_burn])
 
     @allure.link(helpers.get_vcs_link())
     @submit_utils.PARAM_SUBMIT_METHOD
@@ -1009,8 +1005,7 @@ class TestMinting:
             "TX fee doesn't fit the expected interval"
         )
 
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_mint)
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_burn)
+        dbsync_utils.check_txs(cluster_obj=cluster, tx_raw_outputs=[tx_out_mint, tx_out_burn])
 
     @allure.link(helpers.get_vcs_link())
     @submit_utils.PARAM_SUBMIT_METHOD
@@ -1107,9 +1102,9 @@ class TestMinting:
             "TX fee doesn't fit the expected interval"
         )
 
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_mint)
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_burn1)
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_burn2)
+        dbsync_utils.check_txs(
+            cluster_obj=cluster, tx_raw_outputs=[tx_out_mint, tx_out_burn1, tx_out_burn2]
+        )
 
     @allure.link(helpers.get_vcs_link())
     @submit_utils.PARAM_SUBMIT_METHOD
@@ -1195,8 +1190,7 @@ class TestMinting:
             "TX fee doesn't fit the expected interval"
         )
 
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_mint)
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_burn)
+        dbsync_utils.check_txs(cluster_obj=cluster, tx_raw_outputs=[tx_out_mint, tx_out_burn])
 
 
 @common.SKIPIF_TOKENS_UNUSABLE
@@ -1306,8 +1300,7 @@ class TestPolicies:
             "TX fee doesn't fit the expected interval"
         )
 
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_mint)
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_burn)
+        dbsync_utils.check_txs(cluster_obj=cluster, tx_raw_outputs=[tx_out_mint, tx_out_burn])
 
     @allure.link(helpers.get_vcs_link())
     @common.PARAM_BUILD_METHOD_NO_EST
@@ -1414,8 +1407,7 @@ class TestPolicies:
             "TX fee doesn't fit the expected interval"
         )
 
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_mint)
-        dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_burn)
+        dbsync_utils.check_txs(cluster_obj=cluster, tx_raw_outputs=[tx_out_mint, tx_out_burn])
 
     @allure.link(helpers.get_vcs_link())
     @pytest.mark.smoke
@@ -181,6 +181,7 @@ class TestManyUTXOs:
 
         src_address = many_utxos[0].address
         dst_address = many_utxos[1].address
+        tx_raw_outputs: list[clusterlib.TxRawOutput] = []
 
         def _subtest(amount: int) -> None:
             name_template = f"{temp_template}_{amount}"
@@ -257,8 +258,11 @@ class TestManyUTXOs:
                 clusterlib.filter_utxos(utxos=out_utxos, address=dst_address)[0].amount == amount
             ), f"Incorrect balance for destination address `{dst_address}`"
 
-            dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_raw_output)
+            tx_raw_outputs.append(tx_raw_output)
 
         for am in (1_500_000, 5_000_000, 10_000_000):
             with subtests.test(amount=am):
                 _subtest(am)
+
+        # Check all the transactions in db-sync at once
+        dbsync_utils.check_txs(cluster_obj=cluster, tx_raw_outputs=tx_raw_outputs)
@@ -3,6 +3,7 @@ import logging
 import pytest
 
 from cardano_node_tests.cluster_management import cluster_management
+from cardano_node_tests.pytest_plugins import xdist_scheduler
 from cardano_node_tests.utils import governance_setup
 from cardano_node_tests.utils import governance_utils
 
@@ -61,6 +62,9 @@ def cluster_use_governance(
 
 
 @pytest.fixture
+@xdist_scheduler.lock_resources(
+    cluster_management.Resources.COMMITTEE, cluster_management.Resources.DREPS
+)
 def cluster_lock_governance(
     cluster_manager: cluster_management.ClusterManager,
 ) -> governance_utils.GovClusterT:
@@ -77,6 +81,11 @@ def cluster_lock_governance(
 
 
 @pytest.fixture
+@xdist_scheduler.lock_resources(
+    cluster_management.Resources.COMMITTEE,
+    cluster_management.Resources.DREPS,
+    cluster_management.Resources.PLUTUS,
+)
 def cluster_lock_governance_plutus(
     cluster_manager: cluster_management.ClusterManager,
 ) -> governance_utils.GovClusterT:
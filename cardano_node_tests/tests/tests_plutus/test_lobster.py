@@ -482,5 +482,4 @@ class TestLobsterChallenge:
             )
 
         # Check transactions in db-sync
-        for tx_out_rec in tx_outputs_all:
-            dbsync_utils.check_tx(cluster_obj=cluster, tx_raw_output=tx_out_rec)
+        dbsync_utils.check_txs(cluster_obj=cluster, tx_raw_outputs=tx_outputs_all)
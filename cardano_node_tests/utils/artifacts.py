@@ -34,6 +34,27 @@ def save_cli_coverage(
     return json_file
 
 
+def save_cli_latency(
+    *, cluster_obj: clusterlib.ClusterLib, pytest_config: Config
+) -> pl.Path | None:
+    """Save latency histograms of CLI commands, next to the CLI coverage info."""
+    cli_coverage_dir = pytest_config.getoption(CLI_COVERAGE_ARG)
+    cli_latency = getattr(cluster_obj, "cli_latency", None)
+    if not (cli_coverage_dir and cli_latency):
+        return None
+
+    # The most time consuming commands first
+    latency_dict = {
+        k: v.as_dict()
+        for k, v in sorted(cli_latency.items(), key=lambda i: i[1].total_sec, reverse=True)
+    }
+    json_file = pl.Path(cli_coverage_dir) / f"cli_latency_{helpers.get_timestamped_rand_str()}.json"
+    with open(json_file, "w", encoding="utf-8") as out_json:
+        json.dump(latency_dict, out_json, indent=4)
+    LOGGER.info(f"CLI latency file saved to '{cli_coverage_dir}'.")
+    return json_file
+
+
 def save_start_script_coverage(*, log_file: pl.Path, pytest_config: Config) -> pl.Path | None:
     """Save info about CLI commands executed by cluster start script."""
     cli_coverage_dir = pytest_config.getoption(CLI_COVERAGE_ARG)
@@ -545,6 +545,32 @@ def load_pools_data(*, cluster_obj: clusterlib.ClusterLib) -> dict:
     return pools_data
 
 
+def create_faucet_lanes(
+    *,
+    cluster_obj: clusterlib.ClusterLib,
+    addrs_data: dict[str, dict[str, tp.Any]],
+    destination_dir: clusterlib.FileType = ".",
+) -> dict[str, dict[str, tp.Any]]:
+    """Create faucet lanes, so each pytest worker can spend from its own faucet address."""
+    instance_num = get_cluster_env().instance_num
+    workers = [f"gw{i}" for i in range(configuration.XDIST_WORKERS_COUNT)] or ["master"]
+
+    lane_records = {}
+    for worker_id in workers:
+        lane_name = faucet.get_lane_name(worker_id=worker_id)
+        lane_records[lane_name] = cluster_obj.g_address.gen_payment_addr_and_keys(
+            name=f"{lane_name}_ci{instance_num}",
+            destination_dir=destination_dir,
+        )
+
+    return faucet.create_lanes(
+        cluster_obj=cluster_obj,
+        all_faucets=addrs_data,
+        lane_records=lane_records,
+        destination_dir=destination_dir,
+    )
+
+
 def setup_test_addrs(
     *, cluster_obj: clusterlib.ClusterLib, destination_dir: clusterlib.FileType = "."
 ) -> pl.Path:
@@ -558,6 +584,14 @@ def setup_test_addrs(
         cluster_obj=cluster_obj, destination_dir=destination_dir
     )
 
+    if configuration.FAUCET_LANES:
+        LOGGER.debug("Creating faucet lanes for pytest workers.")
+        addrs_data.update(
+            create_faucet_lanes(
+                cluster_obj=cluster_obj, addrs_data=addrs_data, destination_dir=destination_dir
+            )
+        )
+
     pools_data = load_pools_data(cluster_obj=cluster_obj)
     data_file = pl.Path(cluster_env.state_dir) / ADDRS_DATA
     with open(data_file, "wb") as out_data:
@@ -40,11 +40,56 @@ SCHEDULING_LOG: str | pl.Path = os.environ.get("SCHEDULING_LOG") or ""
 if SCHEDULING_LOG:
     SCHEDULING_LOG = pl.Path(SCHEDULING_LOG).expanduser().resolve()
 
+# Resolve SCHEDULING_EVENTS
+SCHEDULING_EVENTS: str | pl.Path = os.environ.get("SCHEDULING_EVENTS") or ""
+if SCHEDULING_EVENTS:
+    SCHEDULING_EVENTS = pl.Path(SCHEDULING_EVENTS).expanduser().resolve()
+
+# Declare resources locked by tests at collection time and take them into account when
+# distributing tests to pytest workers
+RESOURCE_AWARE_SCHEDULING = helpers.is_truthy_env_var("RESOURCE_AWARE_SCHEDULING")
+
+# Resolve SCHEDULING_DURATIONS
+SCHEDULING_DURATIONS: str | pl.Path = os.environ.get("SCHEDULING_DURATIONS") or ""
+if SCHEDULING_DURATIONS:
+    SCHEDULING_DURATIONS = pl.Path(SCHEDULING_DURATIONS).expanduser().resolve()
+
 # Resolve BLOCK_PRODUCTION_DB
 BLOCK_PRODUCTION_DB: str | pl.Path = os.environ.get("BLOCK_PRODUCTION_DB") or ""
 if BLOCK_PRODUCTION_DB:
     BLOCK_PRODUCTION_DB = pl.Path(BLOCK_PRODUCTION_DB).expanduser().resolve()
 
+# Interval (seconds) of indexing errors in cluster log files in the background; disabled if unset
+LOGS_SCAN_INTERVAL = float(os.environ.get("LOGS_SCAN_INTERVAL") or 0)
+# Number of processes for searching cluster log files in parallel; 1 (default) to disable
+LOGS_SCAN_WORKERS = int(os.environ.get("LOGS_SCAN_WORKERS") or 1)
+# Check node and db-sync trace records by their severity instead of searching for error strings
+LOGS_STRUCTURED_CHECK = helpers.is_truthy_env_var("LOGS_STRUCTURED_CHECK")
+# Comma separated trace namespaces (prefixes) that are reported regardless of the severity
+LOGS_FLAGGED_NAMESPACES = tuple(
+    ns.strip() for ns in (os.environ.get("LOGS_FLAGGED_NAMESPACES") or "").split(",") if ns.strip()
+)
+
+# Cache results of node queries for as long as they can't change (per block or epoch).
+# Results valid for a block are cached only with `TIP_FOLLOWER`.
+QUERY_CACHE = helpers.is_truthy_env_var("QUERY_CACHE")
+# Wait for new blocks and epochs using a chain tip shared by all workers
+TIP_FOLLOWER = helpers.is_truthy_env_var("TIP_FOLLOWER")
+# Serve the most frequent node queries in-process, without `cardano-cli` (experimental,
+# the results are checked against `cardano-cli` results until they match)
+NATIVE_QUERIES = helpers.is_truthy_env_var("NATIVE_QUERIES")
+# Max number of concurrent `cardano-cli` commands connecting to the same node socket (per process)
+CLI_SOCKET_CONCURRENCY = int(os.environ.get("CLI_SOCKET_CONCURRENCY") or 8)
+# Pay funding requests of all workers from the same faucet in a single Tx per block
+FAUCET_BROKER = helpers.is_truthy_env_var("FAUCET_BROKER")
+# Fund test addresses from per-worker faucet lanes, topped up in the background
+FAUCET_LANES = helpers.is_truthy_env_var("FAUCET_LANES")
+
+# Resolve CLUSTER_SNAPSHOTS_DIR
+SNAPSHOTS_DIR: str | pl.Path = os.environ.get("CLUSTER_SNAPSHOTS_DIR") or ""
+if SNAPSHOTS_DIR:
+    SNAPSHOTS_DIR = pl.Path(SNAPSHOTS_DIR).expanduser().resolve()
+
 CLUSTER_ERA = os.environ.get("CLUSTER_ERA") or ""
 if CLUSTER_ERA not in ("", "conway"):
     __msg = f"Invalid or unsupported CLUSTER_ERA: {CLUSTER_ERA}"
@@ -57,9 +102,29 @@ if COMMAND_ERA not in ("", "latest", "conway"):
 
 XDIST_WORKERS_COUNT = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT") or 0)
 MAX_TESTS_PER_CLUSTER = int(os.environ.get("MAX_TESTS_PER_CLUSTER") or 8)
-# If CLUSTERS_COUNT is not set, use the number of xdist workers or 1
-CLUSTERS_COUNT = int(os.environ.get("CLUSTERS_COUNT") or 0)
-CLUSTERS_COUNT = int(CLUSTERS_COUNT or (min(XDIST_WORKERS_COUNT, 9)) or 1)
+
+
+def get_clusters_count(xdist_workers_count: int) -> int:
+    """Return number of cluster instances.
+
+    If CLUSTERS_COUNT is not set, use the number of xdist workers (max 9) or 1.
+    """
+    return int(os.environ.get("CLUSTERS_COUNT") or 0) or min(xdist_workers_count, 9) or 1
+
+
+CLUSTERS_COUNT = get_clusters_count(xdist_workers_count=XDIST_WORKERS_COUNT)
+
+# Number of warm spare cluster instances kept running on top of CLUSTERS_COUNT
+SPARE_INSTANCES = int(os.environ.get("CLUSTER_SPARE_INSTANCES") or 0)
+
+# Where to keep status files used for scheduling tests on cluster instances
+STATUS_BACKEND = os.environ.get("CLUSTER_STATUS_BACKEND") or "files"
+if STATUS_BACKEND not in ("files", "sqlite", "memory", "coordinator"):
+    __msg = f"Invalid CLUSTER_STATUS_BACKEND: {STATUS_BACKEND}"
+    raise RuntimeError(__msg)
+if STATUS_BACKEND == "memory" and IS_XDIST:
+    __msg = "The 'memory' CLUSTER_STATUS_BACKEND cannot be used with multiple pytest workers."
+    raise RuntimeError(__msg)
 
 DEV_CLUSTER_RUNNING = helpers.is_truthy_env_var("DEV_CLUSTER_RUNNING")
 FORBID_RESTART = helpers.is_truthy_env_var("FORBID_RESTART")
@@ -82,6 +147,17 @@ if not BOOTSTRAP_DIR and NUM_POOLS < 3:
 HAS_DBSYNC = bool(os.environ.get("DBSYNC_SCHEMA_DIR"))
 HAS_SMASH = HAS_DBSYNC and helpers.is_truthy_env_var("SMASH")
 
+# Max number of connections to db-sync database per cluster instance
+DBSYNC_POOL_SIZE = int(os.environ.get("DBSYNC_POOL_SIZE") or 4)
+
+# Fail when db-sync doesn't index any new block for this many seconds
+DBSYNC_STALL_TIMEOUT = float(os.environ.get("DBSYNC_STALL_TIMEOUT") or 60)
+
+# Resolve DBSYNC_QUERY_STATS
+DBSYNC_QUERY_STATS: str | pl.Path = os.environ.get("DBSYNC_QUERY_STATS") or ""
+if DBSYNC_QUERY_STATS:
+    DBSYNC_QUERY_STATS = pl.Path(DBSYNC_QUERY_STATS).expanduser().resolve()
+
 DONT_OVERWRITE_OUTFILES = helpers.is_truthy_env_var("DONT_OVERWRITE_OUTFILES")
 
 # Allow unstable error messages in tests
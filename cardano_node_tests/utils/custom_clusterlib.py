@@ -1,16 +1,50 @@
 """Custom `ClusterLib` extended with functionality that is useful for testing."""
 
+import concurrent.futures
+import contextlib
+import dataclasses
+import datetime
+import functools
 import logging
 import os
 import pathlib as pl
+import re
+import threading
+import time
 import typing as tp
 
 from cardano_clusterlib import clusterlib
+from cardano_clusterlib import clusterlib_helpers
 from cardano_clusterlib import consts
+from cardano_clusterlib import query_group
 from cardano_clusterlib import transaction_group
+from cardano_clusterlib import txtools
+from cardano_clusterlib import types as itp
+
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import local_state_query
+from cardano_node_tests.utils import tip_follower
 
 LOGGER = logging.getLogger(__name__)
 
+# Results of these queries can change only when a new block is adopted
+BLOCK_SCOPED_QUERIES = frozenset(("utxo", "stake-address-info"))
+# Results of these queries can change only on epoch boundary
+EPOCH_SCOPED_QUERIES = frozenset(("protocol-parameters",))
+# `cardano-cli` reports 100% sync progress when the tip is not older than this, in seconds
+SYNC_TOLERANCE_SEC = 600
+# Upper bounds of buckets of CLI commands latency histogram, in seconds
+LATENCY_BUCKETS_SEC = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Transaction subcommands that connect to the node
+NODE_TX_COMMANDS = frozenset(("submit", "build"))
+# Native queries are disabled after this many results that differ from `cardano-cli` results
+NATIVE_MISMATCHES_LIMIT = 3
+
+SUBCOMMAND_RE = re.compile("[a-z][a-z0-9-]*")
+
+_SOCKET_SEMAPHORES: dict[str, threading.BoundedSemaphore] = {}
+_SOCKET_SEMAPHORES_LOCK = threading.Lock()
+
 
 def record_cli_coverage(*, cli_args: list[str], coverage_dict: dict) -> None:
     """Record coverage info for CLI commands.
@@ -60,6 +94,132 @@ def create_submitted_file(*, tx_file: clusterlib.FileType) -> None:
         raise RuntimeError(err) from exc
 
 
+def get_command_name(*, cli_args: list[str]) -> str:
+    """Return the name of the CLI (sub)command, e.g. "query utxo"."""
+    words = []
+    for arg in cli_args:
+        if not SUBCOMMAND_RE.fullmatch(arg):
+            break
+        words.append(arg)
+    return " ".join(words)
+
+
+def _uses_node_socket(*, command_name: str, cli_args: list[str]) -> bool:
+    words = command_name.split()
+    if "query" in words or "--socket-path" in cli_args:
+        return True
+    return "transaction" in words and bool(NODE_TX_COMMANDS.intersection(words))
+
+
+def _get_socket_semaphore(*, socket_path: str) -> threading.BoundedSemaphore:
+    """Return semaphore limiting the number of concurrent connections to the node socket."""
+    with _SOCKET_SEMAPHORES_LOCK:
+        semaphore = _SOCKET_SEMAPHORES.get(socket_path)
+        if semaphore is None:
+            semaphore = _SOCKET_SEMAPHORES[socket_path] = threading.BoundedSemaphore(
+                max(configuration.CLI_SOCKET_CONCURRENCY, 1)
+            )
+    return semaphore
+
+
+@dataclasses.dataclass
+class CLILatency:
+    """Latency histogram of a CLI command."""
+
+    count: int = 0
+    total_sec: float = 0.0
+    max_sec: float = 0.0
+    # Time spent waiting for a free connection to the node socket
+    queued_sec: float = 0.0
+    buckets: list[int] = dataclasses.field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_SEC) + 1)
+    )
+
+    def add(self, *, duration: float, queued: float) -> None:
+        self.count += 1
+        self.total_sec += duration
+        self.max_sec = max(self.max_sec, duration)
+        self.queued_sec += queued
+        bucket = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS_SEC) if duration <= bound),
+            len(LATENCY_BUCKETS_SEC),
+        )
+        self.buckets[bucket] += 1
+
+    def as_dict(self) -> dict[str, tp.Any]:
+        bounds = [f"<={b}s" for b in LATENCY_BUCKETS_SEC] + [f">{LATENCY_BUCKETS_SEC[-1]}s"]
+        return {
+            "count": self.count,
+            "total_sec": round(self.total_sec, 3),
+            "max_sec": round(self.max_sec, 3),
+            "queued_sec": round(self.queued_sec, 3),
+            "histogram": dict(zip(bounds, self.buckets)),
+        }
+
+
+def _is_tx_submit(*, cli_args: list[str]) -> bool:
+    """Check if the command submits a Tx."""
+    cmd = " ".join(a for a in cli_args[:4] if not a.startswith("-"))
+    return " transaction submit" in f" {cmd}"
+
+
+@dataclasses.dataclass
+class QueryCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class QueryCache:
+    """Cache of `cardano-cli query` results.
+
+    Each record is valid for a scope - the block or epoch the result was obtained in.
+    A record is used only when the current scope matches the scope of the record.
+    The current block is known only from the tip shared by the tip follower (`TIP_FOLLOWER`),
+    without it, only the results that are valid for an epoch are cached.
+    """
+
+    def __init__(self, *, enabled: bool) -> None:
+        self.enabled = enabled
+        self.stats: dict[str, QueryCacheStats] = {}
+        self._records: dict[tuple[str, ...], tuple[tuple[str, int], str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, *, key: tuple[str, ...], scope: tuple[str, int]) -> str | None:
+        """Return the cached result, or None when there's no valid record."""
+        with self._lock:
+            record = self._records.get(key)
+            stats = self.stats.setdefault(key[0], QueryCacheStats())
+            if record is None or record[0] != scope:
+                stats.misses += 1
+                return None
+            stats.hits += 1
+            return record[1]
+
+    def put(self, *, key: tuple[str, ...], scope: tuple[str, int], result: str) -> None:
+        with self._lock:
+            self._records[key] = (scope, result)
+
+    def clear(self) -> None:
+        """Invalidate all records, e.g. after the ledger state was changed by us."""
+        with self._lock:
+            self._records.clear()
+
+    @property
+    def hits(self) -> int:
+        return sum(s.hits for s in self.stats.values())
+
+    @property
+    def misses(self) -> int:
+        return sum(s.misses for s in self.stats.values())
+
+    def get_summary(self) -> str:
+        """Return a human readable summary of hits and misses per query."""
+        per_query = ", ".join(
+            f"{q}: {s.hits}/{s.hits + s.misses}" for q, s in sorted(self.stats.items())
+        )
+        return f"Query cache hits: {self.hits}/{self.hits + self.misses} ({per_query})"
+
+
 class ClusterLib(clusterlib.ClusterLib):
     def __init__(
         self,
@@ -76,6 +236,54 @@ class ClusterLib(clusterlib.ClusterLib):
         )
         self.cli_coverage: dict[str, tp.Any] = {}
         self._cli_command = "cardano-cli"
+        self.query_cache = QueryCache(enabled=configuration.QUERY_CACHE)
+        self._lsq_client: local_state_query.LocalStateQueryClient | None = None
+        # Native queries whose result already matched the `cardano-cli` result
+        self.native_verified: set[str] = set()
+        self.native_mismatches = 0
+        self.cli_latency: dict[str, CLILatency] = {}
+        self._cli_latency_lock = threading.Lock()
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    def submit[**P, T](
+        self, fn: tp.Callable[P, T], /, *args: P.args, **kwargs: P.kwargs
+    ) -> concurrent.futures.Future[T]:
+        """Run independent CLI calls in parallel, e.g. `submit(cluster.g_query.get_utxo, addr)`.
+
+        Connections to the node socket are limited by `CLI_SOCKET_CONCURRENCY`, the calls that
+        need the node wait for a free slot.
+        """
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(configuration.CLI_SOCKET_CONCURRENCY, 1) * 2,
+                thread_name_prefix="cli",
+            )
+        return self._executor.submit(fn, *args, **kwargs)
+
+    @property
+    def lsq_client(self) -> local_state_query.LocalStateQueryClient | None:
+        """Client for running the most frequent queries without `cardano-cli`.
+
+        Available when `NATIVE_QUERIES` is enabled, until the results differ from `cardano-cli`
+        results too many times.
+        """
+        if not configuration.NATIVE_QUERIES or self.native_mismatches >= NATIVE_MISMATCHES_LIMIT:
+            return None
+        if self._lsq_client is None:
+            socket_path = self.socket_path or os.environ.get("CARDANO_NODE_SOCKET_PATH")
+            if not socket_path:
+                return None
+            self._lsq_client = local_state_query.LocalStateQueryClient(
+                socket_path=str(socket_path), network_magic=self.network_magic
+            )
+        return self._lsq_client
+
+    @property
+    def g_query(self) -> query_group.QueryGroup:
+        """Query group."""
+        if not self._query_group:
+            self._query_group = QueryGroup(clusterlib_obj=self)
+        return self._query_group
 
     @property
     def g_transaction(self) -> transaction_group.TransactionGroup:
@@ -84,6 +292,105 @@ class ClusterLib(clusterlib.ClusterLib):
             self._transaction_group = TransactionGroup(clusterlib_obj=self)
         return self._transaction_group
 
+    def _get_feed_tip(self, *, since: float = 0.0) -> tip_follower.FeedTip | None:
+        """Return the tip shared by all workers (see `tip_follower`), if it's available."""
+        if not configuration.TIP_FOLLOWER:
+            return None
+        return tip_follower.get_feed(cluster_obj=self).get_tip(since=since)
+
+    def _wait_for_feed_tip(
+        self, *, reached: tp.Callable[[tip_follower.FeedTip], bool], waiting_for: str
+    ) -> tip_follower.FeedTip | None:
+        if not configuration.TIP_FOLLOWER:
+            return None
+        return tip_follower.get_feed(cluster_obj=self).wait(
+            reached=reached, waiting_for=waiting_for
+        )
+
+    def wait_for_new_block(self, new_blocks: int = 1) -> int:
+        """Wait for new block(s) to be created.
+
+        Args:
+            new_blocks: A number of new blocks to wait for (optional).
+
+        Returns:
+            int: A block number of last added block.
+        """
+        # The tip must be published after the call, so it's not older than the current tip
+        initial_tip = self._get_feed_tip(since=time.time())
+        if initial_tip is None:
+            return super().wait_for_new_block(new_blocks=new_blocks)
+        if new_blocks < 1:
+            return initial_tip.block
+        return self.wait_for_block(block=initial_tip.block + new_blocks)
+
+    def wait_for_block(self, block: int) -> int:
+        """Wait for block number.
+
+        Args:
+            block: A block number to wait for.
+
+        Returns:
+            int: A block number of last added block.
+        """
+        feed_tip = self._wait_for_feed_tip(
+            reached=lambda t: t.block >= block, waiting_for=f"block number {block}"
+        )
+        if feed_tip is None:
+            return super().wait_for_block(block=block)
+        return feed_tip.block
+
+    def wait_for_slot(self, slot: int) -> int:
+        """Wait for slot number.
+
+        Args:
+            slot: A slot number to wait for.
+
+        Returns:
+            int: A slot number of last block.
+        """
+        feed_tip = self._wait_for_feed_tip(
+            reached=lambda t: t.slot >= slot, waiting_for=f"slot number {slot}"
+        )
+        if feed_tip is None:
+            return super().wait_for_slot(slot=slot)
+        return feed_tip.slot
+
+    def wait_for_epoch(
+        self, epoch_no: int, padding_seconds: int = 0, future_is_ok: bool = True
+    ) -> int:
+        """Wait for epoch no.
+
+        Args:
+            epoch_no: A number of epoch to wait for.
+            padding_seconds: A number of additional seconds to wait for (optional).
+            future_is_ok: A bool indicating whether current epoch > `epoch_no` is acceptable
+                (default: True).
+
+        Returns:
+            int: The current epoch.
+        """
+        feed_tip = self._get_feed_tip(since=time.time())
+        if feed_tip is None:
+            return super().wait_for_epoch(
+                epoch_no=epoch_no, padding_seconds=padding_seconds, future_is_ok=future_is_ok
+            )
+        return clusterlib_helpers.wait_for_epoch(
+            clusterlib_obj=self,
+            tip=feed_tip.as_tip(),
+            epoch_no=epoch_no,
+            padding_seconds=padding_seconds,
+            future_is_ok=future_is_ok,
+        )
+
+    def time_to_epoch_end(self, tip: dict | None = None) -> float:
+        """How many seconds to go to start of a new epoch."""
+        # The published tip can be a few slots old, which could be on the other side of the epoch
+        # boundary. Use it only when it was queried during the last slot.
+        if tip is None and (feed_tip := self._get_feed_tip(since=time.time() - self.slot_length)):
+            tip = feed_tip.as_tip()
+        return super().time_to_epoch_end(tip=tip)
+
     def cli(
         self, cli_args: list[str], timeout: float | None = None, add_default_args: bool = True
     ) -> clusterlib.CLIOut:
@@ -108,7 +415,196 @@ class ClusterLib(clusterlib.ClusterLib):
 
         record_cli_coverage(cli_args=cli_args_strs_all, coverage_dict=self.cli_coverage)
 
-        return super().cli(cli_args=cli_args_strs_all, timeout=timeout, add_default_args=False)
+        command_name = get_command_name(
+            cli_args=cli_args_strs_all[2:] if add_default_args else cli_args_strs_all[1:]
+        )
+        # Too many concurrent connections to the node socket fail with
+        # "Network.Socket.connect: <socket: 11>: resource exhausted"
+        socket_limit: contextlib.AbstractContextManager = (
+            _get_socket_semaphore(
+                socket_path=str(self.socket_path or os.environ.get("CARDANO_NODE_SOCKET_PATH"))
+            )
+            if _uses_node_socket(command_name=command_name, cli_args=cli_args_strs_all)
+            else contextlib.nullcontext()
+        )
+
+        queued = time.monotonic()
+        with socket_limit:
+            start = time.monotonic()
+            try:
+                return super().cli(
+                    cli_args=cli_args_strs_all, timeout=timeout, add_default_args=False
+                )
+            finally:
+                end = time.monotonic()
+                with self._cli_latency_lock:
+                    self.cli_latency.setdefault(command_name, CLILatency()).add(
+                        duration=end - start, queued=start - queued
+                    )
+                # The submitted Tx might have changed the ledger state even if the command failed
+                if _is_tx_submit(cli_args=cli_args_strs_all):
+                    self.query_cache.clear()
+
+
+class QueryGroup(query_group.QueryGroup):
+    _clusterlib_obj: ClusterLib
+    _resolving_slots_offset = False
+
+    def _get_cache_scope(self, query: str) -> tuple[str, int] | None:
+        """Return the scope in which the result of the query can't change.
+
+        Return None when the result can't be cached.
+        """
+        cluster_obj = self._clusterlib_obj
+        # The tip published by the tip follower is the only cheap way to find out that a new block
+        # was adopted. Use it only when it was queried during the last slot.
+        feed_tip = cluster_obj._get_feed_tip(since=time.time() - cluster_obj.slot_length)
+        if query in EPOCH_SCOPED_QUERIES:
+            tip = feed_tip.as_tip() if feed_tip else self.get_tip()
+            return ("epoch", int(tip["epoch"]))
+        if feed_tip is None:
+            # Finding out the current block would need a query of its own
+            return None
+        # The tip itself changes only when a new block is adopted
+        return ("block", feed_tip.block)
+
+    def query_cli(
+        self, cli_args: itp.UnpackableSequence, cli_sub_args: itp.UnpackableSequence = ()
+    ) -> str:
+        """Run the `cardano-cli query` command, use cached result when it's still valid."""
+        str_args = [str(a) for a in cli_args]
+        query = str_args[0] if str_args else ""
+        cache = self._clusterlib_obj.query_cache
+        if not (
+            cache.enabled
+            and query in {"tip", *BLOCK_SCOPED_QUERIES, *EPOCH_SCOPED_QUERIES}
+            and not cli_sub_args
+        ):
+            return super().query_cli(cli_args=cli_args, cli_sub_args=cli_sub_args)
+
+        scope = self._get_cache_scope(query)
+        if scope is None:
+            return super().query_cli(cli_args=cli_args, cli_sub_args=cli_sub_args)
+
+        key = tuple(str_args)
+        cached = cache.get(key=key, scope=scope)
+        # The result was written to a file, the file must still be there
+        out_file = str_args[str_args.index("--out-file") + 1] if "--out-file" in str_args else ""
+        if cached is not None and (not out_file or pl.Path(out_file).exists()):
+            return cached
+
+        result = super().query_cli(cli_args=cli_args)
+        cache.put(key=key, scope=scope, result=result)
+        return result
+
+    def _complete_native_tip(self, tip: dict[str, tp.Any], slots_offset: int) -> dict[str, tp.Any]:
+        """Add the fields that `cardano-cli` computes from the tip and genesis."""
+        cluster_obj = self._clusterlib_obj
+        slot_in_epoch = tip["slot"] + slots_offset - tip["epoch"] * cluster_obj.epoch_length
+        tip["slotInEpoch"] = slot_in_epoch
+        tip["slotsToEpochEnd"] = cluster_obj.epoch_length - slot_in_epoch
+
+        system_start = datetime.datetime.fromisoformat(
+            cluster_obj.genesis["systemStart"]
+        ).timestamp()
+        tip_time = system_start + (tip["slot"] + slots_offset) * cluster_obj.slot_length
+        now = time.time()
+        tip["syncProgress"] = (
+            100.0
+            if now - tip_time < SYNC_TOLERANCE_SEC
+            else round(100 * (tip_time - system_start) / (now - system_start), 2)
+        )
+        return tip
+
+    def _verify_native[T](
+        self,
+        *,
+        query: str,
+        get_native_result: tp.Callable[[], T],
+        get_cli_result: tp.Callable[[], T],
+        normalize: tp.Callable[[T], tp.Any],
+    ) -> T:
+        """Check the result of a native query against the `cardano-cli` result.
+
+        The native client was not validated against every node-to-client protocol version,
+        so the `cardano-cli` result is used until the results of the query match once.
+        """
+        cluster_obj = self._clusterlib_obj
+        native_result = get_native_result()
+        if query in cluster_obj.native_verified:
+            return native_result
+
+        cli_result = get_cli_result()
+        normalized_cli = normalize(cli_result)
+        # A new block could have been adopted in between, query the native result once more
+        if normalize(native_result) == normalized_cli or (
+            normalize(get_native_result()) == normalized_cli
+        ):
+            cluster_obj.native_verified.add(query)
+        else:
+            cluster_obj.native_mismatches += 1
+            LOGGER.warning(
+                f"Native `{query}` query result differs from `cardano-cli` result "
+                f"({cluster_obj.native_mismatches}/{NATIVE_MISMATCHES_LIMIT}):\n"
+                f"{native_result}\n{cli_result}"
+            )
+        return cli_result
+
+    def get_tip(self) -> dict[str, tp.Any]:
+        """Return current tip - last block successfully applied to the ledger."""
+        lsq_client = self._clusterlib_obj.lsq_client
+        if lsq_client is not None and not self._resolving_slots_offset:
+            # The slots offset is computed from a full tip, that one is queried using the CLI
+            self._resolving_slots_offset = True
+            try:
+                slots_offset = self._clusterlib_obj.slots_offset
+            finally:
+                self._resolving_slots_offset = False
+            try:
+                return self._verify_native(
+                    query="tip",
+                    get_native_result=lambda: self._complete_native_tip(
+                        lsq_client.get_tip(), slots_offset=slots_offset
+                    ),
+                    get_cli_result=super().get_tip,
+                    # The sync progress is computed from the current time
+                    normalize=lambda t: {k: v for k, v in t.items() if k != "syncProgress"},
+                )
+            except local_state_query.LocalStateQueryError as exc:
+                LOGGER.debug(f"Falling back to `cardano-cli query tip`: {exc}")
+        return super().get_tip()
+
+    def get_utxo(
+        self,
+        address: str | list[str] = "",
+        txin: str | list[str] = "",
+        utxo: clusterlib.UTXOData | clusterlib.OptionalUTXOData = (),
+        tx_raw_output: clusterlib.TxRawOutput | None = None,
+        coins: itp.UnpackableSequence = (),
+    ) -> list[clusterlib.UTXOData]:
+        """Return UTxO info for payment address."""
+        lsq_client = self._clusterlib_obj.lsq_client
+        if lsq_client is not None and address:
+            addresses = [address] if isinstance(address, str) else list(address)
+            try:
+                return self._verify_native(
+                    query="utxo",
+                    get_native_result=lambda: txtools.get_utxo(
+                        utxo_dict=lsq_client.get_utxo(addresses=addresses),
+                        address=address if isinstance(address, str) else "",
+                        coins=coins,
+                    ),
+                    get_cli_result=functools.partial(
+                        super().get_utxo, address=address, coins=coins
+                    ),
+                    normalize=lambda u: sorted(u, key=repr),
+                )
+            except local_state_query.LocalStateQueryError as exc:
+                LOGGER.debug(f"Falling back to `cardano-cli query utxo`: {exc}")
+
+        return super().get_utxo(
+            address=address, txin=txin, utxo=utxo, tx_raw_output=tx_raw_output, coins=coins
+        )
 
 
 class TransactionGroup(transaction_group.TransactionGroup):
@@ -513,6 +513,52 @@ def check_tx_required_signers(
         )
 
 
+def _get_tx_checks(
+    *,
+    cluster_obj: clusterlib.ClusterLib,
+    tx_raw_output: clusterlib.TxRawOutput,
+    response: dbsync_types.TxRecord,
+) -> list[functools.partial[None]]:
+    """Return all the checks of a transaction, ready to be called."""
+    return [
+        functools.partial(check_tx_ins, tx_raw_output=tx_raw_output, response=response),
+        functools.partial(
+            check_tx_outs, cluster_obj=cluster_obj, tx_raw_output=tx_raw_output, response=response
+        ),
+        functools.partial(check_tx_fee, tx_raw_output=tx_raw_output, response=response),
+        functools.partial(check_tx_validity, tx_raw_output=tx_raw_output, response=response),
+        functools.partial(check_tx_mint, tx_raw_output=tx_raw_output, response=response),
+        functools.partial(check_tx_withdrawals, tx_raw_output=tx_raw_output, response=response),
+        functools.partial(
+            check_tx_collaterals,
+            cluster_obj=cluster_obj,
+            tx_raw_output=tx_raw_output,
+            response=response,
+        ),
+        functools.partial(
+            check_tx_scripts,
+            cluster_obj=cluster_obj,
+            tx_raw_output=tx_raw_output,
+            response=response,
+        ),
+        functools.partial(
+            check_tx_datum, cluster_obj=cluster_obj, tx_raw_output=tx_raw_output, response=response
+        ),
+        functools.partial(
+            check_tx_reference_inputs, tx_raw_output=tx_raw_output, response=response
+        ),
+        functools.partial(
+            check_tx_reference_scripts,
+            cluster_obj=cluster_obj,
+            tx_raw_output=tx_raw_output,
+            response=response,
+        ),
+        functools.partial(
+            check_tx_required_signers, tx_raw_output=tx_raw_output, response=response
+        ),
+    ]
+
+
 def check_tx(
     *,
     cluster_obj: clusterlib.ClusterLib,
@@ -520,17 +566,25 @@ def check_tx(
     response: dbsync_types.TxRecord,
 ) -> None:
     """Check a transaction in db-sync."""
-    check_tx_ins(tx_raw_output=tx_raw_output, response=response)
-    check_tx_outs(cluster_obj=cluster_obj, tx_raw_output=tx_raw_output, response=response)
-    check_tx_fee(tx_raw_output=tx_raw_output, response=response)
-    check_tx_validity(tx_raw_output=tx_raw_output, response=response)
-    check_tx_mint(tx_raw_output=tx_raw_output, response=response)
-    check_tx_withdrawals(tx_raw_output=tx_raw_output, response=response)
-    check_tx_collaterals(cluster_obj=cluster_obj, tx_raw_output=tx_raw_output, response=response)
-    check_tx_scripts(cluster_obj=cluster_obj, tx_raw_output=tx_raw_output, response=response)
-    check_tx_datum(cluster_obj=cluster_obj, tx_raw_output=tx_raw_output, response=response)
-    check_tx_reference_inputs(tx_raw_output=tx_raw_output, response=response)
-    check_tx_reference_scripts(
+    for check in _get_tx_checks(
         cluster_obj=cluster_obj, tx_raw_output=tx_raw_output, response=response
-    )
-    check_tx_required_signers(tx_raw_output=tx_raw_output, response=response)
+    ):
+        check()
+
+
+def get_tx_errors(
+    *,
+    cluster_obj: clusterlib.ClusterLib,
+    tx_raw_output: clusterlib.TxRawOutput,
+    response: dbsync_types.TxRecord,
+) -> list[str]:
+    """Run all the checks of a transaction in db-sync and return all the mismatches found."""
+    errors = []
+    for check in _get_tx_checks(
+        cluster_obj=cluster_obj, tx_raw_output=tx_raw_output, response=response
+    ):
+        try:
+            check()
+        except AssertionError as exc:
+            errors.append(f"{check.func.__name__}: {exc}")
+    return errors
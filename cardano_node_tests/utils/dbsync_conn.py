@@ -1,6 +1,9 @@
 """Functionality for interacting with db-sync database in postgres."""
 
+import contextlib
 import logging
+import threading
+import time
 import typing as tp
 
 import psycopg2
@@ -8,58 +11,211 @@ import psycopg2.extensions
 
 from cardano_node_tests.utils import cluster_nodes
 from cardano_node_tests.utils import configuration
-from cardano_node_tests.utils import helpers
 
 LOGGER = logging.getLogger(__name__)
 
+# Idle connections are checked with a round trip to the database after this many seconds
+HEALTH_CHECK_IDLE_SEC = 30
+CONNECT_ATTEMPTS = 5
+CONNECT_BACKOFF_SEC = 0.5
+# Max time to wait for a connection when all connections of the pool are in use
+GETCONN_TIMEOUT_SEC = 300
+
+
+class DBSyncConnection(psycopg2.extensions.connection):
+    """Connection to db-sync database that remembers the statements prepared on it."""
+
+    def __init__(self, *args: tp.Any, **kwargs: tp.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.prepared: set[str] = set()
+        self.last_used = time.monotonic()
+
+
+class ConnectionPool:
+    """Pool of connections to db-sync database of a single cluster instance."""
+
+    def __init__(self, *, instance_num: int, maxconn: int) -> None:
+        self.dbname = f"{configuration.DBSYNC_DB}{instance_num}"
+        self.maxconn = max(maxconn, 1)
+        self._idle: list[DBSyncConnection] = []
+        self._used = 0
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def _connect(self) -> DBSyncConnection:
+        """Open a new connection, retry with exponential backoff when the database is unavailable.
+
+        Connection parameters other than database name are taken from PG* env variables.
+        """
+        for attempt in range(CONNECT_ATTEMPTS):
+            try:
+                conn: DBSyncConnection = psycopg2.connect(
+                    dbname=self.dbname, connection_factory=DBSyncConnection
+                )
+            except psycopg2.OperationalError as err:
+                if attempt == CONNECT_ATTEMPTS - 1:
+                    raise
+                sleep_time = CONNECT_BACKOFF_SEC * 2**attempt
+                LOGGER.warning(
+                    f"Unable to connect to db-sync database {self.dbname}, "
+                    f"retrying in {sleep_time}s: {err}"
+                )
+                time.sleep(sleep_time)
+                continue
+
+            conn.autocommit = True
+            return conn
+
+        msg = f"Failed to connect to db-sync database {self.dbname}."
+        raise RuntimeError(msg)
+
+    def _is_healthy(self, *, conn: DBSyncConnection) -> bool:
+        if conn.closed or (
+            conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+        ):
+            return False
+
+        try:
+            # A transaction might have been left open by a failed query
+            if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if time.monotonic() - conn.last_used >= HEALTH_CHECK_IDLE_SEC:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1;")
+        except psycopg2.Error:
+            return False
+        return True
+
+    def getconn(self, timeout: float = GETCONN_TIMEOUT_SEC) -> DBSyncConnection:
+        """Get a healthy connection, wait for a connection to be returned when at the limit.
+
+        Raises:
+            TimeoutError: If no connection was returned to the pool in `timeout` seconds.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: bool(self._idle) or self._used < self.maxconn, timeout=timeout
+            ):
+                msg = (
+                    f"No connection to db-sync database {self.dbname} was available in "
+                    f"{timeout}s, all {self.maxconn} connections are in use "
+                    "(see `DBSYNC_POOL_SIZE`)."
+                )
+                raise TimeoutError(msg)
+            self._used += 1
+            conn = self._idle.pop() if self._idle else None
+
+        try:
+            # Discard idle connections that failed the health check
+            while conn is not None and not self._is_healthy(conn=conn):
+                _close(dbname=self.dbname, conn=conn)
+                with self._cond:
+                    conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._used -= 1
+                self._cond.notify()
+            raise
+
+        return conn
+
+    def putconn(self, conn: DBSyncConnection) -> None:
+        """Return a connection to the pool, broken connections are discarded."""
+        conn.last_used = time.monotonic()
+        with self._cond:
+            self._used -= 1
+            if self.closed or conn.closed:
+                _close(dbname=self.dbname, conn=conn)
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def closeall(self) -> None:
+        with self._cond:
+            self.closed = True
+            for conn in self._idle:
+                _close(dbname=self.dbname, conn=conn)
+            self._idle.clear()
+
 
 class DBSyncCache:
-    """Cache connection to db-sync database for each cluster instance."""
+    """Cache connection pools to db-sync database for each cluster instance."""
+
+    pools: tp.ClassVar[dict[int, ConnectionPool]] = {}
+    lock: tp.ClassVar[threading.Lock] = threading.Lock()
+
 
-    conns: tp.ClassVar[dict[int, psycopg2.extensions.connection | None]] = {0: None}
+class _PinnedConn(threading.local):
+    conn: DBSyncConnection | None = None
 
 
-def _conn(*, instance_num: int) -> psycopg2.extensions.connection:
-    # Call `psycopg2.connect` with an empty string so it uses PG* env variables.
-    # Temporarily set PGDATABASE env var to the database corresponding to `instance_num`.
-    with helpers.environ({"PGDATABASE": f"{configuration.DBSYNC_DB}{instance_num}"}):
-        conn = psycopg2.connect("")
-    DBSyncCache.conns[instance_num] = conn
-    return conn
+_PINNED = _PinnedConn()
 
 
-def _close(*, instance_num: int, conn: psycopg2.extensions.connection | None) -> None:
-    if conn is None or conn.closed == 1:
+def _close(*, dbname: str, conn: psycopg2.extensions.connection) -> None:
+    if conn.closed == 1:
         return
 
-    LOGGER.info(f"Closing connection to db-sync database {configuration.DBSYNC_DB}{instance_num}.")
+    LOGGER.info(f"Closing connection to db-sync database {dbname}.")
     try:
         conn.close()
     except psycopg2.Error as err:
-        LOGGER.warning(
-            "Unable to close connection to db-sync database "
-            f"{configuration.DBSYNC_DB}{instance_num}: {err}"
-        )
+        LOGGER.warning(f"Unable to close connection to db-sync database {dbname}: {err}")
 
 
-def conn() -> psycopg2.extensions.connection:
+def get_pool() -> ConnectionPool:
+    """Return connection pool for the current cluster instance."""
     instance_num = cluster_nodes.get_instance_num()
-    conn = DBSyncCache.conns.get(instance_num)
+    with DBSyncCache.lock:
+        pool = DBSyncCache.pools.get(instance_num)
+        if pool is None or pool.closed:
+            pool = ConnectionPool(instance_num=instance_num, maxconn=configuration.DBSYNC_POOL_SIZE)
+            DBSyncCache.pools[instance_num] = pool
+    return pool
 
-    if conn is None or conn.closed == 1:
-        return _conn(instance_num=instance_num)
 
-    return conn
+def is_pinned() -> bool:
+    """Check if a connection is pinned to the current thread."""
+    return _PINNED.conn is not None
 
 
-def reconn() -> psycopg2.extensions.connection:
-    instance_num = cluster_nodes.get_instance_num()
-    conn = DBSyncCache.conns.get(instance_num)
-    _close(instance_num=instance_num, conn=conn)
-    conn = _conn(instance_num=instance_num)
-    return conn
+@contextlib.contextmanager
+def connection() -> tp.Iterator[DBSyncConnection]:
+    """Get a connection from the pool for the current cluster instance.
+
+    The connection pinned to the current thread (see `pinned_connection`) is used when there
+    is one.
+    """
+    if _PINNED.conn is not None:
+        yield _PINNED.conn
+        return
+
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn)
+
+
+@contextlib.contextmanager
+def pinned_connection() -> tp.Iterator[DBSyncConnection]:
+    """Pin a connection to the current thread, so all queries run on the same connection."""
+    if _PINNED.conn is not None:
+        yield _PINNED.conn
+        return
+
+    with connection() as conn:
+        _PINNED.conn = conn
+        try:
+            yield conn
+        finally:
+            _PINNED.conn = None
 
 
 def close_all() -> None:
-    for instance_num, conn in DBSyncCache.conns.items():
-        _close(instance_num=instance_num, conn=conn)
+    with DBSyncCache.lock:
+        for pool in DBSyncCache.pools.values():
+            pool.closeall()
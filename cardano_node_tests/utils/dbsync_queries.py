@@ -1,7 +1,16 @@
 """SQL queries to db-sync database."""
 
 import contextlib
+import dataclasses
 import decimal
+import itertools
+import json
+import logging
+import os
+import pathlib as pl
+import re
+import threading
+import time
 import typing as tp
 
 import psycopg2
@@ -12,8 +21,28 @@ from cardano_node_tests.utils import cluster_nodes
 from cardano_node_tests.utils import configuration
 from cardano_node_tests.utils import dbsync_conn
 
+LOGGER = logging.getLogger(__name__)
+
 _CONF_ARBITRARY_T_ALLOWED: pydantic.ConfigDict = {"arbitrary_types_allowed": True}
 
+PLACEHOLDER_RE = re.compile(r"%[s%]")
+
+# Number of rows fetched in a single round trip by server-side cursors
+STREAM_BATCH_SIZE = 1000
+
+_CURSOR_IDS = itertools.count()
+
+
+@dataclasses.dataclass
+class QueryStats:
+    count: int = 0
+    total_sec: float = 0.0
+    max_sec: float = 0.0
+
+
+_QUERY_STATS: dict[str, QueryStats] = {}
+_QUERY_STATS_LOCK = threading.Lock()
+
 
 @pydantic.dataclasses.dataclass(frozen=True, config=_CONF_ARBITRARY_T_ALLOWED)
 class PoolDataDBRow:
@@ -62,8 +91,7 @@ class PoolOffChainFetchErrorDBRow:
     retry_count: int
 
 
-@pydantic.dataclasses.dataclass(frozen=True, config=_CONF_ARBITRARY_T_ALLOWED)
-class EpochStakeDBRow:
+class EpochStakeDBRow(tp.NamedTuple):
     id: int
     hash: memoryview
     view: str
@@ -117,6 +145,39 @@ class TxDBRow:
     ma_tx_mint_quantity: decimal.Decimal | None
 
 
+@pydantic.dataclasses.dataclass(frozen=True)
+class TxFullDBRow:
+    """Transaction with all the related records aggregated into JSON arrays."""
+
+    tx_id: int
+    tx_hash: str
+    block_id: int
+    block_index: int
+    out_sum: decimal.Decimal
+    fee: decimal.Decimal
+    deposit: int
+    size: int
+    invalid_before: decimal.Decimal | None
+    invalid_hereafter: decimal.Decimal | None
+    treasury_donation: int
+    txouts: list[dict[str, tp.Any]] | None
+    ma_txouts: list[dict[str, tp.Any]] | None
+    mint: list[dict[str, tp.Any]] | None
+    inputs: list[dict[str, tp.Any]] | None
+    collateral_outputs: list[dict[str, tp.Any]] | None
+    scripts: list[dict[str, tp.Any]] | None
+    redeemers: list[dict[str, tp.Any]] | None
+    metadata: list[dict[str, tp.Any]] | None
+    reserve: list[dict[str, tp.Any]] | None
+    treasury: list[dict[str, tp.Any]] | None
+    pot_transfers: list[dict[str, tp.Any]] | None
+    stake_registration: list[str] | None
+    stake_deregistration: list[str] | None
+    stake_delegation: list[dict[str, tp.Any]] | None
+    withdrawals: list[dict[str, tp.Any]] | None
+    extra_key_witness: list[str] | None
+
+
 @pydantic.dataclasses.dataclass(frozen=True, config=_CONF_ARBITRARY_T_ALLOWED)
 class MetadataDBRow:
     id: int
@@ -226,8 +287,7 @@ class RedeemerDBRow:
     value: dict
 
 
-@pydantic.dataclasses.dataclass(frozen=True)
-class ADAPotsDBRow:
+class ADAPotsDBRow(tp.NamedTuple):
     id: int
     slot_no: int
     epoch_no: int
@@ -263,8 +323,7 @@ class UTxODBRow:
     data_hash: memoryview | None
 
 
-@pydantic.dataclasses.dataclass(frozen=True)
-class BlockDBRow:
+class BlockDBRow(tp.NamedTuple):
     id: int
     epoch_no: int | None
     slot_no: int | None
@@ -608,51 +667,157 @@ class EpochStateDBRow:
     epoch_no: int
 
 
+def _to_positional(query: str) -> str:
+    """Convert query with `%s` placeholders to query with `$n` placeholders."""
+    counter = iter(range(1, query.count("%s") + 1))
+    return PLACEHOLDER_RE.sub(lambda m: f"${next(counter)}" if m[0] == "%s" else "%", query)
+
+
+def _run_query(
+    *,
+    conn: dbsync_conn.DBSyncConnection,
+    cur: psycopg2.extensions.cursor,
+    query: str,
+    vars: tp.Sequence,
+    prepare_name: str,
+) -> None:
+    if not prepare_name:
+        cur.execute(query, vars)
+        return
+
+    # Prepared statements live as long as the connection
+    if prepare_name not in conn.prepared:
+        cur.execute(f"PREPARE {prepare_name} AS {_to_positional(query)}")
+        conn.prepared.add(prepare_name)
+    params = f" ({', '.join(['%s'] * len(vars))})" if vars else ""
+    cur.execute(f"EXECUTE {prepare_name}{params};", vars)
+
+
+def _record_query_time(*, name: str, elapsed: float) -> None:
+    with _QUERY_STATS_LOCK:
+        stats = _QUERY_STATS.setdefault(name, QueryStats())
+        stats.count += 1
+        stats.total_sec += elapsed
+        stats.max_sec = max(stats.max_sec, elapsed)
+
+
+def get_query_stats() -> dict[str, QueryStats]:
+    """Return timings of the queries executed so far, the most time consuming first.
+
+    Queries are identified by the names the query functions passed to `execute`. The time includes
+    transferring the results, as all rows are fetched to the client when query is executed.
+    """
+    with _QUERY_STATS_LOCK:
+        return {
+            k: dataclasses.replace(v)
+            for k, v in sorted(_QUERY_STATS.items(), key=lambda i: i[1].total_sec, reverse=True)
+        }
+
+
+def save_query_stats(*, stats_file: str | pl.Path) -> None:
+    """Append timings of the queries executed by this process to the stats file (JSON lines)."""
+    query_stats = get_query_stats()
+    if not query_stats:
+        return
+
+    worker = os.environ.get("PYTEST_XDIST_WORKER") or "master"
+    lines = [
+        json.dumps({"worker": worker, "query": k, **dataclasses.asdict(v)})
+        for k, v in query_stats.items()
+    ]
+    with open(stats_file, "a", encoding="utf-8") as out_fp:
+        out_fp.write("".join(f"{line}\n" for line in lines))
+
+
 @contextlib.contextmanager
-def execute(*, query: str, vars: tp.Sequence = ()) -> tp.Iterator[psycopg2.extensions.cursor]:
-    cur = None
-    try:
-        cur = dbsync_conn.conn().cursor()
+def execute(
+    *, name: str, query: str, vars: tp.Sequence = (), prepare: bool = False
+) -> tp.Iterator[psycopg2.extensions.cursor]:
+    """Execute a query and yield the cursor with results.
+
+    The `name` identifies the query in query timings, usually it is name of the query function.
+    With `prepare`, the query runs as a server-side prepared statement, so it is parsed and
+    planned just once per connection. Worth it for queries that run often.
+    """
+    prepare_name = f"dbsync_{name}" if prepare else ""
 
+    with contextlib.ExitStack() as stack:
+        conn = stack.enter_context(dbsync_conn.connection())
+        cur = stack.enter_context(conn.cursor())
+        start = time.perf_counter()
         try:
-            cur.execute(query, vars)
-            conn_alive = True
+            _run_query(conn=conn, cur=cur, query=query, vars=vars, prepare_name=prepare_name)
         except psycopg2.Error:
-            conn_alive = False
+            # The connection is shared with other queries in a transaction, let the caller handle
+            # the error
+            if dbsync_conn.is_pinned():
+                raise
+            # The connection might be broken, repeat the query on a new connection
+            LOGGER.warning(f"Repeating query `{name}` on a new connection to db-sync database.")
+            conn.close()
+            stack.close()
+            conn = stack.enter_context(dbsync_conn.connection())
+            cur = stack.enter_context(conn.cursor())
+            start = time.perf_counter()
+            _run_query(conn=conn, cur=cur, query=query, vars=vars, prepare_name=prepare_name)
+        _record_query_time(name=name, elapsed=time.perf_counter() - start)
 
-        if not conn_alive:
-            cur = dbsync_conn.reconn().cursor()
-            cur.execute(query, vars)
+        yield cur
 
-        if cur is None:
-            err = "Failed to acquire database cursor."
-            raise RuntimeError(err)
 
-        yield cur
-    finally:
-        if cur is not None:
-            cur.close()
+def stream_rows[T](
+    *, name: str, query: str, vars: tp.Sequence = (), row_factory: tp.Callable[[tuple], T]
+) -> tp.Generator[T]:
+    """Execute a query using a server-side cursor and yield the rows as they are fetched.
+
+    Rows are fetched in batches of `STREAM_BATCH_SIZE`, so a large result set is never held in
+    memory all at once. When the caller stops early, the rest of the result is not transferred.
+    """
+    elapsed = 0.0
+
+    with dbsync_conn.connection() as conn:
+        # Server-side cursors exist only inside a transaction
+        own_transaction = not dbsync_conn.is_pinned()
+        if own_transaction:
+            conn.autocommit = False
+
+        try:
+            with conn.cursor(name=f"dbsync_{name}_{next(_CURSOR_IDS)}") as cur:
+                start = time.perf_counter()
+                cur.execute(query, vars)
+                while True:
+                    rows = cur.fetchmany(STREAM_BATCH_SIZE)
+                    elapsed += time.perf_counter() - start
+                    if not rows:
+                        break
+                    yield from map(row_factory, rows)
+                    start = time.perf_counter()
+        finally:
+            _record_query_time(name=name, elapsed=elapsed)
+            if own_transaction and not conn.closed:
+                conn.rollback()
+                conn.autocommit = True
 
 
 @contextlib.contextmanager
 def db_transaction() -> tp.Iterator[None]:
-    """Transaction manager that works with connection pool."""
-    conn = None
-    try:
-        conn = dbsync_conn.conn()
-        # Only modify autocommit if not already in a transaction
-        if conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_IDLE:
-            conn.autocommit = False
+    """Run all queries executed in the context in a single transaction."""
+    if dbsync_conn.is_pinned():
         yield
-        conn.commit()
-    except Exception:
-        if conn and not conn.closed:
-            conn.rollback()
-        raise
-    finally:
-        if conn and not conn.closed:
-            conn.autocommit = True  # Reset to default psycopg2 behavior
-            # Don't close the connection - let execute() manage it
+        return
+
+    with dbsync_conn.pinned_connection() as conn:
+        conn.autocommit = False
+        try:
+            yield
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            if not conn.closed:
+                conn.autocommit = True
 
 
 class SchemaVersion:
@@ -669,7 +834,7 @@ class SchemaVersion:
             "SELECT stage_one, stage_two, stage_three FROM schema_version ORDER BY id DESC LIMIT 1;"
         )
 
-        with execute(query=query) as cur:
+        with execute(name="stages", query=query) as cur:
             result = cur.fetchone()
             if not result:
                 err = "Failed to query schema version from db-sync."
@@ -714,11 +879,161 @@ def query_tx(*, txhash: str) -> tp.Generator[TxDBRow]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_tx", query=query, vars=(rf"\x{txhash}",), prepare=True) as cur:
         while (result := cur.fetchone()) is not None:
             yield TxDBRow(*result)
 
 
+def query_txs_full(*, txhashes: tp.Sequence[str]) -> tp.Generator[TxFullDBRow]:
+    """Query transactions together with all their related records in db-sync.
+
+    Returns the same data as `query_tx` and the `query_tx_*` queries combined, for all the
+    transactions in a single round trip to the database. Hashes are returned hex encoded.
+    """
+    if not txhashes:
+        return
+
+    query = (
+        "WITH t AS (SELECT * FROM tx WHERE hash = ANY(%s)), "
+        "txout AS ("
+        " SELECT"
+        "  tx_out.tx_id, tx_out.id, tx_out.index, tx_out.address, tx_out.value,"
+        "  encode(tx_out.data_hash, 'hex') AS data_hash,"
+        "  encode(datum.hash, 'hex') AS inline_datum_hash,"
+        "  encode(script.hash, 'hex') AS reference_script_hash"
+        " FROM t"
+        " INNER JOIN tx_out ON tx_out.tx_id = t.id"
+        " LEFT JOIN datum ON datum.id = tx_out.inline_datum_id"
+        " LEFT JOIN script ON script.id = tx_out.reference_script_id), "
+        "ma_out AS ("
+        " SELECT"
+        "  txout.tx_id, ma_tx_out.id, txout.index, txout.address, txout.data_hash,"
+        "  encode(multi_asset.policy, 'hex') AS policy, encode(multi_asset.name, 'hex') AS name,"
+        "  ma_tx_out.quantity"
+        " FROM txout"
+        " INNER JOIN ma_tx_out ON ma_tx_out.tx_out_id = txout.id"
+        " INNER JOIN multi_asset ON multi_asset.id = ma_tx_out.ident), "
+        "spent AS ("
+        " SELECT t.id AS tx_id, 'txin' AS kind, tx_in.id AS in_id, tx_in.tx_out_id,"
+        "  tx_in.tx_out_index"
+        " FROM t INNER JOIN tx_in ON tx_in.tx_in_id = t.id"
+        " UNION ALL"
+        " SELECT t.id, 'collateral', collateral_tx_in.id, collateral_tx_in.tx_out_id,"
+        "  collateral_tx_in.tx_out_index"
+        " FROM t INNER JOIN collateral_tx_in ON collateral_tx_in.tx_in_id = t.id"
+        " UNION ALL"
+        " SELECT t.id, 'reference', reference_tx_in.id, reference_tx_in.tx_out_id,"
+        "  reference_tx_in.tx_out_index"
+        " FROM t INNER JOIN reference_tx_in ON reference_tx_in.tx_in_id = t.id), "
+        "spent_out AS ("
+        " SELECT"
+        "  spent.tx_id, spent.kind, spent.in_id,"
+        "  tx_out.id, tx_out.index, tx_out.address, tx_out.value,"
+        "  encode(out_tx.hash, 'hex') AS utxo_hash,"
+        "  encode(script.hash, 'hex') AS reference_script_hash,"
+        "  (SELECT json_agg(json_build_object("
+        "    'id', ma_tx_out.id, 'policy', encode(multi_asset.policy, 'hex'),"
+        "    'name', encode(multi_asset.name, 'hex'), 'quantity', ma_tx_out.quantity)"
+        "    ORDER BY ma_tx_out.id)"
+        "   FROM ma_tx_out"
+        "   INNER JOIN multi_asset ON multi_asset.id = ma_tx_out.ident"
+        "   WHERE ma_tx_out.tx_out_id = tx_out.id AND spent.kind = 'txin') AS assets"
+        " FROM spent"
+        " INNER JOIN tx_out"
+        "  ON (tx_out.tx_id = spent.tx_out_id AND tx_out.index = spent.tx_out_index)"
+        " INNER JOIN tx out_tx ON out_tx.id = tx_out.tx_id"
+        " LEFT JOIN script ON script.id = tx_out.reference_script_id) "
+        "SELECT"
+        " t.id, encode(t.hash, 'hex'), t.block_id, t.block_index, t.out_sum, t.fee, t.deposit,"
+        " t.size, t.invalid_before, t.invalid_hereafter, t.treasury_donation,"
+        " (SELECT json_agg(txout ORDER BY txout.index) FROM txout WHERE txout.tx_id = t.id),"
+        " (SELECT json_agg(ma_out ORDER BY ma_out.id) FROM ma_out WHERE ma_out.tx_id = t.id),"
+        " (SELECT json_agg(json_build_object("
+        "   'policy', encode(multi_asset.policy, 'hex'), 'name', encode(multi_asset.name, 'hex'),"
+        "   'quantity', ma_tx_mint.quantity) ORDER BY ma_tx_mint.id)"
+        "  FROM ma_tx_mint"
+        "  INNER JOIN multi_asset ON multi_asset.id = ma_tx_mint.ident"
+        "  WHERE ma_tx_mint.tx_id = t.id),"
+        " (SELECT json_agg(spent_out ORDER BY spent_out.in_id)"
+        "  FROM spent_out WHERE spent_out.tx_id = t.id),"
+        " (SELECT json_agg(json_build_object("
+        "   'utxo_ix', collateral_tx_out.index, 'address', collateral_tx_out.address,"
+        "   'value', collateral_tx_out.value) ORDER BY collateral_tx_out.id)"
+        "  FROM collateral_tx_out WHERE collateral_tx_out.tx_id = t.id),"
+        " (SELECT json_agg(json_build_object("
+        "   'hash', encode(script.hash, 'hex'), 'type', script.type,"
+        "   'serialised_size', script.serialised_size) ORDER BY script.id)"
+        "  FROM script WHERE script.tx_id = t.id),"
+        " (SELECT json_agg(json_build_object("
+        "   'unit_mem', redeemer.unit_mem, 'unit_steps', redeemer.unit_steps,"
+        "   'fee', redeemer.fee, 'purpose', redeemer.purpose,"
+        "   'script_hash', encode(redeemer.script_hash, 'hex'), 'value', redeemer_data.value)"
+        "   ORDER BY redeemer.id)"
+        "  FROM redeemer"
+        "  LEFT JOIN redeemer_data ON redeemer_data.id = redeemer.redeemer_data_id"
+        "  WHERE redeemer.tx_id = t.id),"
+        " (SELECT json_agg(json_build_object("
+        "   'key', tx_metadata.key, 'json', tx_metadata.json,"
+        "   'bytes', encode(tx_metadata.bytes, 'hex')) ORDER BY tx_metadata.id)"
+        "  FROM tx_metadata WHERE tx_metadata.tx_id = t.id),"
+        " (SELECT json_agg(json_build_object("
+        "   'address', stake_address.view, 'cert_index', reserve.cert_index,"
+        "   'amount', reserve.amount) ORDER BY reserve.id)"
+        "  FROM reserve"
+        "  INNER JOIN stake_address ON stake_address.id = reserve.addr_id"
+        "  WHERE reserve.tx_id = t.id),"
+        " (SELECT json_agg(json_build_object("
+        "   'address', stake_address.view, 'cert_index', treasury.cert_index,"
+        "   'amount', treasury.amount) ORDER BY treasury.id)"
+        "  FROM treasury"
+        "  INNER JOIN stake_address ON stake_address.id = treasury.addr_id"
+        "  WHERE treasury.tx_id = t.id),"
+        " (SELECT json_agg(json_build_object("
+        "   'treasury', pot_transfer.treasury, 'reserves', pot_transfer.reserves)"
+        "   ORDER BY pot_transfer.id)"
+        "  FROM pot_transfer WHERE pot_transfer.tx_id = t.id),"
+        " (SELECT json_agg(stake_address.view ORDER BY stake_registration.id)"
+        "  FROM stake_registration"
+        "  INNER JOIN stake_address ON stake_address.id = stake_registration.addr_id"
+        "  WHERE stake_registration.tx_id = t.id),"
+        " (SELECT json_agg(stake_address.view ORDER BY stake_deregistration.id)"
+        "  FROM stake_deregistration"
+        "  INNER JOIN stake_address ON stake_address.id = stake_deregistration.addr_id"
+        "  WHERE stake_deregistration.tx_id = t.id),"
+        " (SELECT json_agg(json_build_object("
+        "   'address', stake_address.view, 'pool_id', pool_hash.view,"
+        "   'active_epoch_no', delegation.active_epoch_no) ORDER BY delegation.id)"
+        "  FROM delegation"
+        "  INNER JOIN stake_address ON stake_address.id = delegation.addr_id"
+        "  INNER JOIN pool_hash ON pool_hash.id = delegation.pool_hash_id"
+        "  WHERE delegation.tx_id = t.id),"
+        " (SELECT json_agg(json_build_object("
+        "   'address', stake_address.view, 'amount', withdrawal.amount) ORDER BY withdrawal.id)"
+        "  FROM withdrawal"
+        "  INNER JOIN stake_address ON stake_address.id = withdrawal.addr_id"
+        "  WHERE withdrawal.tx_id = t.id),"
+        " (SELECT json_agg(encode(extra_key_witness.hash, 'hex') ORDER BY extra_key_witness.id)"
+        "  FROM extra_key_witness WHERE extra_key_witness.tx_id = t.id) "
+        "FROM t "
+        "ORDER BY t.id;"
+    )
+
+    with execute(
+        name="query_txs_full",
+        query=query,
+        vars=([bytes.fromhex(h) for h in txhashes],),
+        prepare=True,
+    ) as cur:
+        while (result := cur.fetchone()) is not None:
+            yield TxFullDBRow(*result)
+
+
+def query_tx_full(*, txhash: str) -> TxFullDBRow | None:
+    """Query a transaction together with all its related records in db-sync."""
+    rows = list(query_txs_full(txhashes=[txhash]))
+    return rows[0] if rows else None
+
+
 def query_tx_ins(*, txhash: str) -> tp.Generator[TxInDBRow]:
     """Query transaction txins in db-sync."""
     query = (
@@ -737,7 +1052,7 @@ def query_tx_ins(*, txhash: str) -> tp.Generator[TxInDBRow]:
         "WHERE jtx_in.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_tx_ins", query=query, vars=(rf"\x{txhash}",), prepare=True) as cur:
         while (result := cur.fetchone()) is not None:
             yield TxInDBRow(*result)
 
@@ -758,7 +1073,7 @@ def query_collateral_tx_ins(*, txhash: str) -> tp.Generator[TxInNoMADBRow]:
         "WHERE jtx_col.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_collateral_tx_ins", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield TxInNoMADBRow(*result)
 
@@ -779,7 +1094,7 @@ def query_reference_tx_ins(*, txhash: str) -> tp.Generator[TxInNoMADBRow]:
         "WHERE jtx_ref.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_reference_tx_ins", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield TxInNoMADBRow(*result)
 
@@ -796,7 +1111,7 @@ def query_collateral_tx_outs(*, txhash: str) -> tp.Generator[CollateralTxOutDBRo
         "WHERE jtx_col.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_collateral_tx_outs", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield CollateralTxOutDBRow(*result)
 
@@ -811,7 +1126,7 @@ def query_scripts(*, txhash: str) -> tp.Generator[ScriptDBRow]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_scripts", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield ScriptDBRow(*result)
 
@@ -828,7 +1143,7 @@ def query_redeemers(*, txhash: str) -> tp.Generator[RedeemerDBRow]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_redeemers", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield RedeemerDBRow(*result)
 
@@ -844,7 +1159,7 @@ def query_tx_metadata(*, txhash: str) -> tp.Generator[MetadataDBRow]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_tx_metadata", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield MetadataDBRow(*result)
 
@@ -860,7 +1175,7 @@ def query_tx_reserve(*, txhash: str) -> tp.Generator[ADAStashDBRow]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_tx_reserve", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield ADAStashDBRow(*result)
 
@@ -877,7 +1192,7 @@ def query_tx_treasury(*, txhash: str) -> tp.Generator[ADAStashDBRow]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_tx_treasury", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield ADAStashDBRow(*result)
 
@@ -893,7 +1208,7 @@ def query_tx_pot_transfers(*, txhash: str) -> tp.Generator[PotTransferDBRow]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_tx_pot_transfers", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield PotTransferDBRow(*result)
 
@@ -909,7 +1224,7 @@ def query_tx_stake_reg(*, txhash: str) -> tp.Generator[StakeAddrDBRow]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_tx_stake_reg", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield StakeAddrDBRow(*result)
 
@@ -925,7 +1240,7 @@ def query_tx_stake_dereg(*, txhash: str) -> tp.Generator[StakeAddrDBRow]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_tx_stake_dereg", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield StakeAddrDBRow(*result)
 
@@ -943,7 +1258,7 @@ def query_tx_stake_deleg(*, txhash: str) -> tp.Generator[StakeDelegDBRow]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_tx_stake_deleg", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield StakeDelegDBRow(*result)
 
@@ -959,7 +1274,7 @@ def query_tx_withdrawal(*, txhash: str) -> tp.Generator[WithdrawalDBRow]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_tx_withdrawal", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield WithdrawalDBRow(*result)
 
@@ -975,9 +1290,12 @@ def query_ada_pots(*, epoch_from: int = 0, epoch_to: int = 99999999) -> tp.Gener
         "ORDER BY id;"
     )
 
-    with execute(query=query, vars=(epoch_from, epoch_to)) as cur:
-        while (result := cur.fetchone()) is not None:
-            yield ADAPotsDBRow(*result)
+    yield from stream_rows(
+        name="query_ada_pots",
+        query=query,
+        vars=(epoch_from, epoch_to),
+        row_factory=ADAPotsDBRow._make,
+    )
 
 
 def query_address_reward(
@@ -994,7 +1312,12 @@ def query_address_reward(
         "WHERE (stake_address.view = %s) AND (reward.spendable_epoch BETWEEN %s AND %s) ;"
     )
 
-    with execute(query=query, vars=(address, epoch_from, epoch_to)) as cur:
+    with execute(
+        name="query_address_reward",
+        query=query,
+        vars=(address, epoch_from, epoch_to),
+        prepare=True,
+    ) as cur:
         while (result := cur.fetchone()) is not None:
             yield RewardDBRow(*result)
 
@@ -1012,7 +1335,9 @@ def query_address_reward_rest(
         "WHERE (stake_address.view = %s) AND (reward_rest.spendable_epoch BETWEEN %s AND %s) ;"
     )
 
-    with execute(query=query, vars=(address, epoch_from, epoch_to)) as cur:
+    with execute(
+        name="query_address_reward_rest", query=query, vars=(address, epoch_from, epoch_to)
+    ) as cur:
         while (result := cur.fetchone()) is not None:
             yield RewardDBRow(*result)
 
@@ -1033,7 +1358,7 @@ def query_utxo(*, address: str) -> tp.Generator[UTxODBRow]:
         "ORDER BY tx_out.id;"
     )
 
-    with execute(query=query, vars=(address,)) as cur:
+    with execute(name="query_utxo", query=query, vars=(address,), prepare=True) as cur:
         while (result := cur.fetchone()) is not None:
             yield UTxODBRow(*result)
 
@@ -1066,7 +1391,7 @@ def query_pool_data(*, pool_id_bech32: str) -> tp.Generator[PoolDataDBRow]:
         "WHERE pool_hash.view = %s ORDER BY registered_tx_id;"
     )
 
-    with execute(query=query, vars=(pool_id_bech32,)) as cur:
+    with execute(name="query_pool_data", query=query, vars=(pool_id_bech32,)) as cur:
         while (result := cur.fetchone()) is not None:
             yield PoolDataDBRow(*result)
 
@@ -1082,7 +1407,7 @@ def query_off_chain_pool_data(*, pool_id_bech32: str) -> tp.Generator[PoolOffCha
         "WHERE pool_hash.view = %s;"
     )
 
-    with execute(query=query, vars=(pool_id_bech32,)) as cur:
+    with execute(name="query_off_chain_pool_data", query=query, vars=(pool_id_bech32,)) as cur:
         while (result := cur.fetchone()) is not None:
             yield PoolOffChainDataDBRow(*result)
 
@@ -1100,7 +1425,9 @@ def query_off_chain_pool_fetch_error(
         "WHERE pool_hash.view = %s;"
     )
 
-    with execute(query=query, vars=(pool_id_bech32,)) as cur:
+    with execute(
+        name="query_off_chain_pool_fetch_error", query=query, vars=(pool_id_bech32,)
+    ) as cur:
         while (result := cur.fetchone()) is not None:
             yield PoolOffChainFetchErrorDBRow(*result)
 
@@ -1109,7 +1436,7 @@ def query_epoch_stake(*, pool_id_bech32: str, epoch_number: int) -> tp.Generator
     """Query epoch stake record for a pool in db-sync."""
     query = (
         "SELECT "
-        " epoch_stake.id, pool_hash.hash_raw, pool_hash.view, epoch_stake.amount,"
+        " epoch_stake.id, pool_hash.hash_raw, pool_hash.view, epoch_stake.amount::bigint,"
         " epoch_stake.epoch_no "
         "FROM epoch_stake "
         "INNER JOIN pool_hash ON epoch_stake.pool_id = pool_hash.id "
@@ -1117,9 +1444,12 @@ def query_epoch_stake(*, pool_id_bech32: str, epoch_number: int) -> tp.Generator
         "ORDER BY epoch_stake.epoch_no DESC;"
     )
 
-    with execute(query=query, vars=(pool_id_bech32, epoch_number)) as cur:
-        while (result := cur.fetchone()) is not None:
-            yield EpochStakeDBRow(*result)
+    yield from stream_rows(
+        name="query_epoch_stake",
+        query=query,
+        vars=(pool_id_bech32, epoch_number),
+        row_factory=EpochStakeDBRow._make,
+    )
 
 
 def query_epoch_param(*, epoch_no: int = 0) -> EpochParamDBRow:
@@ -1145,7 +1475,7 @@ def query_epoch_param(*, epoch_no: int = 0) -> EpochParamDBRow:
         " WHERE epoch_no =  %s "
     )
 
-    with execute(query=query, vars=(query_var,)) as cur:
+    with execute(name="query_epoch_param", query=query, vars=(query_var,)) as cur:
         results = cur.fetchone()
         if not results:
             err = "Failed to query epoch param from db-sync."
@@ -1176,9 +1506,9 @@ def query_blocks(
         "ORDER BY block.id;"
     )
 
-    with execute(query=query, vars=query_vars) as cur:
-        while (result := cur.fetchone()) is not None:
-            yield BlockDBRow(*result)
+    yield from stream_rows(
+        name="query_blocks", query=query, vars=query_vars, row_factory=BlockDBRow._make
+    )
 
 
 def query_table_names() -> list[str]:
@@ -1190,7 +1520,7 @@ def query_table_names() -> list[str]:
         "ORDER BY tablename ASC;"
     )
 
-    with execute(query=query) as cur:
+    with execute(name="query_table_names", query=query) as cur:
         results: list[tuple[str]] = cur.fetchall()
         table_names = [r[0] for r in results]
         return table_names
@@ -1200,7 +1530,7 @@ def query_datum(*, datum_hash: str) -> tp.Generator[DatumDBRow]:
     """Query datum record in db-sync."""
     query = "SELECT id, hash, tx_id, value, bytes FROM datum WHERE hash = %s;"
 
-    with execute(query=query, vars=(rf"\x{datum_hash}",)) as cur:
+    with execute(name="query_datum", query=query, vars=(rf"\x{datum_hash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield DatumDBRow(*result)
 
@@ -1229,7 +1559,7 @@ def query_cost_model(*, model_id: int = -1, epoch_no: int = -1) -> dict[str, dic
 
     query = f"SELECT * FROM cost_model AS cm {subquery} ORDER BY cm.id DESC LIMIT 1"
 
-    with execute(query=query, vars=(query_var,)) as cur:
+    with execute(name="query_cost_model", query=query, vars=(query_var,)) as cur:
         results = cur.fetchone()
         cost_model: dict[str, dict[str, tp.Any]] = results[1] if results else {}
         return cost_model
@@ -1270,7 +1600,7 @@ def query_param_proposal(*, txhash: str = "") -> ParamProposalDBRow:
         "ORDER BY ID DESC LIMIT 1"
     )
 
-    with execute(query=query, vars=(query_var,)) as cur:
+    with execute(name="query_param_proposal", query=query, vars=(query_var,)) as cur:
         results = cur.fetchone()
         if not results:
             err = "Failed to query param proposal from db-sync."
@@ -1287,7 +1617,7 @@ def query_extra_key_witness(*, txhash: str) -> tp.Generator[memoryview]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_extra_key_witness", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield result[0]
 
@@ -1303,7 +1633,7 @@ def query_epoch(*, epoch_from: int = 0, epoch_to: int = 99999999) -> tp.Generato
         "WHERE (no BETWEEN %s AND %s);"
     )
 
-    with execute(query=query, vars=query_vars) as cur:
+    with execute(name="query_epoch", query=query, vars=query_vars) as cur:
         while (result := cur.fetchone()) is not None:
             yield EpochDBRow(*result)
 
@@ -1318,7 +1648,7 @@ def query_committee_registration(*, cold_key: str) -> tp.Generator[CommitteeRegi
         "WHERE chc.raw = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{cold_key}",)) as cur:
+    with execute(name="query_committee_registration", query=query, vars=(rf"\x{cold_key}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield CommitteeRegistrationDBRow(*result)
 
@@ -1332,7 +1662,9 @@ def query_committee_deregistration(*, cold_key: str) -> tp.Generator[CommitteeDe
         "WHERE committee_hash.raw = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{cold_key}",)) as cur:
+    with execute(
+        name="query_committee_deregistration", query=query, vars=(rf"\x{cold_key}",)
+    ) as cur:
         while (result := cur.fetchone()) is not None:
             yield CommitteeDeregistrationDBRow(*result)
 
@@ -1353,7 +1685,9 @@ def query_drep_registration(
         "ORDER BY dr.tx_id;"
     )
 
-    with execute(query=query, vars=(rf"\x{drep_hash}", drep_deposit)) as cur:
+    with execute(
+        name="query_drep_registration", query=query, vars=(rf"\x{drep_hash}", drep_deposit)
+    ) as cur:
         while (result := cur.fetchone()) is not None:
             yield DrepRegistrationDBRow(*result)
 
@@ -1383,7 +1717,7 @@ def query_gov_action_proposal(
         f"WHERE {gap_query};"
     )
 
-    with execute(query=query, vars=(query_var,)) as cur:
+    with execute(name="query_gov_action_proposal", query=query, vars=(query_var,)) as cur:
         while (result := cur.fetchone()) is not None:
             yield GovActionProposalDBRow(*result)
 
@@ -1398,7 +1732,7 @@ def query_voting_procedure(*, txhash: str) -> tp.Generator[VotingProcedureDBRow]
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_voting_procedure", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield VotingProcedureDBRow(*result)
 
@@ -1415,7 +1749,7 @@ def query_new_committee_info(*, txhash: str) -> tp.Generator[NewCommitteeInfoDBR
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_new_committee_info", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield NewCommitteeInfoDBRow(*result)
 
@@ -1430,7 +1764,7 @@ def query_committee_members(*, committee_id: int) -> tp.Generator[NewCommitteeMe
         "WHERE cm.committee_id = %s;"
     )
 
-    with execute(query=query, vars=(committee_id,)) as cur:
+    with execute(name="query_committee_members", query=query, vars=(committee_id,)) as cur:
         while (result := cur.fetchone()) is not None:
             yield NewCommitteeMemberDBRow(*result)
 
@@ -1449,7 +1783,7 @@ def query_treasury_withdrawal(*, txhash: str) -> tp.Generator[TreasuryWithdrawal
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_treasury_withdrawal", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield TreasuryWithdrawalDBRow(*result)
 
@@ -1475,7 +1809,7 @@ def query_off_chain_vote_data(*, data_hash: str) -> tp.Generator[OffChainVoteDat
         "ORDER BY va.id, ref.id, auth.id, updt.id;"
     )
 
-    with execute(query=query, vars=(rf"\x{data_hash}",)) as cur:
+    with execute(name="query_off_chain_vote_data", query=query, vars=(rf"\x{data_hash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield OffChainVoteDataDBRow(*result)
 
@@ -1491,7 +1825,9 @@ def query_off_chain_vote_fetch_error(
         "WHERE off_chain_vote_fetch_error.voting_anchor_id = %s;"
     )
 
-    with execute(query=query, vars=(voting_anchor_id,)) as cur:
+    with execute(
+        name="query_off_chain_vote_fetch_error", query=query, vars=(voting_anchor_id,)
+    ) as cur:
         while (result := cur.fetchone()) is not None:
             yield OffChainVoteFetchErrorDBRow(*result)
 
@@ -1510,7 +1846,9 @@ def query_off_chain_vote_drep_data(
         "WHERE vd.voting_anchor_id = %s;"
     )
 
-    with execute(query=query, vars=(voting_anchor_id,)) as cur:
+    with execute(
+        name="query_off_chain_vote_drep_data", query=query, vars=(voting_anchor_id,)
+    ) as cur:
         while (result := cur.fetchone()) is not None:
             yield OffChainVoteDrepDataDBRow(*result)
 
@@ -1520,7 +1858,7 @@ def query_db_size() -> int:
     instance_num = cluster_nodes.get_instance_num()
     query = f"SELECT pg_database_size('{configuration.DBSYNC_DB}{instance_num}')/1024/1024;"
 
-    with execute(query=query) as cur:
+    with execute(name="query_db_size", query=query) as cur:
         result = cur.fetchone()
         if not result:
             err = "Failed to query database size from db-sync."
@@ -1540,7 +1878,7 @@ def query_delegation_vote(*, txhash: str) -> tp.Generator[DelegationVoteDBRow]:
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_delegation_vote", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield DelegationVoteDBRow(*result)
 
@@ -1557,7 +1895,7 @@ def query_new_constitution(*, txhash: str) -> tp.Generator[NewConstitutionInfoDB
         "WHERE tx.hash = %s;"
     )
 
-    with execute(query=query, vars=(rf"\x{txhash}",)) as cur:
+    with execute(name="query_new_constitution", query=query, vars=(rf"\x{txhash}",)) as cur:
         while (result := cur.fetchone()) is not None:
             yield NewConstitutionInfoDBRow(*result)
 
@@ -1573,7 +1911,7 @@ def query_drep_distr(*, drep_hash: str, epoch_no: int) -> tp.Generator[DrepDistr
         "WHERE drep_hash.view = %s AND drep_distr.epoch_no = %s "
     )
 
-    with execute(query=query, vars=(drep_hash, epoch_no)) as cur:
+    with execute(name="query_drep_distr", query=query, vars=(drep_hash, epoch_no)) as cur:
         while (result := cur.fetchone()) is not None:
             yield DrepDistributionDBRow(*result)
 
@@ -1582,12 +1920,24 @@ def delete_reserved_pool_tickers() -> int:
     """Delete all records from reserved_pool_ticker and return the number of affected rows."""
     query = "DELETE FROM reserved_pool_ticker;"
 
-    with execute(query=query) as cur:
+    with execute(name="delete_reserved_pool_tickers", query=query) as cur:
         affected_rows = cur.rowcount or 0
-        dbsync_conn.conn().commit()
+        cur.connection.commit()
         return affected_rows
 
 
+def query_last_block_no() -> int:
+    """Query number of the last block in db-sync."""
+    # Cheap lookup of the last inserted block using the primary key index.
+    # Epoch boundary blocks have no block number.
+    query = "SELECT block_no FROM block WHERE block_no IS NOT NULL ORDER BY id DESC LIMIT 1;"
+
+    # Polled while waiting for db-sync to index new blocks
+    with execute(name="query_last_block_no", query=query, prepare=True) as cur:
+        result = cur.fetchone()
+        return int(result[0]) if result and result[0] is not None else -1
+
+
 def query_db_sync_progress() -> float:
     """Calculate blockchain sync percentage (0-100).
 
@@ -1605,7 +1955,7 @@ def query_db_sync_progress() -> float:
         " FROM block;"
     )
 
-    with execute(query=query) as cur:
+    with execute(name="query_db_sync_progress", query=query) as cur:
         result = cur.fetchone()
         return min(100.0, float(result[0])) if result else 0.0
 
@@ -1646,7 +1996,7 @@ def query_rows_count(
     where_clause = f" WHERE {column} {condition}" if (column and condition) else ""
     query = f"{lock_clause} SELECT COUNT(*) FROM {table}{where_clause}"
 
-    with execute(query=query) as cur:
+    with execute(name="query_rows_count", query=query) as cur:
         try:
             result = cur.fetchone()
         except psycopg2.errors.LockNotAvailable as e:  # type: ignore[possibly-missing-attribute]
@@ -1668,6 +2018,6 @@ def query_epoch_state(*, epoch_no: int) -> tp.Generator[EpochStateDBRow]:
         "WHERE epoch_no =  %s "
     )
 
-    with execute(query=query, vars=(epoch_no,)) as cur:
+    with execute(name="query_epoch_state", query=query, vars=(epoch_no,)) as cur:
         while (result := cur.fetchone()) is not None:
             yield EpochStateDBRow(*result)
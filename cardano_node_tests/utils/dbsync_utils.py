@@ -1,5 +1,6 @@
 """Functionality for interacting with db-sync."""
 
+import dataclasses
 import enum
 import functools
 import itertools
@@ -18,6 +19,9 @@ from cardano_node_tests.utils import helpers
 
 LOGGER = logging.getLogger(__name__)
 
+# How often to check the last block indexed by db-sync, in seconds
+BLOCK_POLL_INTERVAL = 0.5
+
 
 class DbSyncNoResponseError(Exception):
     """Raised when no response is returned from db-sync."""
@@ -28,6 +32,10 @@ class DbSyncNoResponseError(Exception):
         super().__init__(msg)
 
 
+class DbSyncStalledError(TimeoutError):
+    """Raised when db-sync doesn't index any new block for too long."""
+
+
 class ActionTypes(enum.StrEnum):
     COMMITTEE = "committee"
     CONSTITUTION = "constitution"
@@ -319,10 +327,11 @@ def get_txins(*, txhash: str) -> list[dbsync_types.UTxORecord]:
     return txins
 
 
-def get_tx_record(*, txhash: str) -> dbsync_types.TxRecord:  # noqa: C901
+def get_tx_record_multi_query(*, txhash: str) -> dbsync_types.TxRecord:  # noqa: C901
     """Get transaction data from db-sync.
 
     Compile data from multiple SQL queries to get as much information about the TX as possible.
+    The same data is returned by `get_tx_record` in a single SQL query.
     """
     txdata = get_prelim_tx_record(txhash=txhash)
     txins = get_txins(txhash=txhash)
@@ -493,25 +502,263 @@ def get_tx_record(*, txhash: str) -> dbsync_types.TxRecord:  # noqa: C901
     return record
 
 
+def _get_coin(policyid: str | None, asset_name: str | None) -> str:
+    return f"{policyid or ''}.{asset_name}" if asset_name else policyid or ""
+
+
+def _get_input_records(
+    inputs: list[dict[str, tp.Any]],
+) -> tuple[list[dbsync_types.UTxORecord], ...]:
+    """Return records of txins, collaterals and reference inputs."""
+    txins: list[dbsync_types.UTxORecord] = []
+    collaterals: list[dbsync_types.UTxORecord] = []
+    reference_inputs: list[dbsync_types.UTxORecord] = []
+    records = {"txin": txins, "collateral": collaterals, "reference": reference_inputs}
+
+    for r in inputs:
+        utxo_rec = dbsync_types.UTxORecord(
+            utxo_hash=r["utxo_hash"],
+            utxo_ix=int(r["index"]),
+            amount=int(r["value"]),
+            address=str(r["address"]),
+            reference_script_hash=r["reference_script_hash"] or "",
+        )
+        records[r["kind"]].append(utxo_rec)
+        # Only the MA of txins are queried
+        records[r["kind"]].extend(
+            dataclasses.replace(
+                utxo_rec,
+                amount=int(ma["quantity"] or 0),
+                coin=_get_coin(policyid=ma["policy"], asset_name=ma["name"]),
+            )
+            for ma in r["assets"] or ()
+        )
+
+    return txins, collaterals, reference_inputs
+
+
+def _get_tx_record_from_row(*, row: dbsync_queries.TxFullDBRow) -> dbsync_types.TxRecord:
+    """Convert the result of the `query_txs_full` query to a transaction record."""
+    txhash = row.tx_hash
+    utxo_out = [
+        dbsync_types.UTxORecord(
+            utxo_hash=str(txhash),
+            utxo_ix=int(r["index"]),
+            amount=int(r["value"]),
+            address=str(r["address"] or ""),
+            datum_hash=r["data_hash"] or "",
+            inline_datum_hash=r["inline_datum_hash"] or "",
+            reference_script_hash=r["reference_script_hash"] or "",
+        )
+        for r in row.txouts or ()
+    ]
+    ma_utxo_out = [
+        dbsync_types.UTxORecord(
+            utxo_hash=str(txhash),
+            utxo_ix=int(r["index"]),
+            amount=int(r["quantity"] or 0),
+            address=str(r["address"] or ""),
+            coin=_get_coin(policyid=r["policy"], asset_name=r["name"]),
+            datum_hash=r["data_hash"] or "",
+        )
+        for r in row.ma_txouts or ()
+    ]
+    # Minting records are not tied to any output, use the index of the first output
+    # like `get_prelim_tx_record` does
+    mint_utxo_ix = min((r.utxo_ix for r in utxo_out), default=0)
+    mint_utxo_out = [
+        dbsync_types.UTxORecord(
+            utxo_hash=str(txhash),
+            utxo_ix=mint_utxo_ix,
+            amount=int(r["quantity"] or 0),
+            address="",  # This is available only for MA outputs
+            coin=_get_coin(policyid=r["policy"], asset_name=r["name"]),
+        )
+        for r in row.mint or ()
+    ]
+    txins, collaterals, reference_inputs = _get_input_records(inputs=row.inputs or [])
+
+    record = dbsync_types.TxRecord(
+        tx_id=int(row.tx_id),
+        tx_hash=row.tx_hash,
+        block_id=int(row.block_id),
+        block_index=int(row.block_index),
+        out_sum=int(row.out_sum),
+        fee=int(row.fee),
+        deposit=int(row.deposit),
+        size=int(row.size),
+        invalid_before=int(row.invalid_before) if row.invalid_before else None,
+        invalid_hereafter=int(row.invalid_hereafter) if row.invalid_hereafter else None,
+        treasury_donation=int(row.treasury_donation),
+        txins=txins,
+        txouts=[*utxo_out, *ma_utxo_out],
+        mint=mint_utxo_out,
+        collaterals=collaterals,
+        collateral_outputs=[
+            clusterlib.UTXOData(
+                utxo_hash=row.tx_hash,
+                utxo_ix=int(r["utxo_ix"]),
+                amount=int(r["value"]),
+                address=str(r["address"]),
+            )
+            for r in row.collateral_outputs or ()
+        ],
+        reference_inputs=reference_inputs,
+        scripts=[
+            dbsync_types.ScriptRecord(
+                hash=r["hash"],
+                type=str(r["type"]),
+                serialised_size=int(r["serialised_size"]) if r["serialised_size"] else 0,
+            )
+            for r in row.scripts or ()
+        ],
+        redeemers=[
+            dbsync_types.RedeemerRecord(
+                unit_mem=int(r["unit_mem"]),
+                unit_steps=int(r["unit_steps"]),
+                fee=int(r["fee"]),
+                purpose=str(r["purpose"]),
+                script_hash=r["script_hash"],
+                value=r["value"],
+            )
+            for r in row.redeemers or ()
+        ],
+        metadata=[
+            dbsync_types.MetadataRecord(
+                key=int(r["key"]), json=r["json"], bytes=memoryview(bytes.fromhex(r["bytes"]))
+            )
+            for r in row.metadata or ()
+        ],
+        reserve=[
+            dbsync_types.ADAStashRecord(
+                address=str(r["address"]), cert_index=int(r["cert_index"]), amount=int(r["amount"])
+            )
+            for r in row.reserve or ()
+        ],
+        treasury=[
+            dbsync_types.ADAStashRecord(
+                address=str(r["address"]), cert_index=int(r["cert_index"]), amount=int(r["amount"])
+            )
+            for r in row.treasury or ()
+        ],
+        pot_transfers=[
+            dbsync_types.PotTransferRecord(treasury=int(r["treasury"]), reserves=int(r["reserves"]))
+            for r in row.pot_transfers or ()
+        ],
+        stake_registration=row.stake_registration or [],
+        stake_deregistration=row.stake_deregistration or [],
+        stake_delegation=[
+            dbsync_types.DelegationRecord(
+                address=r["address"], pool_id=r["pool_id"], active_epoch_no=r["active_epoch_no"]
+            )
+            for r in row.stake_delegation or ()
+            if (r["address"] and r["pool_id"] and r["active_epoch_no"])
+        ],
+        withdrawals=[
+            clusterlib.TxOut(address=r["address"], amount=int(r["amount"]))
+            for r in row.withdrawals or ()
+        ],
+        extra_key_witness=row.extra_key_witness or [],
+    )
+
+    return record
+
+
+def get_tx_record(*, txhash: str) -> dbsync_types.TxRecord:
+    """Get transaction data from db-sync.
+
+    All the information about the TX is fetched in a single SQL query.
+    """
+    row = dbsync_queries.query_tx_full(txhash=txhash)
+    if row is None:
+        msg = "No results were returned by the TX SQL query."
+        raise RuntimeError(msg)
+
+    return _get_tx_record_from_row(row=row)
+
+
+def get_tx_records(*, txhashes: tp.Sequence[str]) -> dict[str, dbsync_types.TxRecord]:
+    """Get data of multiple transactions from db-sync, indexed by transaction hash.
+
+    All the information about the TXs is fetched in a single SQL query. Transactions that
+    are not in db-sync are missing from the result.
+    """
+    return {
+        row.tx_hash: _get_tx_record_from_row(row=row)
+        for row in dbsync_queries.query_txs_full(txhashes=txhashes)
+    }
+
+
+def wait_for_block(*, block_no: int, timeout: float = 600) -> int:
+    """Wait until db-sync indexes block number `block_no`.
+
+    Fail early when db-sync doesn't index any new block for `DBSYNC_STALL_TIMEOUT` seconds.
+
+    Returns:
+        Number of the last block indexed by db-sync.
+    """
+    end_time = time.monotonic() + timeout
+    stalled_time = time.monotonic() + configuration.DBSYNC_STALL_TIMEOUT
+    last_block_no = -1
+
+    while True:
+        dbsync_block_no = dbsync_queries.query_last_block_no()
+        if dbsync_block_no >= block_no:
+            return dbsync_block_no
+
+        now = time.monotonic()
+        if dbsync_block_no != last_block_no:
+            last_block_no = dbsync_block_no
+            stalled_time = now + configuration.DBSYNC_STALL_TIMEOUT
+        elif now > stalled_time:
+            msg = (
+                f"db-sync didn't index any new block in {configuration.DBSYNC_STALL_TIMEOUT}s, "
+                f"it is stuck at block {dbsync_block_no} (waiting for block {block_no})"
+            )
+            raise DbSyncStalledError(msg)
+        if now > end_time:
+            msg = f"db-sync reached only block {dbsync_block_no} in {timeout}s, expected {block_no}"
+            raise TimeoutError(msg)
+
+        time.sleep(BLOCK_POLL_INTERVAL)
+
+
+def _wait_for_new_block(*, last_block_no: int, timeout: float) -> int:
+    """Wait until db-sync indexes a block newer than `last_block_no`, or until timeout."""
+    end_time = time.monotonic() + timeout
+    while True:
+        dbsync_block_no = dbsync_queries.query_last_block_no()
+        if dbsync_block_no > last_block_no or time.monotonic() >= end_time:
+            return dbsync_block_no
+        time.sleep(BLOCK_POLL_INTERVAL)
+
+
 def retry_query(*, query_func: tp.Callable, timeout: int = 20) -> tp.Any:
-    """Wait a bit and retry a query until response is returned.
+    """Retry a query every time db-sync indexes a new block, until response is returned.
 
     A generic function that can be used by any query/check that raises `DbSyncNoResponseError`.
     The query is repeated until the expected data is returned or timeout is reached.
     """
-    end_time = time.time() + timeout
+    end_time = time.monotonic() + timeout
     repeat = 0
+    last_block_no = -1
 
     while True:
         if repeat:
-            sleep_time = 2 + repeat * repeat
-            LOGGER.warning(f"Sleeping {sleep_time}s before repeating query for the {repeat} time.")
-            time.sleep(sleep_time)
+            LOGGER.warning(
+                f"Waiting for db-sync block newer than {last_block_no} before repeating query "
+                f"for the {repeat} time."
+            )
+            last_block_no = _wait_for_new_block(
+                last_block_no=last_block_no, timeout=end_time - time.monotonic()
+            )
         try:
             response = query_func()
             break
         except DbSyncNoResponseError as exc:
-            if time.time() < end_time:
+            if time.monotonic() < end_time:
+                if not repeat:
+                    last_block_no = dbsync_queries.query_last_block_no()
                 repeat += 1
                 continue
             raise TimeoutError from exc
@@ -519,23 +766,27 @@ def retry_query(*, query_func: tp.Callable, timeout: int = 20) -> tp.Any:
     return response
 
 
-def get_tx_record_retry(*, txhash: str, retry_num: int = 3) -> dbsync_types.TxRecord:
+def get_tx_record_retry(
+    *, txhash: str, retry_num: int = 3, block_no: int = -1
+) -> dbsync_types.TxRecord:
     """Retry `get_tx_record` when data is anticipated and are not available yet.
 
-    Under load it might be necessary to wait a bit and retry the query.
+    Wait until db-sync indexes block `block_no` (usually the node tip after the TX was submitted)
+    before the first try. The query is retried every time db-sync indexes a new block, as the TX
+    might have been included in a later block.
     """
     retry_num = max(retry_num, 0)
     response = None
+    last_block_no = wait_for_block(block_no=block_no)
 
     # First try + number of retries
     for r in range(1 + retry_num):
         if r > 0:
-            sleep_time = 2 + r * r
             LOGGER.warning(
-                f"Sleeping {sleep_time}s before repeating TX SQL query for '{txhash}' "
-                f"for the {r} time."
+                f"Waiting for db-sync block {last_block_no + 1} before repeating TX SQL query "
+                f"for '{txhash}' for the {r} time."
             )
-            time.sleep(sleep_time)
+            last_block_no = wait_for_block(block_no=last_block_no + 1)
         try:
             response = get_tx_record(txhash=txhash)
             break
@@ -555,7 +806,9 @@ def get_tx(
         return None
 
     txhash = cluster_obj.g_transaction.get_txid(tx_body_file=tx_raw_output.out_file)
-    response = get_tx_record_retry(txhash=txhash, retry_num=retry_num)
+    response = get_tx_record_retry(
+        txhash=txhash, retry_num=retry_num, block_no=cluster_obj.g_query.get_block_no()
+    )
 
     return response
 
@@ -573,6 +826,54 @@ def check_tx(
     return response
 
 
+def check_txs(
+    *,
+    cluster_obj: clusterlib.ClusterLib,
+    tx_raw_outputs: tp.Sequence[clusterlib.TxRawOutput],
+    timeout: int = 60,
+) -> list[dbsync_types.TxRecord] | None:
+    """Check multiple transactions in db-sync.
+
+    Wait once until db-sync has indexed the current block of the node, get records of all the
+    transactions in bulk and check them. Records that are still missing are queried again when
+    db-sync indexes a new block. All the mismatches are reported, not only the first one.
+    """
+    if not configuration.HAS_DBSYNC:
+        return None
+
+    txhashes = [cluster_obj.g_transaction.get_txid(tx_body_file=r.out_file) for r in tx_raw_outputs]
+    wait_for_block(block_no=cluster_obj.g_query.get_block_no())
+    records: dict[str, dbsync_types.TxRecord] = {}
+
+    def _query_func() -> None:
+        # Some of the transactions might have been submitted but not included in a block yet
+        missing = [h for h in txhashes if h not in records]
+        records.update(get_tx_records(txhashes=missing))
+        missing = [h for h in missing if h not in records]
+        if missing:
+            msg = f"No results were returned by the TX SQL query for: {missing}"
+            raise DbSyncNoResponseError(msg)
+
+    retry_query(query_func=_query_func, timeout=timeout)
+
+    errors: list[str] = []
+    failed_txs = 0
+    for txhash, tx_raw_output in zip(txhashes, tx_raw_outputs):
+        tx_errors = dbsync_check_tx.get_tx_errors(
+            cluster_obj=cluster_obj, tx_raw_output=tx_raw_output, response=records[txhash]
+        )
+        errors.extend(f"{txhash}: {e}" for e in tx_errors)
+        failed_txs += bool(tx_errors)
+
+    if errors:
+        msg = "\n".join(
+            (f"db-sync data don't match for {failed_txs} of {len(txhashes)} TXs:", *errors)
+        )
+        raise AssertionError(msg)
+
+    return [records[h] for h in txhashes]
+
+
 def check_tx_phase_2_failure(
     *,
     cluster_obj: clusterlib.ClusterLib,
@@ -585,7 +886,9 @@ def check_tx_phase_2_failure(
         return None
 
     txhash = cluster_obj.g_transaction.get_txid(tx_body_file=tx_raw_output.out_file)
-    response = get_tx_record_retry(txhash=txhash, retry_num=retry_num)
+    response = get_tx_record_retry(
+        txhash=txhash, retry_num=retry_num, block_no=cluster_obj.g_query.get_block_no()
+    )
 
     # In case of a phase 2 failure, the collateral output becomes the output of the tx.
 
@@ -1588,8 +1891,11 @@ def wait_for_db_sync_completion(
 
     Raises:
         TimeoutError: If sync doesn't reach 99% within timeout
+        DbSyncStalledError: If db-sync doesn't index any new block for `DBSYNC_STALL_TIMEOUT`
     """
     start_time = time.time()
+    stalled_time = time.monotonic() + configuration.DBSYNC_STALL_TIMEOUT
+    last_block_no = -1
 
     def _query_func() -> float:
         dbsync_progress = dbsync_queries.query_db_sync_progress()
@@ -1607,7 +1913,18 @@ def wait_for_db_sync_completion(
             raise TimeoutError(err_msg)
         time.sleep(polling_interval)
         dbsync_progress = dbsync_queries.query_db_sync_progress()
-        LOGGER.info(f"Progress of db-sync: {dbsync_queries.query_db_sync_progress():.2f}%")
+        LOGGER.info(f"Progress of db-sync: {dbsync_progress:.2f}%")
+
+        dbsync_block_no = dbsync_queries.query_last_block_no()
+        if dbsync_block_no != last_block_no:
+            last_block_no = dbsync_block_no
+            stalled_time = time.monotonic() + configuration.DBSYNC_STALL_TIMEOUT
+        elif time.monotonic() > stalled_time:
+            err_msg = (
+                f"db-sync is stuck at block {dbsync_block_no} with {dbsync_progress:.2f}% "
+                f"progress for {configuration.DBSYNC_STALL_TIMEOUT}s"
+            )
+            raise DbSyncStalledError(err_msg)
 
     return dbsync_progress
 
@@ -1,16 +1,168 @@
+import concurrent.futures
 import contextlib
+import functools
 import logging
+import os
 import random
+import threading
+import typing as tp
 
 import cardano_clusterlib.types as cl_types
 from cardano_clusterlib import clusterlib
 
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import faucet_broker
 from cardano_node_tests.utils import helpers
 from cardano_node_tests.utils import locking
 from cardano_node_tests.utils import temptools
 
 LOGGER = logging.getLogger(__name__)
 
+LANE_PREFIX = "lane_"
+# Top up a lane when its balance falls below this part of the lane amount
+LANE_WATERMARK = 0.25
+# Lane balance that must remain after funding, to cover the fee and the change output
+LANE_RESERVE = 10_000_000
+
+_LANE_LOCKS: dict[str, threading.Lock] = {}
+_LANE_LOCKS_LOCK = threading.Lock()
+_LANE_TOP_UPS: dict[str, concurrent.futures.Future] = {}
+_LANE_TOP_UPS_LOCK = threading.Lock()
+
+
+def _get_lane_lock(lane_address: str) -> threading.Lock:
+    """Return the lock of the lane, create it when it doesn't exist yet."""
+    with _LANE_LOCKS_LOCK:
+        lane_lock = _LANE_LOCKS.get(lane_address)
+        if lane_lock is None:
+            lane_lock = _LANE_LOCKS[lane_address] = threading.Lock()
+        return lane_lock
+
+
+def get_lane_name(*, worker_id: str = "") -> str:
+    """Return name of the faucet lane of the pytest worker."""
+    worker_id = worker_id or os.environ.get("PYTEST_XDIST_WORKER") or "master"
+    return f"{LANE_PREFIX}{worker_id}"
+
+
+@functools.cache
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    return concurrent.futures.ThreadPoolExecutor(thread_name_prefix="faucet_lanes")
+
+
+def _log_top_up_error(future: concurrent.futures.Future) -> None:
+    if future.exception() is not None:
+        LOGGER.warning(f"Failed to top up the faucet lane: {future.exception()}")
+
+
+def _top_up_lane(
+    *,
+    cluster_obj: clusterlib.ClusterLib,
+    lane_data: dict,
+    all_faucets: dict[str, dict],
+    destination_dir: clusterlib.FileType = ".",
+) -> None:
+    """Top up the lane from one of the "user" faucets in the background.
+
+    Nothing is done when a top-up of the lane is already in progress.
+    """
+    lane_address = lane_data["payment"].address
+    with _LANE_TOP_UPS_LOCK:
+        in_progress = _LANE_TOP_UPS.get(lane_address)
+        if in_progress and not in_progress.done():
+            return
+
+        all_user_keys = [k for k in all_faucets if k.startswith("user")]
+        future = _get_executor().submit(
+            fund_from_faucet,
+            lane_data["payment"],
+            cluster_obj=cluster_obj,
+            faucet_data=all_faucets[random.choice(all_user_keys)],
+            amount=lane_data["lane_amount"],
+            tx_name=f"{get_lane_name()}_top_up",
+            destination_dir=destination_dir,
+            force=True,
+        )
+        future.add_done_callback(_log_top_up_error)
+        _LANE_TOP_UPS[lane_address] = future
+
+
+def _fund_from_lane(
+    *,
+    cluster_obj: clusterlib.ClusterLib,
+    lane_data: dict,
+    all_faucets: dict[str, dict],
+    txouts: list[clusterlib.TxOut],
+    tx_name: str,
+    destination_dir: clusterlib.FileType = ".",
+) -> clusterlib.TxRawOutput | None:
+    """Transfer funds from the lane of this worker.
+
+    No other worker spends from the lane, so no file locking is needed. Return None when
+    there are not enough funds in the lane.
+    """
+    lane_address = lane_data["payment"].address
+    needed_amount = sum(t.amount for t in txouts)
+
+    with _get_lane_lock(lane_address=lane_address):
+        lane_balance = cluster_obj.g_query.get_address_balance(lane_address)
+        if lane_balance - needed_amount < lane_data["lane_amount"] * LANE_WATERMARK:
+            _top_up_lane(
+                cluster_obj=cluster_obj,
+                lane_data=lane_data,
+                all_faucets=all_faucets,
+                destination_dir=destination_dir,
+            )
+        if lane_balance - needed_amount < LANE_RESERVE:
+            return None
+
+        return cluster_obj.g_transaction.send_tx(
+            src_address=lane_address,
+            tx_name=f"{tx_name}_funding",
+            txouts=txouts,
+            tx_files=clusterlib.TxFiles(signing_key_files=[lane_data["payment"].skey_file]),
+            destination_dir=destination_dir,
+        )
+
+
+def create_lanes(
+    *,
+    cluster_obj: clusterlib.ClusterLib,
+    all_faucets: dict[str, dict],
+    lane_records: dict[str, clusterlib.AddressRecord],
+    share: float = 0.5,
+    destination_dir: clusterlib.FileType = ".",
+) -> dict[str, dict[str, tp.Any]]:
+    """Move `share` of the funds of the "user" faucets to per-worker lanes.
+
+    Lanes are split evenly among the "user" faucets, each faucet funds its lanes in a single Tx.
+    """
+    all_user_keys = sorted(k for k in all_faucets if k.startswith("user"))
+    lane_names = sorted(lane_records)
+    lanes_data: dict[str, dict[str, tp.Any]] = {}
+    for i, user_key in enumerate(all_user_keys):
+        user_lanes = lane_names[i :: len(all_user_keys)]
+        if not user_lanes:
+            continue
+
+        faucet_data = all_faucets[user_key]
+        faucet_balance = cluster_obj.g_query.get_address_balance(faucet_data["payment"].address)
+        lane_amount = int(faucet_balance * share) // len(user_lanes)
+        fund_from_faucet(
+            *(lane_records[n] for n in user_lanes),
+            cluster_obj=cluster_obj,
+            faucet_data=faucet_data,
+            amount=lane_amount,
+            tx_name=f"{user_key}_lanes",
+            destination_dir=destination_dir,
+            force=True,
+        )
+        lanes_data.update(
+            {n: {"payment": lane_records[n], "lane_amount": lane_amount} for n in user_lanes}
+        )
+
+    return lanes_data
+
 
 def fund_from_faucet(
     *dst_addrs: clusterlib.AddressRecord,
@@ -22,7 +174,12 @@ def fund_from_faucet(
     destination_dir: clusterlib.FileType = ".",
     force: bool = False,
 ) -> clusterlib.TxRawOutput | None:
-    """Transfer `amount` from faucet addr to all `dst_addrs`."""
+    """Transfer `amount` from faucet addr to all `dst_addrs`.
+
+    Return the funding Tx output, or `None` when no funding was needed or when the funding Tx
+    is shared with other workers (`FAUCET_BROKER`). Query UTxOs of `dst_addrs` by address when
+    the UTxOs are needed.
+    """
     if not (faucet_data or all_faucets):
         msg = "Either `faucet_data` or `all_faucets` must be provided."
         raise ValueError(msg)
@@ -38,6 +195,22 @@ def fund_from_faucet(
     if not fund_txouts:
         return None
 
+    tx_name = tx_name or helpers.get_timestamped_rand_str()
+
+    lane_data = all_faucets.get(get_lane_name()) if all_faucets and not faucet_data else None
+    if lane_data and all_faucets:
+        tx_raw_output = _fund_from_lane(
+            cluster_obj=cluster_obj,
+            lane_data=lane_data,
+            all_faucets=all_faucets,
+            txouts=fund_txouts,
+            tx_name=tx_name,
+            destination_dir=destination_dir,
+        )
+        if tx_raw_output:
+            return tx_raw_output
+        # Not enough funds in the lane, use the shared faucets until the lane is topped up
+
     if not faucet_data and all_faucets:
         # Randomly select one of the "user" faucets
         all_user_keys = [k for k in all_faucets if k.startswith("user")]
@@ -48,9 +221,20 @@ def fund_from_faucet(
         msg = "Faucet data are not available."
         raise ValueError(msg)
 
+    if configuration.FAUCET_BROKER:
+        # Pay together with funding requests of other workers. The shared Tx is not returned,
+        # `get_utxo(tx_raw_output=...)` would return also outputs of the other workers.
+        faucet_broker.fund(
+            cluster_obj=cluster_obj,
+            faucet_data=faucet_data,
+            txouts=fund_txouts,
+            tx_name=tx_name,
+            destination_dir=destination_dir,
+        )
+        return None
+
     src_address = faucet_data["payment"].address
     with locking.FileLockIfXdist(f"{temptools.get_basetemp()}/{src_address}.lock"):
-        tx_name = tx_name or helpers.get_timestamped_rand_str()
         tx_name = f"{tx_name}_funding"
         fund_tx_files = clusterlib.TxFiles(signing_key_files=[faucet_data["payment"].skey_file])
 
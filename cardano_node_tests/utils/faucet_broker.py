@@ -0,0 +1,257 @@
+"""Funding from faucet batched across all pytest workers.
+
+Funding requests are written to a directory shared by all workers. The worker that gets the lock
+of the faucet address first waits for a short while for more requests, pays all of the pending
+requests in a single multi-output transaction, and writes results for the other requesters.
+Requests that come while the transaction is in flight are paid together in the next one, so there
+is one funding transaction per faucet address and block, instead of one per request.
+
+The requests are claimed before the transaction is submitted, so a request is never paid twice,
+not even when the paying worker crashes.
+"""
+
+import concurrent.futures
+import contextlib
+import fcntl
+import functools
+import json
+import logging
+import os
+import pathlib as pl
+import pickle
+import time
+import typing as tp
+import uuid
+
+from cardano_clusterlib import clusterlib
+
+from cardano_node_tests.utils import helpers
+from cardano_node_tests.utils import temptools
+
+LOGGER = logging.getLogger(__name__)
+
+BROKER_DIR_NAME = "faucet_broker"
+# Time to wait for more funding requests before paying the pending ones, in seconds
+BATCH_WINDOW = 0.5
+# Keep the transaction well below the max Tx size
+MAX_BATCH_TXOUTS = 100
+
+_REQUEST_SUFFIX = ".request.json"
+_CLAIMED_SUFFIX = ".claimed.json"
+_RESULT_SUFFIX = ".result.pickle"
+
+
+class FundingResult(tp.NamedTuple):
+    tx_raw_output: clusterlib.TxRawOutput  # The funding Tx shared with other requesters
+    utxos: list[clusterlib.UTXOData]  # Outputs of the funding Tx that belong to the requester
+
+
+class _Request(tp.NamedTuple):
+    req_id: str
+    txouts: list[clusterlib.TxOut]
+
+
+class _FailedBatch(tp.NamedTuple):
+    err: str
+
+
+def _get_broker_dir(src_address: str) -> pl.Path:
+    broker_dir = temptools.get_basetemp() / BROKER_DIR_NAME / src_address
+    broker_dir.mkdir(parents=True, exist_ok=True)
+    return broker_dir
+
+
+@contextlib.contextmanager
+def _faucet_lock(src_address: str) -> tp.Iterator[None]:
+    """Lock the faucet address.
+
+    The lock file is the same as the one used by `locking.FileLockIfXdist` for the faucet
+    address, so the broker doesn't interfere with other code that spends from the faucet.
+    Unlike `FileLockIfXdist`, the lock works also between threads of the same process.
+    """
+    lock_fd = os.open(temptools.get_basetemp() / f"{src_address}.lock", os.O_RDWR | os.O_CREAT)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(lock_fd)
+
+
+def _write_atomic(path: pl.Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
+
+def _claim(broker_dir: pl.Path, req_id: str) -> bool:
+    """Mark the request as being paid, so no other worker pays it again."""
+    try:
+        (broker_dir / f"{req_id}{_REQUEST_SUFFIX}").rename(
+            broker_dir / f"{req_id}{_CLAIMED_SUFFIX}"
+        )
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _claim_requests(broker_dir: pl.Path, own_request: _Request) -> list[_Request]:
+    """Read and claim pending requests, the own request goes first."""
+    _claim(broker_dir, req_id=own_request.req_id)
+    requests = [own_request]
+    num_txouts = len(own_request.txouts)
+    for req_file in sorted(broker_dir.glob(f"*{_REQUEST_SUFFIX}")):
+        req_id = req_file.name.removesuffix(_REQUEST_SUFFIX)
+        try:
+            txouts = [
+                clusterlib.TxOut(address=a, amount=amt)
+                for a, amt in json.loads(req_file.read_text(encoding="utf-8"))
+            ]
+        except (OSError, ValueError):
+            LOGGER.warning(f"Ignoring invalid funding request '{req_file}'.")
+            continue
+        if num_txouts + len(txouts) > MAX_BATCH_TXOUTS:
+            break
+        if not _claim(broker_dir, req_id=req_id):
+            continue
+        num_txouts += len(txouts)
+        requests.append(_Request(req_id=req_id, txouts=txouts))
+    return requests
+
+
+def _pay_batch(
+    *,
+    cluster_obj: clusterlib.ClusterLib,
+    faucet_data: dict,
+    requests: list[_Request],
+    tx_name: str,
+    destination_dir: clusterlib.FileType,
+) -> FundingResult:
+    """Pay all the requests in a single Tx.
+
+    The requests must be already claimed. Write the results for other requesters, return
+    the result of the first request.
+    """
+    src_address = faucet_data["payment"].address
+    broker_dir = _get_broker_dir(src_address)
+    fund_tx_files = clusterlib.TxFiles(signing_key_files=[faucet_data["payment"].skey_file])
+
+    results: dict[str, FundingResult | _FailedBatch] = {}
+    try:
+        tx_raw_output = cluster_obj.g_transaction.send_tx(
+            src_address=src_address,
+            tx_name=f"{tx_name}_funding",
+            txouts=[t for r in requests for t in r.txouts],
+            tx_files=fund_tx_files,
+            # Other workers need to find the Tx files
+            destination_dir=pl.Path(destination_dir).resolve(),
+        )
+        out_utxos = cluster_obj.g_query.get_utxo(tx_raw_output=tx_raw_output)
+        for r in requests:
+            addresses = {t.address for t in r.txouts}
+            results[r.req_id] = FundingResult(
+                tx_raw_output=tx_raw_output,
+                utxos=[u for u in out_utxos if u.address in addresses],
+            )
+    except Exception as exc:
+        results = {r.req_id: _FailedBatch(err=str(exc)) for r in requests}
+        raise
+    finally:
+        # Results of other requesters need to be written even when the funding failed
+        for r in requests:
+            if r is not requests[0]:
+                result_file = broker_dir / f"{r.req_id}{_RESULT_SUFFIX}"
+                result = results.get(r.req_id) or _FailedBatch(err="funding was interrupted")
+                _write_atomic(result_file, pickle.dumps(result))
+            (broker_dir / f"{r.req_id}{_CLAIMED_SUFFIX}").unlink(missing_ok=True)
+
+    LOGGER.debug(f"Paid {len(requests)} funding request(s) in '{tx_name}_funding'.")
+    return tp.cast(FundingResult, results[requests[0].req_id])
+
+
+def _pop_result(broker_dir: pl.Path, req_id: str) -> FundingResult | _FailedBatch | None:
+    result_file = broker_dir / f"{req_id}{_RESULT_SUFFIX}"
+    try:
+        result: FundingResult | _FailedBatch = pickle.loads(result_file.read_bytes())
+    except FileNotFoundError:
+        return None
+    result_file.unlink()
+    return result
+
+
+def fund(
+    *,
+    cluster_obj: clusterlib.ClusterLib,
+    faucet_data: dict,
+    txouts: list[clusterlib.TxOut],
+    tx_name: str | None = None,
+    destination_dir: clusterlib.FileType = ".",
+) -> FundingResult:
+    """Transfer funds from faucet, in a Tx shared with funding requests of other workers.
+
+    Raises:
+        clusterlib.CLIError: If the funding Tx failed.
+    """
+    src_address = faucet_data["payment"].address
+    broker_dir = _get_broker_dir(src_address)
+    request = _Request(
+        req_id=f"{time.time_ns()}_{uuid.uuid4().hex[:8]}",
+        txouts=[clusterlib.TxOut(address=t.address, amount=t.amount) for t in txouts],
+    )
+    _write_atomic(
+        broker_dir / f"{request.req_id}{_REQUEST_SUFFIX}",
+        json.dumps([(t.address, t.amount) for t in request.txouts]).encode(),
+    )
+
+    with _faucet_lock(src_address):
+        # The request was already paid by another worker
+        result = _pop_result(broker_dir, request.req_id)
+        if result is None:
+            if not (broker_dir / f"{request.req_id}{_REQUEST_SUFFIX}").exists():
+                # The request was claimed, but the worker that was paying it crashed. It is not
+                # known if the funding Tx was submitted, so the request can't be paid again.
+                (broker_dir / f"{request.req_id}{_CLAIMED_SUFFIX}").unlink(missing_ok=True)
+                msg = f"Funding request '{request.req_id}' was lost."
+                raise clusterlib.CLIError(msg)
+
+            # Give other workers a chance to add their requests
+            time.sleep(BATCH_WINDOW)
+            return _pay_batch(
+                cluster_obj=cluster_obj,
+                faucet_data=faucet_data,
+                requests=_claim_requests(broker_dir, own_request=request),
+                tx_name=tx_name or helpers.get_timestamped_rand_str(),
+                destination_dir=destination_dir,
+            )
+
+    if isinstance(result, _FailedBatch):
+        msg = f"Batched funding from faucet failed: {result.err}"
+        raise clusterlib.CLIError(msg)
+    return result
+
+
+@functools.cache
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    return concurrent.futures.ThreadPoolExecutor(thread_name_prefix="faucet_broker")
+
+
+def request_funding(
+    *,
+    cluster_obj: clusterlib.ClusterLib,
+    faucet_data: dict,
+    txouts: list[clusterlib.TxOut],
+    tx_name: str | None = None,
+    destination_dir: clusterlib.FileType = ".",
+) -> concurrent.futures.Future[FundingResult]:
+    """Request funding from faucet, without waiting for the funding Tx.
+
+    Requests of the same worker are paid together as well, so e.g. a fixture can request funding
+    for all of its addresses and wait for the results only when it needs them.
+    """
+    return _get_executor().submit(
+        fund,
+        cluster_obj=cluster_obj,
+        faucet_data=faucet_data,
+        txouts=txouts,
+        tx_name=tx_name,
+        destination_dir=destination_dir,
+    )
@@ -0,0 +1,366 @@
+"""Client of the node-to-client local state query mini-protocol.
+
+Serves the most frequent node queries in-process, over a persistent connection to the node
+socket, instead of spawning a `cardano-cli` process for each of them. Results that can't be
+reproduced exactly as `cardano-cli` would output them raise `UnsupportedQueryError`, and the
+caller is expected to fall back to the CLI.
+"""
+
+import contextlib
+import io
+import logging
+import socket
+import struct
+import threading
+import time
+import typing as tp
+
+import cbor2
+
+LOGGER = logging.getLogger(__name__)
+
+# Mini-protocol numbers
+HANDSHAKE = 0
+LOCAL_STATE_QUERY = 7
+
+# Node-to-client protocol versions V16 to V20, the version number has the bit 15 set
+N2C_VERSIONS = tuple(range(32784, 32789))
+
+ERAS = ("Byron", "Shelley", "Allegra", "Mary", "Alonzo", "Babbage", "Conway")
+# Eras with the transaction outputs encoding that is supported
+UTXO_ERAS = frozenset((ERAS.index("Babbage"), ERAS.index("Conway")))
+
+SET_TAG = 258
+MAX_SEGMENT_SIZE = 0xFFFF
+# Header of multiplexer segment: timestamp, mode bit + mini-protocol number, payload length
+_SEGMENT_HEADER = struct.Struct(">IHH")
+_RESPONDER_BIT = 0x8000
+
+# Local state query messages
+_MSG_ACQUIRE_TIP = [8]
+_MSG_ACQUIRED = 1
+_MSG_QUERY = 3
+_MSG_RESULT = 4
+_MSG_RELEASE = [5]
+_MSG_DONE = [7]
+
+# Queries
+QUERY_CHAIN_BLOCK_NO = [2]
+QUERY_CHAIN_POINT = [3]
+QUERY_CURRENT_ERA = [0, [2, [1]]]
+SHELLEY_QUERY_EPOCH_NO = [1]
+SHELLEY_QUERY_UTXO_BY_ADDRESS = 6
+
+_BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+
+class LocalStateQueryError(Exception):
+    """Local state query failed."""
+
+
+class UnsupportedQueryError(LocalStateQueryError):
+    """The query result can't be served natively."""
+
+
+def _get_era_name(era: int) -> str:
+    """Return name of the era with the given index."""
+    if not isinstance(era, int) or not 0 <= era < len(ERAS):
+        # E.g. a newer node with an era that is not known yet
+        msg = f"Unknown era index {era}."
+        raise UnsupportedQueryError(msg)
+    return ERAS[era]
+
+
+def _bech32_polymod(values: tp.Iterable[int]) -> int:
+    generator = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+    chk = 1
+    for value in values:
+        top = chk >> 25
+        chk = (chk & 0x1FFFFFF) << 5 ^ value
+        for i in range(5):
+            chk ^= generator[i] if ((top >> i) & 1) else 0
+    return chk
+
+
+def bech32_to_bytes(bech32_str: str) -> bytes:
+    """Decode bech32 encoded address (without length limit, as used by Cardano)."""
+    hrp, sep, data_part = bech32_str.lower().rpartition("1")
+    if not (sep and hrp) or len(data_part) < 6:
+        msg = f"Not a bech32 string: {bech32_str}"
+        raise ValueError(msg)
+
+    try:
+        data = [_BECH32_CHARSET.index(c) for c in data_part]
+    except ValueError as exc:
+        msg = f"Not a bech32 string: {bech32_str}"
+        raise ValueError(msg) from exc
+
+    hrp_expanded = [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp]
+    if _bech32_polymod(hrp_expanded + data) != 1:
+        msg = f"Invalid bech32 checksum: {bech32_str}"
+        raise ValueError(msg)
+
+    # Convert 5-bit groups to bytes, the padding bits are dropped
+    acc = bits = 0
+    out = bytearray()
+    for value in data[:-6]:
+        acc = (acc << 5) | value
+        bits += 5
+        if bits >= 8:
+            bits -= 8
+            out.append((acc >> bits) & 0xFF)
+    return bytes(out)
+
+
+class _Mux:
+    """Multiplexer of node-to-client mini-protocols over a Unix socket."""
+
+    def __init__(self, *, socket_path: str, timeout: float) -> None:
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(socket_path)
+        except OSError:
+            self._sock.close()
+            raise
+        self._start = time.monotonic()
+        self._buffers: dict[int, bytearray] = {}
+
+    def send(self, *, protocol: int, msg: tp.Any) -> None:
+        payload = cbor2.dumps(msg)
+        for pos in range(0, len(payload), MAX_SEGMENT_SIZE):
+            chunk = payload[pos : pos + MAX_SEGMENT_SIZE]
+            timestamp = int((time.monotonic() - self._start) * 1_000_000) & 0xFFFFFFFF
+            self._sock.sendall(_SEGMENT_HEADER.pack(timestamp, protocol, len(chunk)) + chunk)
+
+    def _recv_exact(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._sock.recv(size - len(data))
+            if not chunk:
+                msg = "Connection closed by the node."
+                raise LocalStateQueryError(msg)
+            data.extend(chunk)
+        return bytes(data)
+
+    def recv(self, *, protocol: int) -> tp.Any:
+        """Receive a message, it can span multiple segments."""
+        buffer = self._buffers.setdefault(protocol, bytearray())
+        while True:
+            if buffer:
+                fp = io.BytesIO(buffer)
+                with contextlib.suppress(cbor2.CBORDecodeEOF):
+                    msg = cbor2.CBORDecoder(fp).decode()
+                    del buffer[: fp.tell()]
+                    return msg
+
+            __, protocol_word, length = _SEGMENT_HEADER.unpack(
+                self._recv_exact(_SEGMENT_HEADER.size)
+            )
+            payload = self._recv_exact(length)
+            self._buffers.setdefault(protocol_word & ~_RESPONDER_BIT, bytearray()).extend(payload)
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+def _query_if_current(*, era: int, query: list) -> list:
+    """Wrap era specific query."""
+    return [0, [0, [era, query]]]
+
+
+def _unwrap_if_current(*, result: list) -> tp.Any:
+    # The result is wrapped in a list, or there's a list of mismatched era names
+    if len(result) != 1:
+        msg = f"Era mismatch: {result}"
+        raise UnsupportedQueryError(msg)
+    return result[0]
+
+
+def _value_to_json(*, value: int | list) -> dict[str, tp.Any]:
+    if isinstance(value, int):
+        return {"lovelace": value}
+    coin, multi_asset = value
+    value_json: dict[str, tp.Any] = {"lovelace": coin}
+    for policy_id, assets in multi_asset.items():
+        value_json[policy_id.hex()] = {name.hex(): amount for name, amount in assets.items()}
+    return value_json
+
+
+def _txout_to_json(*, txout: list | dict, addresses: dict[bytes, str]) -> dict[str, tp.Any]:
+    """Convert transaction output to the format of `cardano-cli query utxo` output."""
+    datum_hash = None
+    if isinstance(txout, dict):
+        if 3 in txout:
+            msg = "Reference scripts are not supported."
+            raise UnsupportedQueryError(msg)
+        address_b, value = txout[0], txout[1]
+        datum_option = txout.get(2)
+        if datum_option:
+            if datum_option[0] != 0:
+                msg = "Inline datums are not supported."
+                raise UnsupportedQueryError(msg)
+            datum_hash = datum_option[1]
+    else:
+        address_b, value, *rest = txout
+        datum_hash = rest[0] if rest else None
+
+    address = addresses.get(address_b)
+    if address is None:
+        msg = f"Unexpected address: {address_b.hex()}"
+        raise UnsupportedQueryError(msg)
+
+    txout_json: dict[str, tp.Any] = {
+        "address": address,
+        "datum": None,
+        "value": _value_to_json(value=value),
+    }
+    if datum_hash:
+        txout_json["datumhash"] = datum_hash.hex()
+    return txout_json
+
+
+class LocalStateQueryClient:
+    """Local state query client with a persistent connection to the node.
+
+    The connection is opened on the first query and re-opened after errors.
+    """
+
+    def __init__(self, *, socket_path: str, network_magic: int, timeout: float = 30) -> None:
+        self.socket_path = socket_path
+        self.network_magic = network_magic
+        self.timeout = timeout
+        self.version = 0
+        self._mux: _Mux | None = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> _Mux:
+        try:
+            mux = _Mux(socket_path=self.socket_path, timeout=self.timeout)
+        except OSError as exc:
+            msg = f"Cannot connect to '{self.socket_path}': {exc}"
+            raise LocalStateQueryError(msg) from exc
+
+        try:
+            mux.send(
+                protocol=HANDSHAKE,
+                msg=[0, {v: [self.network_magic, False] for v in N2C_VERSIONS}],
+            )
+            reply = mux.recv(protocol=HANDSHAKE)
+        except (OSError, cbor2.CBORError) as exc:
+            mux.close()
+            msg = f"Handshake failed: {exc}"
+            raise LocalStateQueryError(msg) from exc
+        if reply[0] != 1:
+            mux.close()
+            msg = f"Handshake refused: {reply}"
+            raise LocalStateQueryError(msg)
+
+        self.version = reply[1]
+        LOGGER.debug(f"Connected to '{self.socket_path}', node-to-client version {self.version}.")
+        return mux
+
+    def _reset(self) -> None:
+        if self._mux is not None:
+            self._mux.close()
+            self._mux = None
+
+    def _request(self, *, mux: _Mux, msg: list, expected: int) -> list:
+        try:
+            mux.send(protocol=LOCAL_STATE_QUERY, msg=msg)
+            reply: list = mux.recv(protocol=LOCAL_STATE_QUERY)
+        except (OSError, cbor2.CBORError, LocalStateQueryError) as exc:
+            # The state of the protocol is unknown, start over with a new connection
+            self._reset()
+            msg_err = f"Local state query failed: {exc}"
+            raise LocalStateQueryError(msg_err) from exc
+        if reply[0] != expected:
+            self._reset()
+            msg_err = f"Unexpected reply to local state query: {reply}"
+            raise LocalStateQueryError(msg_err)
+        return reply
+
+    @contextlib.contextmanager
+    def acquire(self) -> tp.Iterator[tp.Callable[[list], tp.Any]]:
+        """Acquire the ledger state at the current tip, yield a function for running queries."""
+        with self._lock:
+            if self._mux is None:
+                self._mux = self._connect()
+            mux = self._mux
+            self._request(mux=mux, msg=_MSG_ACQUIRE_TIP, expected=_MSG_ACQUIRED)
+
+            def _query(query: list) -> tp.Any:
+                return self._request(mux=mux, msg=[_MSG_QUERY, query], expected=_MSG_RESULT)[1]
+
+            try:
+                yield _query
+            finally:
+                if self._mux is mux:
+                    try:
+                        mux.send(protocol=LOCAL_STATE_QUERY, msg=_MSG_RELEASE)
+                    except OSError:
+                        self._reset()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mux is not None:
+                with contextlib.suppress(OSError):
+                    self._mux.send(protocol=LOCAL_STATE_QUERY, msg=_MSG_DONE)
+                self._reset()
+
+    def get_tip(self) -> dict[str, tp.Any]:
+        """Return era, slot, hash, block and epoch of the current tip."""
+        with self.acquire() as query:
+            era = query(QUERY_CURRENT_ERA)
+            era_name = _get_era_name(era)
+            if era == 0:
+                msg = "Byron era is not supported."
+                raise UnsupportedQueryError(msg)
+            point = query(QUERY_CHAIN_POINT)
+            block_no = query(QUERY_CHAIN_BLOCK_NO)
+            epoch = _unwrap_if_current(
+                result=query(_query_if_current(era=era, query=SHELLEY_QUERY_EPOCH_NO))
+            )
+
+        # Chain point is `[]` and block number is `[0]` at the origin
+        if not point or block_no == [0]:
+            msg = "The chain is at the origin."
+            raise UnsupportedQueryError(msg)
+        slot, block_hash = point
+        return {
+            "block": block_no[-1] if isinstance(block_no, list) else block_no,
+            "epoch": epoch,
+            "era": era_name,
+            "hash": block_hash.hex(),
+            "slot": slot,
+        }
+
+    def get_utxo(self, *, addresses: list[str]) -> dict[str, dict[str, tp.Any]]:
+        """Return UTxO of the addresses in the format of `cardano-cli query utxo` output."""
+        try:
+            addresses_map = {bech32_to_bytes(a): a for a in addresses}
+        except ValueError as exc:
+            # E.g. Byron addresses
+            raise UnsupportedQueryError(str(exc)) from exc
+
+        with self.acquire() as query:
+            era = query(QUERY_CURRENT_ERA)
+            if era not in UTXO_ERAS:
+                msg = f"UTxO query in {_get_era_name(era)} era is not supported."
+                raise UnsupportedQueryError(msg)
+            utxo = _unwrap_if_current(
+                result=query(
+                    _query_if_current(
+                        era=era,
+                        query=[
+                            SHELLEY_QUERY_UTXO_BY_ADDRESS,
+                            cbor2.CBORTag(SET_TAG, list(addresses_map)),
+                        ],
+                    )
+                )
+            )
+
+        return {
+            f"{txid.hex()}#{ix}": _txout_to_json(txout=txout, addresses=addresses_map)
+            for (txid, ix), txout in sorted(utxo.items())
+        }
@@ -1,3 +1,4 @@
+import concurrent.futures
 import contextlib
 import dataclasses
 import fnmatch
@@ -5,14 +6,18 @@ import functools
 import io
 import itertools
 import logging
+import mmap
+import multiprocessing
 import os
 import pathlib as pl
 import re
+import sqlite3
+import threading
 import time
 import typing as tp
-from collections import deque
 
 from cardano_node_tests.utils import cluster_nodes
+from cardano_node_tests.utils import configuration
 from cardano_node_tests.utils import framework_log
 from cardano_node_tests.utils import helpers
 from cardano_node_tests.utils import locking
@@ -21,17 +26,31 @@ from cardano_node_tests.utils import temptools
 LOGGER = logging.getLogger(__name__)
 
 BUFFER_SIZE = 512 * 1024  # 512 KB buffer
+# Search multiple log files in parallel only when there's at least this many bytes to search
+PARALLEL_SEARCH_MIN_BYTES = 16 * 1024 * 1024
+# Size of memory-mapped window that is searched for literals at once
+LITERALS_WINDOW_SIZE = 8 * 1024 * 1024
+# Regex that is just an alternation of plain words, e.g. "error|fail|ChainDB\.AddBlock"
+LITERALS_RE = re.compile(rb"(?:[\w ]|\\[^\w])+(?:\|(?:[\w ]|\\[^\w])+)*")
+# Ignore rule that matches just a plain string, e.g. "Network\.Socket\.connect"
+LITERAL_RULE_RE = re.compile(r"(?:[^\\.^$*+?{}\[\]|()]|\\[^\w])*")
 ROTATED_RE = re.compile(r".+\.[0-9]+")  # Detect rotated log file
 # NOTE: The regex needs to be unanchored.
 ERRORS_RE = re.compile("error|fail", re.IGNORECASE)
 ERRORS_IGNORE_FILE_NAME = ".errors_to_ignore"
+ERRORS_INDEX_FILE_NAME = ".errors_index.sqlite"
 
-ERRORS_IGNORED = [
+# Trace records with low severity that contain error strings. Not needed when the trace records
+# are checked by their severity (see `LOGS_STRUCTURED_CHECK`).
+ERRORS_IGNORED_SEVERITY = [
     r"cardano\.node\.[^:]+:Debug:",
     r"cardano\.node\.[^:]+:Info:",
     "db-sync-node:Info:",
-    r"TxSubmitApi\.[^\]]*\]\(Info,",
     "cardano-tx-submit:Info:",
+]
+
+ERRORS_IGNORED = [
+    r"TxSubmitApi\.[^\]]*\]\(Info,",
     "Event: LedgerUpdate",
     "trace.*ErrorPolicy",
     "ErrorPolicySuspendConsumer",
@@ -92,6 +111,25 @@ ERRORS_LOOK_BACK_MAP = {
     "TraceNoLedgerState": "Switched to a fork",  # can happen when chain switched to a fork
 }
 
+# Severities of node and db-sync trace records, in increasing order
+TRACE_SEVERITIES = (
+    "Debug",
+    "Info",
+    "Notice",
+    "Warning",
+    "Error",
+    "Critical",
+    "Alert",
+    "Emergency",
+)
+# Trace records with this or higher severity are errors
+TRACE_ERROR_SEVERITY = "Error"
+# Header of text trace records, e.g. "[host:cardano.node.ChainDB:Info:5]" or "[db-sync-node:Info:6]"
+TRACE_TEXT_RE = re.compile(rb"\[(?:[^:\]]*:)?([^:\]]+):([A-Z][a-z]+):\d+\]")
+# Fields of JSON trace records, e.g. `{"at": ..., "ns": "ChainDB.AddBlockEvent", "sev": "Info"}`
+TRACE_JSON_SEV_RE = re.compile(rb'"sev":\s*"(\w+)"')
+TRACE_JSON_NS_RE = re.compile(rb'"ns":\s*\[?\s*"([^"]*)"')
+
 # Relevant errors from supervisord.log
 # NOTE: The regex needs to be unanchored.
 SUPERVISORD_ERRORS_RE = re.compile("not expected|FATAL", re.IGNORECASE)
@@ -167,28 +205,99 @@ def _get_ignore_rules_lock_file(instance_num: int) -> pl.Path:
     return temptools.get_basetemp() / f"{ERRORS_IGNORE_FILE_NAME}_{instance_num}.lock"
 
 
-def _get_ignore_rules(
-    cluster_env: cluster_nodes.ClusterEnv, timestamp: float
-) -> list[tuple[str, str]]:
-    """Get rules (file glob and regex) for ignored errors."""
-    rules: list[tuple[str, str]] = []
+class _IgnoreMatcher:
+    """Matcher of lines that are ignored by a set of regexes.
+
+    Most of the ignore rules are plain strings. These are checked with substring search first,
+    the rest of the rules is combined into a single regex that runs only when no plain string
+    matched.
+    """
+
+    def __init__(self, regexes: tp.Iterable[str]) -> None:
+        literals: list[str] = []
+        patterns: list[str] = []
+        for regex in sorted(regexes):
+            if LITERAL_RULE_RE.fullmatch(regex):
+                literals.append(re.sub(r"\\(.)", r"\1", regex))
+            else:
+                patterns.append(regex)
+        self.literals = tuple(literals)
+        self.regex = re.compile("|".join(patterns)) if patterns else None
+
+    def search(self, line: str) -> bool:
+        """Check if the line is ignored."""
+        if any(literal in line for literal in self.literals):
+            return True
+        return bool(self.regex and self.regex.search(line))
+
+
+@functools.lru_cache(maxsize=256)
+def _get_ignore_matcher(regexes: frozenset[str]) -> _IgnoreMatcher:
+    return _IgnoreMatcher(regexes=regexes)
+
+
+class _IgnoreRules:
+    """Ignore rules added by tests, with the rules classified by the log files they apply to."""
+
+    def __init__(self, rules: list[tuple[str, float, str]]) -> None:
+        self.rules = rules
+        self._file_rules: dict[str, list[tuple[float, str]]] = {}
+
+    def _get_file_rules(self, logfile_name: str) -> list[tuple[float, str]]:
+        file_rules = self._file_rules.get(logfile_name)
+        if file_rules is None:
+            file_rules = self._file_rules[logfile_name] = [
+                (skip_after, regex)
+                for files_glob, skip_after, regex in self.rules
+                if fnmatch.fnmatch(logfile_name, files_glob)
+            ]
+        return file_rules
+
+    def get_matcher(self, logfile: pl.Path, timestamp: float) -> _IgnoreMatcher:
+        """Get matcher for the given log file, using rules that were not expired at `timestamp`."""
+        # Skip the rule if it is expired. The `timestamp` is the time of the last log
+        # search, so the expire time is compared to the time of the last log check.
+        regexes = frozenset(
+            regex
+            for skip_after, regex in self._get_file_rules(logfile_name=logfile.name)
+            if not 0 < skip_after < timestamp
+        )
+        return _get_ignore_matcher(regexes=regexes)
+
+
+# Parsed ignore rules per state dir, together with names, mtimes and sizes of the rules files
+_IGNORE_RULES_CACHE: dict[pl.Path, tuple[list[tuple[str, int, int]], _IgnoreRules]] = {}
+
+
+def _read_ignore_rules(cluster_env: cluster_nodes.ClusterEnv) -> _IgnoreRules:
+    """Read rules (file glob, expire time and regex) for ignored errors.
+
+    The rules files are parsed again only when some of them changed.
+    """
     lock_file = _get_ignore_rules_lock_file(instance_num=cluster_env.instance_num)
 
     with locking.FileLockIfXdist(lock_file):
-        for rules_file in cluster_env.state_dir.glob(f"{ERRORS_IGNORE_FILE_NAME}_*"):
-            with open(rules_file, encoding="utf-8") as infile:
+        rules_files = []
+        for rules_file in sorted(cluster_env.state_dir.glob(f"{ERRORS_IGNORE_FILE_NAME}_*")):
+            stat = rules_file.stat()
+            rules_files.append((rules_file.name, stat.st_mtime_ns, stat.st_size))
+
+        cached = _IGNORE_RULES_CACHE.get(cluster_env.state_dir)
+        if cached and cached[0] == rules_files:
+            return cached[1]
+
+        rules: list[tuple[str, float, str]] = []
+        for rules_file_name, *__ in rules_files:
+            with open(cluster_env.state_dir / rules_file_name, encoding="utf-8") as infile:
                 for line in infile:
                     if ";;" not in line:
                         continue
                     files_glob, skip_after_str, regex = line.split(";;")
-                    skip_after = float(skip_after_str)
-                    # Skip the rule if it is expired. The `timestamp` is the time of the last log
-                    # search, so the expire time is compared to the time of the last log check.
-                    if 0 < skip_after < timestamp:
-                        continue
-                    rules.append((files_glob, regex.rstrip("\n")))
+                    rules.append((files_glob, float(skip_after_str), regex.rstrip("\n")))
 
-    return rules
+    ignore_rules = _IgnoreRules(rules=rules)
+    _IGNORE_RULES_CACHE[cluster_env.state_dir] = (rules_files, ignore_rules)
+    return ignore_rules
 
 
 def _get_offset_file(logfile: pl.Path) -> pl.Path:
@@ -204,16 +313,12 @@ def _read_seek(offset_file: pl.Path) -> int:
         return 0
 
 
-def _get_ignore_regex(
-    ignore_rules: list[tuple[str, str]], regexes: list[str], logfile: pl.Path
-) -> str:
-    """Combine together regex for the given log file using file specific and global ignore rules."""
-    regex_set = set(regexes)
-    for record in ignore_rules:
-        files_glob, regex = record
-        if fnmatch.filter([logfile.name], files_glob):
-            regex_set.add(regex)
-    return "|".join(regex_set) or "nothing_to_ignore"
+def _get_last_search(logfile: pl.Path) -> tuple[int, float]:
+    """Return seek offset (from where to start searching) and timestamp of last search."""
+    offset_file = _get_offset_file(logfile=logfile)
+    if offset_file.exists():
+        return _read_seek(offset_file=offset_file), offset_file.stat().st_mtime
+    return 0, 0.0
 
 
 def _resume_at_line_boundary(fb: tp.BinaryIO, pos: int, size: int) -> None:
@@ -306,7 +411,9 @@ def _compile_look_back_map_bytes(
 
 
 def _should_ignore_error(
-    line_b: bytes, lookback: deque[bytes], pairs: list[tuple[re.Pattern[bytes], re.Pattern[bytes]]]
+    line_b: bytes,
+    lookback: tp.Iterable[bytes],
+    pairs: list[tuple[re.Pattern[bytes], re.Pattern[bytes]]],
 ) -> bool:
     """Return True if line matches an 'error' key and a preceding regex is in the look-back."""
     for err_pat_b, prev_pat_b in pairs:
@@ -327,7 +434,187 @@ def _validated_start(seek: int | None, size: int) -> int:
     return seek
 
 
-def _search_log_lines(  # noqa: C901
+def _mmap_line_start(mm: mmap.mmap, pos: int, size: int) -> int:
+    """Return offset of the first complete line at or after `pos`."""
+    if pos <= 0:
+        return 0
+    if pos >= size:
+        return size
+
+    prev = mm[pos - 1 : pos]
+    if prev == b"\r" and mm[pos : pos + 1] == b"\n":
+        # We're exactly between CRLF, start at the next line
+        return pos + 1
+    if prev in (b"\n", b"\r"):
+        return pos
+
+    # In the middle of a line: skip to next newline
+    nl = mm.find(b"\n", pos)
+    return size if nl == -1 else nl + 1
+
+
+def _mmap_look_back(mm: mmap.mmap, start: int, line_start: int, num: int) -> list[bytes]:
+    """Return up to `num` lines preceding the line at `line_start`, not crossing `start`."""
+    lines: list[bytes] = []
+    end = line_start - 1  # Position of the newline that ends the previous line
+    while len(lines) < num and end > start:
+        nl = mm.rfind(b"\n", start, end)
+        prev_start = start if nl == -1 else nl + 1
+        lines.append(mm[prev_start:end].removesuffix(b"\r"))
+        end = prev_start - 1
+    return lines
+
+
+def _get_literals(pat: re.Pattern[bytes]) -> tuple[bytes, ...]:
+    """Return the words when the regex is just an alternation of plain words."""
+    if not LITERALS_RE.fullmatch(pat.pattern) or pat.flags & ~(re.IGNORECASE | re.ASCII):
+        return ()
+    pattern = pat.pattern.lower() if pat.flags & re.IGNORECASE else pat.pattern
+    return tuple(re.sub(rb"\\(.)", rb"\1", word) for word in pattern.split(b"|"))
+
+
+def _iter_candidates(
+    mm: mmap.mmap, start: int, end: int, errs_b: re.Pattern[bytes]
+) -> tp.Iterator[int]:
+    """Yield increasing positions of possible error matches in the `start`:`end` region.
+
+    Searching for literals is an order of magnitude faster than searching with the `re` module,
+    especially for case insensitive regexes.
+    """
+    literals = _get_literals(pat=errs_b)
+    if not literals:
+        pos = start
+        while match := errs_b.search(mm, pos, end):
+            yield match.start()
+            pos = match.start() + 1
+        return
+
+    ignorecase = bool(errs_b.flags & re.IGNORECASE)
+    overlap = max(len(lit) for lit in literals) - 1
+    for win_start in range(start, end, LITERALS_WINDOW_SIZE):
+        win_end = min(win_start + LITERALS_WINDOW_SIZE, end)
+        window = mm[win_start : min(win_end + overlap, end)]
+        if ignorecase:
+            window = window.lower()
+        positions = []
+        for lit in literals:
+            idx = window.find(lit)
+            # Matches starting in the overlap belong to the next window
+            while idx != -1 and win_start + idx < win_end:
+                positions.append(win_start + idx)
+                idx = window.find(lit, idx + 1)
+        yield from sorted(positions)
+
+
+class _TraceFilter:
+    """Filter of error lines based on severity and namespace of trace records.
+
+    Only the record header (or the "sev" and "ns" fields of JSON records) is parsed. Lines that
+    are not trace records, e.g. exceptions printed by the node, are checked with the error regex.
+    """
+
+    def __init__(self, errors_re: re.Pattern[str], flagged_namespaces: tp.Iterable[str]) -> None:
+        flagged_namespaces = tuple(flagged_namespaces)
+        error_severities = TRACE_SEVERITIES[TRACE_SEVERITIES.index(TRACE_ERROR_SEVERITY) :]
+        self.errors_b = _compile_bytes_from_pattern(pat=errors_re)
+        self.flagged_namespaces = tuple(ns.encode() for ns in flagged_namespaces)
+        self.severities = frozenset(s.encode() for s in TRACE_SEVERITIES)
+        self.error_severities = frozenset(s.encode() for s in error_severities)
+        # Lines that can possibly be errors: lines with error strings, error severities
+        # or flagged namespaces
+        self.candidates_re = re.compile(
+            "|".join(
+                (
+                    errors_re.pattern,
+                    *(s.lower() for s in error_severities),
+                    *(re.escape(ns) for ns in flagged_namespaces),
+                )
+            ),
+            re.IGNORECASE,
+        )
+
+    def _parse(self, line_b: bytes) -> tuple[bytes, bytes] | None:
+        """Return namespace and severity of the trace record, or `None` if it's not a record."""
+        if line_b.startswith(b"{"):
+            sev_match = TRACE_JSON_SEV_RE.search(line_b)
+            if not sev_match:
+                return None
+            ns_match = TRACE_JSON_NS_RE.search(line_b)
+            return (ns_match.group(1) if ns_match else b""), sev_match.group(1)
+
+        header_match = TRACE_TEXT_RE.match(line_b)
+        if not header_match or header_match.group(2) not in self.severities:
+            return None
+        return header_match.group(1), header_match.group(2)
+
+    def is_error(self, line_b: bytes) -> bool:
+        record = self._parse(line_b=line_b)
+        if record is None:
+            return bool(self.errors_b and self.errors_b.search(line_b))
+        namespace, severity = record
+        return severity in self.error_severities or namespace.startswith(self.flagged_namespaces)
+
+
+@functools.cache
+def _get_trace_filter() -> _TraceFilter:
+    return _TraceFilter(
+        errors_re=ERRORS_RE, flagged_namespaces=configuration.LOGS_FLAGGED_NAMESPACES
+    )
+
+
+def _search_mmap(
+    mm: mmap.mmap,
+    start: int,
+    end: int,
+    errs_b: re.Pattern[bytes],
+    *,
+    ign_b: re.Pattern[bytes] | None,
+    lb_pairs: list[tuple[re.Pattern[bytes], re.Pattern[bytes]]],
+    look_back_lines: int,
+    trace_filter: _TraceFilter | None = None,
+) -> list[bytes]:
+    """Return error lines in the `start`:`end` region that consists of complete lines.
+
+    The error regex is searched in the memory-mapped region directly, only the lines with
+    a match are materialized.
+    """
+    found: list[bytes] = []
+    pos = start
+    for candidate in _iter_candidates(mm=mm, start=start, end=end, errs_b=errs_b):
+        # The line with the candidate was already processed
+        if candidate < pos:
+            continue
+
+        nl = mm.rfind(b"\n", start, candidate)
+        line_start = start if nl == -1 else nl + 1
+        line_end = mm.find(b"\n", candidate, end)
+        pos = line_end + 1
+        line_b = mm[line_start:line_end].removesuffix(b"\r")
+
+        if trace_filter:
+            if not trace_filter.is_error(line_b=line_b):
+                continue
+        # The candidate needs to be verified, as the regex match could span multiple lines
+        elif not errs_b.search(line_b):
+            continue
+        if ign_b and ign_b.search(line_b):
+            continue
+        # Error: maybe ignore based on mapping
+        if lb_pairs and _should_ignore_error(
+            line_b=line_b,
+            lookback=_mmap_look_back(
+                mm=mm, start=start, line_start=line_start, num=look_back_lines
+            ),
+            pairs=lb_pairs,
+        ):
+            continue
+
+        found.append(line_b)
+
+    return found
+
+
+def _search_log_lines(
     logfile: pl.Path,
     rotated_logs: list[RotableLog],
     errors_re: re.Pattern[str],  # The the error regex needs to be unanchored
@@ -335,11 +622,15 @@ def _search_log_lines(  # noqa: C901
     errors_ignored_re: re.Pattern[str] | None = None,
     look_back_map: dict[str, str] | None = None,
     look_back_lines: int = 10,
+    trace_filter: _TraceFilter | None = None,
     encoding: str = "utf-8",
 ) -> list[tuple[pl.Path, str]]:
     """Search for error lines, ignoring mapped errors when a preceding message appears.
 
-    - Uses binary I/O + byte offsets for correctness and speed.
+    When `trace_filter` is given, the `errors_re` only selects candidate lines and the trace
+    filter decides which of them are errors.
+
+    - Searches memory-mapped log files and byte offsets for correctness and speed.
     - Decodes only matched lines for output.
     - Persists a byte offset at a line boundary for the live logfile.
     """
@@ -356,62 +647,36 @@ def _search_log_lines(  # noqa: C901
 
     for rec in rotated_logs:
         path = rec.logfile
-        size = path.stat().st_size
-        start = _validated_start(seek=rec.seek, size=size)
 
-        with path.open("rb", buffering=BUFFER_SIZE) as fb:
+        with path.open("rb") as fb:
             _validate_inode(rec)
-            _resume_at_line_boundary(fb=fb, pos=start, size=size)
-
-            look_back: deque[bytes] = deque(maxlen=look_back_lines)
-            leftover = b""
-
-            while True:
-                chunk = fb.read(BUFFER_SIZE)
-                if not chunk:
-                    break
-
-                buf = leftover + chunk
-
-                # Fast prefilter: is there *any* error token in this chunk?
-                # Safe only when the error regex is unanchored.
-                has_error_in_chunk = bool(errs_b.search(buf))
-
-                lines_b, leftover = _split_complete_lines(buf=buf)
-
-                if not has_error_in_chunk:
-                    # No error candidates: just update look-back (cheap) and continue.
-                    # (Deque will keep only the last look_back_lines lines.)
-                    for ln in lines_b:
-                        look_back.append(ln)
-                    continue
-
-                for line_b in lines_b:
-                    # Fast ignore
-                    if ign_b and ign_b.search(line_b):
-                        look_back.append(line_b)
-                        continue
-                    # Not an error -> just update context
-                    if not errs_b.search(line_b):
-                        look_back.append(line_b)
-                        continue
-                    # Error: maybe ignore based on mapping
-                    if lb_pairs and _should_ignore_error(
-                        line_b=line_b, lookback=look_back, pairs=lb_pairs
-                    ):
-                        look_back.append(line_b)
-                        continue
-
-                    look_back.append(line_b)
-
-                    # Report: decode only now
-                    line = line_b.decode(encoding, errors="surrogateescape")
-                    results.append((path, line))
+            size = os.fstat(fb.fileno()).st_size
+            start = _validated_start(seek=rec.seek, size=size)
+
+            # Empty files cannot be memory-mapped
+            end = start
+            if size:
+                with mmap.mmap(fb.fileno(), length=size, access=mmap.ACCESS_READ) as mm:
+                    start = _mmap_line_start(mm=mm, pos=start, size=size)
+                    # Search only complete lines
+                    end = mm.rfind(b"\n", start, size) + 1 or start
+                    lines_b = _search_mmap(
+                        mm=mm,
+                        start=start,
+                        end=end,
+                        errs_b=errs_b,
+                        ign_b=ign_b,
+                        lb_pairs=lb_pairs,
+                        look_back_lines=look_back_lines,
+                        trace_filter=trace_filter,
+                    )
+                results.extend(
+                    (path, line_b.decode(encoding, errors="surrogateescape")) for line_b in lines_b
+                )
 
             # Persist next offset for the "live" logfile at a line boundary
             if path == logfile:
-                cur = fb.tell()
-                last_offset_bytes = cur - len(leftover)
+                last_offset_bytes = end
 
     if last_offset_bytes >= 0:
         offset_file = _get_offset_file(logfile=logfile)
@@ -654,58 +919,247 @@ def expect_messages(regex_pairs: list[tuple[str, str]]) -> tp.Iterator[None]:
         raise AssertionError(errors_joined) from None
 
 
-def search_cluster_logs() -> list[tuple[pl.Path, str]]:
-    """Search cluster logs for errors."""
-    cluster_env = cluster_nodes.get_cluster_env()
-    lock_file = temptools.get_basetemp() / f"search_cluster_{cluster_env.instance_num}.lock"
+class _ErrorsIndex:
+    """Persistent store of error lines found in log files of a cluster instance.
+
+    The index lives in the state dir, so it is discarded together with the cluster instance.
+    """
+
+    def __init__(self, state_dir: pl.Path) -> None:
+        self.db_file = state_dir / ERRORS_INDEX_FILE_NAME
+
+    @contextlib.contextmanager
+    def _connect(self) -> tp.Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS hits ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, logfile TEXT, timestamp REAL, line TEXT)"
+                )
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, hits: list[tuple[pl.Path, str]], timestamp: float) -> None:
+        """Store error lines found in log files.
+
+        The `timestamp` is the time of the previous search of the log files, i.e. the lines
+        were written after it.
+        """
+        if not hits:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO hits (logfile, timestamp, line) VALUES (?, ?, ?)",
+                [(str(logfile), timestamp, line) for logfile, line in hits],
+            )
+
+    def pop_all(self) -> list[tuple[pl.Path, float, str]]:
+        """Return and remove all stored error lines, oldest first."""
+        if not self.db_file.exists():
+            return []
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, logfile, timestamp, line FROM hits ORDER BY id"
+            ).fetchall()
+            if rows:
+                conn.execute("DELETE FROM hits WHERE id <= ?", (rows[-1][0],))
+        return [(pl.Path(logfile), timestamp, line) for __, logfile, timestamp, line in rows]
+
+
+# Serialize indexing of log files between the background scanner and the main thread
+_INDEX_THREAD_LOCK = threading.Lock()
+
+
+@contextlib.contextmanager
+def _index_lock(instance_num: int) -> tp.Iterator[None]:
+    lock_file = temptools.get_basetemp() / f"search_cluster_{instance_num}.lock"
+    with _INDEX_THREAD_LOCK, locking.FileLockIfXdist(lock_file):
+        yield
+
+
+@functools.cache
+def _get_errors_ignored_re(structured: bool = False) -> re.Pattern[str]:
+    if structured:
+        return re.compile("|".join(ERRORS_IGNORED))
+    return re.compile("|".join([*ERRORS_IGNORED_SEVERITY, *ERRORS_IGNORED]))
+
+
+def _search_cluster_logfile(
+    logfile: pl.Path, seek: int, timestamp: float
+) -> list[tuple[pl.Path, str]]:
+    """Search single cluster log file for errors since the last search.
+
+    Runs also in the search worker processes, so it needs to be a module-level function.
+    """
+    trace_filter = _get_trace_filter() if configuration.LOGS_STRUCTURED_CHECK else None
 
-    def _search(
-        logfile: pl.Path, seek: int, timestamp: float, errors_ignored: str
-    ) -> list[tuple[pl.Path, str]]:
+    def _search() -> list[tuple[pl.Path, str]]:
         return _search_log_lines(
             logfile=logfile,
             rotated_logs=_get_rotated_logs(logfile=logfile, seek=seek, timestamp=timestamp),
-            errors_re=ERRORS_RE,
-            errors_ignored_re=re.compile(errors_ignored),
+            errors_re=trace_filter.candidates_re if trace_filter else ERRORS_RE,
+            errors_ignored_re=_get_errors_ignored_re(structured=bool(trace_filter)),
             look_back_map=ERRORS_LOOK_BACK_MAP,
+            trace_filter=trace_filter,
         )
 
-    with locking.FileLockIfXdist(lock_file):
-        errors = []
-        for logfile in cluster_env.state_dir.glob("*.std*"):
-            # Skip if the log file is status file or rotated log
-            if logfile.name.endswith(".offset") or ROTATED_RE.match(logfile.name):
+    return _retry_search(_search)
+
+
+@functools.cache
+def _get_search_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Return pool of processes for searching multiple log files in parallel.
+
+    The `re` module holds the GIL, so threads would not help. The "spawn" start method is used
+    as the pool can be created while the background logs scanner thread is running.
+    """
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=configuration.LOGS_SCAN_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def shutdown_search_pool() -> None:
+    """Stop the processes for searching log files in parallel, if they were started."""
+    if _get_search_pool.cache_info().currsize:
+        _get_search_pool().shutdown()
+        _get_search_pool.cache_clear()
+
+
+def _get_pending_bytes(logfile: pl.Path, seek: int) -> int:
+    """Return approximate number of bytes that were not searched yet."""
+    try:
+        size = logfile.stat().st_size
+    except FileNotFoundError:
+        return 0
+    # The log file was rotated if it is smaller than the seek offset
+    return size if size < seek else size - seek
+
+
+def _index_cluster_logs(cluster_env: cluster_nodes.ClusterEnv) -> None:
+    """Search log files for errors since the last search and store them in the index.
+
+    Only the static ignore rules are applied here. The ignore rules added by tests are applied
+    when the errors are retrieved from the index.
+    """
+    index = _ErrorsIndex(state_dir=cluster_env.state_dir)
+
+    searches: list[tuple[pl.Path, int, float]] = []
+    for logfile in cluster_env.state_dir.glob("*.std*"):
+        # Skip if the log file is status file or rotated log
+        if logfile.name.endswith(".offset") or ROTATED_RE.match(logfile.name):
+            continue
+        searches.append((logfile, *_get_last_search(logfile=logfile)))
+
+    # Fan out to worker processes only when there's enough work to outweigh the overhead
+    pending_bytes = sum(_get_pending_bytes(logfile=lf, seek=seek) for lf, seek, __ in searches)
+    use_pool = (
+        configuration.LOGS_SCAN_WORKERS > 1
+        and len(searches) > 1
+        and pending_bytes >= PARALLEL_SEARCH_MIN_BYTES
+    )
+
+    all_hits: tp.Iterable[list[tuple[pl.Path, str]]] = ()
+    if use_pool:
+        try:
+            all_hits = list(_get_search_pool().map(_search_cluster_logfile, *zip(*searches)))
+        except concurrent.futures.process.BrokenProcessPool:
+            LOGGER.warning("The pool of log search processes is broken, searching serially.")
+            _get_search_pool.cache_clear()
+            use_pool = False
+    if not use_pool:
+        all_hits = (_search_cluster_logfile(*search) for search in searches)
+
+    for (__, __seek, timestamp), hits in zip(searches, all_hits):
+        index.add(hits=hits, timestamp=timestamp)
+
+
+class _LogsScanner(threading.Thread):
+    """Index errors in log files of the watched cluster instance in the background.
+
+    Keeps the amount of log lines that need to be searched after each test small.
+    """
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(name="logs_scanner", daemon=True)
+        self.interval = interval
+        self.cluster_env: cluster_nodes.ClusterEnv | None = None
+
+    def run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            cluster_env = self.cluster_env
+            if cluster_env is None:
                 continue
+            try:
+                with _index_lock(instance_num=cluster_env.instance_num):
+                    # The cluster instance is not watched anymore, it can be respun
+                    if self.cluster_env is not cluster_env:
+                        continue
+                    _index_cluster_logs(cluster_env=cluster_env)
+            except Exception:
+                LOGGER.debug("Failed to index cluster logs.", exc_info=True)
 
-            # Get seek offset (from where to start searching) and timestamp of last search
-            offset_file = _get_offset_file(logfile=logfile)
-            if offset_file.exists():
-                seek = _read_seek(offset_file=offset_file)
-                timestamp = offset_file.stat().st_mtime
-            else:
-                seek = 0
-                timestamp = 0.0
 
-            # Get ignore rules for the log file
-            ignore_rules = _get_ignore_rules(
-                cluster_env=cluster_env, timestamp=timestamp or time.time()
-            )
-            errors_ignored = _get_ignore_regex(
-                ignore_rules=ignore_rules, regexes=ERRORS_IGNORED, logfile=logfile
-            )
+_LOGS_SCANNER: _LogsScanner | None = None
 
-            # Search for errors in the log file
-            errors.extend(
-                _retry_search(
-                    functools.partial(
-                        _search,
-                        logfile=logfile,
-                        seek=seek,
-                        timestamp=timestamp,
-                        errors_ignored=errors_ignored,
-                    )
-                )
-            )
+
+def watch_cluster_logs() -> None:
+    """Start indexing errors in log files of the current cluster instance in the background.
+
+    Must be called only while a test is running on the cluster instance, so the cluster instance
+    is not respun while its log files are searched.
+    """
+    global _LOGS_SCANNER  # noqa: PLW0603
+
+    if configuration.LOGS_SCAN_INTERVAL <= 0:
+        return
+
+    if _LOGS_SCANNER is None:
+        _LOGS_SCANNER = _LogsScanner(interval=configuration.LOGS_SCAN_INTERVAL)
+        _LOGS_SCANNER.start()
+    _LOGS_SCANNER.cluster_env = cluster_nodes.get_cluster_env()
+
+
+def unwatch_cluster_logs() -> None:
+    """Stop indexing errors in log files of the current cluster instance in the background."""
+    if _LOGS_SCANNER is None:
+        return
+
+    # Wait for the indexing in progress to finish
+    with _INDEX_THREAD_LOCK:
+        _LOGS_SCANNER.cluster_env = None
+
+
+def search_cluster_logs() -> list[tuple[pl.Path, str]]:
+    """Search cluster logs for errors.
+
+    Returns errors that were not returned by previous searches. Most of the log lines were
+    already searched by the background scanner (see `watch_cluster_logs`), only the rest of
+    the log files needs to be searched here.
+    """
+    cluster_env = cluster_nodes.get_cluster_env()
+
+    with _index_lock(instance_num=cluster_env.instance_num):
+        _index_cluster_logs(cluster_env=cluster_env)
+        hits = _ErrorsIndex(state_dir=cluster_env.state_dir).pop_all()
+
+    if not hits:
+        return []
+
+    # Apply the ignore rules that were added by tests
+    ignore_rules = _read_ignore_rules(cluster_env=cluster_env)
+    errors = []
+    for logfile, timestamp, line in hits:
+        # The ignore rules for the "live" log file apply also to its rotated versions
+        rules_logfile = logfile.with_suffix("") if ROTATED_RE.match(logfile.name) else logfile
+        matcher = ignore_rules.get_matcher(
+            logfile=rules_logfile, timestamp=timestamp or time.time()
+        )
+        if not matcher.search(line):
+            errors.append((logfile, line))
 
     return errors
 
@@ -717,13 +1171,7 @@ def search_framework_log() -> list[tuple[pl.Path, str]]:
     logfile = framework_log.get_framework_log_path()
 
     # Get seek offset (from where to start searching) and timestamp of last search
-    offset_file = _get_offset_file(logfile=logfile)
-    if offset_file.exists():
-        seek = _read_seek(offset_file=offset_file)
-        timestamp = offset_file.stat().st_mtime
-    else:
-        seek = 0
-        timestamp = 0.0
+    seek, timestamp = _get_last_search(logfile=logfile)
 
     def _search() -> list[tuple[pl.Path, str]]:
         return _search_log_lines(
@@ -747,13 +1195,7 @@ def search_supervisord_logs() -> list[tuple[pl.Path, str]]:
         logfile = cluster_env.state_dir / "supervisord.log"
 
         # Get seek offset (from where to start searching) and timestamp of last search
-        offset_file = _get_offset_file(logfile=logfile)
-        if offset_file.exists():
-            seek = _read_seek(offset_file=offset_file)
-            timestamp = offset_file.stat().st_mtime
-        else:
-            seek = 0
-            timestamp = 0.0
+        seek, timestamp = _get_last_search(logfile=logfile)
 
         def _search() -> list[tuple[pl.Path, str]]:
             return _search_log_lines(
@@ -18,6 +18,7 @@ import typing as tp
 from cardano_clusterlib import clusterlib
 
 from cardano_node_tests.utils import cluster_nodes
+from cardano_node_tests.utils import custom_clusterlib
 from cardano_node_tests.utils import defragment_utxos
 from cardano_node_tests.utils import helpers
 from cardano_node_tests.utils import tx_view
@@ -27,6 +28,16 @@ LOGGER = logging.getLogger(__name__)
 TxInputGroup = list[tuple[list[clusterlib.UTXOData], pl.Path]]
 
 
+def _throttle(*, cluster_obj: clusterlib.ClusterLib, sleep_sec: float) -> None:
+    """Prevent "Network.Socket.connect: <socket: 11>: resource exhausted" errors.
+
+    The custom `ClusterLib` limits the number of concurrent connections to the node socket,
+    no sleep is needed with it.
+    """
+    if not isinstance(cluster_obj, custom_clusterlib.ClusterLib):
+        time.sleep(sleep_sec)
+
+
 def reregister_stake_addr(
     *,
     cluster_obj: clusterlib.ClusterLib,
@@ -389,9 +400,7 @@ def cleanup_addresses(
         for fpath in files:
             f_name = fpath.name
 
-            # Add random sleep for < 0.5s to prevent
-            # "Network.Socket.connect: <socket: 11>: resource exhausted"
-            time.sleep(random.random() / 2)
+            _throttle(cluster_obj=cluster_obj, sleep_sec=random.random() / 2)
 
             if f_name.endswith("_stake.addr"):
                 try:
@@ -471,9 +480,7 @@ def cleanup_certs(
 
     def _run(files: list[pl.Path], payment_addr: clusterlib.AddressRecord) -> None:
         for cert_file in files:
-            # Add random sleep for < 0.5s to prevent
-            # "Network.Socket.connect: <socket: 11>: resource exhausted"
-            time.sleep(random.random() / 2)
+            _throttle(cluster_obj=cluster_obj, sleep_sec=random.random() / 2)
 
             f_name = cert_file.name
             f_dir = cert_file.parent
@@ -547,9 +554,7 @@ def addresses_info(*, cluster_obj: clusterlib.ClusterLib, location: pl.Path) ->
             continue
         seen_addrs.add(address)
 
-        # Add sleep to prevent
-        # "Network.Socket.connect: <socket: 11>: resource exhausted"
-        time.sleep(0.1)
+        _throttle(cluster_obj=cluster_obj, sleep_sec=0.1)
 
         if f_name.endswith("_stake.addr"):
             stake_addr_info = cluster_obj.g_query.get_stake_addr_info(address)
@@ -0,0 +1,285 @@
+"""Chain tip of a cluster instance shared by all pytest workers.
+
+A single process per cluster instance - the one that holds the lock file in the state dir -
+follows the chain tip and publishes it to a memory-mapped file. Other processes wait for new
+blocks, slots and epochs by watching the file instead of running `cardano-cli query tip`.
+When the publishing process goes away, the first process that finds the feed stale takes over.
+"""
+
+import contextlib
+import fcntl
+import logging
+import math
+import mmap
+import os
+import pathlib as pl
+import struct
+import threading
+import time
+import typing as tp
+
+from cardano_clusterlib import clusterlib
+from cardano_clusterlib import clusterlib_helpers
+from cardano_clusterlib import query_group
+
+LOGGER = logging.getLogger(__name__)
+
+FEED_FILE_NAME = ".tip_feed"
+LOCK_FILE_NAME = ".tip_feed.lock"
+# Interval of reading the memory-mapped file while waiting, in seconds
+WATCH_INTERVAL = 0.01
+# Don't query the node more often than this, even if slots are shorter, in seconds
+MIN_FOLLOW_INTERVAL = 0.1
+# The feed is considered stale when it was not updated for this many follow intervals
+STALE_INTERVALS = 10
+
+# sequence no., publish time, slot, block, epoch, sync progress, sequence no.
+_RECORD = struct.Struct("<QdqqqdQ")
+
+
+class FeedTip(tp.NamedTuple):
+    slot: int
+    block: int
+    epoch: int
+    sync_progress: float | None
+    queried: float
+
+    def as_tip(self) -> dict[str, tp.Any]:
+        """Return the record in the format of `cardano-cli query tip` output."""
+        tip: dict[str, tp.Any] = {"slot": self.slot, "block": self.block, "epoch": self.epoch}
+        if self.sync_progress is not None:
+            tip["syncProgress"] = self.sync_progress
+        return tip
+
+
+class TipFeed:
+    """Tip of a single cluster instance, published through a memory-mapped file."""
+
+    def __init__(self, *, cluster_obj: clusterlib.ClusterLib) -> None:
+        self.cluster_obj = cluster_obj
+        state_dir = pl.Path(cluster_obj.state_dir)
+        self.feed_file = state_dir / FEED_FILE_NAME
+        self.lock_file = state_dir / LOCK_FILE_NAME
+        self.follow_interval = max(float(cluster_obj.slot_length), MIN_FOLLOW_INTERVAL)
+        self.max_age = self.follow_interval * STALE_INTERVALS
+        # Plain query group, so the tip is always queried from the node and never cached
+        self._query_group = query_group.QueryGroup(clusterlib_obj=cluster_obj)
+
+        self._mm: mmap.mmap | None = None
+        self._mm_ino = -1
+        self._lock_fd: int | None = None
+        self._seq = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._mutex = threading.Lock()
+
+    @property
+    def is_following(self) -> bool:
+        """Check if this process is the one that publishes the tip."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _open(self) -> mmap.mmap | None:
+        """Map the feed file to memory, map it again when the file was re-created."""
+        try:
+            stat = self.feed_file.stat()
+        except FileNotFoundError:
+            return None
+        if self._mm is not None and stat.st_ino == self._mm_ino:
+            return self._mm
+        if stat.st_size < _RECORD.size:
+            return None
+
+        if self._mm is not None:
+            self._mm.close()
+        with open(self.feed_file, "r+b") as fp:
+            self._mm = mmap.mmap(fp.fileno(), length=_RECORD.size)
+        self._mm_ino = stat.st_ino
+        return self._mm
+
+    def read(self) -> FeedTip | None:
+        """Return the last published tip, or None when the feed is not available."""
+        with self._mutex:
+            mm = self._open()
+            if mm is None:
+                return None
+            # The record can be read while it's being written, retry on mismatched sequence no.
+            for __ in range(100):
+                seq, queried, slot, block, epoch, sync_progress, seq_end = _RECORD.unpack(
+                    mm[: _RECORD.size]
+                )
+                if seq == seq_end:
+                    break
+            else:
+                return None
+        if seq == 0:
+            return None
+        return FeedTip(
+            slot=slot,
+            block=block,
+            epoch=epoch,
+            sync_progress=None if math.isnan(sync_progress) else sync_progress,
+            queried=queried,
+        )
+
+    def _publish(self, *, tip: dict[str, tp.Any], queried: float) -> None:
+        sync_progress = tip.get("syncProgress")
+        self._seq += 1
+        record = _RECORD.pack(
+            self._seq,
+            queried,
+            int(tip.get("slot") or 0),
+            int(tip.get("block") or 0),
+            int(tip.get("epoch") or 0),
+            float(sync_progress) if sync_progress is not None else math.nan,
+            self._seq,
+        )
+        with self._mutex:
+            mm = self._open()
+            if mm is not None:
+                mm[: _RECORD.size] = record
+
+    def _lock_file_replaced(self) -> bool:
+        """Check if the state dir was re-created, e.g. when the cluster instance was respun."""
+        if self._lock_fd is None:
+            return True
+        try:
+            return self.lock_file.stat().st_ino != os.fstat(self._lock_fd).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _follow(self) -> None:
+        while not (self._stop.is_set() or self._lock_file_replaced()):
+            try:
+                queried = time.time()
+                self._publish(tip=self._query_group.get_tip(), queried=queried)
+            except Exception:
+                # The node might be restarting, the feed gets stale if it takes too long
+                LOGGER.debug("Failed to query the tip.", exc_info=True)
+            self._stop.wait(self.follow_interval)
+
+        self._release()
+
+    def _release(self) -> None:
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def _try_follow(self) -> bool:
+        """Start following the tip when no other process does."""
+        if self.is_following:
+            return True
+        if not self.lock_file.parent.is_dir():
+            return False
+
+        lock_fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(lock_fd)
+            return False
+
+        self._lock_fd = lock_fd
+        with open(self.feed_file, "ab") as fp:
+            if fp.tell() < _RECORD.size:
+                fp.truncate(_RECORD.size)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._follow, name=f"tip_follower_{self.feed_file.parent.name}", daemon=True
+        )
+        self._thread.start()
+        LOGGER.debug(f"Following the chain tip of '{self.feed_file.parent}'.")
+        return True
+
+    def stop(self) -> None:
+        """Stop following the tip, another process can take over."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.max_age)
+            self._thread = None
+        with self._mutex:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+                self._mm_ino = -1
+
+    def get_tip(self, *, since: float = 0.0) -> FeedTip | None:
+        """Return the tip that was queried from the node after `since` (unix time).
+
+        Wait at most a few follow intervals for a fresh enough tip. Return None when the feed is
+        stale, so the caller can query the node directly.
+        """
+        deadline = time.monotonic() + self.max_age
+        while True:
+            feed_tip = self.read()
+            now = time.time()
+            if feed_tip is None or now - feed_tip.queried > self.max_age:
+                # Nobody is publishing the tip, or the node is not responding
+                if not self._try_follow() or time.monotonic() > deadline:
+                    return None
+            elif feed_tip.queried >= since:
+                return feed_tip
+            elif time.monotonic() > deadline:
+                return None
+            time.sleep(WATCH_INTERVAL)
+
+    def wait(
+        self,
+        *,
+        reached: tp.Callable[[FeedTip], bool],
+        waiting_for: str,
+    ) -> FeedTip | None:
+        """Wait until `reached` returns True for the published tip.
+
+        Return None when the feed gets stale in the meantime.
+
+        Raises:
+            clusterlib.CLIError: If no new block is created for
+                `clusterlib_helpers.NEXT_BLOCK_TIMEOUT_SLOTS` slots' worth of wall-clock time.
+        """
+        next_block_timeout = (
+            clusterlib_helpers.NEXT_BLOCK_TIMEOUT_SLOTS * self.cluster_obj.slot_length
+        )
+        last_block = -1
+        last_block_time = time.monotonic()
+        while True:
+            feed_tip = self.get_tip()
+            if feed_tip is None:
+                return None
+            if reached(feed_tip):
+                return feed_tip
+
+            now = time.monotonic()
+            if feed_tip.block != last_block:
+                last_block = feed_tip.block
+                last_block_time = now
+            elif now - last_block_time > next_block_timeout:
+                msg = (
+                    f"Timed out waiting for {waiting_for}, no new block for "
+                    f"{now - last_block_time:.0f} sec; last block no: {last_block}."
+                )
+                raise clusterlib.CLIError(msg)
+            time.sleep(WATCH_INTERVAL)
+
+
+_FEEDS: dict[pl.Path, TipFeed] = {}
+_FEEDS_LOCK = threading.Lock()
+
+
+def get_feed(*, cluster_obj: clusterlib.ClusterLib) -> TipFeed:
+    """Return the tip feed of the cluster instance, one per state dir and process."""
+    state_dir = pl.Path(cluster_obj.state_dir)
+    with _FEEDS_LOCK:
+        feed = _FEEDS.get(state_dir)
+        if feed is None:
+            feed = _FEEDS[state_dir] = TipFeed(cluster_obj=cluster_obj)
+    return feed
+
+
+def stop_all() -> None:
+    """Stop following the tips, e.g. at the end of the session."""
+    with _FEEDS_LOCK:
+        feeds = list(_FEEDS.values())
+        _FEEDS.clear()
+    for feed in feeds:
+        with contextlib.suppress(Exception):
+            feed.stop()
@@ -0,0 +1,164 @@
+"""Utilities for measuring throughput and memory usage of the framework code."""
+
+import dataclasses
+import json
+import logging
+import os
+import pathlib as pl
+import time
+import tracemalloc
+import typing as tp
+
+from cardano_node_tests.utils import helpers
+
+LOGGER = logging.getLogger(__name__)
+
+BASELINE_FILE = pl.Path(__file__).parent / "baseline.json"
+
+UPDATE_BASELINE = helpers.is_truthy_env_var("UPDATE_BENCHMARK_BASELINE")
+TOLERANCE = float(os.environ.get("BENCHMARK_TOLERANCE") or 0.3)
+# Differences in peak memory under this many MB are just noise
+MEM_NOISE_MB = 1.0
+
+
+@dataclasses.dataclass(frozen=True, order=True)
+class BenchmarkResult:
+    name: str
+    # Amount of work done, e.g. MB of searched log files or number of queries
+    amount: float
+    unit: str
+    seconds: float
+    peak_mem_mb: float
+    # Throughput of the reference implementation on the same machine, 0 when not measured
+    reference_per_s: float = 0.0
+
+    @property
+    def per_s(self) -> float:
+        return self.amount / self.seconds if self.seconds else 0.0
+
+    @property
+    def relative_per_s(self) -> float:
+        """Return throughput relative to the reference, it doesn't depend on the machine speed."""
+        return self.per_s / self.reference_per_s if self.reference_per_s else 0.0
+
+
+def load_baseline() -> dict[str, dict[str, float]]:
+    if not BASELINE_FILE.exists():
+        return {}
+    return dict(json.loads(BASELINE_FILE.read_text()))
+
+
+def save_baseline(results: list[BenchmarkResult]) -> None:
+    baseline = load_baseline()
+    for res in results:
+        record = {"peak_mem_mb": round(res.peak_mem_mb, 2)}
+        if res.relative_per_s:
+            record["relative_per_s"] = round(res.relative_per_s, 3)
+        baseline[res.name] = record
+    BASELINE_FILE.write_text(f"{json.dumps(baseline, indent=2, sort_keys=True)}\n")
+
+
+def _check_regression(res: BenchmarkResult, baseline: dict[str, dict[str, float]]) -> list[str]:
+    base = baseline.get(res.name)
+    if not base:
+        return []
+
+    errors = []
+    # Absolute throughput depends on the machine, only the relative one is compared
+    base_relative = base.get("relative_per_s")
+    if (
+        base_relative
+        and res.relative_per_s
+        and res.relative_per_s < base_relative * (1 - TOLERANCE)
+    ):
+        errors.append(
+            f"{res.name}: relative throughput {res.relative_per_s:.3f} is below "
+            f"the baseline {base_relative:.3f}"
+        )
+    if res.peak_mem_mb > base["peak_mem_mb"] * (1 + TOLERANCE) + MEM_NOISE_MB:
+        errors.append(
+            f"{res.name}: peak memory {res.peak_mem_mb:.2f} MB is above "
+            f"the baseline {base['peak_mem_mb']:.2f} MB"
+        )
+    return errors
+
+
+class Benchmark:
+    """Measure throughput and peak memory of a function and compare them to the baseline."""
+
+    def __init__(self, baseline: dict[str, dict[str, float]]) -> None:
+        self.baseline = baseline
+        self.results: list[BenchmarkResult] = []
+        # Throughput of reference implementations, per unit
+        self.reference_per_s: dict[str, float] = {}
+
+    def measure_reference(
+        self, func: tp.Callable[[], tp.Any], *, size_bytes: int = 0, ops: int = 0
+    ) -> None:
+        """Measure throughput of a reference implementation, e.g. a naive search.
+
+        Throughput of the benchmarks with the same unit is compared to the baseline relative to
+        the reference, so the baseline can be used on machines of different speed. Without
+        the reference, the throughput is just reported.
+        """
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        unit = "MB" if size_bytes else "ops"
+        amount = size_bytes / 1024 / 1024 if size_bytes else ops
+        self.reference_per_s[unit] = amount / seconds if seconds else 0.0
+        LOGGER.info(f"Reference throughput: {self.reference_per_s[unit]:.1f} {unit}/s")
+
+    def __call__[T](
+        self,
+        name: str,
+        func: tp.Callable[[], T],
+        *,
+        size_bytes: int = 0,
+        ops: int = 0,
+        setup: tp.Callable[[], None] | None = None,
+    ) -> T:
+        """Run the function twice - once for timing and once for tracing memory allocations.
+
+        The throughput is measured in MB/s when `size_bytes` is given, otherwise in operations
+        (`ops`) per second. The `setup` function is called before each run, e.g. to remove
+        the saved offsets of log files. Returns the result of the function, so it can be
+        checked for correctness.
+        """
+        if setup:
+            setup()
+        start = time.perf_counter()
+        retval = func()
+        seconds = time.perf_counter() - start
+
+        # Tracing memory allocations slows down the function considerably
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            func()
+            peak_mem = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        unit = "MB" if size_bytes else "ops"
+        res = BenchmarkResult(
+            name=name,
+            amount=size_bytes / 1024 / 1024 if size_bytes else ops,
+            unit=unit,
+            seconds=seconds,
+            peak_mem_mb=peak_mem / 1024 / 1024,
+            reference_per_s=self.reference_per_s.get(unit, 0.0),
+        )
+        self.results.append(res)
+        relative = f" ({res.relative_per_s:.3f} of reference)" if res.relative_per_s else ""
+        LOGGER.info(
+            f"{res.name}: {res.amount:.0f} {res.unit} in {res.seconds:.2f} s, "
+            f"{res.per_s:.1f} {res.unit}/s{relative}, peak memory {res.peak_mem_mb:.2f} MB"
+        )
+
+        if not UPDATE_BASELINE:
+            errors = _check_regression(res=res, baseline=self.baseline)
+            assert not errors, "\n".join(errors)
+
+        return retval
@@ -0,0 +1,42 @@
+"""Benchmarks of the framework code.
+
+The benchmarks run only when the `RUN_BENCHMARKS` env variable is set, e.g.
+
+    RUN_BENCHMARKS=1 pytest -s framework_tests/benchmarks
+
+Results are compared to the baseline stored in `baseline.json`. Throughput is compared
+relative to a reference implementation measured on the same machine, e.g. a naive search of
+the same log files, as absolute numbers depend on the machine. Relative throughput can be
+lower and peak memory higher by `BENCHMARK_TOLERANCE` (default: 0.3). Set
+`UPDATE_BENCHMARK_BASELINE` to store the results as the new baseline instead.
+"""
+
+import pathlib as pl
+import typing as tp
+
+import pytest
+
+from cardano_node_tests.utils import helpers
+from framework_tests.benchmarks import bench_utils
+
+BENCHMARKS_DIR = pl.Path(__file__).parent
+
+RUN_BENCHMARKS = helpers.is_truthy_env_var("RUN_BENCHMARKS")
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    if RUN_BENCHMARKS:
+        return
+
+    skip = pytest.mark.skip(reason="set `RUN_BENCHMARKS=1` to run benchmarks")
+    for item in items:
+        if BENCHMARKS_DIR in item.path.parents:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def benchmark() -> tp.Generator[bench_utils.Benchmark]:
+    bench = bench_utils.Benchmark(baseline=bench_utils.load_baseline())
+    yield bench
+    if bench_utils.UPDATE_BASELINE and bench.results:
+        bench_utils.save_baseline(results=bench.results)
@@ -0,0 +1,57 @@
+"""Benchmarks of db-sync queries.
+
+Need a running cluster instance with db-sync, i.e. `CARDANO_NODE_SOCKET_PATH` and the `PG*`
+and `DBSYNC_*` env variables set as for the tests. The most recent `BENCHMARK_DBSYNC_TXS`
+(default: 200) transactions are queried.
+"""
+
+import dataclasses
+import os
+import typing as tp
+
+import pytest
+
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import dbsync_queries
+from cardano_node_tests.utils import dbsync_types
+from cardano_node_tests.utils import dbsync_utils
+from framework_tests.benchmarks import bench_utils
+
+NUM_TXS = int(os.environ.get("BENCHMARK_DBSYNC_TXS") or 200)
+
+pytestmark = pytest.mark.skipif(not configuration.HAS_DBSYNC, reason="db-sync is not available")
+
+
+@pytest.fixture(scope="module")
+def txhashes() -> list[str]:
+    query = "SELECT encode(hash, 'hex') FROM tx ORDER BY id DESC LIMIT %s;"
+    with dbsync_queries.execute(name="bench_txhashes", query=query, vars=(NUM_TXS,)) as cur:
+        return [r[0] for r in cur.fetchall()]
+
+
+def _normalize(record: dbsync_types.TxRecord) -> dbsync_types.TxRecord:
+    """Make the records returned by different query paths comparable."""
+    # The order of the records from the multi-query path is not defined
+    fields: dict[str, tp.Any] = {
+        f.name: sorted(getattr(record, f.name), key=repr)
+        for f in dataclasses.fields(record)
+        if isinstance(getattr(record, f.name), list)
+    }
+    # The minting records are not tied to any output, so the output index is not relevant
+    fields["mint"] = sorted((dataclasses.replace(r, utxo_ix=0) for r in record.mint), key=repr)
+    return dataclasses.replace(record, **fields)
+
+
+def test_get_tx_record(benchmark: bench_utils.Benchmark, txhashes: list[str]):
+    multi_query = benchmark(
+        "dbsync_utils.get_tx_record[multi_query]",
+        lambda: [dbsync_utils.get_tx_record_multi_query(txhash=h) for h in txhashes],
+        ops=len(txhashes),
+    )
+    single_query = benchmark(
+        "dbsync_utils.get_tx_record[single_query]",
+        lambda: [dbsync_utils.get_tx_record(txhash=h) for h in txhashes],
+        ops=len(txhashes),
+    )
+
+    assert [_normalize(r) for r in single_query] == [_normalize(r) for r in multi_query]
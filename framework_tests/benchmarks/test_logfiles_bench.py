@@ -0,0 +1,314 @@
+"""Benchmarks of searching cluster log files.
+
+Synthetic node, db-sync and supervisord logs are generated once per session. The total size is
+set by the `BENCHMARK_LOGS_MB` env variable (default: 256), e.g. `BENCHMARK_LOGS_MB=4096`
+for multi-GB logs.
+"""
+
+import dataclasses
+import os
+import pathlib as pl
+import random
+import time
+import typing as tp
+
+import pytest
+
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import logfiles
+from framework_tests.benchmarks import bench_utils
+
+LOGS_SIZE = int(os.environ.get("BENCHMARK_LOGS_MB") or 256) * 1024 * 1024
+# Logs are written in blocks of lines, the same blocks are repeated
+BLOCK_LINES = 20_000
+NUM_BLOCKS_VARIANTS = 4
+
+NODE_LOGS_SHARE = {
+    "bft1.stdout.1": 0.25,
+    "bft1.stdout": 0.2,
+    "pool1.stdout": 0.2,
+    "pool2.stdout": 0.15,
+}
+DBSYNC_LOGS_SHARE = {"dbsync.stdout": 0.15}
+SUPERVISORD_LOGS_SHARE = {"supervisord.log": 0.05}
+
+END_MARKER = "Benchmark end marker"
+
+TS = "[2024-01-01 00:00:00.00 UTC]"
+NODE_LINES = [
+    # Common records
+    "[{host}:cardano.node.ChainDB:Info:{thread}] {ts} Chain extended, new tip: {hash} at slot {n}",
+    "[{host}:cardano.node.ChainDB:Info:{thread}] {ts} Valid candidate {hash} at slot {n}",
+    "[{host}:cardano.node.BlockFetch.Client:Debug:{thread}] {ts} CompletedBlockFetch {hash}",
+    "[{host}:cardano.node.ChainSync.Client:Info:{thread}] {ts} Rolling forward to {hash}",
+    "[{host}:cardano.node.Mempool:Info:{thread}] {ts} TraceMempoolAddedTx {hash} size {n}",
+    "[{host}:cardano.node.Forge:Info:{thread}] {ts} TraceNodeNotLeader slot {n}",
+    "[{host}:cardano.node.Forge:Info:{thread}] {ts} TraceAdoptedBlock {hash} slot {n}",
+    # Records that contain error strings and are ignored
+    "[{host}:cardano.node.ErrorPolicy:Notice:{thread}] {ts} ErrorPolicySuspendConsumer {n}s",
+    "[{host}:cardano.node.Peers:Info:{thread}] {ts} Connection Attempt Exception, failed {n}",
+    "[{host}:cardano.node.ChainSync.Remote:Info:{thread}] {ts} TraceError ExceededTimeLimit",
+    "[{host}:cardano.node.Startup:Warning:{thread}] {ts} AsyncCancelled, peer failed {n}",
+    "[{host}:cardano.node.ChainDB:Notice:{thread}] {ts} Switched to a fork, new tip {hash}",
+]
+NODE_ERRORS = [
+    "[{host}:cardano.node.ChainDB:Error:{thread}] {ts} InvalidBlock {hash} failed validation",
+    # Ignored because of the preceding "Switched to a fork" record
+    "[{host}:cardano.node.LedgerPeers:Error:{thread}] {ts} TraceNoLedgerState error",
+    # Ignored by the ignore rules added by tests
+    "[{host}:cardano.node.Mempool:Error:{thread}] {ts} ExpectedTestError failure {n}",
+    "cardano-node: Unexpected exception, failed to open database",
+]
+DBSYNC_LINES = [
+    "[db-sync-node:Info:{thread}] {ts} Insert Babbage Block: epoch 5, slot {n}, hash {hash}",
+    "[db-sync-node:Info:{thread}] {ts} Offline pool data fetch OffChainPoolFetchError {n}",
+    "[db-sync-node:Info:{thread}] {ts} Received block which is not in the db, error free {n}",
+]
+DBSYNC_ERRORS = [
+    "[db-sync-node:Error:{thread}] {ts} Database error: relation {hash} does not exist",
+    "[db-sync-node:Error:{thread}] {ts} db-sync-node could not serialize access",
+]
+SUPERVISORD_LINES = [
+    "2024-01-01 00:00:00,000 INFO success: pool{n} entered RUNNING state, process has stayed up",
+    "2024-01-01 00:00:00,000 INFO spawned: 'pool{n}' with pid {n}",
+]
+SUPERVISORD_ERRORS = ["2024-01-01 00:00:00,000 INFO exited: pool{n} (exit status 1; not expected)"]
+
+# Rules added by tests, most of them don't apply or are expired
+IGNORE_RULES = [
+    ("bft*.stdout", "ExpectedTestError"),
+    ("pool*.stdout", "ExpectedTestError"),
+    *((f"pool{i}.stdout", f"Ignored error {i}") for i in range(20)),
+    *(("*.stdout", rf"TraceError.*Code{i}\b") for i in range(20)),
+]
+EXPIRED_RULES = [("*", "InvalidBlock"), ("dbsync.stdout", "Database error")]
+
+
+@dataclasses.dataclass(frozen=True)
+class GeneratedLogs:
+    state_dir: pl.Path
+    # Expected number of (not ignored) errors per log file
+    errors: dict[str, int]
+    # Number of the "TraceAdoptedBlock" records in the (rotated) "bft1.stdout" log files
+    adopted_blocks: int
+    sizes: dict[str, int]
+
+
+def _gen_block(
+    rng: random.Random, host: str, lines: list[str], errors: list[str], num_errors: int
+) -> tuple[bytes, list[str]]:
+    """Generate block of log lines, return the block and the error lines that it contains."""
+    block = [
+        rng.choice(lines).format(
+            host=host, thread=rng.randint(1, 99), ts=TS, hash=rng.randbytes(8).hex(), n=i
+        )
+        for i in range(BLOCK_LINES)
+    ]
+    for i in range(num_errors):
+        # Leave room for the look-back lines before the error
+        pos = rng.randrange(logfiles.ERRORS_LOOK_BACK_LINES, len(block))
+        block.insert(
+            pos,
+            errors[i % len(errors)].format(
+                host=host, thread=rng.randint(1, 99), ts=TS, hash=rng.randbytes(8).hex(), n=i
+            ),
+        )
+    return ("\n".join(block) + "\n").encode(), block
+
+
+def _write_log(
+    logfile: pl.Path,
+    size: int,
+    rng: random.Random,
+    lines: list[str],
+    errors: list[str],
+    is_error: tp.Callable[[list[str], int], bool],
+) -> tuple[int, int]:
+    """Write log file of (at least) the given size.
+
+    Return the number of error lines and the number of "TraceAdoptedBlock" records in the log.
+    """
+    variants = []
+    for __ in range(NUM_BLOCKS_VARIANTS):
+        block_b, block = _gen_block(
+            rng=rng, host=logfile.name.split(".")[0], lines=lines, errors=errors, num_errors=8
+        )
+        num_errors = sum(is_error(block, i) for i in range(len(block)))
+        num_adopted = sum("TraceAdoptedBlock" in ln for ln in block)
+        variants.append((block_b, num_errors, num_adopted))
+
+    total_errors = total_adopted = written = 0
+    with open(logfile, "wb") as out_fp:
+        while written < size:
+            block_b, num_errors, num_adopted = rng.choice(variants)
+            out_fp.write(block_b)
+            written += len(block_b)
+            total_errors += num_errors
+            total_adopted += num_adopted
+        out_fp.write(f"{END_MARKER}\n".encode())
+
+    return total_errors, total_adopted
+
+
+def _is_node_error(block: list[str], idx: int) -> bool:
+    line = block[idx]
+    if "Error:" not in line and "cardano-node:" not in line:
+        return False
+    if "ExpectedTestError" in line:
+        return False
+    if "TraceNoLedgerState" in line:
+        look_back = block[max(idx - logfiles.ERRORS_LOOK_BACK_LINES, 0) : idx]
+        return not any("Switched to a fork" in ln for ln in look_back)
+    return True
+
+
+def _is_dbsync_error(block: list[str], idx: int) -> bool:
+    return "Database error" in block[idx]
+
+
+def _is_supervisord_error(block: list[str], idx: int) -> bool:
+    return "not expected" in block[idx]
+
+
+@pytest.fixture(scope="session")
+def generated_logs(tmp_path_factory: pytest.TempPathFactory) -> tp.Generator[GeneratedLogs]:
+    state_dir = tmp_path_factory.mktemp("logs_bench") / "state-cluster7"
+    state_dir.mkdir()
+    rng = random.Random(42)
+
+    errors: dict[str, int] = {}
+    sizes: dict[str, int] = {}
+    adopted_blocks = 0
+    specs = (
+        (NODE_LOGS_SHARE, NODE_LINES, NODE_ERRORS, _is_node_error),
+        (DBSYNC_LOGS_SHARE, DBSYNC_LINES, DBSYNC_ERRORS, _is_dbsync_error),
+        (SUPERVISORD_LOGS_SHARE, SUPERVISORD_LINES, SUPERVISORD_ERRORS, _is_supervisord_error),
+    )
+    for shares, lines, errs, is_error in specs:
+        for fname, share in shares.items():
+            logfile = state_dir / fname
+            num_errors, num_adopted = _write_log(
+                logfile=logfile,
+                size=int(LOGS_SIZE * share),
+                rng=rng,
+                lines=lines,
+                errors=errs,
+                is_error=is_error,
+            )
+            errors[fname] = num_errors
+            sizes[fname] = logfile.stat().st_size
+            if fname.startswith("bft1.stdout"):
+                adopted_blocks += num_adopted
+
+    # The rotated log file is older than the "live" one
+    rotated_time = time.time() - 60
+    os.utime(state_dir / "bft1.stdout.1", (rotated_time, rotated_time))
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("CARDANO_NODE_SOCKET_PATH", str(state_dir / "bft1.socket"))
+        for i, (files_glob, regex) in enumerate(IGNORE_RULES):
+            logfiles.add_ignore_rule(files_glob=files_glob, regex=regex, ignore_file_id=f"gw{i}")
+        for i, (files_glob, regex) in enumerate(EXPIRED_RULES):
+            logfiles.add_ignore_rule(
+                files_glob=files_glob, regex=regex, ignore_file_id=f"expired{i}", skip_after=1.0
+            )
+        yield GeneratedLogs(
+            state_dir=state_dir, errors=errors, adopted_blocks=adopted_blocks, sizes=sizes
+        )
+
+    if logfiles._get_search_pool.cache_info().currsize:
+        logfiles._get_search_pool().shutdown()
+        logfiles._get_search_pool.cache_clear()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def reference_search(benchmark: bench_utils.Benchmark, generated_logs: GeneratedLogs) -> None:
+    """Measure throughput of a naive line-by-line search of all the log files."""
+
+    def _search() -> int:
+        found = 0
+        for fname in generated_logs.sizes:
+            with open(generated_logs.state_dir / fname, encoding="utf-8") as in_fp:
+                found += sum(1 for line in in_fp if "rror" in line)
+        return found
+
+    benchmark.measure_reference(func=_search, size_bytes=sum(generated_logs.sizes.values()))
+
+
+def _reset_search(state_dir: pl.Path) -> None:
+    """Forget about the previous searches of the log files."""
+    for offset_file in state_dir.glob(".*.offset"):
+        offset_file.unlink()
+    (state_dir / logfiles.ERRORS_INDEX_FILE_NAME).unlink(missing_ok=True)
+
+
+def _count_errors(errors: list[tuple[pl.Path, str]]) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for logfile, __ in errors:
+        counts[logfile.name] = counts.get(logfile.name, 0) + 1
+    return counts
+
+
+@pytest.mark.parametrize("structured", [False, True], ids=["substring", "structured"])
+def test_search_cluster_logs(
+    benchmark: bench_utils.Benchmark,
+    generated_logs: GeneratedLogs,
+    monkeypatch: pytest.MonkeyPatch,
+    structured: bool,
+):
+    monkeypatch.setattr(configuration, "LOGS_STRUCTURED_CHECK", structured)
+    cluster_logs = [f for f in generated_logs.sizes if ".std" in f]
+
+    errors = benchmark(
+        f"logfiles.search_cluster_logs[{'structured' if structured else 'substring'}]",
+        logfiles.search_cluster_logs,
+        size_bytes=sum(generated_logs.sizes[f] for f in cluster_logs),
+        setup=lambda: _reset_search(state_dir=generated_logs.state_dir),
+    )
+
+    expected = {f: generated_logs.errors[f] for f in cluster_logs}
+    assert _count_errors(errors=errors) == {f: n for f, n in expected.items() if n}
+
+
+def test_search_supervisord_logs(benchmark: bench_utils.Benchmark, generated_logs: GeneratedLogs):
+    errors = benchmark(
+        "logfiles.search_supervisord_logs",
+        logfiles.search_supervisord_logs,
+        size_bytes=generated_logs.sizes["supervisord.log"],
+        setup=lambda: _reset_search(state_dir=generated_logs.state_dir),
+    )
+    assert len(errors) == generated_logs.errors["supervisord.log"]
+
+
+def test_find_msgs_in_logs(benchmark: bench_utils.Benchmark, generated_logs: GeneratedLogs):
+    lines_found = benchmark(
+        "logfiles.find_msgs_in_logs",
+        lambda: logfiles.find_msgs_in_logs(
+            regex=r"TraceAdoptedBlock [0-9a-f]+ slot",
+            logfile=generated_logs.state_dir / "bft1.stdout",
+            seek_offset=0,
+            timestamp=0.0,
+        ),
+        size_bytes=generated_logs.sizes["bft1.stdout"] + generated_logs.sizes["bft1.stdout.1"],
+    )
+    assert len(lines_found) == generated_logs.adopted_blocks
+
+
+def test_check_msgs_presence_in_logs(
+    benchmark: bench_utils.Benchmark, generated_logs: GeneratedLogs
+):
+    state_dir = generated_logs.state_dir
+    logs = ("pool1.stdout", "pool2.stdout", "dbsync.stdout")
+
+    # The searched messages are at the end of the log files
+    errors = benchmark(
+        "logfiles.check_msgs_presence_in_logs",
+        lambda: logfiles.check_msgs_presence_in_logs(
+            regex_pairs=[("pool*.stdout", END_MARKER), ("dbsync.stdout", END_MARKER)],
+            seek_offsets={str(state_dir / f): 0 for f in logs},
+            state_dir=state_dir,
+            timestamp=0.0,
+        ),
+        size_bytes=sum(generated_logs.sizes[f] for f in logs),
+    )
+    assert not errors
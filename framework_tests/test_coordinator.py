@@ -0,0 +1,92 @@
+import threading
+import time
+import typing as tp
+
+import pytest
+
+from cardano_node_tests.cluster_management import coordinator
+from cardano_node_tests.cluster_management import status_files
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import temptools
+
+
+@pytest.fixture
+def coordinator_server(tmp_path) -> tp.Generator[coordinator.CoordinatorServer]:
+    server = coordinator.CoordinatorServer(socket_path=tmp_path / "coord.sock")
+    server.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def coordinator_backend(coordinator_server, tmp_path, monkeypatch) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    backend = coordinator.CoordinatorBackend(
+        root=root,
+        client=coordinator.CoordinatorClient(socket_path=str(coordinator_server.socket_path)),
+    )
+    monkeypatch.setattr(temptools.PytestTempDirs, "pytest_root_tmp", root)
+    monkeypatch.setattr(configuration, "STATUS_BACKEND", "coordinator")
+    monkeypatch.setattr(coordinator, "get_backend", lambda **__: backend)
+
+
+class TestCoordinator:
+    def test_fifo_lock(self, coordinator_server):
+        socket_path = str(coordinator_server.socket_path)
+        holder = coordinator.CoordinatorClient(socket_path=socket_path)
+        order = []
+
+        def _worker(num: int) -> None:
+            client = coordinator.CoordinatorClient(socket_path=socket_path)
+            with client.lock():
+                order.append(num)
+
+        with holder.lock():
+            threads = []
+            for num in range(5):
+                t = threading.Thread(target=_worker, args=(num,))
+                t.start()
+                threads.append(t)
+                # Make sure the workers are queued in known order
+                while holder.request("stats")["max_waiters"] < num + 1:
+                    time.sleep(0.01)
+
+        for t in threads:
+            t.join(timeout=10)
+
+        assert order == [0, 1, 2, 3, 4]
+        stats = holder.request("stats")
+        assert stats["lock_acquisitions"] == 6
+
+    def test_lock_released_on_disconnect(self, coordinator_server):
+        socket_path = str(coordinator_server.socket_path)
+        client1 = coordinator.CoordinatorClient(socket_path=socket_path)
+        client1.request("lock")
+        client1.close()
+
+        client2 = coordinator.CoordinatorClient(socket_path=socket_path)
+        with client2.lock():
+            pass
+
+    @pytest.mark.usefixtures("coordinator_backend")
+    def test_status_files(self):
+        status_files.create_test_running_file(instance_num=0, worker_id="gw0", test_id="test_a")
+        status_files.create_resource_locked_files(
+            instance_num=0, worker_id="gw0", lock_names=["node-pool1"]
+        )
+        status_files.create_prio_in_progress_file(worker_id="gw1")
+
+        assert status_files.get_test_names(instance_num=0) == ["test_a"]
+        assert len(status_files.list_prio_in_progress_files()) == 1
+
+        with status_files.cached_reads():
+            status_files.rm_test_running_files(instance_num=0, worker_id="gw0")
+            assert not status_files.list_test_running_files()
+            locked = status_files.get_resources_from_path(
+                paths=status_files.list_resource_locked_files(instance_num=0)
+            )
+            assert locked == ["node-pool1"]
+
+        assert not status_files.get_test_names()
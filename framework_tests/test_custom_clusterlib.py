@@ -0,0 +1,315 @@
+import json
+import pathlib as pl
+import threading
+import time
+import types
+import typing as tp
+
+import pytest
+from cardano_clusterlib import clusterlib
+
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import custom_clusterlib
+from cardano_node_tests.utils import tip_follower
+
+
+class TestQueryCache:
+    @pytest.fixture
+    def cluster_obj(
+        self, tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> custom_clusterlib.ClusterLib:
+        # Avoid the constructor, it needs genesis files of a running cluster
+        cluster_obj = custom_clusterlib.ClusterLib.__new__(custom_clusterlib.ClusterLib)
+        cluster_obj.cli_coverage = {}
+        cluster_obj._cli_command = "cardano-cli"
+        cluster_obj.command_era = "latest"
+        cluster_obj.magic_args = ["--testnet-magic", "42"]
+        cluster_obj.socket_args = []
+        cluster_obj.slot_length = 0.2
+        cluster_obj.pparams_file = tmp_path / "pparams.json"
+        cluster_obj._query_group = None
+        cluster_obj._transaction_group = None
+        cluster_obj.query_cache = custom_clusterlib.QueryCache(enabled=True)
+        cluster_obj.socket_path = tmp_path / "missing.socket"
+        cluster_obj.network_magic = 42
+        cluster_obj._lsq_client = None
+        cluster_obj.native_verified = set()
+        cluster_obj.native_mismatches = 0
+        cluster_obj._slots_offset = 0
+        cluster_obj.cli_latency = {}
+        cluster_obj._cli_latency_lock = threading.Lock()
+        cluster_obj._executor = None
+
+        self.tip: dict[str, tp.Any] = {"block": 10, "epoch": 1, "era": "Conway", "slot": 100}
+        self.now = 100.1
+        self.calls: list[str] = []
+
+        def _cli(_self: clusterlib.ClusterLib, cli_args: list[str], **__: object) -> object:
+            cmd = cli_args[2:4]
+            self.calls.append(cmd[1])
+            if cmd == ["query", "tip"]:
+                out = json.dumps(self.tip)
+            elif cmd == ["query", "utxo"]:
+                out = json.dumps(
+                    {f"{'aa' * 32}#0": {"address": "addr_test1", "value": {"lovelace": 5}}}
+                )
+            elif cmd == ["query", "protocol-parameters"]:
+                cluster_obj.pparams_file.write_text(json.dumps({"stakeAddressDeposit": 2}))
+                out = ""
+            else:
+                out = ""
+            return clusterlib.CLIOut(stdout=out.encode(), stderr=b"")
+
+        monkeypatch.setattr(clusterlib.ClusterLib, "cli", _cli)
+        monkeypatch.setattr(custom_clusterlib.time, "time", lambda: self.now)
+        return cluster_obj
+
+    def _follow_tip(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Publish the current tip as if it was queried by the tip follower just now."""
+
+        def _get_tip(*, since: float = 0.0) -> tip_follower.FeedTip:
+            assert since <= self.now
+            return tip_follower.FeedTip(
+                slot=self.tip["slot"],
+                block=self.tip["block"],
+                epoch=self.tip["epoch"],
+                sync_progress=None,
+                queried=self.now,
+            )
+
+        monkeypatch.setattr(configuration, "TIP_FOLLOWER", True)
+        monkeypatch.setattr(
+            tip_follower, "get_feed", lambda **__: types.SimpleNamespace(get_tip=_get_tip)
+        )
+
+    def test_block_scope(
+        self, cluster_obj: custom_clusterlib.ClusterLib, monkeypatch: pytest.MonkeyPatch
+    ):
+        self._follow_tip(monkeypatch)
+        for __ in range(3):
+            assert cluster_obj.g_query.get_address_balance(address="addr_test1") == 5
+            assert cluster_obj.g_query.get_tip()["block"] == 10
+        assert self.calls == ["utxo", "tip"]
+
+        # New block, the UTxO and the tip are queried again
+        self.tip = {**self.tip, "block": 11}
+        self.now += cluster_obj.slot_length
+        cluster_obj.g_query.get_utxo(address="addr_test1")
+        cluster_obj.g_query.get_tip()
+        assert self.calls == ["utxo", "tip", "utxo", "tip"]
+
+        # Different query arguments
+        cluster_obj.g_query.get_utxo(address="addr_test2")
+        assert self.calls[-1] == "utxo"
+
+        assert cluster_obj.query_cache.stats["utxo"] == custom_clusterlib.QueryCacheStats(
+            hits=2, misses=3
+        )
+
+    def test_no_tip_follower(self, cluster_obj: custom_clusterlib.ClusterLib):
+        # Without the shared tip, finding out the current block costs as much as the query itself
+        for __ in range(2):
+            cluster_obj.g_query.get_utxo(address="addr_test1")
+            cluster_obj.g_query.get_tip()
+        assert self.calls == ["utxo", "tip", "utxo", "tip"]
+        assert not cluster_obj.query_cache.stats
+
+    def test_epoch_scope(self, cluster_obj: custom_clusterlib.ClusterLib):
+        assert cluster_obj.g_query.get_address_deposit() == 2
+        self.tip = {**self.tip, "block": 11}
+        self.now += cluster_obj.slot_length
+        assert cluster_obj.g_query.get_address_deposit() == 2
+        assert cluster_obj.g_query.get_era() == "Conway"
+        assert self.calls == ["tip", "protocol-parameters", "tip", "tip"]
+
+        # The output file is needed
+        cluster_obj.pparams_file.unlink()
+        assert cluster_obj.g_query.get_protocol_params() == {"stakeAddressDeposit": 2}
+        assert self.calls[-1] == "protocol-parameters"
+
+    def test_submit_invalidates(
+        self, cluster_obj: custom_clusterlib.ClusterLib, monkeypatch: pytest.MonkeyPatch
+    ):
+        self._follow_tip(monkeypatch)
+        cluster_obj.g_query.get_utxo(address="addr_test1")
+        cluster_obj.cli(["transaction", "submit", "--tx-file", "tx.signed"])
+        cluster_obj.g_query.get_utxo(address="addr_test1")
+
+        assert self.calls == ["utxo", "submit", "utxo"]
+        assert "utxo: 0/2" in cluster_obj.query_cache.get_summary()
+
+    def test_disabled(self, cluster_obj: custom_clusterlib.ClusterLib):
+        cluster_obj.query_cache.enabled = False
+        cluster_obj.g_query.get_tip()
+        cluster_obj.g_query.get_tip()
+
+        assert self.calls == ["tip", "tip"]
+        assert not cluster_obj.query_cache.stats
+
+    def test_native_fallback(
+        self, cluster_obj: custom_clusterlib.ClusterLib, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(configuration, "NATIVE_QUERIES", True)
+        cluster_obj.query_cache.enabled = False
+
+        # The node socket is not available, the CLI is used instead
+        assert cluster_obj.g_query.get_tip()["block"] == 10
+        assert cluster_obj.g_query.get_address_balance(address="addr_test1") == 5
+        assert self.calls == ["tip", "utxo"]
+        assert cluster_obj.lsq_client is cluster_obj.lsq_client
+
+    def test_native_verified(
+        self, cluster_obj: custom_clusterlib.ClusterLib, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(configuration, "NATIVE_QUERIES", True)
+        cluster_obj.query_cache.enabled = False
+        native_utxo = {f"{'aa' * 32}#0": {"address": "addr_test1", "value": {"lovelace": 5}}}
+        native_calls: list[list[str]] = []
+
+        def _get_utxo(*, addresses: list[str]) -> dict[str, dict[str, tp.Any]]:
+            native_calls.append(addresses)
+            return native_utxo
+
+        cluster_obj._lsq_client = types.SimpleNamespace(get_utxo=_get_utxo)  # type: ignore[assignment]
+
+        # The first result is checked against the CLI result
+        assert cluster_obj.g_query.get_address_balance(address="addr_test1") == 5
+        assert self.calls == ["utxo"]
+        assert cluster_obj.native_verified == {"utxo"}
+
+        # The results matched, the CLI is no longer used
+        assert cluster_obj.g_query.get_address_balance(address="addr_test1") == 5
+        assert self.calls == ["utxo"]
+        assert len(native_calls) == 2
+
+    def test_native_mismatch(
+        self, cluster_obj: custom_clusterlib.ClusterLib, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(configuration, "NATIVE_QUERIES", True)
+        cluster_obj.query_cache.enabled = False
+        native_utxo = {f"{'bb' * 32}#0": {"address": "addr_test1", "value": {"lovelace": 7}}}
+        cluster_obj._lsq_client = types.SimpleNamespace(  # type: ignore[assignment]
+            get_utxo=lambda **__: native_utxo
+        )
+
+        # The CLI result is used when the results differ
+        for __ in range(custom_clusterlib.NATIVE_MISMATCHES_LIMIT):
+            assert cluster_obj.g_query.get_address_balance(address="addr_test1") == 5
+        assert not cluster_obj.native_verified
+
+        # Too many mismatches, the native client is not used anymore
+        assert cluster_obj.lsq_client is None
+        cluster_obj.g_query.get_utxo(address="addr_test1")
+        assert self.calls == ["utxo"] * (custom_clusterlib.NATIVE_MISMATCHES_LIMIT + 1)
+
+    def test_time_to_epoch_end_stale_feed(
+        self, cluster_obj: custom_clusterlib.ClusterLib, monkeypatch: pytest.MonkeyPatch
+    ):
+        # The published tip is from the previous epoch
+        stale_tip = tip_follower.FeedTip(
+            slot=95, block=9, epoch=0, sync_progress=None, queried=self.now - 1
+        )
+
+        def _get_tip(*, since: float = 0.0) -> tip_follower.FeedTip | None:
+            return stale_tip if stale_tip.queried >= since else None
+
+        monkeypatch.setattr(configuration, "TIP_FOLLOWER", True)
+        monkeypatch.setattr(
+            tip_follower, "get_feed", lambda **__: types.SimpleNamespace(get_tip=_get_tip)
+        )
+        cluster_obj.epoch_length = 100
+
+        # The tip is queried from the node
+        assert cluster_obj.time_to_epoch_end() == pytest.approx(101 * cluster_obj.slot_length)
+        assert self.calls == ["tip"]
+
+        # A fresh published tip is used
+        stale_tip = stale_tip._replace(slot=150, epoch=1, queried=self.now)
+        assert cluster_obj.time_to_epoch_end() == pytest.approx(51 * cluster_obj.slot_length)
+        assert self.calls == ["tip"]
+
+
+def test_command_name():
+    assert custom_clusterlib.get_command_name(cli_args=["query", "utxo", "--address", "addr"]) == (
+        "query utxo"
+    )
+    assert (
+        custom_clusterlib.get_command_name(cli_args=["transaction", "build-raw", "--fee", "0"])
+        == "transaction build-raw"
+    )
+
+
+def test_latency_histogram():
+    latency = custom_clusterlib.CLILatency()
+    latency.add(duration=0.01, queued=0.0)
+    latency.add(duration=0.3, queued=0.2)
+    latency.add(duration=100.0, queued=0.0)
+
+    latency_dict = latency.as_dict()
+    assert latency_dict["count"] == 3
+    assert latency_dict["max_sec"] == 100.0
+    assert latency_dict["queued_sec"] == 0.2
+    assert latency_dict["histogram"]["<=0.05s"] == 1
+    assert latency_dict["histogram"]["<=0.5s"] == 1
+    assert latency_dict["histogram"][">60.0s"] == 1
+    assert sum(latency_dict["histogram"].values()) == 3
+
+
+class TestSocketConcurrency:
+    @pytest.fixture
+    def cluster_obj(
+        self, tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> custom_clusterlib.ClusterLib:
+        monkeypatch.setattr(configuration, "CLI_SOCKET_CONCURRENCY", 2)
+        monkeypatch.setattr(custom_clusterlib, "_SOCKET_SEMAPHORES", {})
+
+        cluster_obj = custom_clusterlib.ClusterLib.__new__(custom_clusterlib.ClusterLib)
+        cluster_obj.cli_coverage = {}
+        cluster_obj._cli_command = "cardano-cli"
+        cluster_obj.command_era = "latest"
+        cluster_obj.socket_path = tmp_path / "node.socket"
+        cluster_obj.query_cache = custom_clusterlib.QueryCache(enabled=False)
+        cluster_obj.cli_latency = {}
+        cluster_obj._cli_latency_lock = threading.Lock()
+        cluster_obj._executor = None
+
+        self.running = 0
+        self.max_running: dict[str, int] = {}
+        lock = threading.Lock()
+
+        def _cli(_self: clusterlib.ClusterLib, cli_args: list[str], **__: object) -> object:
+            cmd = cli_args[2]
+            with lock:
+                self.running += 1
+                self.max_running[cmd] = max(self.max_running.get(cmd, 0), self.running)
+            time.sleep(0.05)
+            with lock:
+                self.running -= 1
+            return clusterlib.CLIOut(stdout=b"", stderr=b"")
+
+        monkeypatch.setattr(clusterlib.ClusterLib, "cli", _cli)
+        return cluster_obj
+
+    def test_limit(self, cluster_obj: custom_clusterlib.ClusterLib):
+        futures = [
+            cluster_obj.submit(cluster_obj.cli, ["query", "tip", "--testnet-magic", "42"])
+            for __ in range(6)
+        ]
+        for f in futures:
+            assert f.result().stdout == b""
+        assert self.max_running["query"] == 2
+
+        latency = cluster_obj.cli_latency["query tip"]
+        assert latency.count == 6
+        # Some of the calls needed to wait for a free connection
+        assert latency.queued_sec > 0
+
+    def test_offline_not_limited(self, cluster_obj: custom_clusterlib.ClusterLib):
+        futures = [
+            cluster_obj.submit(cluster_obj.cli, ["address", "build", "--testnet-magic", "42"])
+            for __ in range(4)
+        ]
+        for f in futures:
+            f.result()
+        assert self.max_running["address"] > 2
+        assert cluster_obj.cli_latency["address build"].queued_sec < 0.01
@@ -0,0 +1,127 @@
+import contextlib
+import typing as tp
+
+import pytest
+
+from cardano_node_tests.utils import dbsync_conn
+from cardano_node_tests.utils import dbsync_queries
+
+
+class _Cursor:
+    def __init__(self, conn: "_Connection", name: str | None) -> None:
+        self.conn = conn
+        self.name = name
+        self.closed = False
+
+    def __enter__(self) -> "_Cursor":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.closed = True
+
+    def execute(self, query: str, vars: tp.Sequence = ()) -> None:
+        self.conn.executed.append((query, vars))
+
+    def fetchone(self) -> None:
+        return None
+
+    def fetchmany(self, size: int) -> list[tuple]:
+        self.conn.fetched.append(size)
+        rows, self.conn.rows = self.conn.rows[:size], self.conn.rows[size:]
+        return rows
+
+
+class _Connection:
+    def __init__(self) -> None:
+        self.prepared: set[str] = set()
+        self.executed: list[tuple[str, tp.Sequence]] = []
+        self.rows: list[tuple] = []
+        self.fetched: list[int] = []
+        self.cursors: list[_Cursor] = []
+        self.autocommit = True
+        self.closed = 0
+        self.rolled_back = False
+
+    def cursor(self, name: str | None = None) -> _Cursor:
+        cur = _Cursor(conn=self, name=name)
+        self.cursors.append(cur)
+        return cur
+
+    def rollback(self) -> None:
+        assert not self.autocommit
+        self.rolled_back = True
+
+
+@pytest.fixture
+def fake_conn(monkeypatch: pytest.MonkeyPatch) -> _Connection:
+    conn = _Connection()
+
+    @contextlib.contextmanager
+    def _connection() -> tp.Iterator[_Connection]:
+        yield conn
+
+    monkeypatch.setattr(dbsync_conn, "connection", _connection)
+    monkeypatch.setattr(dbsync_queries, "_QUERY_STATS", {})
+    return conn
+
+
+def test_to_positional():
+    query = "SELECT * FROM t WHERE a = %s AND b LIKE 'x%%' AND c BETWEEN %s AND %s;"
+    assert (
+        dbsync_queries._to_positional(query)
+        == "SELECT * FROM t WHERE a = $1 AND b LIKE 'x%' AND c BETWEEN $2 AND $3;"
+    )
+
+
+def test_prepared_query(fake_conn: _Connection):
+    assert not list(dbsync_queries.query_txs_full(txhashes=["ab"]))
+    assert not list(dbsync_queries.query_txs_full(txhashes=["cd", "ef"]))
+
+    prepare, *executes = fake_conn.executed
+    assert prepare[0].startswith("PREPARE dbsync_query_txs_full AS WITH t AS")
+    assert "hash = ANY($1)" in prepare[0]
+    # The statement is prepared only once per connection
+    assert executes == [
+        ("EXECUTE dbsync_query_txs_full (%s);", ([b"\xab"],)),
+        ("EXECUTE dbsync_query_txs_full (%s);", ([b"\xcd", b"\xef"],)),
+    ]
+    assert dbsync_queries.get_query_stats()["query_txs_full"].count == 2
+
+
+def test_pool_timeout():
+    pool = dbsync_conn.ConnectionPool(instance_num=0, maxconn=1)
+    pool._used = 1
+    with pytest.raises(TimeoutError, match="all 1 connections are in use"):
+        pool.getconn(timeout=0.1)
+
+
+class TestStreamRows:
+    def _rows(self, num: int) -> list[tuple]:
+        return [(i, 1, i, 0, i, i - 1, 0, 10, 0, None) for i in range(num)]
+
+    def test_batches(self, fake_conn: _Connection, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(dbsync_queries, "STREAM_BATCH_SIZE", 2)
+        fake_conn.rows = self._rows(5)
+
+        blocks = list(dbsync_queries.query_blocks(epoch_from=1))
+
+        assert [b.block_no for b in blocks] == list(range(5))
+        assert blocks[0] == dbsync_queries.BlockDBRow(0, 1, 0, 0, 0, -1, 0, 10, 0, None)
+        assert fake_conn.fetched == [2, 2, 2, 2]
+        assert str(fake_conn.cursors[0].name).startswith("dbsync_query_blocks_")
+        assert fake_conn.cursors[0].closed
+        assert fake_conn.rolled_back
+        assert fake_conn.autocommit
+        assert dbsync_queries.get_query_stats()["query_blocks"].count == 1
+
+    def test_stop_early(self, fake_conn: _Connection, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(dbsync_queries, "STREAM_BATCH_SIZE", 2)
+        fake_conn.rows = self._rows(5)
+
+        assert next(dbsync_queries.query_blocks()).block_no == 0
+
+        # Only the first batch was fetched, the transaction was ended when the generator
+        # was garbage collected
+        assert fake_conn.fetched == [2]
+        assert fake_conn.cursors[0].closed
+        assert fake_conn.autocommit
@@ -0,0 +1,240 @@
+import dataclasses
+import decimal
+import pathlib as pl
+import types
+
+import pytest
+from cardano_clusterlib import clusterlib
+
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import dbsync_check_tx
+from cardano_node_tests.utils import dbsync_queries
+from cardano_node_tests.utils import dbsync_types
+from cardano_node_tests.utils import dbsync_utils
+
+TXHASH = "aa" * 32
+IN_TXHASH = "bb" * 32
+
+
+def _get_tx_row() -> dbsync_queries.TxFullDBRow:
+    return dbsync_queries.TxFullDBRow(
+        tx_id=10,
+        tx_hash=TXHASH,
+        block_id=5,
+        block_index=0,
+        out_sum=decimal.Decimal(3_000_000),
+        fee=decimal.Decimal(200_000),
+        deposit=0,
+        size=400,
+        invalid_before=None,
+        invalid_hereafter=decimal.Decimal(1000),
+        treasury_donation=0,
+        txouts=[
+            {
+                "id": 1,
+                "index": 0,
+                "address": "addr_test1",
+                "value": 2_000_000,
+                "data_hash": "cc" * 32,
+                "inline_datum_hash": None,
+                "reference_script_hash": None,
+            },
+            {
+                "id": 2,
+                "index": 1,
+                "address": "addr_test2",
+                "value": 1_000_000,
+                "data_hash": None,
+                "inline_datum_hash": None,
+                "reference_script_hash": "dd" * 28,
+            },
+        ],
+        ma_txouts=[
+            {
+                "id": 7,
+                "index": 0,
+                "address": "addr_test1",
+                "data_hash": "cc" * 32,
+                "policy": "ee" * 28,
+                "name": "746f6b656e",
+                "quantity": 5,
+            }
+        ],
+        mint=[{"policy": "ee" * 28, "name": "746f6b656e", "quantity": 5}],
+        inputs=[
+            {
+                "kind": "txin",
+                "in_id": 1,
+                "id": 3,
+                "index": 2,
+                "address": "addr_test3",
+                "value": 3_200_000,
+                "utxo_hash": IN_TXHASH,
+                "reference_script_hash": None,
+                "assets": [{"id": 8, "policy": "ff" * 28, "name": "", "quantity": 1}],
+            },
+            {
+                "kind": "collateral",
+                "in_id": 1,
+                "id": 4,
+                "index": 3,
+                "address": "addr_test3",
+                "value": 5_000_000,
+                "utxo_hash": IN_TXHASH,
+                "reference_script_hash": None,
+                "assets": None,
+            },
+        ],
+        collateral_outputs=None,
+        scripts=[{"hash": "dd" * 28, "type": "plutusV2", "serialised_size": None}],
+        redeemers=None,
+        metadata=[{"key": 1, "json": {"msg": "hi"}, "bytes": "a1"}],
+        reserve=None,
+        treasury=None,
+        pot_transfers=None,
+        stake_registration=["stake_test1"],
+        stake_deregistration=None,
+        stake_delegation=[
+            {"address": "stake_test1", "pool_id": "pool1", "active_epoch_no": 3},
+            {"address": "stake_test1", "pool_id": None, "active_epoch_no": None},
+        ],
+        withdrawals=[{"address": "stake_test2", "amount": 100}],
+        extra_key_witness=None,
+    )
+
+
+class TestGetTxRecord:
+    def test_single_query(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(dbsync_queries, "query_tx_full", lambda **__: _get_tx_row())
+
+        record = dbsync_utils.get_tx_record(txhash=TXHASH)
+
+        coin = f"{'ee' * 28}.746f6b656e"
+        assert record.txouts == [
+            dbsync_types.UTxORecord(
+                utxo_hash=TXHASH,
+                utxo_ix=0,
+                amount=2_000_000,
+                address="addr_test1",
+                datum_hash="cc" * 32,
+            ),
+            dbsync_types.UTxORecord(
+                utxo_hash=TXHASH,
+                utxo_ix=1,
+                amount=1_000_000,
+                address="addr_test2",
+                reference_script_hash="dd" * 28,
+            ),
+            dbsync_types.UTxORecord(
+                utxo_hash=TXHASH,
+                utxo_ix=0,
+                amount=5,
+                address="addr_test1",
+                coin=coin,
+                datum_hash="cc" * 32,
+            ),
+        ]
+        assert record.mint == [
+            dbsync_types.UTxORecord(utxo_hash=TXHASH, utxo_ix=0, amount=5, address="", coin=coin)
+        ]
+        assert record.txins == [
+            dbsync_types.UTxORecord(
+                utxo_hash=IN_TXHASH, utxo_ix=2, amount=3_200_000, address="addr_test3"
+            ),
+            dbsync_types.UTxORecord(
+                utxo_hash=IN_TXHASH, utxo_ix=2, amount=1, address="addr_test3", coin="ff" * 28
+            ),
+        ]
+        assert record.collaterals == [
+            dbsync_types.UTxORecord(
+                utxo_hash=IN_TXHASH, utxo_ix=3, amount=5_000_000, address="addr_test3"
+            )
+        ]
+        assert not record.reference_inputs
+        assert not record.collateral_outputs
+        assert record.scripts == [
+            dbsync_types.ScriptRecord(hash="dd" * 28, type="plutusV2", serialised_size=0)
+        ]
+        assert record.metadata == [
+            dbsync_types.MetadataRecord(key=1, json={"msg": "hi"}, bytes=memoryview(b"\xa1"))
+        ]
+        assert record.stake_registration == ["stake_test1"]
+        assert record.stake_delegation == [
+            dbsync_types.DelegationRecord(address="stake_test1", pool_id="pool1", active_epoch_no=3)
+        ]
+        assert record.withdrawals == [clusterlib.TxOut(address="stake_test2", amount=100)]
+        assert record.invalid_before is None
+        assert record.invalid_hereafter == 1000
+        assert record.out_sum == 3_000_000
+
+    def test_no_tx(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(dbsync_queries, "query_tx_full", lambda **__: None)
+
+        with pytest.raises(RuntimeError, match="No results"):
+            dbsync_utils.get_tx_record(txhash=TXHASH)
+
+
+class TestCheckTxs:
+    def test_all_errors(self, monkeypatch: pytest.MonkeyPatch):
+        txhashes = [TXHASH, IN_TXHASH]
+        cluster_obj = types.SimpleNamespace(
+            g_transaction=types.SimpleNamespace(get_txid=lambda tx_body_file: tx_body_file.name),
+            g_query=types.SimpleNamespace(get_block_no=lambda: 10),
+        )
+        tx_raw_outputs = [types.SimpleNamespace(out_file=pl.Path(h)) for h in txhashes]
+        # db-sync catches up with the node tip on the second poll, the second TX
+        # is indexed in the next block
+        last_block_nos = iter([9, 10, 10, 11])
+        queried: list[list[str]] = []
+
+        def _query_txs_full(txhashes: list[str]) -> list[dbsync_queries.TxFullDBRow]:
+            queried.append(txhashes)
+            available = txhashes if len(queried) > 1 else txhashes[:1]
+            return [dataclasses.replace(_get_tx_row(), tx_hash=h) for h in available]
+
+        monkeypatch.setattr(configuration, "HAS_DBSYNC", True)
+        monkeypatch.setattr(dbsync_utils.time, "sleep", lambda __: None)
+        monkeypatch.setattr(dbsync_queries, "query_last_block_no", lambda: next(last_block_nos))
+        monkeypatch.setattr(dbsync_queries, "query_txs_full", _query_txs_full)
+        monkeypatch.setattr(
+            dbsync_check_tx,
+            "get_tx_errors",
+            lambda response, **__: [f"check_a: {response.tx_hash}", "check_b: mismatch"],
+        )
+
+        with pytest.raises(AssertionError) as excinfo:
+            dbsync_utils.check_txs(
+                cluster_obj=cluster_obj,  # type: ignore[arg-type]
+                tx_raw_outputs=tx_raw_outputs,  # type: ignore[arg-type]
+            )
+
+        assert queried == [txhashes, [IN_TXHASH]]
+        assert str(excinfo.value).splitlines() == [
+            "db-sync data don't match for 2 of 2 TXs:",
+            *(f"{h}: {e}" for h in txhashes for e in (f"check_a: {h}", "check_b: mismatch")),
+        ]
+
+
+class TestWaitForBlock:
+    def test_wait(self, monkeypatch: pytest.MonkeyPatch):
+        last_block_nos = iter([7, 8, 8, 10])
+        monkeypatch.setattr(dbsync_utils.time, "sleep", lambda __: None)
+        monkeypatch.setattr(dbsync_queries, "query_last_block_no", lambda: next(last_block_nos))
+
+        assert dbsync_utils.wait_for_block(block_no=9) == 10
+
+    def test_stalled(self, monkeypatch: pytest.MonkeyPatch):
+        polls: list[int] = []
+
+        def _query_last_block_no() -> int:
+            polls.append(8)
+            return 8
+
+        monkeypatch.setattr(configuration, "DBSYNC_STALL_TIMEOUT", 0.0)
+        monkeypatch.setattr(dbsync_utils.time, "sleep", lambda __: None)
+        monkeypatch.setattr(dbsync_queries, "query_last_block_no", _query_last_block_no)
+
+        with pytest.raises(dbsync_utils.DbSyncStalledError, match="stuck at block 8"):
+            dbsync_utils.wait_for_block(block_no=9)
+        # Fails on the first poll that sees no progress
+        assert len(polls) == 2
@@ -0,0 +1,181 @@
+import pathlib as pl
+import threading
+import types
+
+import pytest
+from cardano_clusterlib import clusterlib
+
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import faucet
+from cardano_node_tests.utils import faucet_broker
+
+ADA = 1_000_000
+
+
+def _addr_rec(name: str) -> clusterlib.AddressRecord:
+    return clusterlib.AddressRecord(
+        address=f"addr_test1{name}",
+        vkey_file=pl.Path(f"{name}.vkey"),
+        skey_file=pl.Path(f"{name}.skey"),
+    )
+
+
+class _Cluster:
+    """Stand-in for `ClusterLib` that keeps balances of addresses."""
+
+    def __init__(self, balances: dict[str, int]) -> None:
+        self.balances = balances
+        self.txs: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self.g_transaction = types.SimpleNamespace(send_tx=self.send_tx)
+        self.g_query = types.SimpleNamespace(get_address_balance=self.get_address_balance)
+
+    def get_address_balance(self, address: str) -> int:
+        return self.balances.get(address, 0)
+
+    def send_tx(
+        self, *, src_address: str, tx_name: str, txouts: list[clusterlib.TxOut], **__: object
+    ) -> clusterlib.TxRawOutput:
+        with self._lock:
+            for t in txouts:
+                self.balances[src_address] -= t.amount
+                self.balances[t.address] = self.balances.get(t.address, 0) + t.amount
+            self.txs.append((src_address, tx_name))
+        return types.SimpleNamespace(txouts=txouts)  # type: ignore[return-value]
+
+
+@pytest.fixture(autouse=True)
+def lanes_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(faucet, "_LANE_LOCKS", {})
+    monkeypatch.setattr(faucet, "_LANE_TOP_UPS", {})
+
+
+@pytest.fixture
+def all_faucets() -> dict[str, dict]:
+    return {
+        "user1": {"payment": _addr_rec("user1")},
+        "user2": {"payment": _addr_rec("user2")},
+        faucet.get_lane_name(): {"payment": _addr_rec("lane"), "lane_amount": 100 * ADA},
+    }
+
+
+def _fund(cluster: _Cluster, all_faucets: dict[str, dict], amount: int) -> None:
+    faucet.fund_from_faucet(
+        _addr_rec("dst"),
+        cluster_obj=cluster,  # type: ignore[arg-type]
+        all_faucets=all_faucets,
+        amount=amount,
+        tx_name="test",
+        force=True,
+    )
+
+
+def _wait_for_top_up() -> None:
+    for future in faucet._LANE_TOP_UPS.values():
+        future.result(timeout=10)
+
+
+def test_lane(all_faucets: dict[str, dict]):
+    cluster = _Cluster(balances={"addr_test1user1": 1000 * ADA, "addr_test1lane": 100 * ADA})
+
+    _fund(cluster, all_faucets, amount=10 * ADA)
+    assert cluster.txs == [("addr_test1lane", "test_funding")]
+    assert cluster.balances["addr_test1dst"] == 10 * ADA
+
+
+def test_lane_top_up(all_faucets: dict[str, dict]):
+    cluster = _Cluster(
+        balances={
+            "addr_test1user1": 1000 * ADA,
+            "addr_test1user2": 1000 * ADA,
+            "addr_test1lane": 100 * ADA,
+        }
+    )
+
+    # The lane falls below the watermark
+    _fund(cluster, all_faucets, amount=80 * ADA)
+    _wait_for_top_up()
+    # The top-up runs in the background, it can be sent before the funding Tx
+    assert sorted(tx_name for __, tx_name in cluster.txs) == [
+        f"{faucet.get_lane_name()}_top_up_funding",
+        "test_funding",
+    ]
+    assert ("addr_test1lane", "test_funding") in cluster.txs
+    assert cluster.balances["addr_test1lane"] == 120 * ADA
+
+
+def test_lane_depleted(all_faucets: dict[str, dict]):
+    cluster = _Cluster(balances={"addr_test1user1": 1000 * ADA, "addr_test1user2": 1000 * ADA})
+
+    # The shared faucets are used until the lane is topped up
+    _fund(cluster, all_faucets, amount=10 * ADA)
+    _wait_for_top_up()
+    funding_srcs = [src for src, tx_name in cluster.txs if tx_name == "test_funding"]
+    assert funding_srcs in (["addr_test1user1"], ["addr_test1user2"])
+    assert cluster.balances["addr_test1dst"] == 10 * ADA
+    assert cluster.balances["addr_test1lane"] == 100 * ADA
+
+
+def test_lane_lock():
+    lane_address = "addr_test1lane_lock"
+    barrier = threading.Barrier(8)
+    lane_locks: list[threading.Lock] = []
+
+    def _get_lock() -> None:
+        barrier.wait()
+        lane_locks.append(faucet._get_lane_lock(lane_address=lane_address))
+
+    threads = [threading.Thread(target=_get_lock) for __ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # All the threads got the same lock
+    assert len({id(lock) for lock in lane_locks}) == 1
+    assert faucet._LANE_LOCKS.pop(lane_address) is lane_locks[0]
+
+
+def test_create_lanes():
+    all_faucets = {
+        "user1": {"payment": _addr_rec("user1")},
+        "user2": {"payment": _addr_rec("user2")},
+    }
+    cluster = _Cluster(balances={"addr_test1user1": 1000 * ADA, "addr_test1user2": 600 * ADA})
+    lane_records = {f"lane_gw{i}": _addr_rec(f"lane{i}") for i in range(3)}
+
+    lanes_data = faucet.create_lanes(
+        cluster_obj=cluster,  # type: ignore[arg-type]
+        all_faucets=all_faucets,
+        lane_records=lane_records,
+    )
+
+    # One Tx per "user" faucet, half of the faucet funds split among its lanes
+    assert len(cluster.txs) == 2
+    assert lanes_data["lane_gw0"]["lane_amount"] == 250 * ADA
+    assert lanes_data["lane_gw1"]["lane_amount"] == 300 * ADA
+    assert lanes_data["lane_gw2"]["lane_amount"] == 250 * ADA
+    assert cluster.balances["addr_test1lane1"] == 300 * ADA
+
+
+def test_broker_shared_tx(monkeypatch: pytest.MonkeyPatch):
+    cluster = _Cluster(balances={"addr_test1user1": 1000 * ADA})
+    requested: list[list[clusterlib.TxOut]] = []
+
+    def _fund(*, txouts: list[clusterlib.TxOut], **__: object) -> None:
+        requested.append(txouts)
+
+    monkeypatch.setattr(configuration, "FAUCET_BROKER", True)
+    monkeypatch.setattr(faucet_broker, "fund", _fund)
+
+    # The funding Tx is shared with other workers, so it is not returned
+    assert (
+        faucet.fund_from_faucet(
+            _addr_rec("dst"),
+            cluster_obj=cluster,  # type: ignore[arg-type]
+            faucet_data={"payment": _addr_rec("user1")},
+            amount=10 * ADA,
+        )
+        is None
+    )
+    assert requested == [[clusterlib.TxOut(address="addr_test1dst", amount=10 * ADA)]]
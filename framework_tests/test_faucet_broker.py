@@ -0,0 +1,126 @@
+import concurrent.futures
+import pathlib as pl
+import threading
+import time
+import types
+
+import pytest
+from cardano_clusterlib import clusterlib
+
+from cardano_node_tests.utils import faucet_broker
+from cardano_node_tests.utils import temptools
+
+
+class _Cluster:
+    """Stand-in for `ClusterLib`, a funding Tx takes a while to get into a block."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.txs: list[list[clusterlib.TxOut]] = []
+        self._lock = threading.Lock()
+        self.g_transaction = types.SimpleNamespace(send_tx=self.send_tx)
+        self.g_query = types.SimpleNamespace(get_utxo=self.get_utxo)
+
+    def send_tx(
+        self, *, txouts: list[clusterlib.TxOut], tx_name: str, **__: object
+    ) -> clusterlib.TxRawOutput:
+        if self.fail:
+            msg = "Not enough funds."
+            raise clusterlib.CLIError(msg)
+        with self._lock:
+            self.txs.append(txouts)
+        time.sleep(0.2)
+        return clusterlib.TxRawOutput(
+            txins=[],
+            txouts=txouts,
+            txouts_count=len(txouts),
+            tx_files=clusterlib.TxFiles(),
+            out_file=pl.Path(f"{tx_name}.body"),
+            fee=0,
+            build_args=[],
+        )
+
+    def get_utxo(self, *, tx_raw_output: clusterlib.TxRawOutput) -> list[clusterlib.UTXOData]:
+        return [
+            clusterlib.UTXOData(utxo_hash="ab" * 32, utxo_ix=i, amount=t.amount, address=t.address)
+            for i, t in enumerate(tx_raw_output.txouts)
+        ]
+
+
+FAUCET_DATA = {
+    "payment": clusterlib.AddressRecord(
+        address="addr_test1faucet", vkey_file=pl.Path("f.vkey"), skey_file=pl.Path("f.skey")
+    )
+}
+
+
+@pytest.fixture(autouse=True)
+def basetemp(tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(temptools, "get_basetemp", lambda: tmp_path)
+    monkeypatch.setattr(faucet_broker, "BATCH_WINDOW", 0.1)
+
+
+def _request(cluster: _Cluster, num: int) -> concurrent.futures.Future[faucet_broker.FundingResult]:
+    return faucet_broker.request_funding(
+        cluster_obj=cluster,  # type: ignore[arg-type]
+        faucet_data=FAUCET_DATA,
+        txouts=[
+            clusterlib.TxOut(address=f"addr_test1_{num}_{i}", amount=num + 1) for i in range(2)
+        ],
+        tx_name=f"req{num}",
+    )
+
+
+def test_batching(tmp_path: pl.Path):
+    cluster = _Cluster()
+    futures = [_request(cluster, num=n) for n in range(10)]
+    results = [f.result(timeout=30) for f in futures]
+
+    # All the requests were paid, with a lot less transactions than requests
+    assert sorted(t.address for tx in cluster.txs for t in tx) == sorted(
+        f"addr_test1_{n}_{i}" for n in range(10) for i in range(2)
+    )
+    assert len(cluster.txs) < 5
+
+    for n, result in enumerate(results):
+        # The whole shared funding Tx, but only the own outputs
+        assert result.tx_raw_output.txouts_count == len(result.tx_raw_output.txouts)
+        assert len(result.tx_raw_output.txouts) >= 2
+        assert {(u.address, u.amount) for u in result.utxos} == {
+            (f"addr_test1_{n}_{i}", n + 1) for i in range(2)
+        }
+
+    broker_dir = tmp_path / faucet_broker.BROKER_DIR_NAME / "addr_test1faucet"
+    assert not list(broker_dir.iterdir())
+
+
+def test_failed_batch(tmp_path: pl.Path):
+    cluster = _Cluster(fail=True)
+    futures = [_request(cluster, num=n) for n in range(4)]
+    for f in futures:
+        with pytest.raises(clusterlib.CLIError, match="Not enough funds"):
+            f.result(timeout=30)
+
+    broker_dir = tmp_path / faucet_broker.BROKER_DIR_NAME / "addr_test1faucet"
+    assert not list(broker_dir.iterdir())
+
+
+def test_crashed_payer(tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch):
+    def _crash(**__: object) -> faucet_broker.FundingResult:
+        msg = "Worker crashed."
+        raise RuntimeError(msg)
+
+    # The worker that claimed the requests crashed before it could write the results
+    monkeypatch.setattr(faucet_broker, "_pay_batch", _crash)
+    cluster = _Cluster()
+    futures = [_request(cluster, num=n) for n in range(2)]
+
+    errors = sorted(str(f.exception(timeout=30)) for f in futures)
+
+    # The claimed request of the other worker is not paid again
+    assert errors[0].startswith("Funding request '")
+    assert errors[0].endswith("' was lost.")
+    assert errors[1] == "Worker crashed."
+    assert not cluster.txs
+    broker_dir = tmp_path / faucet_broker.BROKER_DIR_NAME / "addr_test1faucet"
+    assert not list(broker_dir.glob("*.request.json"))
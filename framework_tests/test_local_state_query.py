@@ -0,0 +1,161 @@
+import json
+import pathlib as pl
+import socket
+import tempfile
+import threading
+import typing as tp
+
+import cbor2
+import pytest
+
+from cardano_node_tests.utils import local_state_query
+
+# The transcript is composed from the node-to-client protocol specification, it was not recorded
+# from a running node. Results of the client are checked against `cardano-cli` results at runtime.
+TRANSCRIPT = pl.Path(__file__).parent / "mocks" / "lsq_transcript.json"
+
+
+class _TranscriptServer:
+    """Stand-in for the node that replays a transcript of node-to-client messages.
+
+    Requests from the client are checked against the transcript. Responses are sent in two
+    segments, so the client needs to reassemble them.
+    """
+
+    def __init__(self, socket_path: pl.Path, exchanges: list[dict[str, tp.Any]]) -> None:
+        self.exchanges = exchanges
+        self.errors: list[str] = []
+        self.connections = 0
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(str(socket_path))
+        self._server.listen(1)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _recv_exact(self, conn: socket.socket, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                raise EOFError
+            data += chunk
+        return data
+
+    def _send(self, conn: socket.socket, protocol: int, payload: bytes) -> None:
+        half = len(payload) // 2
+        for chunk in (payload[:half], payload[half:]):
+            header = local_state_query._SEGMENT_HEADER.pack(0, protocol | 0x8000, len(chunk))
+            conn.sendall(header + chunk)
+
+    def _serve(self) -> None:
+        conn, __ = self._server.accept()
+        self.connections += 1
+        with conn:
+            for exchange in self.exchanges:
+                try:
+                    header = self._recv_exact(conn, local_state_query._SEGMENT_HEADER.size)
+                except EOFError:
+                    self.errors.append(f"connection closed before '{exchange['comment']}'")
+                    return
+                __, protocol, length = local_state_query._SEGMENT_HEADER.unpack(header)
+                request = cbor2.loads(self._recv_exact(conn, length))
+                expected = cbor2.loads(bytes.fromhex(exchange["request"]))
+                if (protocol, request) != (exchange["protocol"], expected):
+                    self.errors.append(f"{exchange['comment']}: unexpected {request}")
+                    return
+                if exchange["response"] is not None:
+                    self._send(conn, protocol, bytes.fromhex(exchange["response"]))
+
+    def close(self) -> None:
+        self._thread.join(timeout=5)
+        self._server.close()
+
+
+@pytest.fixture
+def transcript() -> dict[str, tp.Any]:
+    with open(TRANSCRIPT, encoding="utf-8") as in_fp:
+        transcript: dict[str, tp.Any] = json.load(in_fp)
+    return transcript
+
+
+@pytest.fixture
+def socket_path() -> tp.Iterator[pl.Path]:
+    # Path of Unix socket has length limit, `tmp_path` can be too long
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield pl.Path(tmp_dir) / "node.socket"
+
+
+def test_transcript(socket_path: pl.Path, transcript: dict[str, tp.Any]):
+    server = _TranscriptServer(socket_path=socket_path, exchanges=transcript["exchanges"])
+    client = local_state_query.LocalStateQueryClient(socket_path=str(socket_path), network_magic=42)
+    try:
+        tip = client.get_tip()
+        utxo = client.get_utxo(addresses=[transcript["address"]])
+    finally:
+        client.close()
+        server.close()
+
+    assert not server.errors
+    # Both queries used the same connection
+    assert server.connections == 1
+    assert client.version == 32788
+    assert tip == {"block": 56, "epoch": 12, "era": "Conway", "hash": "ab" * 32, "slot": 1234}
+    assert utxo == {
+        f"{'cd' * 32}#0": {
+            "address": transcript["address"],
+            "datum": None,
+            "datumhash": "11" * 32,
+            "value": {"lovelace": 5_000_000, "ee" * 28: {"746f6b": 10}},
+        },
+        f"{'cd' * 32}#1": {
+            "address": transcript["address"],
+            "datum": None,
+            "value": {"lovelace": 2_000_000},
+        },
+    }
+
+
+def test_unknown_era(socket_path: pl.Path, transcript: dict[str, tp.Any]):
+    handshake, acquire, era, *__, release = transcript["exchanges"][:7]
+    # Era that is not known to the client, e.g. from a newer node
+    era = {**era, "response": cbor2.dumps([4, len(local_state_query.ERAS)]).hex()}
+    server = _TranscriptServer(
+        socket_path=socket_path, exchanges=[handshake, acquire, era, release]
+    )
+    client = local_state_query.LocalStateQueryClient(socket_path=str(socket_path), network_magic=42)
+    try:
+        with pytest.raises(local_state_query.UnsupportedQueryError, match="Unknown era index 7"):
+            client.get_tip()
+    finally:
+        client.close()
+        server.close()
+
+    assert not server.errors
+
+
+def test_no_node(socket_path: pl.Path):
+    client = local_state_query.LocalStateQueryClient(socket_path=str(socket_path), network_magic=42)
+    with pytest.raises(local_state_query.LocalStateQueryError, match="Cannot connect"):
+        client.get_tip()
+
+
+def test_unsupported_txout():
+    addresses = {b"\x60": "addr_test1"}
+    inline_datum = {0: b"\x60", 1: 2_000_000, 2: [1, cbor2.CBORTag(24, b"\x00")]}
+
+    with pytest.raises(local_state_query.UnsupportedQueryError, match="Inline datums"):
+        local_state_query._txout_to_json(txout=inline_datum, addresses=addresses)
+    with pytest.raises(local_state_query.UnsupportedQueryError, match="Reference scripts"):
+        local_state_query._txout_to_json(
+            txout={0: b"\x60", 1: 2_000_000, 3: cbor2.CBORTag(24, b"\x00")}, addresses=addresses
+        )
+
+
+def test_bech32():
+    assert local_state_query.bech32_to_bytes(
+        "abcdef1qpzry9x8gf2tvdw0s3jn54khce6mua7lmqqqxw"
+    ) == bytes.fromhex("00443214c74254b635cf84653a56d7c675be77df")
+    with pytest.raises(ValueError, match="checksum"):
+        local_state_query.bech32_to_bytes("abcdef1qpzry9x8gf2tvdw0s3jn54khce6mua7lmqqqxx")
+    with pytest.raises(ValueError, match="Not a bech32"):
+        local_state_query.bech32_to_bytes("DdzFFzCqrhsfYMUNRxtQ5NNKbWVw3ZJBNcMLLZSoqmD5trHHPBDw")
@@ -0,0 +1,239 @@
+import pathlib as pl
+import re
+import time
+
+import pytest
+
+from cardano_node_tests.utils import cluster_nodes
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import logfiles
+
+
+@pytest.fixture
+def state_dir(tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch) -> pl.Path:
+    state_dir = tmp_path / "state-cluster5"
+    state_dir.mkdir()
+    monkeypatch.setenv("CARDANO_NODE_SOCKET_PATH", str(state_dir / "bft1.socket"))
+    return state_dir
+
+
+def _append(logfile: pl.Path, *lines: str) -> None:
+    with open(logfile, "a", encoding="utf-8") as out_fp:
+        out_fp.writelines(f"{line}\n" for line in lines)
+
+
+class TestSearchClusterLogs:
+    def test_incremental(self, state_dir: pl.Path):
+        logfile = state_dir / "bft1.stdout"
+        _append(logfile, "all good", "first error", "cardano.node.Foo:Info: no error here")
+
+        assert logfiles.search_cluster_logs() == [(logfile, "first error")]
+        # Errors are reported just once
+        assert not logfiles.search_cluster_logs()
+
+        _append(logfile, "second failure", "expected error")
+        logfiles.add_ignore_rule(files_glob="bft*.stdout", regex="expected", ignore_file_id="gw0")
+        assert logfiles.search_cluster_logs() == [(logfile, "second failure")]
+
+    def test_expired_ignore_rule(self, state_dir: pl.Path):
+        logfile = state_dir / "pool1.stdout"
+        _append(logfile, "nothing")
+        assert not logfiles.search_cluster_logs()
+
+        logfiles.add_ignore_rule(
+            files_glob="pool1.stdout", regex="expected", ignore_file_id="gw0", skip_after=1.0
+        )
+        _append(logfile, "expected error")
+        assert logfiles.search_cluster_logs() == [(logfile, "expected error")]
+
+    def test_rotated_ignore_rule(self, state_dir: pl.Path):
+        logfile = state_dir / "bft1.stdout"
+        rotated_logfile = state_dir / "bft1.stdout.1"
+        _append(rotated_logfile, "expected error", "rotated error")
+        _append(logfile, "expected error")
+        logfiles.add_ignore_rule(files_glob="bft*.stdout", regex="expected", ignore_file_id="gw0")
+
+        assert logfiles.search_cluster_logs() == [(rotated_logfile, "rotated error")]
+
+    def test_background_scanner(self, state_dir: pl.Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(configuration, "LOGS_SCAN_INTERVAL", 0.05)
+        logfile = state_dir / "pool2.stdout"
+        _append(logfile, "scanned error")
+
+        logfiles.watch_cluster_logs()
+        try:
+            offset_file = logfiles._get_offset_file(logfile=logfile)
+            for __ in range(100):
+                if offset_file.exists():
+                    break
+                time.sleep(0.05)
+        finally:
+            logfiles.unwatch_cluster_logs()
+
+        # The log file was already searched, the error is retrieved from the index
+        assert logfiles._get_last_search(logfile=logfile)[0] == logfile.stat().st_size
+        assert logfiles.search_cluster_logs() == [(logfile, "scanned error")]
+
+    def test_parallel_search(self, state_dir: pl.Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(configuration, "LOGS_SCAN_WORKERS", 2)
+        monkeypatch.setattr(logfiles, "PARALLEL_SEARCH_MIN_BYTES", 0)
+        expected = []
+        for i in range(1, 5):
+            logfile = state_dir / f"pool{i}.stdout"
+            _append(logfile, *(f"line {n}" for n in range(1000)), f"error in pool{i}")
+            expected.append((logfile, f"error in pool{i}"))
+
+        try:
+            assert sorted(logfiles.search_cluster_logs()) == sorted(expected)
+        finally:
+            logfiles.shutdown_search_pool()
+
+        for logfile, __ in expected:
+            assert logfiles._get_last_search(logfile=logfile)[0] == logfile.stat().st_size
+
+
+class TestSearchLogLines:
+    def _search(self, logfile: pl.Path, seek: int = 0) -> list[str]:
+        return [
+            line
+            for __, line in logfiles._search_log_lines(
+                logfile=logfile,
+                rotated_logs=logfiles._get_rotated_logs(logfile=logfile, seek=seek),
+                errors_re=logfiles.ERRORS_RE,
+                errors_ignored_re=logfiles._get_errors_ignored_re(),
+                look_back_map={"TraceNoLedgerState": "Switched to a fork"},
+                look_back_lines=2,
+            )
+        ]
+
+    def test_lines(self, tmp_path: pl.Path):
+        logfile = tmp_path / "bft1.stdout"
+        logfile.write_bytes(
+            b"first error\r\nok\n"
+            b"Switched to a fork\nok\nTraceNoLedgerState error\n"
+            b"ok\nok\nok\nTraceNoLedgerState error\n"
+            b"incomplete error"
+        )
+
+        assert self._search(logfile=logfile) == ["first error", "TraceNoLedgerState error"]
+        # The incomplete last line is searched next time
+        offset = logfiles._get_last_search(logfile=logfile)[0]
+        assert offset == logfile.stat().st_size - len(b"incomplete error")
+
+        _append(logfile, "")
+        assert self._search(logfile=logfile, seek=offset) == ["incomplete error"]
+
+    def test_seek_mid_line(self, tmp_path: pl.Path):
+        logfile = tmp_path / "bft1.stdout"
+        logfile.write_bytes(b"first error\nsecond error\n")
+
+        assert self._search(logfile=logfile, seek=3) == ["second error"]
+        assert not self._search(logfile=logfile, seek=logfile.stat().st_size)
+
+    def test_empty(self, tmp_path: pl.Path):
+        logfile = tmp_path / "bft1.stdout"
+        logfile.touch()
+
+        assert not self._search(logfile=logfile)
+        assert logfiles._get_last_search(logfile=logfile)[0] == 0
+
+    def test_literals_windows(self, tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(logfiles, "LITERALS_WINDOW_SIZE", 7)
+        logfile = tmp_path / "bft1.stdout"
+        lines = ["ok", "an ERROR", "ok ok", "FaIl", "error and failure", "ok"] * 5
+        _append(logfile, *lines)
+
+        expected = [ln for ln in lines if logfiles.ERRORS_RE.search(ln)]
+        assert self._search(logfile=logfile) == expected
+
+    def test_regex(self, tmp_path: pl.Path):
+        logfile = tmp_path / "bft1.stdout"
+        _append(logfile, "ok", "Exited: errno 2", "ok", "ERRNO 3")
+
+        found = logfiles._search_log_lines(
+            logfile=logfile,
+            rotated_logs=logfiles._get_rotated_logs(logfile=logfile),
+            errors_re=re.compile(r"errno \d"),
+        )
+        assert found == [(logfile, "Exited: errno 2")]
+
+
+class TestIgnoreRules:
+    def test_matcher(self):
+        matcher = logfiles._IgnoreMatcher(
+            regexes=[r"Network\.Socket\.connect", "plain (text)?", "trace.*Policy", "just text"]
+        )
+
+        assert matcher.literals == ("Network.Socket.connect", "just text")
+        assert matcher.search("AcquireConnectionError Network.Socket.connect failed")
+        assert matcher.search("traced by ErrorPolicy")
+        assert matcher.search("plain error")
+        assert not matcher.search("Network-Socket-connect error")
+        assert not logfiles._IgnoreMatcher(regexes=[]).search("error")
+
+    def test_cached_rules(self, state_dir: pl.Path):
+        logfiles.add_ignore_rule(files_glob="bft*.stdout", regex="expected", ignore_file_id="gw0")
+        ignore_rules = logfiles._read_ignore_rules(cluster_env=cluster_nodes.get_cluster_env())
+        assert (
+            logfiles._read_ignore_rules(cluster_env=cluster_nodes.get_cluster_env()) is ignore_rules
+        )
+
+        bft_matcher = ignore_rules.get_matcher(logfile=state_dir / "bft1.stdout", timestamp=1.0)
+        assert bft_matcher.search("expected error")
+        pool_matcher = ignore_rules.get_matcher(logfile=state_dir / "pool1.stdout", timestamp=1.0)
+        assert not pool_matcher.search("expected error")
+
+        # The rules are read again when a rules file changes
+        logfiles.add_ignore_rule(files_glob="pool*", regex="other", ignore_file_id="gw1")
+        new_rules = logfiles._read_ignore_rules(cluster_env=cluster_nodes.get_cluster_env())
+        assert new_rules is not ignore_rules
+        assert new_rules.get_matcher(logfile=state_dir / "pool1.stdout", timestamp=1.0).search(
+            "other error"
+        )
+
+
+class TestStructuredCheck:
+    def test_search(self, state_dir: pl.Path, monkeypatch: pytest.MonkeyPatch):
+        trace_filter = logfiles._TraceFilter(
+            errors_re=logfiles.ERRORS_RE, flagged_namespaces=["cardano.node.Mempool"]
+        )
+        monkeypatch.setattr(configuration, "LOGS_STRUCTURED_CHECK", True)
+        monkeypatch.setattr(logfiles, "_get_trace_filter", lambda: trace_filter)
+
+        logfile = state_dir / "bft1.stdout"
+        errors = [
+            "[bft1:cardano.node.ChainDB:Error:5] [2024-01-01 00:00:00.00 UTC] Something broke",
+            '{"at":"2024-01-01T00:00:00Z","ns":"Net.Server","data":{},"sev":"Critical"}',
+            "[bft1:cardano.node.Mempool:Info:7] [2024-01-01 00:00:00.00 UTC] Rejected tx",
+            "cardano-node: failed to open the database",
+        ]
+        _append(
+            logfile,
+            "[bft1:cardano.node.ChainDB:Info:5] [2024-01-01 00:00:00.00 UTC] TraceError fine",
+            '{"at":"2024-01-01T00:00:00Z","ns":"ChainDB","data":{"err":"fail"},"sev":"Warning"}',
+            "[db-sync-node:Info:6] [2024-01-01 00:00:00.00 UTC] Insert error: none",
+            errors[0],
+            errors[1],
+            errors[2],
+            # Error records are still subject to the ignore rules
+            "[bft1:cardano.node.ChainDB:Error:5] [2024-01-01 00:00:00.00 UTC] ExceededTimeLimit",
+            errors[3],
+        )
+
+        assert logfiles.search_cluster_logs() == [(logfile, e) for e in errors]
+
+    def test_candidates_literals(self):
+        trace_filter = logfiles._TraceFilter(
+            errors_re=logfiles.ERRORS_RE, flagged_namespaces=["Net.Peer-Selection"]
+        )
+        errs_b = logfiles._compile_bytes_from_pattern(pat=trace_filter.candidates_re)
+        assert errs_b
+        assert logfiles._get_literals(pat=errs_b) == (
+            b"error",
+            b"fail",
+            b"error",
+            b"critical",
+            b"alert",
+            b"emergency",
+            b"net.peer-selection",
+        )
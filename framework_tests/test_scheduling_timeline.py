@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from cardano_node_tests import scheduling_timeline
+from cardano_node_tests.cluster_management import scheduling_events
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import temptools
+
+
+@pytest.fixture
+def events_file(tmp_path, monkeypatch):
+    events_file = tmp_path / "events.jsonl"
+    monkeypatch.setattr(temptools.PytestTempDirs, "pytest_root_tmp", tmp_path)
+    monkeypatch.setattr(configuration, "SCHEDULING_EVENTS", str(events_file))
+    return events_file
+
+
+class TestSchedulingTimeline:
+    def test_emit(self, events_file):
+        scheduling_events.emit("gw0", scheduling_events.WAIT_START, test="test_a")
+
+        record = json.loads(events_file.read_text())
+        assert record["worker"] == "gw0"
+        assert record["event"] == scheduling_events.WAIT_START
+        assert record["test"] == "test_a"
+
+    def test_timeline(self):
+        events = [
+            {"ts": 0, "worker": "gw0", "event": "wait_start"},
+            {"ts": 0, "worker": "gw1", "event": "wait_start"},
+            {"ts": 0, "worker": "gw0", "event": "respin_start", "instance": 0},
+            {"ts": 2, "worker": "gw1", "event": "wait_end", "instance": 1, "test": "test_b"},
+            {
+                "ts": 3,
+                "worker": "gw0",
+                "event": "resources_unavailable",
+                "test": "test_a",
+                "unavailable": ["node-pool1"],
+            },
+            {"ts": 10, "worker": "gw0", "event": "respin_end", "instance": 0, "success": True},
+            {"ts": 10, "worker": "gw0", "event": "wait_end", "instance": 0, "test": "test_a"},
+            {"ts": 12, "worker": "gw1", "event": "test_stop", "instance": 1},
+            {"ts": 20, "worker": "gw0", "event": "test_stop", "instance": 0},
+        ]
+
+        timeline = scheduling_timeline.get_timeline(events)
+
+        assert timeline.span == 20
+        assert sorted(timeline.waits) == [2, 10]
+        assert [(i.instance, i.duration) for i in timeline.tests] == [(1, 10), (0, 10)]
+        assert [(i.instance, i.duration) for i in timeline.respins] == [(0, 10)]
+        assert timeline.contention["node-pool1"] == 1
+
+        summary = scheduling_timeline.format_summary(timeline)
+        assert "Respins: 1 (0 failed)" in summary
+        assert "most contended: node-pool1 (1)" in summary
+
+    def test_unfinished_waits(self):
+        events = [
+            {"ts": 0, "worker": "gw0", "event": "wait_start"},
+            {"ts": 1, "worker": "gw0", "event": "wait_end", "instance": 0, "test": "test_a"},
+            # The same test asked for the cluster instance again
+            {"ts": 2, "worker": "gw0", "event": "wait_start"},
+            {"ts": 2, "worker": "gw0", "event": "wait_end", "instance": 0, "already_running": 1},
+            {"ts": 5, "worker": "gw0", "event": "test_stop", "instance": 0},
+            {"ts": 5, "worker": "gw0", "event": "wait_start"},
+            {"ts": 6, "worker": "gw0", "event": "respin_start", "instance": 0},
+            {"ts": 7, "worker": "gw0", "event": "respin_end", "instance": 0, "success": False},
+            {"ts": 7, "worker": "gw0", "event": "wait_end", "instance": -1, "error": "Timeout"},
+        ]
+
+        timeline = scheduling_timeline.get_timeline(events)
+
+        assert timeline.waits == [1, 0, 2]
+        assert [(i.instance, i.duration) for i in timeline.tests] == [(0, 4)]
+        assert [(i.instance, i.duration) for i in timeline.respins] == [(0, 1)]
+        assert timeline.failed_respins == 1
+
+    def test_busy_time(self):
+        intervals = [
+            scheduling_timeline.Interval(start=0, end=5, instance=0),
+            scheduling_timeline.Interval(start=3, end=8, instance=0),
+            scheduling_timeline.Interval(start=10, end=12, instance=0),
+        ]
+        assert scheduling_timeline.get_busy_time(intervals) == 10
+        assert scheduling_timeline.get_max_concurrency(intervals) == 2
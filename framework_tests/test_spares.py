@@ -0,0 +1,80 @@
+import pytest
+
+from cardano_node_tests.cluster_management import spares
+from cardano_node_tests.cluster_management import status_backends
+from cardano_node_tests.cluster_management import status_files
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import temptools
+
+
+@pytest.fixture(params=status_backends.BACKENDS)
+def warmups(request, tmp_path, monkeypatch) -> list[int]:
+    monkeypatch.setattr(temptools.PytestTempDirs, "pytest_root_tmp", tmp_path)
+    monkeypatch.setattr(configuration, "STATUS_BACKEND", request.param)
+
+    started: list[int] = []
+
+    def _start_warmup(instance_num: int) -> None:
+        status_files.create_respin_progress_file(
+            instance_num=instance_num, worker_id=spares.SPARE_WORKER_ID
+        )
+        started.append(instance_num)
+
+    monkeypatch.setattr(spares, "start_warmup", _start_warmup)
+    return started
+
+
+def _finish_warmup(instance_num: int) -> None:
+    status_files.rm_respin_progress_files(instance_num=instance_num)
+    status_files.rm_respin_needed_files(instance_num=instance_num)
+    status_files.get_cluster_running_file(instance_num=instance_num).touch()
+
+
+class TestSpares:
+    def test_init_spares(self, warmups: list[int]):
+        spares.init_spares(num_of_instances=3, num_of_spares=2)
+        assert status_files.get_spare_instances() == {3, 4}
+
+        # The spare instances are selected only once
+        status_files.rm_spare_files(instance_num=3)
+        spares.init_spares(num_of_instances=3, num_of_spares=2)
+        assert status_files.get_spare_instances() == {4}
+        assert not warmups
+
+    def test_maintain_spare(self, warmups: list[int]):
+        spares.init_spares(num_of_instances=1, num_of_spares=1)
+
+        spares.maintain_spare(instance_num=1)
+        spares.maintain_spare(instance_num=1)
+        assert warmups == [1]
+        assert spares.find_warm_spare() == -1
+
+        _finish_warmup(instance_num=1)
+        spares.maintain_spare(instance_num=1)
+        assert warmups == [1]
+        assert spares.find_warm_spare() == 1
+
+    def test_swap_for_spare(self, warmups: list[int]):
+        spares.init_spares(num_of_instances=2, num_of_spares=1)
+        _finish_warmup(instance_num=2)
+        status_files.get_instance_dir(instance_num=0).mkdir()
+        status_files.create_respin_needed_file(instance_num=0, worker_id="gw0")
+        status_files.create_curr_mark_file(instance_num=0, worker_id="gw0", mark="mymark")
+
+        spares.swap_for_spare(instance_num=0, spare_num=2, worker_id="gw1")
+
+        assert status_files.get_spare_instances() == {0}
+        assert warmups == [0]
+        assert not status_files.list_curr_mark_files(instance_num=0)
+        assert spares.find_warm_spare() == -1
+
+        _finish_warmup(instance_num=0)
+        assert spares.find_warm_spare() == 0
+
+    def test_dead_spare(self, warmups: list[int]):
+        spares.init_spares(num_of_instances=1, num_of_spares=1)
+        status_files.create_cluster_dead_file(instance_num=1)
+
+        spares.maintain_spare(instance_num=1)
+        assert not warmups
+        assert spares.find_warm_spare() == -1
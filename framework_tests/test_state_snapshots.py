@@ -0,0 +1,215 @@
+import json
+import pathlib as pl
+import time
+import types
+import typing as tp
+
+import pytest
+
+from cardano_node_tests.cluster_management import state_snapshots
+from cardano_node_tests.utils import cluster_nodes
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import helpers
+
+
+def _create_state_dir(state_dir: pl.Path) -> None:
+    (state_dir / "byron").mkdir(parents=True)
+    (state_dir / "shelley").mkdir()
+    (state_dir / "byron" / "genesis.json").write_text(json.dumps({"startTime": 1700000000}))
+    (state_dir / "shelley" / "genesis.json").write_text(
+        json.dumps({"systemStart": "2023-11-14T22:13:20Z", "networkMagic": 42})
+    )
+    (state_dir / state_snapshots.CLUSTER_START_TIME).write_text("1700000000\n")
+    (state_dir / "config-bft1.json").write_text(
+        json.dumps({"ByronGenesisHash": "old", "ShelleyGenesisHash": "old", "Protocol": "Cardano"})
+    )
+    (state_dir / state_snapshots.REGISTRATION_TX).write_text("{}")
+    (state_dir / state_snapshots.FAUCET_ADDR_FILE).write_text("addr_test1faucet\n")
+
+
+class _Cluster:
+    """Stand-in for `ClusterLib` of the restored cluster."""
+
+    def __init__(self, produces_blocks: bool = True) -> None:
+        self.produces_blocks = produces_blocks
+        self.submitted: list[tuple[pl.Path, list[str]]] = []
+        self.g_query = types.SimpleNamespace(get_tip=self.get_tip, get_utxo=self.get_utxo)
+        self.g_transaction = types.SimpleNamespace(submit_tx=self.submit_tx)
+
+    def get_tip(self) -> dict:
+        if not self.produces_blocks:
+            return {"era": "Conway", "syncProgress": "100.00"}
+        return {"era": "Conway", "block": 1, "slot": 5}
+
+    def get_utxo(self, address: str) -> list[str]:
+        return [f"{address}#0"]
+
+    def submit_tx(self, tx_file: pl.Path, txins: list[str]) -> None:
+        self.submitted.append((tx_file, txins))
+
+
+@pytest.fixture
+def commands(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    """Record the commands, return fake genesis hashes."""
+    executed: list[list[str]] = []
+
+    def _run_command(command: str | list, **__: tp.Any) -> bytes:
+        cmd = command.split() if isinstance(command, str) else command
+        executed.append(cmd)
+        if "print-genesis-hash" in cmd:
+            return b"byron_hash\n"
+        if "hash" in cmd:
+            return b"shelley_hash\n"
+        return b""
+
+    monkeypatch.setattr(helpers, "run_command", _run_command)
+    return executed
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch) -> pl.Path:
+    """Create a snapshot of cluster instance 0 that was taken 100 seconds ago."""
+    monkeypatch.setattr(configuration, "SNAPSHOTS_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(
+        state_snapshots, "get_snapshot_key", lambda instance_num: f"cluster{instance_num}"
+    )
+
+    snapshot_dir = tmp_path / "snapshots" / "cluster0"
+    _create_state_dir(state_dir=snapshot_dir / state_snapshots.SNAPSHOT_STATE)
+    (snapshot_dir / state_snapshots.SNAPSHOT_META).write_text(
+        json.dumps({"created": time.time() - 100})
+    )
+    return snapshot_dir
+
+
+def _set_cluster(monkeypatch: pytest.MonkeyPatch, cluster_obj: _Cluster) -> list[str]:
+    """Use the stand-in as the restored cluster, return names of started services."""
+    cluster_type = types.SimpleNamespace(get_cluster_obj=lambda: cluster_obj)
+    monkeypatch.setattr(cluster_nodes, "get_cluster_type", lambda: cluster_type)
+    monkeypatch.setattr(
+        cluster_nodes,
+        "services_status",
+        lambda **__: [
+            types.SimpleNamespace(name="nodes:bft1", status="RUNNING"),
+            types.SimpleNamespace(name="submit_api", status="STOPPED"),
+        ],
+    )
+    started: list[str] = []
+    monkeypatch.setattr(
+        cluster_nodes,
+        "services_action",
+        lambda service_names, **__: started.extend(service_names),
+    )
+    return started
+
+
+class TestStateSnapshots:
+    def test_set_start_time(self, tmp_path: pl.Path):
+        _create_state_dir(state_dir=tmp_path)
+
+        state_snapshots.set_start_time(state_dir=tmp_path, start_time=1700003725)
+
+        byron_data = json.loads((tmp_path / "byron" / "genesis.json").read_text())
+        shelley_data = json.loads((tmp_path / "shelley" / "genesis.json").read_text())
+        assert byron_data["startTime"] == 1700003725
+        assert shelley_data == {"systemStart": "2023-11-14T23:15:25Z", "networkMagic": 42}
+        assert (tmp_path / state_snapshots.CLUSTER_START_TIME).read_text() == "1700003725\n"
+
+    def test_update_genesis_hashes(self, tmp_path: pl.Path, commands: list[list[str]]):
+        _create_state_dir(state_dir=tmp_path)
+
+        state_snapshots.update_genesis_hashes(state_dir=tmp_path)
+
+        assert json.loads((tmp_path / "config-bft1.json").read_text()) == {
+            "ByronGenesisHash": "byron_hash",
+            "ShelleyGenesisHash": "shelley_hash",
+            "Protocol": "Cardano",
+        }
+        assert str(tmp_path / "byron" / "genesis.json") in commands[0]
+        assert str(tmp_path / "shelley" / "genesis.json") in commands[1]
+
+    def test_restore_snapshot(
+        self,
+        tmp_path: pl.Path,
+        snapshot_dir: pl.Path,
+        commands: list[list[str]],
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        cluster_obj = _Cluster()
+        started = _set_cluster(monkeypatch=monkeypatch, cluster_obj=cluster_obj)
+        state_dir = tmp_path / "state-cluster0"
+
+        restored = state_snapshots.restore_snapshot(state_dir=state_dir, instance_num=0)
+
+        assert restored is cluster_obj
+        # A new chain starts now, not when the snapshot was taken
+        start_time = int((state_dir / state_snapshots.CLUSTER_START_TIME).read_text())
+        assert 0 <= start_time - time.time() <= state_snapshots.START_DELAY
+        byron_data = json.loads((state_dir / "byron" / "genesis.json").read_text())
+        assert byron_data["startTime"] == start_time
+        config = json.loads((state_dir / "config-bft1.json").read_text())
+        assert config["ShelleyGenesisHash"] == "shelley_hash"
+        assert commands[-1] == [str(state_dir / "supervisord_start")]
+        assert started == ["submit_api"]
+        # The registration Tx spends the genesis UTxO of the faucet
+        assert cluster_obj.submitted == [
+            (state_dir / state_snapshots.REGISTRATION_TX, ["addr_test1faucet#0"])
+        ]
+        # The snapshot itself is unchanged and can be restored again
+        snapshot_config = snapshot_dir / state_snapshots.SNAPSHOT_STATE / "config-bft1.json"
+        assert json.loads(snapshot_config.read_text())["ShelleyGenesisHash"] == "old"
+
+    def test_restore_snapshot_no_blocks(
+        self,
+        tmp_path: pl.Path,
+        snapshot_dir: pl.Path,
+        commands: list[list[str]],
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(state_snapshots, "FIRST_BLOCK_TIMEOUT", -1)
+        cluster_obj = _Cluster(produces_blocks=False)
+        _set_cluster(monkeypatch=monkeypatch, cluster_obj=cluster_obj)
+        state_dir = tmp_path / "state-cluster0"
+
+        assert state_snapshots.restore_snapshot(state_dir=state_dir, instance_num=0) is None
+        # The cluster is stopped and the broken snapshot is removed
+        assert not cluster_obj.submitted
+        assert commands[-1] == [str(state_dir / "stop-cluster")]
+        assert not state_dir.exists()
+        assert not snapshot_dir.exists()
+
+    def test_take_snapshot(self, tmp_path: pl.Path, snapshot_dir: pl.Path):
+        state_dir = tmp_path / "state-cluster1"
+        _create_state_dir(state_dir=state_dir)
+        (state_dir / "db-pool1" / "immutable").mkdir(parents=True)
+        for fname in ("supervisord.pid", "pool1.stdout", "start-cluster.log"):
+            (state_dir / fname).touch()
+
+        state_snapshots.take_snapshot(state_dir=state_dir, instance_num=1)
+
+        snapshot_state = snapshot_dir.parent / "cluster1" / state_snapshots.SNAPSHOT_STATE
+        assert (snapshot_state / "config-bft1.json").exists()
+        assert (snapshot_state / state_snapshots.REGISTRATION_TX).exists()
+        # The node databases and files of the running processes are not needed for a new chain
+        for fname in ("db-pool1", "supervisord.pid", "pool1.stdout", "start-cluster.log"):
+            assert not (snapshot_state / fname).exists()
+
+    def test_take_snapshot_unsupported(self, tmp_path: pl.Path, snapshot_dir: pl.Path):
+        state_dir = tmp_path / "state-cluster1"
+        _create_state_dir(state_dir=state_dir)
+        (state_dir / state_snapshots.REGISTRATION_TX).unlink()
+
+        state_snapshots.take_snapshot(state_dir=state_dir, instance_num=1)
+
+        assert not (snapshot_dir.parent / "cluster1").exists()
+
+    def test_no_snapshot(self, tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(configuration, "SNAPSHOTS_DIR", str(tmp_path))
+        monkeypatch.setattr(
+            state_snapshots, "get_snapshot_key", lambda instance_num: f"cluster{instance_num}"
+        )
+
+        assert (
+            state_snapshots.restore_snapshot(state_dir=tmp_path / "state-cluster0", instance_num=0)
+            is None
+        )
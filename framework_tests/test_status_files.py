@@ -0,0 +1,89 @@
+import pytest
+
+from cardano_node_tests.cluster_management import status_backends
+from cardano_node_tests.cluster_management import status_files
+from cardano_node_tests.utils import configuration
+from cardano_node_tests.utils import temptools
+
+
+@pytest.fixture(params=status_backends.BACKENDS)
+def status_backend(request, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(temptools.PytestTempDirs, "pytest_root_tmp", tmp_path)
+    monkeypatch.setattr(configuration, "STATUS_BACKEND", request.param)
+    for i in range(3):
+        status_files.get_instance_dir(instance_num=i).mkdir()
+
+
+def _create_statuses() -> None:
+    status_files.create_test_running_file(instance_num=0, worker_id="gw0", test_id="test_a")
+    status_files.create_test_running_file(
+        instance_num=0, worker_id="gw1", test_id="test_b", mark="mymark"
+    )
+    status_files.create_test_running_file(instance_num=1, worker_id="gw2", test_id="test_c")
+    status_files.create_resource_locked_files(
+        instance_num=0, worker_id="gw0", lock_names=["node-pool1", "node-pool2"]
+    )
+    status_files.create_resource_locked_files(
+        instance_num=0, worker_id="gw1", lock_names=["treasury"], mark="mymark"
+    )
+    status_files.create_resource_used_files(instance_num=0, worker_id="gw0", use_names=["cluster"])
+    status_files.create_curr_mark_file(instance_num=0, worker_id="gw1", mark="mymark")
+    status_files.create_respin_needed_file(instance_num=2, worker_id="gw3")
+    status_files.create_prio_in_progress_file(worker_id="gw4")
+
+
+@pytest.mark.usefixtures("status_backend")
+class TestStatusFiles:
+    def test_lookups(self):
+        _create_statuses()
+
+        assert len(status_files.list_test_running_files()) == 3
+        assert len(status_files.list_test_running_files(instance_num=0)) == 2
+        assert len(status_files.list_test_running_files(instance_num=0, mark="")) == 1
+        assert len(status_files.list_test_running_files(instance_num=0, mark="*")) == 1
+        assert sorted(status_files.get_test_names(instance_num=0)) == ["test_a", "test_b"]
+        assert status_files.get_marks_in_progress(instance_num=0) == ["mymark"]
+
+        locked = status_files.get_resources_from_path(
+            paths=status_files.list_resource_locked_files(instance_num=0)
+        )
+        assert sorted(locked) == ["node-pool1", "node-pool2", "treasury"]
+        locked_unmarked = status_files.get_resources_from_path(
+            paths=status_files.list_resource_locked_files(instance_num=0, mark="")
+        )
+        assert sorted(locked_unmarked) == ["node-pool1", "node-pool2"]
+
+        assert len(status_files.list_curr_mark_files(mark="mymark")) == 1
+        assert len(status_files.list_respin_needed_files(instance_num=2)) == 1
+        assert not status_files.list_respin_needed_files(instance_num=0)
+        assert len(status_files.list_prio_in_progress_files()) == 1
+
+    def test_rm(self):
+        _create_statuses()
+
+        status_files.rm_resource_locked_files(instance_num=0, worker_id="gw0", mark="")
+        status_files.rm_test_running_files(instance_num=0, worker_id="gw0")
+        status_files.rm_prio_in_progress_files(worker_id="gw4")
+
+        assert status_files.get_test_names(instance_num=0) == ["test_b"]
+        locked = status_files.get_resources_from_path(
+            paths=status_files.list_resource_locked_files(instance_num=0)
+        )
+        assert locked == ["treasury"]
+        assert not status_files.list_prio_in_progress_files()
+
+    def test_cached_reads(self):
+        _create_statuses()
+
+        with status_files.cached_reads():
+            assert len(status_files.list_test_running_files()) == 3
+
+            # Changes done through `status_files` are visible while the cache is active
+            status_files.rm_test_running_files(instance_num=0, worker_id="gw0")
+            status_files.create_test_running_file(instance_num=2, worker_id="gw0", test_id="test_d")
+            status_files.create_prio_in_progress_file(worker_id="gw5")
+
+            assert sorted(status_files.get_test_names()) == ["test_b", "test_c", "test_d"]
+            assert len(status_files.list_prio_in_progress_files()) == 2
+
+        assert sorted(status_files.get_test_names()) == ["test_b", "test_c", "test_d"]
@@ -0,0 +1,102 @@
+import json
+import pathlib as pl
+import time
+import types
+
+import pytest
+from cardano_clusterlib import clusterlib
+from cardano_clusterlib import clusterlib_helpers
+
+from cardano_node_tests.utils import tip_follower
+
+
+class _Node:
+    """Stand-in for the node, a new block is adopted on every `query tip`."""
+
+    def __init__(self, state_dir: pl.Path, grow: bool = True) -> None:
+        self.block = 0
+        self.grow = grow
+        self.queries = 0
+        self.cluster_obj = types.SimpleNamespace(
+            state_dir=state_dir,
+            slot_length=0.01,
+            magic_args=[],
+            socket_args=[],
+            cli=self.cli,
+        )
+
+    def cli(self, cli_args: list[str], **__: object) -> clusterlib.CLIOut:
+        assert cli_args[:2] == ["query", "tip"]
+        self.queries += 1
+        if self.grow:
+            self.block += 1
+        tip = {"slot": self.block * 2, "block": self.block, "epoch": self.block // 10}
+        return clusterlib.CLIOut(stdout=json.dumps(tip).encode(), stderr=b"")
+
+
+@pytest.fixture
+def node(tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch) -> _Node:
+    monkeypatch.setattr(tip_follower, "MIN_FOLLOW_INTERVAL", 0.02)
+    return _Node(state_dir=tmp_path)
+
+
+def _get_feed(node: _Node) -> tip_follower.TipFeed:
+    return tip_follower.TipFeed(cluster_obj=node.cluster_obj)  # type: ignore[arg-type]
+
+
+def test_shared_feed(node: _Node):
+    leader = _get_feed(node)
+    other = _get_feed(node)
+    try:
+        first = leader.get_tip(since=time.time())
+        assert first is not None
+        assert leader.is_following
+
+        # Other workers just read the published tip
+        feed_tip = other.get_tip()
+        assert feed_tip is not None
+        assert feed_tip.block >= first.block
+        assert not other.is_following
+        assert feed_tip.as_tip().keys() == {"slot", "block", "epoch"}
+
+        # When the follower goes away, the feed gets stale and another worker takes over
+        leader.stop()
+        queries = node.queries
+        time.sleep(other.max_age)
+        assert other.get_tip(since=time.time()) is not None
+        assert other.is_following
+        assert node.queries > queries
+    finally:
+        leader.stop()
+        other.stop()
+
+
+def test_wait(node: _Node):
+    feed = _get_feed(node)
+    try:
+        feed_tip = feed.wait(reached=lambda t: t.block >= 5, waiting_for="block number 5")
+        assert feed_tip is not None
+        assert feed_tip.block >= 5
+        # Only the follower queries the node
+        assert node.queries <= feed_tip.block
+    finally:
+        feed.stop()
+
+
+def test_no_new_block(tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(tip_follower, "MIN_FOLLOW_INTERVAL", 0.02)
+    monkeypatch.setattr(clusterlib_helpers, "NEXT_BLOCK_TIMEOUT_SLOTS", 20)
+    node = _Node(state_dir=tmp_path, grow=False)
+
+    feed = _get_feed(node)
+    try:
+        with pytest.raises(clusterlib.CLIError, match="no new block"):
+            feed.wait(reached=lambda t: t.block >= 1, waiting_for="block number 1")
+    finally:
+        feed.stop()
+
+
+def test_unavailable(tmp_path: pl.Path):
+    feed = _get_feed(_Node(state_dir=tmp_path / "missing"))
+    # The caller falls back to querying the node directly
+    assert feed.get_tip() is None
@@ -0,0 +1,84 @@
+import pathlib as pl
+import time
+import typing as tp
+
+import pytest
+
+from cardano_node_tests.cluster_management import wakeup
+from cardano_node_tests.utils import temptools
+
+
+@pytest.fixture
+def root_tmp(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(temptools.PytestTempDirs, "pytest_root_tmp", tmp_path)
+
+
+@pytest.mark.usefixtures("root_tmp")
+class TestWakeup:
+    def test_timeout(self):
+        waiter = wakeup.get_waiter(worker_id="gw0")
+        assert waiter.sock is not None
+
+        start = time.monotonic()
+        assert not waiter.wait(timeout=0.2)
+        assert time.monotonic() - start >= 0.2
+
+    def test_notify(self):
+        waiter0 = wakeup.get_waiter(worker_id="gw0")
+        waiter1 = wakeup.get_waiter(worker_id="gw1")
+
+        wakeup.notify_waiters(worker_id="gw1")
+
+        start = time.monotonic()
+        assert waiter0.wait(timeout=10)
+        assert time.monotonic() - start < 5
+
+        # The sender doesn't wake itself up
+        assert not waiter1.wait(timeout=0)
+
+        # Pending notifications were consumed
+        assert not waiter0.drain()
+
+    def test_gone_waiter(self):
+        waiter = wakeup.get_waiter(worker_id="gw0")
+        sock_path = waiter.sock_path
+        waiter.close()
+        assert not sock_path.exists()
+
+        # Must not fail when there's nobody listening
+        sock_path.touch()
+        wakeup.notify_waiters(worker_id="gw1")
+
+    def test_cached_sock_paths(self, tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch):
+        waiter0 = wakeup.get_waiter(worker_id="gw0")
+        listings: list[object] = []
+        orig_glob = type(tmp_path).glob
+
+        def _glob(self: pl.Path, pattern: str) -> tp.Iterator[pl.Path]:
+            listings.append(pattern)
+            return orig_glob(self, pattern)
+
+        monkeypatch.setattr(type(tmp_path), "glob", _glob)
+        # The dir was modified just now, the listing is not trusted
+        wakeup.notify_waiters(worker_id="gw1")
+        wakeup.notify_waiters(worker_id="gw1")
+        assert len(listings) == 2
+
+        # The listing is trusted once the dir modification is old enough
+        monkeypatch.setattr(wakeup, "MTIME_RACY_SEC", -60)
+        wakeup.notify_waiters(worker_id="gw1")
+        wakeup.notify_waiters(worker_id="gw1")
+        assert len(listings) == 2
+        assert waiter0.drain()
+
+        # A new waiter modifies the dir
+        waiter1 = wakeup.get_waiter(worker_id="gw2")
+        wakeup.notify_waiters(worker_id="gw0")
+        assert len(listings) == 3
+        assert waiter1.wait(timeout=0)
+
+        # The socket of a gone waiter invalidates the listing
+        waiter1.close()
+        wakeup._SOCK_PATHS_LISTINGS[tmp_path].mtime_ns = tmp_path.stat().st_mtime_ns
+        wakeup.notify_waiters(worker_id="gw0")
+        assert tmp_path not in wakeup._SOCK_PATHS_LISTINGS
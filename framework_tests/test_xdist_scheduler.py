@@ -0,0 +1,220 @@
+import time
+import types
+import typing as tp
+
+import pytest
+from xdist import workermanage
+
+from cardano_node_tests.pytest_plugins import xdist_scheduler
+
+
+class FakeNode:
+    def __init__(self, name: str) -> None:
+        self.gateway = types.SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent: list[int] = []
+
+    def send_runtest_some(self, indices: list[int]) -> None:
+        self.sent.extend(indices)
+
+    def shutdown(self) -> None:
+        self.shutting_down = True
+
+
+def _worker(node: FakeNode) -> workermanage.WorkerController:
+    """Pass the fake node where the scheduler expects a worker controller."""
+    return tp.cast(workermanage.WorkerController, node)
+
+
+def _get_scheduler(
+    collection: list[str], durations: dict[str, float], nodes_num: int = 2
+) -> tuple[xdist_scheduler.OneLongScheduling, list[FakeNode]]:
+    config = types.SimpleNamespace(
+        getvalue=lambda __: [f"{nodes_num}*popen"],
+        option=types.SimpleNamespace(loadscopereorder=False),
+    )
+    sched = xdist_scheduler.OneLongScheduling(
+        config, log=types.SimpleNamespace(loadscopesched=lambda *__: None)
+    )
+    sched.durations = durations
+
+    nodes = [FakeNode(f"gw{i}") for i in range(nodes_num)]
+    for node in nodes:
+        sched.add_node(_worker(node))
+        sched.add_node_collection(_worker(node), collection)
+    sched.schedule()
+
+    return sched, nodes
+
+
+def _get_synthetic_collection(items_num: int) -> list[str]:
+    """Return collection with parametrized tests, groups of tests and long-running tests.
+
+    Some of the tests lock resources.
+    """
+    collection = []
+    for i in range(items_num):
+        nodeid = f"tests/test_mod{i // 50}.py::test_func{i // 10}[param{i}]"
+        if i % 10 == 7:
+            nodeid = f"{nodeid}@res=node-pool{i % 3 + 1}"
+        if i % 10 == 0:
+            nodeid = f"{nodeid}@group{i // 100}"
+        if i % 20 == 3:
+            nodeid = f"{nodeid}@long"
+        collection.append(nodeid)
+    return collection
+
+
+class TestXdistScheduler:
+    def test_base_nodeid(self):
+        assert xdist_scheduler.get_base_nodeid("t.py::test_a[x@y]@grp@long") == "t.py::test_a[x@y]"
+        assert xdist_scheduler.get_base_nodeid("t.py::test_a@long") == "t.py::test_a"
+        assert xdist_scheduler.get_base_nodeid("t.py::test_a") == "t.py::test_a"
+
+    def test_longest_first(self):
+        collection = [
+            "t.py::test_short",
+            "t.py::test_mid",
+            "t.py::test_grp1@grp",
+            "t.py::test_grp2@grp",
+            "t.py::test_long1@long",
+            "t.py::test_long2@long",
+            "t.py::test_unknown",
+        ]
+        durations = {
+            "t.py::test_short": 1.0,
+            "t.py::test_mid": 5.0,
+            "t.py::test_grp1": 4.0,
+            "t.py::test_grp2": 4.0,
+            "t.py::test_long1": 20.0,
+            "t.py::test_long2": 30.0,
+        }
+        sched, nodes = _get_scheduler(collection=collection, durations=durations, nodes_num=2)
+
+        first_tests = [collection[n.sent[0]] for n in nodes]
+        # Both workers start with a long-running test, the longest one first
+        assert first_tests == ["t.py::test_long2@long", "t.py::test_long1@long"]
+
+        # The rest is handed out longest first, the group is kept together
+        sent = [collection[i] for n in nodes for i in n.sent[1:]]
+        assert sent == ["t.py::test_grp1@grp", "t.py::test_grp2@grp", "t.py::test_mid"]
+        # Test with no recorded duration is estimated to take the median time
+        assert list(sched.workqueue) == ["t.py::test_unknown", "t.py::test_short"]
+
+    def test_no_durations(self):
+        collection = ["t.py::test_a", "t.py::test_b", "t.py::test_c", "t.py::test_d"]
+        sched, nodes = _get_scheduler(collection=collection, durations={}, nodes_num=1)
+        # Collection order is kept
+        assert [collection[i] for i in nodes[0].sent] == ["t.py::test_a", "t.py::test_b"]
+        assert list(sched.workqueue) == ["t.py::test_c", "t.py::test_d"]
+
+    def test_save_durations(self, tmp_path):
+        durations_file = tmp_path / "durations.json"
+        xdist_scheduler.save_durations(durations_file, {"t.py::test_a": 10.0})
+        xdist_scheduler.save_durations(durations_file, {"t.py::test_a": 20.0, "t.py::test_b": 1})
+
+        assert xdist_scheduler.load_durations(durations_file) == {
+            "t.py::test_a": 15.0,
+            "t.py::test_b": 1.0,
+        }
+
+    @pytest.mark.parametrize("items_num", (10_000, 50_000))
+    def test_scheduling_benchmark(self, items_num: int):
+        """Check that scheduling of large collections stays (close to) linear."""
+        collection = _get_synthetic_collection(items_num=items_num)
+
+        start = time.perf_counter()
+        sched, nodes = _get_scheduler(collection=collection, durations={}, nodes_num=8)
+
+        # Complete tests one by one on each worker, like when the tests are running
+        executed = []
+        while any(n.sent for n in nodes):
+            for node in nodes:
+                if node.sent:
+                    item_index = node.sent.pop(0)
+                    executed.append(item_index)
+                    sched.mark_test_complete(_worker(node), item_index)
+        elapsed = time.perf_counter() - start
+
+        assert sorted(executed) == list(range(items_num))
+        assert all(n.shutting_down for n in nodes)
+        # Takes well under a second, quadratic scheduling would take minutes
+        assert elapsed < 30, f"Scheduling of {items_num} items took {elapsed:.1f} s"
+
+    def test_crashed_node(self):
+        collection = [f"t.py::test_{i}" for i in range(8)] + ["t.py::test_long@long"]
+        sched, nodes = _get_scheduler(collection=collection, durations={}, nodes_num=2)
+        node0, node1 = nodes
+
+        crashed_sent = list(node0.sent)
+        sched.mark_test_complete(_worker(node0), node0.sent.pop(0))
+        crashitem = sched.remove_node(_worker(node0))
+        assert crashitem == collection[crashed_sent[1]]
+
+        # Pending tests of the crashed node are rescheduled on the other node
+        executed = set(crashed_sent[:1])
+        while node1.sent:
+            item_index = node1.sent.pop(0)
+            executed.add(item_index)
+            sched.mark_test_complete(_worker(node1), item_index)
+
+        assert executed == set(range(len(collection)))
+
+    def test_split_scope_with_resources(self):
+        sched, __ = _get_scheduler(collection=["t.py::test_a"], durations={}, nodes_num=1)
+        assert (
+            sched._split_scope("t.py::test_a[p@x]@res=cluster") == "t.py::test_a[p@x]@res=cluster"
+        )
+        assert sched._split_scope("t.py::test_a@res=cluster@grp") == "grp"
+        assert sched._split_scope("t.py::test_a@res=cluster@grp@long") == "grp"
+        assert sched._split_scope("t.py::test_a@res=a,b|c@long") == "t.py::test_a@res=a,b|c@long"
+        assert xdist_scheduler.get_resources("t.py::test_a@res=a,b|c@long") == ["a", "b|c"]
+        assert xdist_scheduler.get_base_nodeid("t.py::test_a@res=a,b|c@long") == "t.py::test_a"
+
+    def test_resources(self, monkeypatch):
+        monkeypatch.setenv("CLUSTERS_COUNT", "1")
+        collection = [
+            "t.py::test_singleton1@res=cluster",
+            "t.py::test_singleton2@res=cluster",
+            *(f"t.py::test_{i}" for i in range(6)),
+            "t.py::test_pool1@res=node-pool1|node-pool2",
+            "t.py::test_pool2@res=node-pool1|node-pool2",
+        ]
+        sched, nodes = _get_scheduler(collection=collection, durations={}, nodes_num=2)
+        node0, node1 = nodes
+
+        # Only one test locking the whole cluster instance can be pending, the other one is
+        # deferred. Both tests that lock one of the two pools can be pending.
+        assert [collection[i] for i in node0.sent] == [
+            "t.py::test_singleton1@res=cluster",
+            "t.py::test_pool2@res=node-pool1|node-pool2",
+        ]
+        assert [collection[i] for i in node1.sent] == [
+            "t.py::test_pool1@res=node-pool1|node-pool2",
+            "t.py::test_0",
+        ]
+        assert "t.py::test_singleton2@res=cluster" in sched.workqueue
+
+        # Once the first test locking the cluster instance finishes, the other one is scheduled
+        sched.mark_test_complete(_worker(node0), node0.sent.pop(0))
+        assert collection[node0.sent[-1]] == "t.py::test_singleton2@res=cluster"
+
+    def test_resources_work_unit(self, monkeypatch):
+        monkeypatch.setenv("CLUSTERS_COUNT", "2")
+        collection = [
+            "t.py::test_grp1@res=cluster@grp",
+            "t.py::test_grp2@res=cluster@grp",
+            "t.py::test_singleton@res=cluster",
+            *(f"t.py::test_{i}" for i in range(6)),
+        ]
+        sched, nodes = _get_scheduler(collection=collection, durations={}, nodes_num=2)
+        node0, node1 = nodes
+
+        # Tests of the same work unit run one after another, so they lock one copy of
+        # the resource
+        assert [collection[i] for i in node0.sent[:2]] == [
+            "t.py::test_grp1@res=cluster@grp",
+            "t.py::test_grp2@res=cluster@grp",
+        ]
+        assert collection[node1.sent[0]] == "t.py::test_singleton@res=cluster"
+        assert "t.py::test_singleton@res=cluster" not in sched.workqueue